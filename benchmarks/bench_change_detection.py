@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Jellynouncer Batch Change Detection Benchmark
+
+Compares ChangeDetector.detect_changes(), called once per old/new pair,
+with ChangeDetector.detect_changes_batch() over columns of the same pairs:
+
+1. Correctness: for every pair, the batch result (`ChangeBatch.changes()`)
+   must equal what detect_changes() returns, with every check enabled and
+   with the default configuration. The pairs include the awkward cases:
+   missing values, HDR spellings, a stored file size of 0, reordered
+   subtitle languages
+2. Speed: microseconds per pair for each method. The batch is timed on
+   ready-made columns, then including building the columns from the items,
+   and finally with change dictionaries built for the changed pairs
+
+Usage:
+    python benchmarks/bench_change_detection.py [--pairs 100000] [--changed 0.05]
+
+Author: Mark Newton
+Project: Jellynouncer
+Version: 1.0.0
+License: MIT
+"""
+
+import argparse
+import logging
+import os
+import random
+import sys
+import time
+from dataclasses import replace
+
+# Add parent directory to path so we can import jellynouncer modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_database import make_item  # noqa: E402
+from jellynouncer.change_detector import ChangeDetector  # noqa: E402
+from jellynouncer.config_models import NotificationsConfig  # noqa: E402
+
+ALL_CHANGES = {change: True for change in
+               ("resolution", "codec", "audio_codec", "audio_channels", "hdr_status", "file_size",
+                "video_bitrate", "subtitles")}
+
+MODIFICATIONS = (
+    lambda item: replace(item, video_height=random.choice([480, 720, 1080, 2160, None])),
+    lambda item: replace(item, video_codec=random.choice(["h264", "hevc", "av1", "", None])),
+    lambda item: replace(item, audio_codec=random.choice(["aac", "eac3", "truehd", None])),
+    lambda item: replace(item, audio_channels=random.choice([2, 6, 8, None])),
+    lambda item: replace(item, video_range=random.choice(["SDR", "HDR", "HDR10", "DOVI", "hlg", "", None])),
+    lambda item: replace(item, file_size=random.choice([0, None, 1, (item.file_size or 1) * 2,
+                                                        int((item.file_size or 100) * 1.05)])),
+    lambda item: replace(item, video_bitrate=random.choice([None, 0, 8_000_000, 8_100_000, 12_000_000])),
+    lambda item: replace(item, subtitle_count=random.choice([0, 1, 2, None])),
+    lambda item: replace(item, subtitle_languages=random.choice([["eng"], ["spa", "eng"], ["eng", "spa"], [], None])),
+)
+
+
+def make_pairs(count: int, changed: float) -> tuple:
+    """Old and new item lists; roughly `changed` of the pairs get modified fields."""
+    old_items, new_items = [], []
+    for index in range(count):
+        old = make_item(index)
+        new = replace(old)
+        if random.random() < changed:
+            for modify in random.sample(MODIFICATIONS, random.randint(1, 3)):
+                old, new = (modify(old), new) if random.random() < 0.3 else (old, modify(new))
+        old_items.append(old)
+        new_items.append(new)
+    return old_items, new_items
+
+
+def check(detector: ChangeDetector, old_items, new_items) -> int:
+    """Assert both methods agree on every pair; return the number of changed pairs."""
+    batch = detector.detect_changes_batch(ChangeDetector.item_columns(old_items),
+                                          ChangeDetector.item_columns(new_items))
+    for index, (old, new) in enumerate(zip(old_items, new_items)):
+        expected = detector.detect_changes(old, new)
+        assert batch.changes(index) == expected, (index, old, new, batch.changes(index), expected)
+        assert bool(batch.masks[index]) == bool(expected), index
+    return len(batch.changed_indexes())
+
+
+def per_pair(detector: ChangeDetector, old_items, new_items) -> float:
+    start = time.perf_counter()
+    for old, new in zip(old_items, new_items):
+        detector.detect_changes(old, new)
+    return time.perf_counter() - start
+
+
+def batched(detector: ChangeDetector, old_items, new_items, build_columns: bool, describe: bool) -> float:
+    def columns() -> tuple:
+        return ChangeDetector.item_columns(old_items), ChangeDetector.item_columns(new_items)
+
+    prebuilt = None if build_columns else columns()
+    start = time.perf_counter()
+    old_columns, new_columns = prebuilt or columns()
+    batch = detector.detect_changes_batch(old_columns, new_columns)
+    if describe:
+        for index in batch.changed_indexes():
+            batch.changes(index)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark batch change detection")
+    parser.add_argument("--pairs", type=int, default=100000, help="Old/new item pairs to compare")
+    parser.add_argument("--changed", type=float, default=0.05, help="Fraction of pairs with modified fields")
+    parser.add_argument("--repeat", type=int, default=3, help="Timing runs per method (best is reported)")
+    args = parser.parse_args()
+
+    # detect_changes() logs at debug level per pair
+    logging.disable(logging.CRITICAL)
+    random.seed(42)
+    old_items, new_items = make_pairs(args.pairs, args.changed)
+
+    for label, watch_changes in (("all checks", ALL_CHANGES), ("default config", {})):
+        detector = ChangeDetector(NotificationsConfig(watch_changes=watch_changes))
+        changed = check(detector, old_items, new_items)
+        print(f"\n{label}: {args.pairs:,} pairs, {changed:,} changed, results identical")
+        print(f"{'method':<30} {'us/pair':>8} {'speedup':>8}")
+        baseline = min(per_pair(detector, old_items, new_items) for _ in range(args.repeat))
+        print(f"{'detect_changes() per pair':<30} {baseline * 1e6 / args.pairs:>8.2f} {1:>7.1f}x")
+        for name, build_columns, describe in (("batch masks (columns given)", False, False),
+                                        ("batch masks + item_columns()", True, False),
+                                        ("  + descriptions", True, True)):
+            elapsed = min(batched(detector, old_items, new_items, build_columns, describe) for _ in range(args.repeat))
+            print(f"{name:<30} {elapsed * 1e6 / args.pairs:>8.2f} {baseline / elapsed:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Jellynouncer Change Rule Benchmark
+
+Compares change detection before and after the change settings were
+compiled into check functions (jellynouncer/change_rules.py):
+
+1. Default configuration: the previous detect_changes(), reproduced below
+   (it read every `watch_changes` flag on each call), against the compiled
+   ChangeDetector.detect_changes(). Both must return identical changes.
+2. Custom rules ("resolution increases only", "ignore video bitrate drift
+   of 5% or less", "HDR upgrades only for movies"): the compiled detector
+   against a straightforward reference that filters the previous method's
+   results, which must again agree.
+
+Usage:
+    python benchmarks/bench_change_rules.py [--pairs 100000] [--changed 0.2]
+
+Author: Mark Newton
+Project: Jellynouncer
+Version: 1.0.0
+License: MIT
+"""
+
+import argparse
+import logging
+import os
+import random
+import sys
+import time
+
+# Add parent directory to path so we can import jellynouncer modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_change_detection import make_pairs  # noqa: E402
+from jellynouncer.change_detector import ChangeDetector  # noqa: E402
+from jellynouncer.change_rules import HDR_RANK  # noqa: E402
+from jellynouncer.config_models import NotificationsConfig  # noqa: E402
+
+CUSTOM_RULES = [
+    {"change": "resolution", "direction": "increase"},
+    {"change": "video_bitrate", "min_change_percent": 5},
+    {"change": "hdr_status", "direction": "increase", "item_types": ["Movie"]},
+]
+
+
+def legacy_detect_changes(watch_changes, old_item, new_item):
+    """ChangeDetector.detect_changes() before change rules (logging removed)."""
+    changes = []
+
+    try:
+        # Resolution changes (most common and important upgrade scenario)
+        if (watch_changes.get('resolution', True) and
+                old_item.video_height != new_item.video_height and
+                old_item.video_height is not None and new_item.video_height is not None):
+            changes.append({
+                'type': 'resolution',
+                'field': 'video_height',
+                'old_value': old_item.video_height,
+                'new_value': new_item.video_height,
+                'description': f"Resolution changed from {old_item.video_height}p to {new_item.video_height}p"
+            })
+
+        # Video codec changes (compression and efficiency improvements)
+        if (watch_changes.get('codec', True) and
+                old_item.video_codec != new_item.video_codec and
+                (old_item.video_codec or new_item.video_codec)):
+            changes.append({
+                'type': 'codec',
+                'field': 'video_codec',
+                'old_value': old_item.video_codec,
+                'new_value': new_item.video_codec,
+                'description': f"Video codec changed from {old_item.video_codec or 'Unknown'} to {new_item.video_codec or 'Unknown'}"
+            })
+
+        # Audio codec changes (sound quality improvements)
+        if (watch_changes.get('audio_codec', True) and
+                old_item.audio_codec != new_item.audio_codec and
+                (old_item.audio_codec or new_item.audio_codec)):
+            changes.append({
+                'type': 'audio_codec',
+                'field': 'audio_codec',
+                'old_value': old_item.audio_codec,
+                'new_value': new_item.audio_codec,
+                'description': f"Audio codec changed from {old_item.audio_codec or 'Unknown'} to {new_item.audio_codec or 'Unknown'}"
+            })
+
+        # Audio channel changes (surround sound upgrades)
+        if (watch_changes.get('audio_channels', True) and
+                old_item.audio_channels != new_item.audio_channels and
+                old_item.audio_channels is not None and new_item.audio_channels is not None):
+            changes.append({
+                'type': 'audio_channels',
+                'field': 'audio_channels',
+                'old_value': old_item.audio_channels,
+                'new_value': new_item.audio_channels,
+                'description': f"Audio channels changed from {old_item.audio_channels} to {new_item.audio_channels}"
+            })
+
+        # HDR status changes (display quality improvements)
+        if watch_changes.get('hdr_status', True):
+            old_hdr = ChangeDetector._normalize_hdr_status(old_item.video_range)
+            new_hdr = ChangeDetector._normalize_hdr_status(new_item.video_range)
+
+            if old_hdr != new_hdr:
+                changes.append({
+                    'type': 'hdr_status',
+                    'field': 'video_range',
+                    'old_value': old_hdr,
+                    'new_value': new_hdr,
+                    'description': f"HDR status changed from {old_hdr} to {new_hdr}"
+                })
+
+        # File size changes (complete file replacements)
+        if (watch_changes.get('file_size', False) and
+                old_item.file_size != new_item.file_size and
+                old_item.file_size is not None and new_item.file_size is not None):
+            # Only report significant size changes (>10% difference)
+            size_diff_pct = abs(new_item.file_size - old_item.file_size) / old_item.file_size * 100
+            if size_diff_pct > 10:
+                changes.append({
+                    'type': 'file_size',
+                    'field': 'file_size',
+                    'old_value': old_item.file_size,
+                    'new_value': new_item.file_size,
+                    'description': f"File size changed significantly ({size_diff_pct:.1f}% difference)"
+                })
+
+        # Subtitle changes (track count and language changes)
+        if watch_changes.get('subtitles', True):
+            # Check subtitle count changes
+            old_sub_count = getattr(old_item, 'subtitle_count', 0) or 0
+            new_sub_count = getattr(new_item, 'subtitle_count', 0) or 0
+
+            if old_sub_count != new_sub_count:
+                changes.append({
+                    'type': 'subtitles',
+                    'field': 'subtitle_count',
+                    'old_value': old_sub_count,
+                    'new_value': new_sub_count,
+                    'description': f"Subtitle tracks changed from {old_sub_count} to {new_sub_count}"
+                })
+
+            # Check subtitle languages changes
+            old_sub_langs = getattr(old_item, 'subtitle_languages', []) or []
+            new_sub_langs = getattr(new_item, 'subtitle_languages', []) or []
+
+            # Convert to sets for comparison
+            old_langs_set = set(old_sub_langs) if old_sub_langs else set()
+            new_langs_set = set(new_sub_langs) if new_sub_langs else set()
+
+            added_langs = new_langs_set - old_langs_set
+            removed_langs = old_langs_set - new_langs_set
+
+            if added_langs or removed_langs:
+                if added_langs and not removed_langs:
+                    desc = f"Added subtitle languages: {', '.join(sorted(added_langs))}"
+                elif removed_langs and not added_langs:
+                    desc = f"Removed subtitle languages: {', '.join(sorted(removed_langs))}"
+                else:
+                    desc = f"Subtitle languages changed (added: {', '.join(sorted(added_langs))}, removed: {', '.join(sorted(removed_langs))})"
+
+                changes.append({
+                    'type': 'subtitles',
+                    'field': 'subtitle_languages',
+                    'old_value': sorted(old_langs_set),
+                    'new_value': sorted(new_langs_set),
+                    'description': desc
+                })
+    except Exception:
+        changes = []
+    return changes
+
+
+def reference_custom(old_item, new_item):
+    """CUSTOM_RULES applied by hand to the previous method's results."""
+    changes = legacy_detect_changes({}, old_item, new_item)
+    kept = []
+    for change in changes:
+        if change['type'] == 'resolution' and change['new_value'] <= change['old_value']:
+            continue
+        if change['type'] == 'hdr_status' and not (
+                new_item.item_type == 'Movie' and HDR_RANK[change['new_value']] > HDR_RANK[change['old_value']]):
+            continue
+        kept.append(change)
+    old, new = old_item.video_bitrate, new_item.video_bitrate
+    if old != new and old is not None and new is not None:
+        # Any change from 0 counts
+        if not old or abs(new - old) / old * 100 > 5:
+            kept.insert(sum(1 for change in kept if change['type'] != 'subtitles'), {
+                'type': 'video_bitrate', 'field': 'video_bitrate', 'old_value': old, 'new_value': new,
+                'description': f"Video bitrate changed from {old / 1_000_000:.1f} to {new / 1_000_000:.1f} Mbps"})
+    return kept
+
+
+def timed(function, old_items, new_items) -> float:
+    start = time.perf_counter()
+    for old, new in zip(old_items, new_items):
+        function(old, new)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark compiled change rules")
+    parser.add_argument("--pairs", type=int, default=100000, help="Old/new item pairs to compare")
+    parser.add_argument("--changed", type=float, default=0.2, help="Fraction of pairs with modified fields")
+    parser.add_argument("--repeat", type=int, default=3, help="Timing runs per method (best is reported)")
+    args = parser.parse_args()
+
+    # Both methods log at debug level per pair
+    logging.disable(logging.CRITICAL)
+    random.seed(42)
+    old_items, new_items = make_pairs(args.pairs, args.changed)
+
+    cases = (
+        ("default config", NotificationsConfig(),
+         lambda old, new: legacy_detect_changes({}, old, new)),
+        ("custom rules", NotificationsConfig(change_rules=CUSTOM_RULES), reference_custom),
+    )
+    for label, config, baseline in cases:
+        detector = ChangeDetector(config)
+        for old, new in zip(old_items, new_items):
+            assert detector.detect_changes(old, new) == baseline(old, new), (old, new)
+        before = min(timed(baseline, old_items, new_items) for _ in range(args.repeat))
+        after = min(timed(detector.detect_changes, old_items, new_items) for _ in range(args.repeat))
+        print(f"{label}: {args.pairs:,} pairs, results identical - "
+              f"previous/reference {before * 1e6 / args.pairs:.2f}us, "
+              f"compiled {after * 1e6 / args.pairs:.2f}us per pair ({before / after:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Jellynouncer Compact Schema Benchmarks
+
+Compares the standard and compact media_items formats on throwaway
+databases:
+
+1. Size: the same items loaded into each format, with table and index
+   sizes from SQLite's dbstat (DatabaseManager.get_storage_report())
+2. Migration: a standard database converted online to the compact format,
+   with webhook-style saves running alongside, and the report it produces
+3. Speed: batch save and get_item() in each format
+
+Usage:
+    python benchmarks/bench_compact_schema.py [--items 50000] [--lookups 2000]
+
+Author: Mark Newton
+Project: Jellynouncer
+Version: 1.0.0
+License: MIT
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from dataclasses import replace
+
+# Add parent directory to path so we can import jellynouncer modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_database import make_item  # noqa: E402
+from jellynouncer.config_models import DatabaseConfig  # noqa: E402
+from jellynouncer.database_manager import DatabaseManager  # noqa: E402
+
+
+def megabytes(size: int) -> str:
+    return f"{size / 1_048_576:>7.2f} MB"
+
+
+async def load(path: str, items, compact: bool) -> tuple:
+    """Create a database in one format and load `items`; returns (manager, items/s)."""
+    db = DatabaseManager(DatabaseConfig(path=path, compact_schema=compact))
+    await db.initialize()
+    start = time.perf_counter()
+    for batch_start in range(0, len(items), 500):
+        await db.save_items_batch(items[batch_start:batch_start + 500])
+    return db, len(items) / (time.perf_counter() - start)
+
+
+async def mean_get_item_us(db: DatabaseManager, items, lookups: int) -> float:
+    timings = []
+    for _ in range(lookups):
+        item_id = random.choice(items).item_id
+        start = time.perf_counter()
+        await db.get_item(item_id)
+        timings.append((time.perf_counter() - start) * 1_000_000)
+    return statistics.mean(timings)
+
+
+async def run(args) -> None:
+    random.seed(42)
+    items = [make_item(i) for i in range(args.items)]
+    # Real libraries name their libraries and vary subtitle sets a little
+    items = [replace(item, library_name=random.choice(["TV Shows", "Anime", "Kids TV"]),
+                     subtitle_languages=random.choice([["eng"], ["eng", "spa"], ["eng", "fre", "ger"], []]))
+             for item in items]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"{args.items:,} items")
+        print(f"{'format':<10} {'table':>10} {'indexes':>10} {'total':>10} {'in use':>10} {'save/s':>9} {'get_item':>9}")
+        reports = {}
+        for label, compact in (("standard", False), ("compact", True)):
+            db, rate = await load(os.path.join(tmp, f"{label}.db"), items, compact)
+            report = await db.get_storage_report()
+            lookup = await mean_get_item_us(db, items, args.lookups)
+            await db.close()
+            reports[label] = report
+            sizes = report['media_items']
+            print(f"{label:<10} {megabytes(sizes['table_bytes'])} {megabytes(sizes['index_bytes'])} "
+                  f"{megabytes(sizes['total_bytes'])} {megabytes(report['used_bytes'])} {rate:>9,.0f} {lookup:>7.0f}us")
+
+        standard, compact = reports['standard']['media_items'], reports['compact']['media_items']
+        print("\nLargest differences per index:")
+        changes = sorted(compact['indexes'], key=lambda name: compact['indexes'][name] - standard['indexes'].get(name, 0))
+        for name in changes[:5]:
+            print(f"  {name:<32} {megabytes(standard['indexes'].get(name, 0))} -> {megabytes(compact['indexes'][name])}")
+
+        # Online migration of the standard database while saves keep arriving
+        db = DatabaseManager(DatabaseConfig(path=os.path.join(tmp, "standard.db"), compact_schema=True))
+        saves = 0
+
+        async def webhook_saves():
+            nonlocal saves
+            while db._schema_migration_task is None or not db._schema_migration_task.done():
+                await db.save_item(replace(random.choice(items), file_size=random.randrange(1 << 30)))
+                saves += 1
+                await asyncio.sleep(0.001)
+
+        await db.initialize()
+        await asyncio.gather(db._schema_migration_task, webhook_saves())
+        report = db.last_schema_migration
+        await db.close()
+        print(f"\nOnline migration to compact: {report['items']:,} items in {report['seconds']}s, "
+              f"{saves:,} saves during it ({report['rewritten']:,} rows re-copied)")
+        print(f"  media_items + indexes {megabytes(report['before']['media_items']['total_bytes'])} -> "
+              f"{megabytes(report['after']['media_items']['total_bytes'])}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the compact media_items format")
+    parser.add_argument("--items", type=int, default=50000, help="Items in each benchmark database")
+    parser.add_argument("--lookups", type=int, default=2000, help="get_item calls to time")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Jellynouncer Content Hash Benchmarks
+
+Compares the two content hash versions (see jellynouncer/content_hash.py):
+
+1. Speed: microseconds per hash for version 1 (JSON) and version 2 (packed
+   bytes), on DatabaseItems with realistic field values, plus the generic
+   fallback encoding version 2 uses for unexpected field types
+2. Upgrade: a throwaway database whose rows all carry version 1 hashes is
+   opened, and DatabaseManager.rehash_items() upgrades them in the background
+
+Usage:
+    python benchmarks/bench_content_hash.py [--items 1000000] [--db-items 100000]
+
+Author: Mark Newton
+Project: Jellynouncer
+Version: 1.0.0
+License: MIT
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+from dataclasses import replace
+
+# Add parent directory to path so we can import jellynouncer modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import aiosqlite  # noqa: E402
+
+from bench_database import make_item  # noqa: E402
+from jellynouncer.config_models import DatabaseConfig  # noqa: E402
+from jellynouncer.content_hash import compute_content_hash, content_hash_v1  # noqa: E402
+from jellynouncer.database_manager import DatabaseManager  # noqa: E402
+
+
+def microseconds_per_hash(function, items) -> float:
+    start = time.perf_counter()
+    for item in items:
+        function(item)
+    return (time.perf_counter() - start) * 1_000_000 / len(items)
+
+
+def speed(items: int, sample: int = 10000) -> None:
+    """Hash `items` items (cycling through a sample) with each encoding."""
+    sample_items = [replace(make_item(i), subtitle_languages=random.choice([["eng"], ["eng", "spa"], []]))
+                    for i in range(min(items, sample))]
+    repeats = max(1, items // len(sample_items))
+    # A float bitrate can't use the packed layout
+    generic_items = [replace(item, video_bitrate=float(item.video_bitrate or 0)) for item in sample_items]
+
+    print(f"{len(sample_items) * repeats:,} hashes per encoding")
+    print(f"{'encoding':<22} {'us/hash':>9} {'hashes/s':>12}")
+    for label, function, hashed in (("v1 json", content_hash_v1, sample_items),
+                                    ("v2 packed", compute_content_hash, sample_items),
+                                    ("v2 generic fallback", compute_content_hash, generic_items)):
+        timings = [microseconds_per_hash(function, hashed) for _ in range(repeats)]
+        per_hash = min(timings)
+        print(f"{label:<22} {per_hash:>9.2f} {1_000_000 / per_hash:>12,.0f}")
+
+
+async def upgrade(path: str, items: int) -> None:
+    """Create a database of version 1 rows, then time the upgrade on startup."""
+    db = DatabaseManager(DatabaseConfig(path=path))
+    await db.initialize()
+    library = [make_item(i) for i in range(items)]
+    for batch_start in range(0, items, 500):
+        await db.save_items_batch(library[batch_start:batch_start + 500])
+    await db.close()
+
+    # As written by a version that only knew the JSON hash
+    async with aiosqlite.connect(path) as connection:
+        await connection.executemany(
+            "UPDATE media_items SET content_hash = ?, hash_version = 1 WHERE item_id = ?",
+            [(content_hash_v1(item), item.item_id) for item in library]
+        )
+        await connection.commit()
+
+    db = DatabaseManager(DatabaseConfig(path=path))
+    started = time.perf_counter()
+    await db.initialize()
+    startup = time.perf_counter() - started
+    if db._rehash_task is not None:
+        await db._rehash_task
+    report = db.last_rehash
+    await db.close()
+    print(f"\nUpgrade of {items:,} version 1 rows: initialize() {startup:.2f}s, "
+          f"rehash_items() {report['items']:,} rows in {report['seconds']}s "
+          f"({report['items'] / max(report['seconds'], 0.1):,.0f} rows/s)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark content hash versions")
+    parser.add_argument("--items", type=int, default=1_000_000, help="Hashes to compute per encoding")
+    parser.add_argument("--db-items", type=int, default=100000, help="Rows in the upgrade benchmark database")
+    args = parser.parse_args()
+
+    random.seed(42)
+    speed(args.items)
+    with tempfile.TemporaryDirectory() as tmp:
+        asyncio.run(upgrade(os.path.join(tmp, "bench.db"), args.db_items))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Jellynouncer Content Index Benchmarks
+
+1. Memory: builds a ContentHashIndex for a given number of items (one
+   million by default) and measures what it allocates with tracemalloc,
+   next to a plain dict of id and hash strings for comparison.
+2. Change check latency: on a throwaway database, times answering "is this
+   item new/changed/unchanged?" with the index, with a content_hash-only
+   query (index disabled), and with get_item() as webhooks used to do.
+
+Usage:
+    python benchmarks/bench_content_index.py [--index-items 1000000]
+                                             [--items 20000] [--checks 5000]
+
+Author: Mark Newton
+Project: Jellynouncer
+Version: 1.0.0
+License: MIT
+"""
+
+import argparse
+import asyncio
+import hashlib
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+# Add parent directory to path so we can import jellynouncer modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_database import make_item  # noqa: E402
+from jellynouncer.config_models import DatabaseConfig  # noqa: E402
+from jellynouncer.content_index import ContentHashIndex  # noqa: E402
+from jellynouncer.database_manager import DatabaseManager  # noqa: E402
+
+
+def fake_rows(count: int):
+    """Yield (item_id, content_hash) pairs shaped like real Jellyfin data."""
+    for index in range(count):
+        yield f"{index:032x}", hashlib.blake2b(index.to_bytes(8, 'big'), digest_size=32).hexdigest()
+
+
+def measure(build) -> tuple:
+    """Return (object, bytes allocated) for a builder function."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    built = build()
+    allocated = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return built, allocated
+
+
+async def time_checks(check, item_ids, checks: int) -> float:
+    """Mean microseconds per call of `check(item)` over random items."""
+    timings = []
+    for _ in range(checks):
+        item = make_item(random.choice(item_ids))
+        start = time.perf_counter()
+        await check(item)
+        timings.append((time.perf_counter() - start) * 1_000_000)
+    return statistics.mean(timings)
+
+
+async def bench_checks(args) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        indexed = DatabaseManager(DatabaseConfig(path=path))
+        await indexed.initialize()
+        random.seed(42)
+        items = [make_item(i) for i in range(args.items)]
+        for start in range(0, len(items), 500):
+            await indexed.save_items_batch(items[start:start + 500])
+        unindexed = DatabaseManager(DatabaseConfig(path=path, content_index=False))
+        await unindexed.initialize()
+
+        # Half the checks hit stored items, half are new ids
+        item_ids = list(range(args.items * 2))
+        print(f"\nChange check on {args.items:,} stored items ({args.checks:,} checks, mean per check)")
+        for label, check in (
+            ("get_item()", lambda item: indexed.get_item(item.item_id)),
+            ("hash query", unindexed.get_change_status),
+            ("index", indexed.get_change_status),
+        ):
+            print(f"  {label:<12} {await time_checks(check, item_ids, args.checks):>8.1f}us")
+
+        await indexed.close()
+        await unindexed.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the Jellynouncer content hash index")
+    parser.add_argument("--index-items", type=int, default=1_000_000, help="Items for the memory measurement")
+    parser.add_argument("--items", type=int, default=20000, help="Items in the benchmark database")
+    parser.add_argument("--checks", type=int, default=5000, help="Change checks to time")
+    args = parser.parse_args()
+
+    rows = list(fake_rows(args.index_items))
+
+    def build_index():
+        index = ContentHashIndex()
+        index.load(rows)
+        return index
+
+    index, index_bytes = measure(build_index)
+    _, strings_bytes = measure(lambda: {item_id: content_hash for item_id, content_hash in rows})
+    # The dict above shares the strings in `rows`; count them as a real cache would hold them
+    strings_bytes += sum(sys.getsizeof(item_id) + sys.getsizeof(content_hash) for item_id, content_hash in rows)
+
+    print(f"Memory for {args.index_items:,} items")
+    print(f"  ContentHashIndex  {index_bytes / 1_048_576:>7.1f} MB measured, "
+          f"{index.memory_bytes() / 1_048_576:.1f} MB estimated by memory_bytes()")
+    print(f"  dict of strings   {strings_bytes / 1_048_576:>7.1f} MB")
+
+    asyncio.run(bench_checks(args))
+
+
+if __name__ == "__main__":
+    main()
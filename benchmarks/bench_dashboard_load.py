@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Jellynouncer Dashboard Load Benchmarks
+
+Measures how much web dashboard polling slows down the webhook service's
+database writes. As in production, the two run in separate processes on
+the same throwaway database:
+
+- Webhook process: a steady stream of save_item() calls (plus the event
+  log entry each webhook records), timing every save
+- Web process: a number of open dashboard tabs, each loading the overview
+  (statistics, recent notifications, Jellyfin stats) every few seconds
+
+The web process reads the database in one of two ways:
+
+1. ad-hoc: a new read-write connection per query, without caching (how the
+   web interface used to read the databases)
+2. read-only: DatabaseManager(read_only=True) - pooled `mode=ro`
+   shared-cache readers - with the overview result cache
+
+A run without any dashboard gives the baseline.
+
+Usage:
+    python benchmarks/bench_dashboard_load.py [--items 100000] [--seconds 10]
+                                              [--tabs 20] [--interval 1.0]
+                                              [--cache 10]
+
+Author: Mark Newton
+Project: Jellynouncer
+Version: 1.0.0
+License: MIT
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+# Add parent directory to path so we can import jellynouncer modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_database import PerCallConnectionManager, make_item, percentile  # noqa: E402
+from jellynouncer.config_models import DatabaseConfig  # noqa: E402
+from jellynouncer.database_manager import DatabaseManager  # noqa: E402
+
+
+async def poll_dashboard(path: str, mode: str, tabs: int, interval: float, cache: float, stop, polls) -> None:
+    """Web process: `tabs` dashboards loading the overview every `interval` seconds until `stop` is set."""
+    config = DatabaseConfig(path=path)
+    if mode == "ad-hoc":
+        db = PerCallConnectionManager(config)
+    else:
+        db = DatabaseManager(config, read_only=True, result_cache_seconds=cache)
+        await db.initialize()
+
+    async def tab() -> None:
+        # Tabs were opened at different times
+        await asyncio.sleep(random.uniform(0, interval))
+        while not stop.is_set():
+            await db.get_statistics()
+            await db.get_recent_changes(limit=10)
+            await db.get_latest_jellyfin_stats()
+            with polls.get_lock():
+                polls.value += 1
+            await asyncio.sleep(interval)
+
+    await asyncio.gather(*(tab() for _ in range(tabs)))
+    await db.close()
+
+
+def dashboard_process(path: str, mode: str, tabs: int, interval: float, cache: float, stop, polls) -> None:
+    asyncio.run(poll_dashboard(path, mode, tabs, interval, cache, stop, polls))
+
+
+async def timed_saves(path: str, items: int, seconds: float) -> list:
+    """Webhook process: save one changed item every 2ms for `seconds`; returns save latencies in ms."""
+    db = DatabaseManager(DatabaseConfig(path=path))
+    await db.initialize()
+    latencies = []
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        item = make_item(random.randrange(items))
+        item.file_size += random.randrange(1, 1000)
+        start = time.perf_counter()
+        assert await db.save_item(item), "save_item failed"
+        latencies.append((time.perf_counter() - start) * 1000)
+        db.record_event("metadata_updated", "success", item_id=item.item_id, item_name=item.name,
+                        item_type=item.item_type, event_type="ItemAdded")
+        await asyncio.sleep(0.002)
+    await db.close()
+    return latencies
+
+
+async def build(path: str, items: int) -> None:
+    db = DatabaseManager(DatabaseConfig(path=path))
+    await db.initialize()
+    for batch_start in range(0, items, 500):
+        await db.save_items_batch([make_item(i) for i in range(batch_start, min(items, batch_start + 500))])
+    await db.save_jellyfin_stats({"server_name": "bench", "server_status": "online", "total_items": items})
+    await db.close()
+
+
+def run(args) -> None:
+    random.seed(42)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        asyncio.run(build(path, args.items))
+
+        print(f"{args.items:,} items, {args.tabs} dashboard tabs polling every {args.interval}s, "
+              f"{args.seconds}s per run, overview cache {args.cache}s")
+        print(f"{'dashboard':<12} {'saves':>7} {'p50':>9} {'p95':>9} {'p99':>9} {'max':>9} {'overviews':>10}")
+
+        for mode in ("none", "ad-hoc", "read-only"):
+            stop = multiprocessing.Event()
+            polls = multiprocessing.Value('i', 0)
+            web = None
+            if mode != "none":
+                web = multiprocessing.Process(
+                    target=dashboard_process,
+                    args=(path, mode, args.tabs, args.interval, args.cache, stop, polls)
+                )
+                web.start()
+                time.sleep(0.5)  # Let the web process open the database
+
+            latencies = asyncio.run(timed_saves(path, args.items, args.seconds))
+            stop.set()
+            if web is not None:
+                web.join()
+            print(f"{mode:<12} {len(latencies):>7,} {statistics.median(latencies):>7.2f}ms "
+                  f"{percentile(latencies, 95):>7.2f}ms {percentile(latencies, 99):>7.2f}ms "
+                  f"{max(latencies):>7.2f}ms {polls.value:>10,}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark webhook writes under web dashboard load")
+    parser.add_argument("--items", type=int, default=100000, help="Items in the benchmark database")
+    parser.add_argument("--seconds", type=float, default=10, help="Length of each run")
+    parser.add_argument("--tabs", type=int, default=20, help="Open dashboard tabs")
+    parser.add_argument("--interval", type=float, default=1.0, help="Seconds between overview loads per tab")
+    parser.add_argument("--cache", type=float, default=10, help="Overview result cache in seconds")
+    run(parser.parse_args())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Jellynouncer Database Benchmarks
+
+Measures DatabaseManager performance on a throwaway database:
+
+1. get_item latency: sequential lookups of random existing items
+2. Webhook throughput: concurrent "webhooks", each doing what
+   WebhookService does per item - get_item() followed by save_item()
+3. Save burst: many save_item() calls issued at once, as when a large
+   library scan in Jellyfin fires a webhook per item
+
+Each benchmark runs twice: with the pooled connections and group commit
+DatabaseManager uses now, and with a connection and commit per call (the
+previous behaviour), so the difference can be compared on the actual
+hardware Jellynouncer runs on.
+
+Usage:
+    python benchmarks/bench_database.py [--items 20000] [--lookups 2000]
+                                        [--webhooks 1000] [--concurrency 20]
+                                        [--burst 500]
+
+Author: Mark Newton
+Project: Jellynouncer
+Version: 1.0.0
+License: MIT
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from contextlib import asynccontextmanager
+
+import aiosqlite
+
+# Add parent directory to path so we can import jellynouncer modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from jellynouncer.config_models import DatabaseConfig  # noqa: E402
+from jellynouncer.database_manager import DatabaseManager  # noqa: E402
+from jellynouncer.database_models import DatabaseItem  # noqa: E402
+
+
+class PerCallConnectionManager(DatabaseManager):
+    """DatabaseManager that opens a new connection and commits per call, as before pooling."""
+
+    async def _submit_write(self, operation, payload):
+        try:
+            async with self._write_connection() as db:
+                if operation == "upsert":
+                    result = await self._upsert_item(db, payload)
+                else:
+                    result = await self._delete_item(db, payload)
+                await db.commit()
+                return result
+        except Exception:
+            return False
+
+    @asynccontextmanager
+    async def _write_connection(self):
+        async with aiosqlite.connect(self.db_path) as db:
+            db.row_factory = aiosqlite.Row
+            yield db
+
+    @asynccontextmanager
+    async def _read_connection(self):
+        async with aiosqlite.connect(self.db_path) as db:
+            db.row_factory = aiosqlite.Row
+            yield db
+
+
+def make_item(index: int) -> DatabaseItem:
+    """Build a realistic episode record."""
+    return DatabaseItem(
+        item_id=f"{index:032x}",
+        name=f"Episode {index}",
+        item_type="Episode",
+        series_name=f"Series {index // 100}",
+        series_id=f"{index // 100:032x}",
+        season_number=(index // 10) % 10 + 1,
+        episode_number=index % 10 + 1,
+        year=2000 + index % 25,
+        video_height=random.choice([720, 1080, 2160]),
+        video_width=1920,
+        video_codec=random.choice(["h264", "hevc", "av1"]),
+        video_range="SDR",
+        video_framerate=23.976,
+        video_bitrate=8_000_000,
+        audio_codec="eac3",
+        audio_channels=6,
+        audio_language="eng",
+        subtitle_count=2,
+        subtitle_languages=["eng", "spa"],
+        subtitle_formats=["srt"],
+        file_path=f"/media/tv/series{index // 100}/episode{index}.mkv",
+        file_size=1_500_000_000 + index,
+    )
+
+
+def percentile(values, percent):
+    """Nearest-rank percentile of a list of numbers."""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * percent / 100))]
+
+
+async def bench_get_item(db: DatabaseManager, item_count: int, lookups: int) -> dict:
+    """Time sequential get_item() calls for random existing ids."""
+    timings = []
+    for _ in range(lookups):
+        item_id = f"{random.randrange(item_count):032x}"
+        start = time.perf_counter()
+        item = await db.get_item(item_id)
+        timings.append((time.perf_counter() - start) * 1_000_000)
+        assert item is not None, f"get_item({item_id}) returned None"
+    return {
+        "mean_us": statistics.mean(timings),
+        "p50_us": percentile(timings, 50),
+        "p95_us": percentile(timings, 95),
+    }
+
+
+async def bench_webhooks(db: DatabaseManager, item_count: int, webhooks: int, concurrency: int) -> dict:
+    """Run get_item + save_item "webhooks" with limited concurrency."""
+    slots = asyncio.Semaphore(concurrency)
+
+    async def webhook(index: int) -> None:
+        async with slots:
+            item = make_item(random.randrange(item_count))
+            await db.get_item(item.item_id)
+            assert await db.save_item(item), "save_item failed"
+
+    start = time.perf_counter()
+    await asyncio.gather(*(webhook(i) for i in range(webhooks)))
+    elapsed = time.perf_counter() - start
+    return {"webhooks_per_second": webhooks / elapsed, "seconds": elapsed}
+
+
+async def bench_burst(db: DatabaseManager, item_count: int, burst: int) -> dict:
+    """Issue `burst` save_item() calls at once and time until all have committed."""
+    items = [make_item(random.randrange(item_count)) for _ in range(burst)]
+    start = time.perf_counter()
+    results = await asyncio.gather(*(db.save_item(item) for item in items))
+    elapsed = time.perf_counter() - start
+    assert all(results), "save_item failed during burst"
+    return {"saves_per_second": burst / elapsed, "seconds": elapsed}
+
+
+async def run(args) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        config = DatabaseConfig(path=os.path.join(tmp, "bench.db"))
+        setup = DatabaseManager(config)
+        await setup.initialize()
+        random.seed(42)
+        items = [make_item(i) for i in range(args.items)]
+        for start in range(0, len(items), 500):
+            await setup.save_items_batch(items[start:start + 500])
+        await setup.close()
+
+        print(f"Database: {args.items:,} items, {args.lookups:,} lookups, "
+              f"{args.webhooks:,} webhooks at concurrency {args.concurrency}, burst of {args.burst:,} saves")
+        print(f"{'mode':<12} {'get_item mean':>14} {'p50':>10} {'p95':>10} {'webhooks/s':>12} {'burst saves/s':>14}")
+
+        for label, manager_class in (("per-call", PerCallConnectionManager), ("current", DatabaseManager)):
+            db = manager_class(config)
+            lookup = await bench_get_item(db, args.items, args.lookups)
+            throughput = await bench_webhooks(db, args.items, args.webhooks, args.concurrency)
+            burst = await bench_burst(db, args.items, args.burst)
+            await db.close()
+            print(f"{label:<12} {lookup['mean_us']:>12.0f}us {lookup['p50_us']:>8.0f}us "
+                  f"{lookup['p95_us']:>8.0f}us {throughput['webhooks_per_second']:>12.0f} "
+                  f"{burst['saves_per_second']:>14.0f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark Jellynouncer database access")
+    parser.add_argument("--items", type=int, default=20000, help="Items in the benchmark database")
+    parser.add_argument("--lookups", type=int, default=2000, help="Sequential get_item calls")
+    parser.add_argument("--webhooks", type=int, default=1000, help="Simulated webhooks")
+    parser.add_argument("--concurrency", type=int, default=20, help="Concurrent webhooks")
+    parser.add_argument("--burst", type=int, default=500, help="save_item calls issued at once")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
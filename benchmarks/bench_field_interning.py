@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Jellynouncer Field Interning Memory Benchmark
+
+Measures how much memory the field intern tables (jellynouncer/field_interning.py)
+save while a large library's items are held in memory, as during a sync
+(items waiting in the pipeline queues) plus an item_id -> item cache.
+
+Payloads go through a JSON round trip one 500-item page at a time, like real
+API responses, so every string value starts out as its own object. Each
+mode runs in a fresh process and reports the growth of its resident set
+size (RSS) while the converted items are kept:
+
+1. plain: intern tables disabled (limit 0), every item keeps its own strings
+2. interned: the default table limits
+
+Usage:
+    python benchmarks/bench_field_interning.py [--items 500000] [--series 5000]
+
+Author: Mark Newton
+Project: Jellynouncer
+Version: 1.0.0
+License: MIT
+"""
+
+import argparse
+import asyncio
+import gc
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import time
+
+# Add parent directory to path so we can import jellynouncer modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from jellynouncer.config_models import JellyfinConfig  # noqa: E402
+from jellynouncer.field_interning import field_values  # noqa: E402
+from jellynouncer.jellyfin_api import JellyfinAPI  # noqa: E402
+
+PAGE_SIZE = 500
+
+
+def rss_bytes() -> int:
+    """Current resident set size (peak RSS where /proc isn't available)."""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+def make_page(start: int, count: int, series: int) -> str:
+    """A page of Jellyfin /Items episodes as the JSON text the API returns."""
+    items = []
+    for index in range(start, start + count):
+        series_index = index % series
+        items.append({
+            "Id": f"{index:032x}",
+            "Name": f"Episode {index}",
+            "Type": random.choice(["Episode"] * 9 + ["Movie"]),
+            "SeriesName": f"Series {series_index}",
+            "SeriesId": f"{series_index:032x}",
+            "ParentIndexNumber": index % 10 + 1,
+            "IndexNumber": index % 24 + 1,
+            "ProductionYear": 1990 + index % 35,
+            "Path": f"/media/tv/series{series_index}/episode{index}.mkv",
+            "DateLastSaved": "2024-05-01T12:00:00.0000000Z",
+            "MediaSources": [{
+                "Size": 1_500_000_000 + index,
+                "MediaStreams": [
+                    {"Type": "Video", "Height": random.choice([720, 1080, 2160]), "Width": 1920,
+                     "Codec": random.choice(["h264", "hevc", "av1"]),
+                     "Profile": random.choice(["High", "Main", "Main 10"]),
+                     "VideoRange": random.choice(["SDR", "HDR"]), "RealFrameRate": 23.976,
+                     "BitRate": 8_000_000, "BitDepth": 10},
+                    {"Type": "Audio", "Codec": random.choice(["aac", "ac3", "eac3", "truehd"]),
+                     "Channels": 6, "Language": random.choice(["eng", "jpn", "fre"]),
+                     "BitRate": 640_000, "SampleRate": 48000},
+                    {"Type": "Subtitle", "Language": "eng", "Codec": "srt"},
+                    {"Type": "Subtitle", "Language": random.choice(["spa", "ger"]), "Codec": "ass"},
+                ],
+            }],
+        })
+    return json.dumps({"Items": items})
+
+
+async def measure(items: int, series: int) -> dict:
+    """Convert and keep `items` items; return the RSS growth and timing."""
+    random.seed(42)
+    api = JellyfinAPI(JellyfinConfig(server_url="http://jellyfin:8096", api_key="bench", user_id="bench"))
+    queued = []  # Items in flight through the pipeline
+    cache = {}   # item_id -> item
+    gc.collect()
+    before = rss_bytes()
+    elapsed = 0.0
+    for page_start in range(0, items, PAGE_SIZE):
+        page = json.loads(make_page(page_start, min(PAGE_SIZE, items - page_start), series))["Items"]
+        start = time.perf_counter()
+        for item_data in page:
+            db_item = await api.convert_to_database_item(item_data)
+            queued.append(db_item)
+            cache[db_item.item_id] = db_item
+        elapsed += time.perf_counter() - start
+        del page
+    gc.collect()
+    return {
+        "rss": rss_bytes() - before,
+        "items_per_second": items / elapsed,
+        "tables": {field: table.stats() for field, table in field_values.items() if table},
+    }
+
+
+def child(mode: str, items: int, series: int) -> None:
+    if mode == "plain":
+        for table in field_values.values():
+            table.max_size = 0
+    print(json.dumps(asyncio.run(measure(items, series))))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the RSS saved by field value interning")
+    parser.add_argument("--items", type=int, default=500_000, help="Items converted and kept")
+    parser.add_argument("--series", type=int, default=5000, help="Distinct series names")
+    parser.add_argument("--child", choices=("plain", "interned"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child, args.items, args.series)
+        return
+
+    print(f"{args.items:,} items kept ({args.series:,} series), one process per mode")
+    print(f"{'mode':<10} {'RSS growth':>12} {'bytes/item':>11} {'items/s':>10}")
+    results = {}
+    for mode in ("plain", "interned"):
+        output = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--child", mode,
+             "--items", str(args.items), "--series", str(args.series)],
+            check=True, capture_output=True, text=True
+        ).stdout
+        results[mode] = json.loads(output.strip().splitlines()[-1])
+        result = results[mode]
+        print(f"{mode:<10} {result['rss'] / 1e6:>10.1f}MB {result['rss'] / args.items:>11,.0f} "
+              f"{result['items_per_second']:>10,.0f}")
+
+    saved = results["plain"]["rss"] - results["interned"]["rss"]
+    print(f"\nSaved {saved / 1e6:.1f}MB ({saved / max(results['plain']['rss'], 1):.0%})")
+    for field, stats in results["interned"]["tables"].items():
+        print(f"  {field:<18} {stats['values']:>6} values (limit {stats['max_size']}, overflow {stats['overflow']})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Jellynouncer DatabaseItem Memory Benchmarks
+
+Builds DatabaseItems from Jellyfin-style API payloads through
+JellyfinAPI.convert_to_database_item(), as a library sync does, and
+compares the slotted DatabaseItem (`@dataclass(slots=True)`) with the same
+class without slots (a per-instance `__dict__`, as before):
+
+1. Throughput: items converted per second (one million by default)
+2. Memory: bytes held per item while the converted items are kept, measured
+   with tracemalloc on a sample, split into the DatabaseItem object itself
+   and everything it references (ids, names, hashes, lists)
+
+Usage:
+    python benchmarks/bench_item_memory.py [--items 1000000] [--memory-items 100000]
+
+Author: Mark Newton
+Project: Jellynouncer
+Version: 1.0.0
+License: MIT
+"""
+
+import argparse
+import asyncio
+import gc
+import inspect
+import os
+import random
+import sys
+import time
+import tracemalloc
+import types
+
+# Add parent directory to path so we can import jellynouncer modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from jellynouncer import database_models  # noqa: E402
+from jellynouncer.config_models import JellyfinConfig  # noqa: E402
+from jellynouncer.jellyfin_api import JellyfinAPI  # noqa: E402
+
+
+def unslotted_database_item():
+    """Build DatabaseItem from its own source without `slots=True`, for comparison."""
+    source = inspect.getsource(database_models).replace(
+        "@dataclass(slots=True)\nclass DatabaseItem", "@dataclass\nclass DatabaseItem"
+    )
+    module = types.ModuleType("database_models_unslotted")
+    module.__package__ = "jellynouncer"
+    sys.modules[module.__name__] = module
+    exec(compile(source, module.__name__, "exec"), module.__dict__)
+    return module.DatabaseItem
+
+
+def make_payload(index: int) -> dict:
+    """A Jellyfin /Items entry for an episode, with the fields a sync requests."""
+    return {
+        "Id": f"{index:032x}",
+        "Name": f"Episode {index}",
+        "Type": "Episode",
+        "SeriesName": f"Series {index // 100}",
+        "SeriesId": f"{index // 100:032x}",
+        "ParentIndexNumber": (index // 10) % 10 + 1,
+        "IndexNumber": index % 10 + 1,
+        "ProductionYear": 2000 + index % 25,
+        "Path": f"/media/tv/series{index // 100}/episode{index}.mkv",
+        "DateLastSaved": "2024-05-01T12:00:00.0000000Z",
+        "MediaSources": [{
+            "Size": 1_500_000_000 + index,
+            "MediaStreams": [
+                {"Type": "Video", "Height": random.choice([720, 1080, 2160]), "Width": 1920,
+                 "Codec": random.choice(["h264", "hevc", "av1"]), "Profile": "Main 10",
+                 "VideoRange": "SDR", "RealFrameRate": 23.976, "BitRate": 8_000_000, "BitDepth": 10},
+                {"Type": "Audio", "Codec": "eac3", "Channels": 6, "Language": "eng",
+                 "BitRate": 640_000, "SampleRate": 48000},
+                {"Type": "Subtitle", "Language": "eng", "Codec": "srt"},
+                {"Type": "Subtitle", "Language": "spa", "Codec": "srt"},
+            ],
+        }],
+    }
+
+
+async def convert(api: JellyfinAPI, payloads) -> list:
+    return [await api.convert_to_database_item(payload) for payload in payloads]
+
+
+async def throughput(api: JellyfinAPI, items: int, chunk: int = 10000) -> float:
+    """Items per second converted, not counting payload creation."""
+    elapsed = 0.0
+    for chunk_start in range(0, items, chunk):
+        payloads = [make_payload(index) for index in range(chunk_start, min(items, chunk_start + chunk))]
+        start = time.perf_counter()
+        await convert(api, payloads)
+        elapsed += time.perf_counter() - start
+    return items / elapsed
+
+
+async def memory_per_item(api: JellyfinAPI, items: int) -> tuple:
+    """(total bytes, object-only bytes) held per converted item."""
+    payloads = [make_payload(index) for index in range(items)]
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    converted = await convert(api, payloads)
+    gc.collect()
+    total = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    sample = converted[0]
+    own = sys.getsizeof(sample) + (sys.getsizeof(sample.__dict__) if hasattr(sample, '__dict__') else 0)
+    return total / items, own
+
+
+async def run(args) -> None:
+    random.seed(42)
+    api = JellyfinAPI(JellyfinConfig(server_url="http://jellyfin:8096", api_key="bench", user_id="bench"))
+    classes = (("dict", unslotted_database_item()), ("slots", database_models.DatabaseItem))
+
+    print(f"convert_to_database_item(): {args.items:,} items for throughput, "
+          f"{args.memory_items:,} kept for memory")
+    print(f"{'DatabaseItem':<14} {'items/s':>10} {'bytes/item':>12} {'object only':>12}")
+    for label, item_class in classes:
+        # convert_to_database_item() imports DatabaseItem from database_models on each call
+        original = database_models.DatabaseItem
+        database_models.DatabaseItem = item_class
+        try:
+            rate = await throughput(api, args.items)
+            per_item, own = await memory_per_item(api, args.memory_items)
+        finally:
+            database_models.DatabaseItem = original
+        print(f"{label:<14} {rate:>10,.0f} {per_item:>12,.0f} {own:>12,}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark DatabaseItem construction and memory")
+    parser.add_argument("--items", type=int, default=1_000_000, help="Items to convert for throughput")
+    parser.add_argument("--memory-items", type=int, default=100_000, help="Items kept for the memory measurement")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
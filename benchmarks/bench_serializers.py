@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Jellynouncer Serializer Microbenchmarks
+
+Times `dataclasses.asdict()` against the generated serializers in
+jellynouncer/serializers.py for each hot path that used to call it:
+
+1. DatabaseItem -> media_items row (save_item / save_items_batch)
+2. DatabaseItem -> dict (DatabaseItem.to_dict)
+3. MediaItem -> template dict (DiscordNotifier.render_embed)
+4. OMDbMetadata / TMDbMetadata -> template dict (their to_dict methods)
+5. MediaItem -> JSON text (webhook payload debugging)
+
+Every case first checks that both sides give the same result.
+
+Usage:
+    python benchmarks/bench_serializers.py [--number 100000] [--repeat 5]
+
+Author: Mark Newton
+Project: Jellynouncer
+Version: 1.0.0
+License: MIT
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import timeit
+from dataclasses import asdict
+
+# Add parent directory to path so we can import jellynouncer modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_database import make_item  # noqa: E402
+from jellynouncer.database_manager import ITEM_COLUMNS, _JSON_COLUMNS, item_row  # noqa: E402
+from jellynouncer.media_models import MediaItem  # noqa: E402
+from jellynouncer.metadata_omdb import OMDbMetadata, OMDbRating  # noqa: E402
+from jellynouncer.metadata_tmdb import TMDbMetadata  # noqa: E402
+from jellynouncer.serializers import to_dict, to_json_dict  # noqa: E402
+
+
+def asdict_row(item) -> tuple:
+    """Row building the asdict() way: deep copy, then pick columns and encode lists."""
+    data = asdict(item)
+    for column in _JSON_COLUMNS:
+        if data[column] is not None:
+            data[column] = json.dumps(data[column])
+    return tuple(data[column] for column in ITEM_COLUMNS)
+
+
+def make_media_item() -> MediaItem:
+    """A movie with the fields a notification template typically uses."""
+    return MediaItem(
+        item_id="a" * 32, name="Example Movie", item_type="Movie", year=2024,
+        overview="A long overview of the movie. " * 8,
+        video_height=2160, video_width=3840, video_codec="hevc", video_range="HDR10",
+        video_framerate=23.976, video_bitrate=40_000_000, video_bitdepth=10,
+        audio_codec="truehd", audio_channels=8, audio_language="eng",
+        subtitle_count=3, subtitle_languages=["eng", "spa", "fre"], subtitle_formats=["pgs"],
+        genres=["Action", "Adventure", "Science Fiction"], studios=["Studio A", "Studio B"],
+        tags=["4K", "Atmos"], imdb_id="tt0000001", tmdb_id="1", file_size=60_000_000_000,
+    )
+
+
+def make_omdb() -> OMDbMetadata:
+    return OMDbMetadata(
+        imdb_id="tt0000001", title="Example Movie", year="2024", genre="Action, Adventure",
+        actors="Actor One, Actor Two, Actor Three", plot="Plot. " * 20,
+        ratings=[OMDbRating(source="Internet Movie Database", value="8.1/10"),
+                 OMDbRating(source="Rotten Tomatoes", value="91%"),
+                 OMDbRating(source="Metacritic", value="77/100")],
+    )
+
+
+def make_tmdb() -> TMDbMetadata:
+    return TMDbMetadata(tmdb_id=1, media_type="movie", title="Example Movie", overview="Overview. " * 20,
+                        vote_average=8.123, vote_count=1234,
+                        genres=[{"id": 28, "name": "Action"}, {"id": 12, "name": "Adventure"}])
+
+
+def run(args) -> None:
+    random.seed(42)
+    database_item = make_item(1)
+    media_item = make_media_item()
+    omdb, tmdb = make_omdb(), make_tmdb()
+
+    cases = (
+        ("DatabaseItem -> row", lambda: asdict_row(database_item), lambda: item_row(database_item)),
+        ("DatabaseItem -> dict", lambda: asdict(database_item), lambda: database_item.to_dict()),
+        ("MediaItem -> template", lambda: asdict(media_item), lambda: to_dict(media_item)),
+        ("OMDbMetadata -> dict", lambda: asdict(omdb), lambda: omdb.to_dict()),
+        ("TMDbMetadata -> dict", lambda: asdict(tmdb), lambda: to_dict(tmdb)),
+        ("MediaItem -> JSON", lambda: json.dumps(asdict(media_item), default=str),
+         lambda: json.dumps(to_json_dict(media_item))),
+    )
+
+    print(f"{args.number:,} calls per case, best of {args.repeat}")
+    print(f"{'case':<24} {'asdict':>10} {'compiled':>10} {'speedup':>8}")
+    for label, baseline, compiled in cases:
+        assert baseline() == compiled(), f"{label}: results differ"
+        before = min(timeit.repeat(baseline, number=args.number, repeat=args.repeat)) / args.number
+        after = min(timeit.repeat(compiled, number=args.number, repeat=args.repeat)) / args.number
+        print(f"{label:<24} {before * 1e6:>8.2f}us {after * 1e6:>8.2f}us {before / after:>7.1f}x")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark generated dataclass serializers against asdict()")
+    parser.add_argument("--number", type=int, default=100000, help="Calls per timing run")
+    parser.add_argument("--repeat", type=int, default=5, help="Timing runs per case (best is reported)")
+    run(parser.parse_args())
+
+
+if __name__ == "__main__":
+    main()
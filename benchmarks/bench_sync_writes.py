@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Jellynouncer Sync Write Benchmarks
+
+Measures DatabaseManager.save_items_batch() the way a library sync uses it,
+on a throwaway database, in three scenarios:
+
+1. Initial sync: every item is new
+2. Unchanged resync: every item is saved again exactly as stored
+3. Partial resync: the same items with 10% of them changed
+
+Each scenario runs with the current conditional upsert
+(`INSERT ... ON CONFLICT DO UPDATE ... WHERE changed`, run through
+executemany) and with the previous implementation, one multi-VALUES
+`INSERT OR REPLACE` per chunk of 500 items built from `dataclasses.asdict()`.
+A third run repeats the current implementation with the initial sync in
+bulk-load mode (indexes deferred, as the first sync after install does).
+
+Usage:
+    python benchmarks/bench_sync_writes.py [--items 50000] [--batch 500] [--changed 10]
+
+Author: Mark Newton
+Project: Jellynouncer
+Version: 1.0.0
+License: MIT
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from dataclasses import asdict, replace
+
+# Add parent directory to path so we can import jellynouncer modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_database import make_item  # noqa: E402
+from jellynouncer.config_models import DatabaseConfig  # noqa: E402
+from jellynouncer.database_manager import DatabaseManager  # noqa: E402
+
+
+class MultiValuesManager(DatabaseManager):
+    """DatabaseManager with the previous multi-VALUES INSERT OR REPLACE batch save."""
+
+    async def save_items_batch(self, items):
+        successful = 0
+        async with self._write_connection() as db:
+            await db.execute("BEGIN IMMEDIATE")
+            for chunk_start in range(0, len(items), 500):
+                chunk = items[chunk_start:chunk_start + 500]
+                old_tokens = await self._load_sync_tokens(db, [item.item_id for item in chunk])
+                columns = None
+                rows = []
+                bucket_changes = []
+                for item in chunk:
+                    bucket_change = self._inherit_sync_tracking(item, old_tokens)
+                    item_dict = asdict(item)
+                    for field in ('subtitle_languages', 'subtitle_formats'):
+                        if item_dict[field] is not None:
+                            item_dict[field] = json.dumps(item_dict[field])
+                    if columns is None:
+                        columns = list(item_dict.keys())
+                    rows.append(list(item_dict.values()))
+                    if bucket_change:
+                        bucket_changes.append(bucket_change)
+
+                placeholders = ','.join([f"({','.join('?' * len(columns))})"] * len(rows))
+                await db.execute(
+                    f"INSERT OR REPLACE INTO media_items ({','.join(columns)}) VALUES {placeholders}",
+                    [value for row in rows for value in row]
+                )
+                await self._apply_bucket_changes(db, bucket_changes)
+                successful += len(rows)
+            await db.commit()
+        return {'successful': successful, 'failed': 0, 'total': len(items)}
+
+
+def changed_copy(items, percent: int):
+    """Copy of `items` with `percent`% of them given a new file size and save date."""
+    changed = set(random.sample(range(len(items)), len(items) * percent // 100))
+    return [
+        replace(item, file_size=item.file_size + 1, server_token="2025-01-01T00:00:00Z") if index in changed else item
+        for index, item in enumerate(items)
+    ]
+
+
+async def timed_sync(db: DatabaseManager, items, batch: int) -> dict:
+    """Save `items` in sync-sized batches and total up the results."""
+    totals = {}
+    start = time.perf_counter()
+    for batch_start in range(0, len(items), batch):
+        results = await db.save_items_batch(items[batch_start:batch_start + batch])
+        for key, value in results.items():
+            totals[key] = totals.get(key, 0) + value
+    elapsed = time.perf_counter() - start
+    assert totals['successful'] == len(items), f"save_items_batch saved {totals['successful']}/{len(items)}"
+    totals['items_per_second'] = len(items) / elapsed
+    return totals
+
+
+async def run(args) -> None:
+    random.seed(42)
+    items = [replace(make_item(i), server_token="2024-01-01T00:00:00Z") for i in range(args.items)]
+    partial = changed_copy(items, args.changed)
+
+    print(f"{args.items:,} items in batches of {args.batch}, {args.changed}% changed on the partial resync")
+    print(f"{'implementation':<16} {'initial/s':>12} {'unchanged/s':>12} {'partial/s':>12} {'db size':>10}")
+
+    for label, manager_class, bulk_load in (("multi-VALUES", MultiValuesManager, False),
+                                            ("upsert", DatabaseManager, False),
+                                            ("upsert + bulk", DatabaseManager, True)):
+        with tempfile.TemporaryDirectory() as tmp:
+            config = DatabaseConfig(path=os.path.join(tmp, "bench.db"))
+            db = manager_class(config)
+            await db.initialize()
+            if bulk_load:
+                start = time.perf_counter()
+                assert await db.begin_bulk_load(), "bulk load did not start"
+                initial = await timed_sync(db, items, args.batch)
+                await db.end_bulk_load()
+                # Include the index rebuild in the rate
+                initial['items_per_second'] = len(items) / (time.perf_counter() - start)
+            else:
+                initial = await timed_sync(db, items, args.batch)
+            unchanged = await timed_sync(db, items, args.batch)
+            changed = await timed_sync(db, partial, args.batch)
+            await db.close()
+            size_mb = (os.path.getsize(config.path) + os.path.getsize(config.path + "-wal")
+                       if os.path.exists(config.path + "-wal") else os.path.getsize(config.path)) / 1_048_576
+            print(f"{label:<16} {initial['items_per_second']:>12,.0f} {unchanged['items_per_second']:>12,.0f} "
+                  f"{changed['items_per_second']:>12,.0f} {size_mb:>8.1f}MB")
+            if 'unchanged' in changed and not bulk_load:
+                print(f"{'':<16} partial resync: {changed['inserted']} inserted, "
+                      f"{changed['updated']} updated, {changed['unchanged']} unchanged")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark Jellynouncer sync batch writes")
+    parser.add_argument("--items", type=int, default=50000, help="Items per sync")
+    parser.add_argument("--batch", type=int, default=500, help="Items per save_items_batch call")
+    parser.add_argument("--changed", type=int, default=10, help="Percent of items changed on the partial resync")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
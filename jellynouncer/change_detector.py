@@ -11,8 +11,21 @@ The ChangeDetector class focuses on technical improvements that users care about
 such as resolution upgrades, codec improvements, and audio enhancements, while
 filtering out trivial changes that don't warrant notifications.
 
+**Configured Checks:**
+Which changes count is decided by `watch_changes` and `change_rules` in
+NotificationsConfig. They are compiled into one check function per enabled
+change type when the detector is created (see jellynouncer/change_rules.py),
+so comparing two items doesn't consult the configuration at all.
+
+**Batch Comparison:**
+`ChangeDetector.detect_changes_batch()` compares thousands of old/new pairs
+at once, one watched field (column) at a time, and returns a bitmask of
+changed checks per pair. Change dictionaries and their descriptions are only
+built for the pairs that are actually notified, with `ChangeBatch.changes()`.
+
 Classes:
     ChangeDetector: Intelligent change detector for media quality upgrades
+    ChangeBatch: Per-pair change bitmasks from a batch comparison
 
 Author: Mark Newton
 Project: Jellynouncer
@@ -21,14 +34,296 @@ License: MIT
 """
 
 import logging
-from typing import List, Dict, Any, Union, Optional
+from functools import lru_cache
+from array import array
+from itertools import compress, repeat
+from operator import and_, attrgetter, is_not, ne, or_, truth
+from typing import List, Dict, Any, Union, Optional, Iterable, Mapping, Sequence, Set, Callable
 
+from .change_rules import Predicate, compile_change_rules
 from .config_models import NotificationsConfig
 from .media_models import MediaItem
 from .database_models import DatabaseItem
+from .quality_score import item_quality_score, normalize_hdr_status
 from .utils import get_logger
 
 
+# Bits of a ChangeBatch mask, in the order detect_changes() reports the changes
+CHANGE_RESOLUTION = 1 << 0
+CHANGE_CODEC = 1 << 1
+CHANGE_AUDIO_CODEC = 1 << 2
+CHANGE_AUDIO_CHANNELS = 1 << 3
+CHANGE_HDR_STATUS = 1 << 4
+CHANGE_FILE_SIZE = 1 << 5
+CHANGE_VIDEO_BITRATE = 1 << 6
+CHANGE_SUBTITLE_COUNT = 1 << 7
+CHANGE_SUBTITLE_LANGUAGES = 1 << 8
+
+# Item fields (columns) a batch comparison reads
+WATCHED_FIELDS = (
+    'video_height', 'video_codec', 'audio_codec', 'audio_channels', 'video_range',
+    'file_size', 'video_bitrate', 'subtitle_count', 'subtitle_languages', 'item_type',
+)
+_field_getters = tuple((field, attrgetter(field)) for field in WATCHED_FIELDS)
+
+
+def _changed_and_known(old: Sequence, new: Sequence) -> Iterable[bool]:
+    """Per pair: values differ and neither is None (resolution, channels, size, bitrate)."""
+    return map(and_, map(ne, old, new),
+               map(and_, map(is_not, old, repeat(None)), map(is_not, new, repeat(None))))
+
+
+def _changed_and_set(old: Sequence, new: Sequence) -> Iterable[bool]:
+    """Per pair: values differ and at least one is set (codecs)."""
+    return map(and_, map(ne, old, new), map(or_, map(truth, old), map(truth, new)))
+
+
+# ==================== CHANGE ENTRIES ====================
+# The dictionaries detect_changes() returns, one builder per change type
+
+def _resolution_entry(old: Any, new: Any) -> Dict[str, Any]:
+    return {'type': 'resolution', 'field': 'video_height', 'old_value': old, 'new_value': new,
+            'description': f"Resolution changed from {old}p to {new}p"}
+
+
+def _codec_entry(old: Any, new: Any) -> Dict[str, Any]:
+    return {'type': 'codec', 'field': 'video_codec', 'old_value': old, 'new_value': new,
+            'description': f"Video codec changed from {old or 'Unknown'} to {new or 'Unknown'}"}
+
+
+def _audio_codec_entry(old: Any, new: Any) -> Dict[str, Any]:
+    return {'type': 'audio_codec', 'field': 'audio_codec', 'old_value': old, 'new_value': new,
+            'description': f"Audio codec changed from {old or 'Unknown'} to {new or 'Unknown'}"}
+
+
+def _audio_channels_entry(old: Any, new: Any) -> Dict[str, Any]:
+    return {'type': 'audio_channels', 'field': 'audio_channels', 'old_value': old, 'new_value': new,
+            'description': f"Audio channels changed from {old} to {new}"}
+
+
+def _hdr_entry(old: str, new: str) -> Dict[str, Any]:
+    return {'type': 'hdr_status', 'field': 'video_range', 'old_value': old, 'new_value': new,
+            'description': f"HDR status changed from {old} to {new}"}
+
+
+def _file_size_entry(old: Any, new: Any) -> Dict[str, Any]:
+    if old:
+        description = f"File size changed significantly ({abs(new - old) / old * 100:.1f}% difference)"
+    else:
+        description = f"File size changed from 0 to {new} bytes"
+    return {'type': 'file_size', 'field': 'file_size', 'old_value': old, 'new_value': new,
+            'description': description}
+
+
+def _video_bitrate_entry(old: Any, new: Any) -> Dict[str, Any]:
+    return {'type': 'video_bitrate', 'field': 'video_bitrate', 'old_value': old, 'new_value': new,
+            'description': f"Video bitrate changed from {old / 1_000_000:.1f} to {new / 1_000_000:.1f} Mbps"}
+
+
+def _subtitle_count_entry(old: int, new: int) -> Dict[str, Any]:
+    return {'type': 'subtitles', 'field': 'subtitle_count', 'old_value': old, 'new_value': new,
+            'description': f"Subtitle tracks changed from {old} to {new}"}
+
+
+def _subtitle_languages_entry(old: set, new: set) -> Dict[str, Any]:
+    added, removed = sorted(new - old), sorted(old - new)
+    if added and not removed:
+        desc = f"Added subtitle languages: {', '.join(added)}"
+    elif removed and not added:
+        desc = f"Removed subtitle languages: {', '.join(removed)}"
+    else:
+        desc = f"Subtitle languages changed (added: {', '.join(added)}, removed: {', '.join(removed)})"
+    return {'type': 'subtitles', 'field': 'subtitle_languages',
+            'old_value': sorted(old), 'new_value': sorted(new), 'description': desc}
+
+
+# ==================== PER-ITEM CHECKS ====================
+# Built once per ChangeDetector from the compiled rules. Each check compares
+# one change type of an old/new pair and appends what it reports to `changes`.
+
+Check = Callable[[Any, Any, List[Dict[str, Any]]], None]
+
+
+def _known_value_check(field: str, entry: Callable, predicate: Optional[Predicate]) -> Check:
+    """Report a change of `field` when both values are known."""
+    get = attrgetter(field)
+    if predicate is None:
+        def check(old_item, new_item, changes):
+            old, new = get(old_item), get(new_item)
+            if old != new and old is not None and new is not None:
+                changes.append(entry(old, new))
+    else:
+        def check(old_item, new_item, changes):
+            old, new = get(old_item), get(new_item)
+            if old != new and old is not None and new is not None and predicate(old, new, new_item.item_type):
+                changes.append(entry(old, new))
+    return check
+
+
+def _set_value_check(field: str, entry: Callable, predicate: Optional[Predicate]) -> Check:
+    """Report a change of `field` when either value is set (codecs)."""
+    get = attrgetter(field)
+    if predicate is None:
+        def check(old_item, new_item, changes):
+            old, new = get(old_item), get(new_item)
+            if old != new and (old or new):
+                changes.append(entry(old, new))
+    else:
+        def check(old_item, new_item, changes):
+            old, new = get(old_item), get(new_item)
+            if old != new and (old or new) and predicate(old, new, new_item.item_type):
+                changes.append(entry(old, new))
+    return check
+
+
+def _hdr_check(normalize: Callable[[Any], str], predicate: Optional[Predicate]) -> Check:
+    """Report a change of the normalized HDR status."""
+    def check(old_item, new_item, changes):
+        old, new = normalize(old_item.video_range), normalize(new_item.video_range)
+        if old != new and (predicate is None or predicate(old, new, new_item.item_type)):
+            changes.append(_hdr_entry(old, new))
+    return check
+
+
+def _subtitles_check(predicate: Optional[Predicate]) -> Check:
+    """Report subtitle track count and language changes."""
+    def check(old_item, new_item, changes):
+        old_count = getattr(old_item, 'subtitle_count', 0) or 0
+        new_count = getattr(new_item, 'subtitle_count', 0) or 0
+        old_languages = set(getattr(old_item, 'subtitle_languages', []) or ())
+        new_languages = set(getattr(new_item, 'subtitle_languages', []) or ())
+        if (old_count == new_count and old_languages == new_languages) or not (
+                predicate is None or predicate(old_count, new_count, new_item.item_type)):
+            return
+        if old_count != new_count:
+            changes.append(_subtitle_count_entry(old_count, new_count))
+        if old_languages != new_languages:
+            changes.append(_subtitle_languages_entry(old_languages, new_languages))
+    return check
+
+
+def _accepted(predicate: Optional[Predicate], flags: Iterable[bool], old: Sequence, new: Sequence,
+              item_types: Sequence, failed: Set[int]) -> Iterable[bool]:
+    """
+    Apply a change type's compiled rules to the pairs whose values changed.
+
+    Only flagged pairs call the predicate. A pair whose values make the
+    predicate fail (e.g. values of an unexpected type) is added to `failed`.
+    """
+    if predicate is None:
+        return flags
+    flags = list(flags)
+    for index in compress(range(len(flags)), flags):
+        try:
+            flags[index] = bool(predicate(old[index], new[index], item_types[index]))
+        except Exception:
+            flags[index] = False
+            failed.add(index)
+    return flags
+
+
+# Change types checked by comparing one column: mask bit, column, base comparison
+_COLUMN_CHECKS = {
+    'resolution': (CHANGE_RESOLUTION, 'video_height', _changed_and_known),
+    'codec': (CHANGE_CODEC, 'video_codec', _changed_and_set),
+    'audio_codec': (CHANGE_AUDIO_CODEC, 'audio_codec', _changed_and_set),
+    'audio_channels': (CHANGE_AUDIO_CHANNELS, 'audio_channels', _changed_and_known),
+    'file_size': (CHANGE_FILE_SIZE, 'file_size', _changed_and_known),
+    'video_bitrate': (CHANGE_VIDEO_BITRATE, 'video_bitrate', _changed_and_known),
+}
+
+
+class ChangeBatch:
+    """
+    Result of `ChangeDetector.detect_changes_batch()`.
+
+    Holds one bitmask per compared pair (see the `CHANGE_*` constants) and
+    the columns that were compared, so the change dictionaries of a pair -
+    the same ones `detect_changes()` returns - can be built later, only for
+    the pairs that are notified.
+
+    Attributes:
+        masks (array): Change bitmask per pair (unsigned 16-bit), 0 for unchanged pairs
+        old_columns (Mapping[str, Sequence]): Previous values per watched field
+        new_columns (Mapping[str, Sequence]): Current values per watched field
+
+    Example:
+        ```python
+        batch = detector.detect_changes_batch(old_columns, new_columns)
+        for index in batch.changed_indexes():
+            if batch.masks[index] & CHANGE_RESOLUTION:
+                await notify(new_items[index], batch.changes(index))
+        ```
+    """
+
+    __slots__ = ('masks', 'old_columns', 'new_columns')
+
+    def __init__(self, masks: array, old_columns: Mapping[str, Sequence], new_columns: Mapping[str, Sequence]):
+        self.masks = masks
+        self.old_columns = old_columns
+        self.new_columns = new_columns
+
+    def __len__(self) -> int:
+        return len(self.masks)
+
+    def changed_indexes(self) -> List[int]:
+        """
+        Get the positions of the pairs with at least one change.
+
+        Returns:
+            List[int]: Indexes into the compared columns, in order
+        """
+        return list(compress(range(len(self.masks)), self.masks))
+
+    def changes(self, index: int) -> List[Dict[str, Any]]:
+        """
+        Build the change dictionaries for one pair.
+
+        Args:
+            index (int): Position of the pair in the compared columns
+
+        Returns:
+            List[Dict[str, Any]]: Same entries, in the same order, as
+                `detect_changes()` returns for the pair
+        """
+        mask = self.masks[index]
+        if not mask:
+            return []
+
+        changes = []
+        for bit, field, entry in _BATCH_ENTRIES:
+            if mask & bit:
+                changes.append(entry(self.old_columns[field][index], self.new_columns[field][index]))
+        return changes
+
+
+def _hdr_column_entry(old_range: Any, new_range: Any) -> Dict[str, Any]:
+    normalize = ChangeDetector._normalize_hdr_status
+    return _hdr_entry(normalize(old_range), normalize(new_range))
+
+
+def _subtitle_count_column_entry(old: Any, new: Any) -> Dict[str, Any]:
+    return _subtitle_count_entry(old or 0, new or 0)
+
+
+def _subtitle_languages_column_entry(old: Any, new: Any) -> Dict[str, Any]:
+    return _subtitle_languages_entry(set(old or ()), set(new or ()))
+
+
+# Mask bit, column and entry builder (from the raw column values), in reporting order
+_BATCH_ENTRIES = (
+    (CHANGE_RESOLUTION, 'video_height', _resolution_entry),
+    (CHANGE_CODEC, 'video_codec', _codec_entry),
+    (CHANGE_AUDIO_CODEC, 'audio_codec', _audio_codec_entry),
+    (CHANGE_AUDIO_CHANNELS, 'audio_channels', _audio_channels_entry),
+    (CHANGE_HDR_STATUS, 'video_range', _hdr_column_entry),
+    (CHANGE_FILE_SIZE, 'file_size', _file_size_entry),
+    (CHANGE_VIDEO_BITRATE, 'video_bitrate', _video_bitrate_entry),
+    (CHANGE_SUBTITLE_COUNT, 'subtitle_count', _subtitle_count_column_entry),
+    (CHANGE_SUBTITLE_LANGUAGES, 'subtitle_languages', _subtitle_languages_column_entry),
+)
+
+
 class ChangeDetector:
     """
     Intelligent change detector for media quality upgrades and modifications.
@@ -194,10 +489,38 @@ class ChangeDetector:
         self.logger = get_logger("jellynouncer.detector")
         self.watch_changes = config.watch_changes
 
+        # Compile watch_changes and change_rules once; comparisons only run these
+        self.predicates: Dict[str, Optional[Predicate]] = compile_change_rules(config)
+        self._checks = self._compile_checks(self.predicates)
+
         # Log initialization with monitoring configuration
-        enabled_changes = [change_type for change_type, enabled in self.watch_changes.items() if enabled]
+        ruled = {rule.change for rule in config.change_rules}
+        enabled_changes = [f"{change} (rules)" if change in ruled else change for change in self.predicates]
         self.logger.info(f"Change detector initialized - Monitoring: {', '.join(enabled_changes)}")
 
+    def _compile_checks(self, predicates: Dict[str, Optional[Predicate]]) -> tuple:
+        """
+        Build the per-item check function of every enabled change type.
+
+        Args:
+            predicates: Compiled rules from compile_change_rules()
+
+        Returns:
+            tuple: Check functions in reporting order
+        """
+        builders = {
+            'resolution': lambda predicate: _known_value_check('video_height', _resolution_entry, predicate),
+            'codec': lambda predicate: _set_value_check('video_codec', _codec_entry, predicate),
+            'audio_codec': lambda predicate: _set_value_check('audio_codec', _audio_codec_entry, predicate),
+            'audio_channels': lambda predicate: _known_value_check('audio_channels', _audio_channels_entry, predicate),
+            # Only a handful of distinct video ranges exist, so normalize each once
+            'hdr_status': lambda predicate: _hdr_check(lru_cache(maxsize=256)(self._normalize_hdr_status), predicate),
+            'file_size': lambda predicate: _known_value_check('file_size', _file_size_entry, predicate),
+            'video_bitrate': lambda predicate: _known_value_check('video_bitrate', _video_bitrate_entry, predicate),
+            'subtitles': _subtitles_check,
+        }
+        return tuple(builders[change](predicate) for change, predicate in predicates.items())
+
     def detect_changes(self, old_item: Union[MediaItem, DatabaseItem], new_item: Union[MediaItem, DatabaseItem]) -> List[Dict[str, Any]]:
         """
         Detect meaningful changes between two versions of the same media item.
@@ -212,9 +535,13 @@ class ChangeDetector:
         2. Check video codec changes for compression improvements
         3. Analyze audio codec and channel changes for sound upgrades
         4. Detect HDR status changes for display improvements
-        5. Check file size changes for complete replacements
+        5. Check file size (and, if enabled, video bitrate) changes for replacements
         6. Monitor subtitle track and language changes
 
+        Only the change types enabled by `watch_changes`/`change_rules` are
+        checked, each by the function compiled for it in `__init__`; a
+        change is reported only if the type's rules accept it.
+
         **Change Object Structure:**
         Each detected change is returned as a dictionary containing:
         - `type`: Change category (resolution, codec, audio_codec, etc.)
@@ -260,124 +587,9 @@ class ChangeDetector:
         changes = []
 
         try:
-            # Resolution changes (most common and important upgrade scenario)
-            if (self.watch_changes.get('resolution', True) and
-                    old_item.video_height != new_item.video_height and
-                    old_item.video_height is not None and new_item.video_height is not None):
-                changes.append({
-                    'type': 'resolution',
-                    'field': 'video_height',
-                    'old_value': old_item.video_height,
-                    'new_value': new_item.video_height,
-                    'description': f"Resolution changed from {old_item.video_height}p to {new_item.video_height}p"
-                })
-
-            # Video codec changes (compression and efficiency improvements)
-            if (self.watch_changes.get('codec', True) and
-                    old_item.video_codec != new_item.video_codec and
-                    (old_item.video_codec or new_item.video_codec)):
-                changes.append({
-                    'type': 'codec',
-                    'field': 'video_codec',
-                    'old_value': old_item.video_codec,
-                    'new_value': new_item.video_codec,
-                    'description': f"Video codec changed from {old_item.video_codec or 'Unknown'} to {new_item.video_codec or 'Unknown'}"
-                })
-
-            # Audio codec changes (sound quality improvements)
-            if (self.watch_changes.get('audio_codec', True) and
-                    old_item.audio_codec != new_item.audio_codec and
-                    (old_item.audio_codec or new_item.audio_codec)):
-                changes.append({
-                    'type': 'audio_codec',
-                    'field': 'audio_codec',
-                    'old_value': old_item.audio_codec,
-                    'new_value': new_item.audio_codec,
-                    'description': f"Audio codec changed from {old_item.audio_codec or 'Unknown'} to {new_item.audio_codec or 'Unknown'}"
-                })
-
-            # Audio channel changes (surround sound upgrades)
-            if (self.watch_changes.get('audio_channels', True) and
-                    old_item.audio_channels != new_item.audio_channels and
-                    old_item.audio_channels is not None and new_item.audio_channels is not None):
-                changes.append({
-                    'type': 'audio_channels',
-                    'field': 'audio_channels',
-                    'old_value': old_item.audio_channels,
-                    'new_value': new_item.audio_channels,
-                    'description': f"Audio channels changed from {old_item.audio_channels} to {new_item.audio_channels}"
-                })
-
-            # HDR status changes (display quality improvements)
-            if self.watch_changes.get('hdr_status', True):
-                old_hdr = self._normalize_hdr_status(old_item.video_range)
-                new_hdr = self._normalize_hdr_status(new_item.video_range)
-
-                if old_hdr != new_hdr:
-                    changes.append({
-                        'type': 'hdr_status',
-                        'field': 'video_range',
-                        'old_value': old_hdr,
-                        'new_value': new_hdr,
-                        'description': f"HDR status changed from {old_hdr} to {new_hdr}"
-                    })
-
-            # File size changes (complete file replacements)
-            if (self.watch_changes.get('file_size', False) and
-                    old_item.file_size != new_item.file_size and
-                    old_item.file_size is not None and new_item.file_size is not None):
-                # Only report significant size changes (>10% difference)
-                size_diff_pct = abs(new_item.file_size - old_item.file_size) / old_item.file_size * 100
-                if size_diff_pct > 10:
-                    changes.append({
-                        'type': 'file_size',
-                        'field': 'file_size',
-                        'old_value': old_item.file_size,
-                        'new_value': new_item.file_size,
-                        'description': f"File size changed significantly ({size_diff_pct:.1f}% difference)"
-                    })
-
-            # Subtitle changes (track count and language changes)
-            if self.watch_changes.get('subtitles', True):
-                # Check subtitle count changes
-                old_sub_count = getattr(old_item, 'subtitle_count', 0) or 0
-                new_sub_count = getattr(new_item, 'subtitle_count', 0) or 0
-                
-                if old_sub_count != new_sub_count:
-                    changes.append({
-                        'type': 'subtitles',
-                        'field': 'subtitle_count',
-                        'old_value': old_sub_count,
-                        'new_value': new_sub_count,
-                        'description': f"Subtitle tracks changed from {old_sub_count} to {new_sub_count}"
-                    })
-                
-                # Check subtitle languages changes
-                old_sub_langs = getattr(old_item, 'subtitle_languages', []) or []
-                new_sub_langs = getattr(new_item, 'subtitle_languages', []) or []
-                
-                # Convert to sets for comparison
-                old_langs_set = set(old_sub_langs) if old_sub_langs else set()
-                new_langs_set = set(new_sub_langs) if new_sub_langs else set()
-                
-                added_langs = new_langs_set - old_langs_set
-                removed_langs = old_langs_set - new_langs_set
-                
-                if added_langs or removed_langs:
-                    if added_langs and not removed_langs:
-                        desc = f"Added subtitle languages: {', '.join(sorted(added_langs))}"
-                    elif removed_langs and not added_langs:
-                        desc = f"Removed subtitle languages: {', '.join(sorted(removed_langs))}"
-                    else:
-                        desc = f"Subtitle languages changed (added: {', '.join(sorted(added_langs))}, removed: {', '.join(sorted(removed_langs))})"
-                    
-                    changes.append({
-                        'type': 'subtitles',
-                        'field': 'subtitle_languages',
-                        'old_value': sorted(old_langs_set),
-                        'new_value': sorted(new_langs_set),
-                        'description': desc
-                    })
+            # One compiled check per enabled change type, in reporting order
+            for check in self._checks:
+                check(old_item, new_item, changes)
 
             # Note: Provider ID changes are NOT tracked since they're not stored in the database
             # Provider IDs are fetched fresh from webhooks/API when needed for notifications
@@ -398,6 +610,148 @@ class ChangeDetector:
 
         return changes
 
+    def detect_changes_batch(self, old_columns: Mapping[str, Sequence],
+                             new_columns: Mapping[str, Sequence]) -> ChangeBatch:
+        """
+        Compare many old/new pairs at once, one watched field at a time.
+
+        Takes the watched fields as columns - equal-length lists, tuples or
+        arrays keyed by field name (see `WATCHED_FIELDS` and `item_columns()`),
+        where position `i` of every column belongs to pair `i` - and runs
+        each enabled check over a whole column with `map()` and the
+        `operator` functions, so the per-value work happens in C. Only the
+        few pairs that pass the cheap comparison get the Python-level
+        checks: the compiled rules (such as the >10% file size threshold)
+        and subtitle language sets. Every field in `WATCHED_FIELDS` needs a
+        column, including `item_type` for rules limited to item types.
+
+        The checks and compiled rules are exactly those of
+        `detect_changes()`, including HDR normalization (each
+        distinct video range is normalized once per batch). Like there, a
+        pair whose values make a check fail (for example values of an
+        unexpected type) is reported as unchanged, and an unexpected error is
+        logged and reported as no changes instead of raised.
+
+        Args:
+            old_columns (Mapping[str, Sequence]): Previous values per watched field
+            new_columns (Mapping[str, Sequence]): Current values per watched field
+
+        Returns:
+            ChangeBatch: Change bitmask per pair; descriptions on request
+
+        Raises:
+            ValueError: If the columns don't all have the same length
+
+        Example:
+            ```python
+            old_columns = ChangeDetector.item_columns(stored_items)
+            new_columns = ChangeDetector.item_columns(synced_items)
+            batch = detector.detect_changes_batch(old_columns, new_columns)
+
+            for index in batch.changed_indexes():
+                logger.info(detector.get_change_summary(batch.changes(index)))
+            ```
+        """
+        count = len(new_columns[WATCHED_FIELDS[0]])
+        if any(len(columns[field]) != count for columns in (old_columns, new_columns) for field in WATCHED_FIELDS):
+            raise ValueError("All old and new columns must have the same length")
+
+        try:
+            failed: Set[int] = set()  # Pairs whose values made a check fail
+            masks = array('H', bytes(2 * count))
+            for change, predicate in self.predicates.items():
+                for bit, flags in self._column_flags(change, predicate, old_columns, new_columns, failed):
+                    # compress() skips the unflagged pairs in C; most pairs of a sync are unchanged
+                    for index in compress(range(count), flags):
+                        masks[index] |= bit
+            for index in failed:
+                masks[index] = 0
+
+        except Exception as e:
+            self.logger.error(f"Error detecting changes for a batch of {count} items: {e}")
+            masks = array('H', bytes(2 * count))
+
+        self.logger.debug(f"Batch change detection: {count - masks.count(0)} of {count} items changed")
+        return ChangeBatch(masks, old_columns, new_columns)
+
+    def _column_flags(self, change: str, predicate: Optional[Predicate], old_columns: Mapping[str, Sequence],
+                      new_columns: Mapping[str, Sequence], failed: Set[int]) -> List[tuple]:
+        """
+        Run one change type's check over whole columns.
+
+        Args:
+            change: Change type
+            predicate: Its compiled rules (None: every change counts)
+            old_columns: Previous values per watched field
+            new_columns: Current values per watched field
+            failed: Collects pairs whose values made the check fail
+
+        Returns:
+            List[tuple]: (mask bit, per-pair flags) for each bit of the type
+        """
+        item_types = new_columns['item_type']
+
+        if change == 'hdr_status':
+            old, new = self._normalized_ranges(old_columns['video_range'], new_columns['video_range'], failed)
+            return [(CHANGE_HDR_STATUS, _accepted(predicate, map(ne, old, new), old, new, item_types, failed))]
+
+        if change == 'subtitles':
+            old_counts = [value or 0 for value in old_columns['subtitle_count']]
+            new_counts = [value or 0 for value in new_columns['subtitle_count']]
+            count_flags = list(map(ne, old_counts, new_counts))
+            language_flags = self._subtitle_language_changes(
+                old_columns['subtitle_languages'], new_columns['subtitle_languages'], failed)
+            if predicate is not None:
+                # Rules decide for the pair as a whole, like detect_changes()
+                accepted = _accepted(predicate, list(map(or_, count_flags, language_flags)),
+                                     old_counts, new_counts, item_types, failed)
+                count_flags = list(map(and_, count_flags, accepted))
+                language_flags = list(map(and_, language_flags, accepted))
+            return [(CHANGE_SUBTITLE_COUNT, count_flags), (CHANGE_SUBTITLE_LANGUAGES, language_flags)]
+
+        bit, field, changed = _COLUMN_CHECKS[change]
+        old, new = old_columns[field], new_columns[field]
+        return [(bit, _accepted(predicate, changed(old, new), old, new, item_types, failed))]
+
+    def _normalized_ranges(self, old: Sequence, new: Sequence, failed: Set[int]) -> tuple:
+        """Normalized HDR status columns. Each distinct range is normalized once."""
+        normalized = {}
+        unusable = set()
+        for video_range in set(old).union(new):
+            try:
+                normalized[video_range] = self._normalize_hdr_status(video_range)
+            except Exception:
+                normalized[video_range] = None
+                unusable.add(video_range)
+        if unusable:
+            failed.update(index for index, pair in enumerate(zip(old, new)) if not unusable.isdisjoint(pair))
+        return list(map(normalized.__getitem__, old)), list(map(normalized.__getitem__, new))
+
+    @staticmethod
+    def _subtitle_language_changes(old: Sequence, new: Sequence, failed: Set[int]) -> List[bool]:
+        """Per pair: the sets of subtitle languages differ (order doesn't matter)."""
+        flags = list(map(ne, old, new))
+        for index in compress(range(len(flags)), flags):
+            try:
+                flags[index] = set(old[index] or ()) != set(new[index] or ())
+            except Exception:
+                flags[index] = False
+                failed.add(index)
+        return flags
+
+    @staticmethod
+    def item_columns(items: Sequence[Union[MediaItem, DatabaseItem]]) -> Dict[str, List[Any]]:
+        """
+        Turn items into the columns `detect_changes_batch()` takes.
+
+        Args:
+            items (Sequence[Union[MediaItem, DatabaseItem]]): Items in pair order
+
+        Returns:
+            Dict[str, List[Any]]: One list per field in `WATCHED_FIELDS`
+        """
+        return {field: list(map(getter, items)) for field, getter in _field_getters}
+
     async def is_rename(self, new_item: Union[MediaItem, DatabaseItem], 
                         existing_items: List[DatabaseItem]) -> tuple[bool, Optional[DatabaseItem]]:
         """
@@ -448,7 +802,34 @@ class ChangeDetector:
                 return True, existing_item
         
         return False, None
-    
+
+    @staticmethod
+    def is_quality_upgrade(old_item: Union[MediaItem, DatabaseItem],
+                           new_item: Union[MediaItem, DatabaseItem]) -> bool:
+        """
+        Check whether a new version of an item has better overall quality.
+
+        `detect_changes()` reports *what* changed, in either direction; this
+        answers whether the result is better, by comparing quality scores
+        (see the quality_score module). Stored items carry their score, so
+        this is usually one integer comparison.
+
+        Args:
+            old_item: The stored version
+            new_item: The new version
+
+        Returns:
+            bool: True if the new version scores higher
+
+        Example:
+            ```python
+            changes = detector.detect_changes(existing_item, media_item)
+            if changes and detector.is_quality_upgrade(existing_item, media_item):
+                logger.info(f"Quality upgrade: {detector.get_change_summary(changes)}")
+            ```
+        """
+        return item_quality_score(new_item) > item_quality_score(old_item)
+
     @staticmethod
     def _normalize_hdr_status(video_range: str) -> str:
         """
@@ -482,24 +863,10 @@ class ChangeDetector:
         Note:
             This method handles various naming conventions and edge cases to
             provide consistent HDR status reporting across different media sources.
+            The mapping itself lives in the quality_score module, which ranks
+            the same names for quality scores.
         """
-        if not video_range:
-            return "SDR"
-
-        # Convert to lowercase for case-insensitive comparison
-        range_lower = video_range.lower()
-
-        # Map various HDR format indicators to standard names
-        if any(hdr_indicator in range_lower for hdr_indicator in ['dovi', 'dolby', 'vision']):
-            return "Dolby Vision"
-        elif any(hdr_indicator in range_lower for hdr_indicator in ['hdr10+', 'hdr10plus']):
-            return "HDR10+"
-        elif any(hdr_indicator in range_lower for hdr_indicator in ['hdr10', 'hdr', 'smpte2084', 'bt2020']):
-            return "HDR10"
-        elif any(hdr_indicator in range_lower for hdr_indicator in ['hlg', 'hybrid']):
-            return "HLG"
-        else:
-            return "SDR"
+        return normalize_hdr_status(video_range)
 
     def get_change_summary(self, changes: List[Dict[str, Any]]) -> str:
         """
@@ -557,7 +924,8 @@ class ChangeDetector:
                 'audio_channels': [],
                 'hdr_status': [],
                 'subtitles': [],
-                'file_size': []
+                'file_size': [],
+                'video_bitrate': []
             }
 
             # Categorize changes
@@ -567,7 +935,8 @@ class ChangeDetector:
                     change_categories[change_type].append(change)
 
             # Build summary with prioritized order (most important first)
-            priority_order = ['resolution', 'hdr_status', 'codec', 'audio_codec', 'audio_channels', 'subtitles', 'file_size']
+            priority_order = ['resolution', 'hdr_status', 'codec', 'audio_codec', 'audio_channels', 'subtitles',
+                              'file_size', 'video_bitrate']
 
             for category in priority_order:
                 category_changes = change_categories[category]
@@ -610,6 +979,11 @@ class ChangeDetector:
                 elif category == 'file_size':
                     summary_parts.append("File replacement")
 
+                elif category == 'video_bitrate':
+                    for change in category_changes:
+                        summary_parts.append(f"Bitrate change ({change['old_value'] / 1_000_000:.1f} → "
+                                             f"{change['new_value'] / 1_000_000:.1f} Mbps)")
+
             # Join summary parts with appropriate separators
             if len(summary_parts) <= 2:
                 summary = " and ".join(summary_parts)
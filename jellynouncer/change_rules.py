@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Jellynouncer Change Rule Compiler
+
+This module turns the change settings in NotificationsConfig (`watch_changes`
+and `change_rules`) into plain Python functions, once, when ChangeDetector is
+created. Comparing two items then only runs the checks that are switched on,
+each with its thresholds already bound, instead of looking settings up in
+the configuration on every comparison.
+
+**Rules and Predicates:**
+Every enabled change type gets a *predicate*: a function called with the old
+and new value of a change that was found (for example two video heights)
+and the new item's type, which answers whether the change is reported.
+The options a rule doesn't use don't appear in its predicate at all, and a
+change type that reports every change gets no predicate (None), so the
+common configuration runs no extra code.
+
+`watch_changes` entries are compiled as rules too: an enabled type becomes
+a rule without conditions, except `file_size`, whose built-in rule is
+"more than 10% change".
+
+Functions:
+    compile_rule: Build the predicate for one ChangeRuleConfig
+    compile_change_rules: Build the predicates of every enabled change type
+
+Author: Mark Newton
+Project: Jellynouncer
+Version: 1.0.0
+License: MIT
+"""
+
+from typing import Any, Callable, Dict, List, Optional
+
+from .config_models import CHANGE_TYPES, ChangeRuleConfig, NotificationsConfig
+from .quality_score import HDR_RANK  # Order of the normalized HDR formats, for direction rules
+
+# (old value, new value, new item's type) -> report the change?
+Predicate = Callable[[Any, Any, Optional[str]], bool]
+
+# Change types reported unless watch_changes switches them off
+DEFAULT_ENABLED = {
+    'resolution': True,
+    'codec': True,
+    'audio_codec': True,
+    'audio_channels': True,
+    'hdr_status': True,
+    'file_size': False,
+    'video_bitrate': False,
+    'subtitles': True,
+}
+
+# What an enabled watch_changes entry means, as a rule
+BUILTIN_RULES = {change: ChangeRuleConfig(change=change) for change in CHANGE_TYPES}
+BUILTIN_RULES['file_size'] = ChangeRuleConfig(change='file_size', min_change_percent=10)
+
+
+def _all_of(tests: List[Predicate]) -> Predicate:
+    """Combine tests into one predicate, without a loop for the usual one or two."""
+    if len(tests) == 1:
+        return tests[0]
+    if len(tests) == 2:
+        first, second = tests
+        return lambda old, new, item_type: first(old, new, item_type) and second(old, new, item_type)
+    return lambda old, new, item_type: all(test(old, new, item_type) for test in tests)
+
+
+def _any_of(tests: tuple) -> Predicate:
+    """Combine the predicates of several rules for one change type."""
+    return lambda old, new, item_type: any(test(old, new, item_type) for test in tests)
+
+
+def compile_rule(rule: ChangeRuleConfig) -> Optional[Predicate]:
+    """
+    Build the predicate for one rule.
+
+    Only the options the rule sets become tests. The item type test comes
+    first because it is the cheapest and often rules a change out at once.
+
+    Args:
+        rule (ChangeRuleConfig): Validated rule
+
+    Returns:
+        Optional[Predicate]: Predicate, or None if the rule reports every change
+
+    Example:
+        ```python
+        upgrade_only = compile_rule(ChangeRuleConfig(change="resolution", direction="increase"))
+        upgrade_only(1080, 2160, "Movie")  # True
+        upgrade_only(2160, 1080, "Movie")  # False
+        ```
+    """
+    tests: List[Predicate] = []
+
+    if rule.item_types:
+        item_types = frozenset(rule.item_types)
+        tests.append(lambda old, new, item_type: item_type in item_types)
+
+    if rule.direction != 'any':
+        increase = rule.direction == 'increase'
+        if rule.change == 'hdr_status':
+            # Unknown names (there are none after normalization) rank as SDR
+            rank = HDR_RANK.get
+            if increase:
+                tests.append(lambda old, new, item_type: rank(new, 0) > rank(old, 0))
+            else:
+                tests.append(lambda old, new, item_type: rank(new, 0) < rank(old, 0))
+        elif increase:
+            tests.append(lambda old, new, item_type: new > old)
+        else:
+            tests.append(lambda old, new, item_type: new < old)
+
+    if rule.min_change_percent is not None:
+        threshold = rule.min_change_percent
+        # Any change from 0 counts as significant (there is no percentage of 0)
+        tests.append(lambda old, new, item_type: abs(new - old) / old * 100 > threshold if old else new != old)
+
+    return _all_of(tests) if tests else None
+
+
+def compile_change_rules(config: NotificationsConfig) -> Dict[str, Optional[Predicate]]:
+    """
+    Build the predicates of every enabled change type.
+
+    Types with entries in `config.change_rules` use those rules (a change is
+    reported if any of them matches); the others use their built-in rule if
+    `watch_changes` (or the default) enables them.
+
+    Args:
+        config (NotificationsConfig): Notification settings
+
+    Returns:
+        Dict[str, Optional[Predicate]]: Change type -> predicate (None: report
+            every change), in reporting order. Disabled types are left out.
+
+    Example:
+        ```python
+        predicates = compile_change_rules(NotificationsConfig(
+            watch_changes={"codec": False},
+            change_rules=[{"change": "resolution", "direction": "increase"}],
+        ))
+        list(predicates)  # ['resolution', 'audio_codec', 'audio_channels', 'hdr_status', 'subtitles']
+        ```
+    """
+    rules_by_change: Dict[str, List[ChangeRuleConfig]] = {}
+    for rule in config.change_rules:
+        rules_by_change.setdefault(rule.change, []).append(rule)
+
+    predicates: Dict[str, Optional[Predicate]] = {}
+    for change in CHANGE_TYPES:
+        if change in rules_by_change:
+            compiled = [compile_rule(rule) for rule in rules_by_change[change]]
+        elif config.watch_changes.get(change, DEFAULT_ENABLED[change]):
+            compiled = [compile_rule(BUILTIN_RULES[change])]
+        else:
+            continue
+
+        if any(predicate is None for predicate in compiled):
+            predicates[change] = None  # One rule reports everything
+        elif len(compiled) == 1:
+            predicates[change] = compiled[0]
+        else:
+            predicates[change] = _any_of(tuple(compiled))
+    return predicates
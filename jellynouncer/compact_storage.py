@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+Jellynouncer Compact media_items Storage
+
+This module holds the value encodings for the optional compact media_items
+format (`database.compact_schema`). The compact format stores the same
+columns as the regular one, with smaller values:
+
+- **content_hash** as the raw 32-byte digest (BLOB) instead of 64 hex characters
+- **Low-cardinality strings** (codecs, video range, audio language, library
+  name) as integer codes into the `media_strings` lookup table
+- **Subtitle language/format lists** packed into one string ("eng,spa")
+  and dictionary-coded like the other strings, since the same few
+  combinations repeat across the whole library
+
+Decoding is driven by the stored value's type (an integer is a code, bytes
+are a digest, text is a plain value), so rows in either format - or a mix,
+during a migration - always decode correctly. Only writes need to know
+which format the table is in.
+
+Classes:
+    StringDictionary: In-memory copy of the media_strings lookup table
+
+Functions:
+    pack_hash / unpack_hash: Hex content hash <-> raw digest
+    pack_string_set / unpack_string_set: Subtitle list <-> packed string
+    compile_compact_encoder: Build a fast row encoder for the compact format
+    expand_row: Decode a stored row (either format) to DatabaseItem values
+
+Author: Mark Newton
+Project: Jellynouncer
+Version: 1.0.0
+License: MIT
+"""
+
+import json
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple, Union
+
+# Text columns stored as media_strings codes in the compact format
+DICTIONARY_STRING_COLUMNS = (
+    'video_codec', 'video_profile', 'video_range',
+    'audio_codec', 'audio_language', 'library_name',
+)
+
+# List columns stored as a packed, dictionary-coded string in the compact format
+DICTIONARY_SET_COLUMNS = ('subtitle_languages', 'subtitle_formats')
+
+DICTIONARY_COLUMNS = DICTIONARY_STRING_COLUMNS + DICTIONARY_SET_COLUMNS
+
+
+def pack_hash(content_hash: Any) -> Union[bytes, Any]:
+    """
+    Convert a lowercase hex content hash to its raw digest.
+
+    Anything that isn't plain lowercase hex is returned unchanged, so an
+    unusual value is stored as-is rather than altered.
+
+    Args:
+        content_hash (Any): Hex digest from DatabaseItem
+
+    Returns:
+        Union[bytes, Any]: Raw digest bytes, or the original value
+    """
+    if not isinstance(content_hash, str):
+        return content_hash
+    try:
+        digest = bytes.fromhex(content_hash)
+    except ValueError:
+        return content_hash
+    return digest if digest.hex() == content_hash else content_hash
+
+
+def unpack_hash(stored: Any) -> Any:
+    """Convert a stored content hash (raw digest or hex text) to hex text."""
+    return stored.hex() if isinstance(stored, bytes) else stored
+
+
+def pack_string_set(values: List[Any]) -> str:
+    """
+    Pack a list of short strings into one string.
+
+    Plain lists become comma-separated ("eng,spa"). Lists whose entries
+    contain commas, aren't strings, or could be mistaken for JSON are
+    stored as JSON instead, which `unpack_string_set()` recognises by the
+    leading "[".
+
+    Args:
+        values (List[Any]): Subtitle languages or formats
+
+    Returns:
+        str: Packed representation ("" for an empty list)
+
+    Example:
+        ```python
+        pack_string_set(["eng", "spa"])   # "eng,spa"
+        pack_string_set([])               # ""
+        ```
+    """
+    if all(isinstance(value, str) and value and ',' not in value for value in values) \
+            and not (values and values[0].startswith('[')):
+        return ','.join(values)
+    return json.dumps(values)
+
+
+def unpack_string_set(packed: Optional[str]) -> List[Any]:
+    """
+    Unpack a stored subtitle list: packed string or (legacy) JSON text.
+
+    Args:
+        packed (Optional[str]): Stored value
+
+    Returns:
+        List[Any]: The list (empty for NULL, "" or unreadable JSON)
+    """
+    if not packed:
+        return []
+    if packed.startswith('['):
+        try:
+            return json.loads(packed)
+        except json.JSONDecodeError:
+            return []
+    return packed.split(',')
+
+
+class StringDictionary:
+    """
+    In-memory copy of the `media_strings` lookup table (code <-> string).
+
+    Codes are handed out by this process, which is the only writer of
+    media_items. Every write stores the (code, value) pairs its rows use
+    with `INSERT OR IGNORE` in the same transaction, so a rolled-back write
+    can never leave a row pointing at a code that isn't in the table.
+
+    Example:
+        ```python
+        strings = StringDictionary()
+        strings.load([(1, "hevc"), (2, "eng")])
+
+        strings.code("hevc")   # 1
+        strings.code("av1")    # 3 (new)
+        strings.value(3)       # "av1"
+        ```
+    """
+
+    def __init__(self):
+        """Create an empty dictionary."""
+        self._codes: Dict[str, int] = {}
+        self._values: Dict[int, str] = {}
+        self._next_code = 1
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def load(self, rows: Iterable[Tuple[int, str]]) -> None:
+        """
+        Add (code, value) rows read from media_strings.
+
+        Args:
+            rows (Iterable[Tuple[int, str]]): Stored codes and values
+        """
+        for code, value in rows:
+            self._values[code] = value
+            self._codes.setdefault(value, code)
+            self._next_code = max(self._next_code, code + 1)
+
+    def code(self, value: str) -> int:
+        """Get the code for a string, assigning a new one if needed."""
+        code = self._codes.get(value)
+        if code is None:
+            code = self._next_code
+            self._next_code += 1
+            self._codes[value] = code
+            self._values[code] = value
+        return code
+
+    def value(self, code: int) -> str:
+        """Get the string for a code (KeyError if unknown)."""
+        return self._values[code]
+
+    def entries(self, codes: Iterable[int]) -> List[Tuple[int, str]]:
+        """(code, value) pairs for the given codes, ready to store."""
+        return [(code, self._values[code]) for code in codes]
+
+    def unknown_codes(self, rows: Iterable[Any]) -> Set[int]:
+        """
+        Find codes in stored rows that this dictionary doesn't know yet.
+
+        Only happens when another process added strings since the
+        dictionary was loaded.
+
+        Args:
+            rows (Iterable[Any]): media_items rows (mappings with the dictionary columns)
+
+        Returns:
+            Set[int]: Codes to load from media_strings
+        """
+        unknown = set()
+        for row in rows:
+            for column in DICTIONARY_COLUMNS:
+                value = row[column]
+                if isinstance(value, int) and value not in self._values:
+                    unknown.add(value)
+        return unknown
+
+
+def compile_compact_encoder(columns: Sequence[str], strings: StringDictionary) -> Callable[[Sequence[Any], Set[int]], tuple]:
+    """
+    Build a function converting item values to a compact-format row.
+
+    The encoder takes the column values in `columns` order, with subtitle
+    lists either as lists or as (legacy) JSON text, and returns the row to
+    store. Every dictionary code it uses is added to `used_codes`, so the
+    caller can store those lookup entries alongside the row.
+
+    Args:
+        columns (Sequence[str]): media_items column order
+        strings (StringDictionary): Dictionary to assign codes from
+
+    Returns:
+        Callable[[Sequence[Any], Set[int]], tuple]: encode(values, used_codes) -> row
+    """
+    string_indexes = tuple(columns.index(column) for column in DICTIONARY_STRING_COLUMNS)
+    set_indexes = tuple(columns.index(column) for column in DICTIONARY_SET_COLUMNS)
+    hash_index = columns.index('content_hash')
+    code = strings.code
+
+    def encode(values: Sequence[Any], used_codes: Set[int]) -> tuple:
+        row = list(values)
+        for index in string_indexes:
+            value = row[index]
+            if value is not None:
+                row[index] = code(value if isinstance(value, str) else str(value))
+                used_codes.add(row[index])
+        for index in set_indexes:
+            value = row[index]
+            if value is not None:
+                if isinstance(value, str):
+                    value = unpack_string_set(value)
+                row[index] = code(pack_string_set(value))
+                used_codes.add(row[index])
+        row[hash_index] = pack_hash(row[hash_index])
+        return tuple(row)
+
+    return encode
+
+
+def expand_row(item_dict: Dict[str, Any], strings: StringDictionary) -> Dict[str, Any]:
+    """
+    Decode a stored media_items row, in either format, in place.
+
+    Dictionary codes become their strings, subtitle columns become lists
+    and a raw content hash becomes hex text.
+
+    Args:
+        item_dict (Dict[str, Any]): Row as a dictionary
+        strings (StringDictionary): Dictionary holding every code in the row
+
+    Returns:
+        Dict[str, Any]: The same dictionary, decoded
+    """
+    for column in DICTIONARY_STRING_COLUMNS:
+        value = item_dict.get(column)
+        if isinstance(value, int):
+            item_dict[column] = strings.value(value)
+    for column in DICTIONARY_SET_COLUMNS:
+        value = item_dict.get(column)
+        if isinstance(value, int):
+            value = strings.value(value)
+        item_dict[column] = unpack_string_set(value)
+    if 'content_hash' in item_dict:
+        item_dict['content_hash'] = unpack_hash(item_dict['content_hash'])
+    return item_dict
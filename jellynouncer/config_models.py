@@ -27,7 +27,10 @@ Classes:
         DiscordConfig: Overall Discord integration settings
         DatabaseConfig: SQLite database configuration
         TemplatesConfig: Jinja2 template file settings
+        ChangeRuleConfig: One rule deciding when a change type is reported
         NotificationsConfig: Notification behavior settings
+        JobScheduleConfig: Schedule for a single maintenance job
+        SchedulerConfig: Background maintenance scheduler settings
         ServerConfig: FastAPI web server configuration
         SyncConfig: Library synchronization settings
         MetadataServiceConfig: External metadata service settings
@@ -360,7 +363,13 @@ class DatabaseConfig(BaseModel):
     Attributes:
         path (str): File path where SQLite database will be stored
         wal_mode (bool): Enable WAL mode for better concurrent access
-        vacuum_interval_hours (int): How often to optimize database (1-168 hours)
+        vacuum_interval_hours (int): How often to run incremental vacuum maintenance (1-168 hours)
+        reader_connections (int): Pooled read-only connections (1-16)
+        group_commit_ms (int): How long single-item writes wait to share a commit (0-100 ms)
+        content_index (bool): Keep item hashes in memory for instant change checks
+        stats_raw_days (int): Days Jellyfin stats snapshots are kept before hourly rollup
+        stats_hourly_days (int): Days hourly stats rollups are kept before daily rollup
+        compact_schema (bool): Store media_items with binary hashes and dictionary-coded strings
 
     Example:
         ```python
@@ -380,6 +389,12 @@ class DatabaseConfig(BaseModel):
     path: str = Field(default="/app/data/jellyfin_items.db")
     wal_mode: bool = Field(default=True)
     vacuum_interval_hours: int = Field(default=24, ge=1, le=168)  # 1 hour to 1 week
+    reader_connections: int = Field(default=4, ge=1, le=16, description="Pooled read-only database connections")
+    group_commit_ms: int = Field(default=5, ge=0, le=100, description="Window (ms) for grouping single-item writes into one commit")
+    content_index: bool = Field(default=True, description="Keep an in-memory item_id -> content hash index (about 150MB per million items)")
+    stats_raw_days: int = Field(default=7, ge=1, le=365, description="Days to keep every Jellyfin stats snapshot")
+    stats_hourly_days: int = Field(default=90, ge=1, le=3650, description="Days to keep hourly stats rollups (daily rollups are kept after that)")
+    compact_schema: bool = Field(default=False, description="Store media_items in the compact format; changing it migrates the table on startup")
 
     # noinspection PyDecorator
     @field_validator('path')
@@ -544,6 +559,84 @@ class TemplatesConfig(BaseModel):
 
 # ==================== NOTIFICATION CONFIGURATION ====================
 
+# Change types ChangeDetector reports, in the order it reports them
+CHANGE_TYPES = ('resolution', 'codec', 'audio_codec', 'audio_channels', 'hdr_status',
+                'file_size', 'video_bitrate', 'subtitles')
+
+# Change types whose values are ordered (HDR by format: SDR < HLG < HDR10 < HDR10+ < Dolby Vision)
+ORDERED_CHANGE_TYPES = ('resolution', 'audio_channels', 'hdr_status', 'file_size', 'video_bitrate')
+
+# Change types with numeric values, so a relative change can be measured
+NUMERIC_CHANGE_TYPES = ('resolution', 'audio_channels', 'file_size', 'video_bitrate')
+
+
+class ChangeRuleConfig(BaseModel):
+    """
+    One rule deciding when a change type is reported.
+
+    `watch_changes` only switches change types on or off. Rules say *which*
+    changes of a type count: only increases, only changes above a relative
+    size, only for certain item types. A change is reported when any rule for
+    its type matches. Change types without rules keep their `watch_changes`
+    behaviour; the rules for a type replace its `watch_changes` entry.
+
+    The rules are compiled once, when ChangeDetector is created (see
+    jellynouncer/change_rules.py), so a comparison doesn't read the
+    configuration again.
+
+    Attributes:
+        change (str): Change type the rule applies to (see CHANGE_TYPES)
+        direction (str): "any", "increase" or "decrease" (ordered types only)
+        min_change_percent (Optional[float]): Report only if the value changed by
+            more than this many percent of the old value; any change from 0
+            counts (numeric types only)
+        item_types (List[str]): Only apply to these item types (empty: all types)
+
+    Example:
+        ```python
+        rules = [
+            # Notify only on resolution increases
+            ChangeRuleConfig(change="resolution", direction="increase"),
+            # Ignore bitrate drift of 5% or less
+            ChangeRuleConfig(change="video_bitrate", min_change_percent=5),
+            # HDR upgrades only for movies
+            ChangeRuleConfig(change="hdr_status", direction="increase", item_types=["Movie"]),
+        ]
+        ```
+    """
+    model_config = ConfigDict(extra='forbid')
+
+    change: str = Field(description="Change type the rule applies to")
+    direction: str = Field(default="any", description="any, increase or decrease")
+    min_change_percent: Optional[float] = Field(default=None, ge=0, description="Minimum relative change in percent")
+    item_types: List[str] = Field(default_factory=list, description="Item types the rule applies to (empty: all)")
+
+    @field_validator('change')
+    @classmethod
+    def validate_change(cls, v: str) -> str:
+        """Validate that the change type is one ChangeDetector reports"""
+        if v not in CHANGE_TYPES:
+            raise ValueError(f"Unknown change type '{v}'. Must be one of: {', '.join(CHANGE_TYPES)}")
+        return v
+
+    @field_validator('direction')
+    @classmethod
+    def validate_direction(cls, v: str) -> str:
+        """Validate the direction keyword"""
+        if v not in ('any', 'increase', 'decrease'):
+            raise ValueError("direction must be 'any', 'increase' or 'decrease'")
+        return v
+
+    @model_validator(mode='after')
+    def validate_options(self):
+        """Reject options that don't apply to the rule's change type"""
+        if self.direction != 'any' and self.change not in ORDERED_CHANGE_TYPES:
+            raise ValueError(f"direction only applies to: {', '.join(ORDERED_CHANGE_TYPES)}")
+        if self.min_change_percent is not None and self.change not in NUMERIC_CHANGE_TYPES:
+            raise ValueError(f"min_change_percent only applies to: {', '.join(NUMERIC_CHANGE_TYPES)}")
+        return self
+
+
 class NotificationsConfig(BaseModel):
     """
     Configuration for notification behavior and appearance.
@@ -562,8 +655,15 @@ class NotificationsConfig(BaseModel):
         quickly understand what happened. Colors are specified as integers
         representing hex color codes.
 
+    **Change Rules:**
+        For finer control than on/off, `change_rules` lists rules such as
+        "resolution increases only" or "HDR upgrades only for movies" (see
+        ChangeRuleConfig). A change type with rules is decided by its rules
+        alone; all other types follow `watch_changes`.
+
     Attributes:
         watch_changes (Dict[str, bool]): Which change types to monitor
+        change_rules (List[ChangeRuleConfig]): Rules replacing watch_changes for their change types
         colors (Dict[str, int]): Color codes for different notification types
 
     Example:
@@ -576,6 +676,10 @@ class NotificationsConfig(BaseModel):
                 "hdr_status": True,     # Monitor HDR changes
                 "file_size": False      # Ignore file size changes
             },
+            change_rules=[
+                {"change": "resolution", "direction": "increase"},   # Upgrades only
+                {"change": "file_size", "min_change_percent": 25}    # Bigger replacements only
+            ],
             colors={
                 "new_item": 0x00FF00,           # Green for new items
                 "resolution_upgrade": 0xFFD700, # Gold for resolution upgrades
@@ -588,6 +692,7 @@ class NotificationsConfig(BaseModel):
     model_config = ConfigDict(extra='forbid')
 
     watch_changes: Dict[str, bool] = Field(default_factory=dict)
+    change_rules: List[ChangeRuleConfig] = Field(default_factory=list)
     colors: Dict[str, int] = Field(default_factory=dict)
     filter_renames: bool = Field(default=True, description="Filter out notifications for file renames (same content, different path)")
     filter_deletes: bool = Field(default=True, description="Filter out delete notifications for upgrades (delete followed by add of same item)")
@@ -655,6 +760,182 @@ class BackupConfig(BaseModel):
             raise ValueError("Backup time must be in HH:MM format (e.g., 02:00)")
 
 
+# ==================== SYNC CONFIGURATION ====================
+
+class SyncConfig(BaseModel):
+    """
+    Configuration for the library sync pipeline.
+
+    A library sync runs as three stages connected by bounded queues:
+    fetch (pages from the Jellyfin API), convert (API items to DatabaseItems,
+    including content hashing) and write (batched database upserts). Each
+    stage has its own number of workers, and the queues between stages apply
+    backpressure so a fast stage can't run away from a slow one.
+
+    **Memory Budget:**
+        The queues are bounded by estimated payload size, not batch count, so
+        peak memory stays predictable on small NAS devices no matter how many
+        streams the items carry. Lower `queue_memory_mb` on memory-constrained
+        hosts; the sync summary reports the peak actually used.
+
+    **Failed Pages:**
+        A page that fails to fetch is retried with exponential backoff. If it
+        keeps failing, it is split in half repeatedly so the rest of the page
+        still syncs and only the item(s) that break the server are skipped.
+        Skipped items, and items that fail conversion, are recorded in the
+        `sync_quarantine` table with the error.
+
+    **Bucket Summaries:**
+        With `bucket_summaries` enabled, scheduled full syncs first list each
+        library with only item ids and save dates and compare per-bucket
+        summaries with the database. Unchanged buckets are skipped and only
+        new or changed items are fetched in full. The first full sync after
+        enabling it still scans everything to establish the summaries.
+
+    **Tuning the Pipeline:**
+        The sync summary reports how busy each stage was. If `fetch` is close to
+        100% the Jellyfin server is the bottleneck and more fetch workers may
+        help; if `write` is saturated SQLite is the limit and more workers won't.
+
+    Attributes:
+        page_size (Optional[int]): Items per API request (None = adaptive 100-500)
+        fetch_workers (int): Concurrent Jellyfin page requests
+        convert_workers (int): Concurrent conversion workers
+        write_workers (int): Concurrent database writers
+        queue_memory_mb (int): Memory budget for batches waiting between stages
+        page_retries (int): Extra attempts for a failed page before splitting it
+        retry_backoff_seconds (float): Delay before the first retry (doubles each time)
+        bucket_summaries (bool): Skip unchanged parts of the library on full syncs
+
+    Example:
+        ```python
+        # Slow remote Jellyfin server, fast local disk
+        SyncConfig(fetch_workers=4, write_workers=1)
+        ```
+    """
+    # Older releases documented startup_sync, sync_batch_size and api_request_delay
+    # here; they are ignored rather than rejected so existing configs keep loading.
+    model_config = ConfigDict(extra='ignore')
+
+    page_size: Optional[int] = Field(default=None, ge=10, le=2000, description="Items per API request (None = adaptive)")
+    fetch_workers: int = Field(default=2, ge=1, le=8, description="Concurrent Jellyfin page requests")
+    convert_workers: int = Field(default=1, ge=1, le=8, description="Concurrent conversion workers")
+    write_workers: int = Field(default=1, ge=1, le=4, description="Concurrent database writers")
+    queue_memory_mb: int = Field(default=64, ge=8, le=2048, description="Memory budget (MB) for queued batches")
+    page_retries: int = Field(default=3, ge=0, le=10, description="Retries for a failed page before splitting it")
+    retry_backoff_seconds: float = Field(default=1.0, ge=0.0, le=60.0, description="Initial retry delay in seconds (doubles each retry)")
+    bucket_summaries: bool = Field(default=True, description="Compare per-library bucket summaries to skip unchanged items on full syncs")
+
+
+# ==================== SCHEDULER CONFIGURATION ====================
+
+class JobScheduleConfig(BaseModel):
+    """
+    Schedule for a single background maintenance job.
+
+    A job runs either on a fixed interval or on a cron-like schedule. If both
+    are given, the cron expression wins. Random jitter spreads runs out so that
+    restarts or several instances don't all hit Jellyfin at the same moment.
+
+    Attributes:
+        enabled (bool): Whether the job runs at all
+        interval_minutes (Optional[int]): Minutes between runs
+        cron (Optional[str]): Five-field cron expression (minute hour day month weekday)
+        jitter_seconds (int): Random delay (0..jitter_seconds) added to each run
+        defer_when_busy (bool): Postpone the job while webhooks/notifications are busy
+
+    Example:
+        ```python
+        # Every 6 hours, give or take 5 minutes
+        JobScheduleConfig(interval_minutes=360, jitter_seconds=300)
+
+        # Every night at 03:30, never postponed
+        JobScheduleConfig(cron="30 3 * * *", defer_when_busy=False)
+        ```
+    """
+    model_config = ConfigDict(extra='forbid')
+
+    enabled: bool = Field(default=True, description="Enable this job")
+    interval_minutes: Optional[int] = Field(default=None, ge=1, le=525600, description="Minutes between runs")
+    cron: Optional[str] = Field(default=None, description="Cron expression: minute hour day month weekday")
+    jitter_seconds: int = Field(default=0, ge=0, le=3600, description="Random delay added to each run")
+    defer_when_busy: bool = Field(default=True, description="Postpone while the service is busy")
+
+    @field_validator('cron')
+    @classmethod
+    def validate_cron(cls, v: Optional[str]) -> Optional[str]:
+        """Validate the cron expression by parsing it"""
+        if v is None or not v.strip():
+            return None
+        # Imported here because the scheduler module imports these config models
+        from .scheduler import CronSchedule
+        return CronSchedule(v).expression
+
+
+class SchedulerConfig(BaseModel):
+    """
+    Configuration for the background maintenance scheduler.
+
+    Controls when library syncs, database maintenance, statistics refreshes and
+    cache pruning run, and when they should back off because the service is
+    busy handling webhooks.
+
+    **Load-Aware Deferral:**
+        A job marked `defer_when_busy` is postponed while any of these is true:
+        - At least `busy_active_webhooks` webhooks are being processed
+        - The Discord notification queue holds `busy_notification_queue_size` or more items
+        - A webhook arrived within the last `quiet_period_seconds`
+        - A library sync is already running
+        Deferred jobs are retried every `defer_retry_seconds` and run anyway once
+        they have waited `max_defer_minutes`.
+
+    Attributes:
+        full_sync (JobScheduleConfig): Complete library sync with Jellyfin
+        incremental_sync (JobScheduleConfig): Sync of items changed since the last sync
+        vacuum (JobScheduleConfig): Incremental vacuum and planner statistics (defaults to database.vacuum_interval_hours)
+        stats_refresh (JobScheduleConfig): Jellyfin server statistics snapshot
+        cache_pruning (JobScheduleConfig): Removal of expired in-memory cache entries
+        stats_compaction (JobScheduleConfig): Rollup and cleanup of old Jellyfin statistics
+        wal_checkpoint (JobScheduleConfig): Checkpoint and truncate the database WAL while idle
+        connectivity_check_seconds (int): Seconds between Jellyfin connectivity checks
+        busy_active_webhooks (int): Concurrent webhooks that count as busy
+        busy_notification_queue_size (int): Queued notifications that count as busy
+        quiet_period_seconds (int): Seconds after the last webhook that count as busy
+        defer_retry_seconds (int): Seconds between retries of a deferred job
+        max_defer_minutes (int): Longest a job may be deferred before it runs anyway
+    """
+    model_config = ConfigDict(extra='forbid')
+
+    full_sync: JobScheduleConfig = Field(
+        default_factory=lambda: JobScheduleConfig(interval_minutes=360, jitter_seconds=300)
+    )
+    incremental_sync: JobScheduleConfig = Field(
+        default_factory=lambda: JobScheduleConfig(interval_minutes=30, jitter_seconds=60)
+    )
+    vacuum: JobScheduleConfig = Field(
+        default_factory=lambda: JobScheduleConfig(jitter_seconds=600)
+    )
+    stats_refresh: JobScheduleConfig = Field(
+        default_factory=lambda: JobScheduleConfig(interval_minutes=30, jitter_seconds=60)
+    )
+    cache_pruning: JobScheduleConfig = Field(
+        default_factory=lambda: JobScheduleConfig(interval_minutes=60, defer_when_busy=False)
+    )
+    stats_compaction: JobScheduleConfig = Field(
+        default_factory=lambda: JobScheduleConfig(interval_minutes=1440, jitter_seconds=600)
+    )
+    wal_checkpoint: JobScheduleConfig = Field(
+        default_factory=lambda: JobScheduleConfig(interval_minutes=15, jitter_seconds=60)
+    )
+
+    connectivity_check_seconds: int = Field(default=300, ge=30, le=3600, description="Jellyfin connectivity check interval")
+    busy_active_webhooks: int = Field(default=1, ge=1, le=1000, description="In-flight webhooks that count as busy")
+    busy_notification_queue_size: int = Field(default=10, ge=1, le=1000, description="Queued notifications that count as busy")
+    quiet_period_seconds: int = Field(default=60, ge=0, le=3600, description="Seconds after the last webhook that count as busy")
+    defer_retry_seconds: int = Field(default=60, ge=5, le=3600, description="Seconds between retries of deferred jobs")
+    max_defer_minutes: int = Field(default=120, ge=1, le=1440, description="Maximum deferral before a job runs anyway")
+
+
 # ==================== SERVER CONFIGURATION ====================
 
 class ServerConfig(BaseModel):
@@ -791,6 +1072,8 @@ class WebInterfaceConfig(BaseModel):
         ssl_cert_path (Optional[str]): Path to SSL certificate file
         ssl_key_path (Optional[str]): Path to SSL private key file
         ssl_port (int): Port for HTTPS connections (default: 9000)
+        overview_cache_seconds (int): How long dashboard statistics are reused
+            before the database is queried again (0 disables the cache)
     """
     model_config = ConfigDict(extra='forbid')
     
@@ -805,6 +1088,7 @@ class WebInterfaceConfig(BaseModel):
     ssl_cert_path: Optional[str] = Field(default=None, description="Path to SSL certificate file")
     ssl_key_path: Optional[str] = Field(default=None, description="Path to SSL private key file")
     ssl_port: int = Field(default=9000, ge=1024, le=65535, description="HTTPS port for web interface")
+    overview_cache_seconds: int = Field(default=10, ge=0, le=300, description="Seconds dashboard statistics are cached between database queries (0 disables)")
 
     @model_validator(mode='after')
     def validate_auth(self) -> 'WebInterfaceConfig':
@@ -1151,6 +1435,8 @@ class AppConfig(BaseModel):
         notifications (NotificationsConfig): Notification behavior settings (optional)
         server (ServerConfig): Web server configuration (optional, has defaults)
         metadata_services (MetadataServicesConfig): External metadata services config (optional)
+        scheduler (SchedulerConfig): Background maintenance job schedules (optional, has defaults)
+        sync (SyncConfig): Library sync pipeline tuning (optional, has defaults)
 
     Example:
         ```python
@@ -1174,7 +1460,7 @@ class AppConfig(BaseModel):
         )
         ```
     """
-    model_config = ConfigDict(extra='ignore')  # Ignore extra fields like deprecated 'sync' config
+    model_config = ConfigDict(extra='ignore')  # Ignore unknown top-level sections from older releases
 
     # Required configurations
     jellyfin: JellyfinConfig
@@ -1189,6 +1475,8 @@ class AppConfig(BaseModel):
     web_interface: WebInterfaceConfig = Field(default_factory=WebInterfaceConfig)
     metadata_services: MetadataServicesConfig = Field(default_factory=MetadataServicesConfig)
     backup: BackupConfig = Field(default_factory=BackupConfig)
+    scheduler: SchedulerConfig = Field(default_factory=SchedulerConfig)
+    sync: SyncConfig = Field(default_factory=SyncConfig)
 
 
 # ==================== CONFIGURATION VALIDATION ====================
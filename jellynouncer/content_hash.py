@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Jellynouncer Content Hashes
+
+This module computes the content hash that MediaItem and DatabaseItem use
+for change detection: a Blake2b digest of the item's technical
+specifications (name, type, video, audio, subtitles and file size). Two
+versions of the same item with equal hashes need no further comparison.
+
+**Hash Versions:**
+- **Version 1** serialized the fields as a JSON object (`json.dumps` with
+  sorted keys) and hashed the text. Building the dictionary and the JSON
+  string cost more than the hash itself, for every item of every sync.
+- **Version 2** (current) packs the same fields straight into bytes in a
+  fixed order - numbers with `struct`, strings length-prefixed - with no
+  dictionary or JSON in between.
+
+The versions give different digests for the same item, so the database
+stores which version each row's hash was made with (`hash_version`) and
+rehashes old rows after an upgrade (see `DatabaseManager.rehash_items()`).
+Hashes of different versions are never compared with each other.
+
+**Encoding (version 2):**
+The fields in `HASH_FIELDS` order, split by type:
+- A bitmask of which fields are None (so None and 0 / "" / [] differ,
+  except for the subtitle lists, where version 1 already treated None as
+  an empty list)
+- The integer fields as signed 64-bit numbers and the frame rate as a double
+- The byte length of every string and of every packed subtitle list
+- The UTF-8 strings, then each subtitle list sorted and NUL-separated
+
+Values of an unexpected type (a float bitrate, a numeric codec, ...) can't
+use that layout; those items are hashed with a generic type-tagged
+encoding instead. The two layouts start with different marker bytes, so
+they can never produce the same input.
+
+Functions:
+    compute_content_hash: Current content hash of an item
+    content_hash_v1: Version 1 (JSON) hash, for rows stored by older versions
+
+Author: Mark Newton
+Project: Jellynouncer
+Version: 1.0.0
+License: MIT
+"""
+
+import hashlib
+import json
+import operator
+import struct
+from typing import Any
+
+# Version of the hash compute_content_hash() returns
+CONTENT_HASH_VERSION = 2
+
+# Every field that contributes to the content hash. The order is part of the
+# version 2 format: changing it (or the field types) requires a new version.
+HASH_FIELDS = (
+    'name', 'item_type',
+    'video_height', 'video_width', 'video_codec', 'video_profile', 'video_range',
+    'video_framerate', 'video_bitrate', 'video_bitdepth',
+    'audio_codec', 'audio_channels', 'audio_bitrate', 'audio_samplerate',
+    'subtitle_count', 'subtitle_languages', 'subtitle_formats',
+    'file_size',
+)
+
+_INT_FIELDS = (
+    'video_height', 'video_width', 'video_bitrate', 'video_bitdepth',
+    'audio_channels', 'audio_bitrate', 'audio_samplerate', 'subtitle_count', 'file_size',
+)
+_STRING_FIELDS = ('name', 'item_type', 'video_codec', 'video_profile', 'video_range', 'audio_codec')
+_LIST_FIELDS = ('subtitle_languages', 'subtitle_formats')
+
+_numbers = operator.attrgetter(*_INT_FIELDS, 'video_framerate')
+_strings = operator.attrgetter(*_STRING_FIELDS)
+_lists = operator.attrgetter(*_LIST_FIELDS)
+_fields = operator.attrgetter(*HASH_FIELDS)
+
+# Layout markers, so the packed and generic encodings can never collide
+_PACKED = b'\x01'
+_GENERIC = b'\x02'
+
+# None bitmask, 9 integers, the frame rate, then the byte lengths of the
+# 6 strings and 2 packed lists
+_HEADER = struct.Struct(f'>I{len(_INT_FIELDS)}qd{len(_STRING_FIELDS) + len(_LIST_FIELDS)}I')
+_STRING_NONE_SHIFT = len(_INT_FIELDS) + 1
+
+# Keeps version 2 digests distinct from any other Blake2b use
+_PERSON = b'jellynouncer-v2'
+
+
+def _packed_encoding(item: Any) -> bytes:
+    """
+    Version 2 fixed layout (see module docstring).
+
+    Raises:
+        struct.error, TypeError, AttributeError: A field has an unexpected type
+    """
+    numbers = _numbers(item)
+    mask = 0
+    if None in numbers:
+        for bit, value in enumerate(numbers):
+            if value is None:
+                mask |= 1 << bit
+        numbers = [0 if value is None else value for value in numbers]
+
+    texts = []
+    for bit, value in enumerate(_strings(item), _STRING_NONE_SHIFT):
+        if value is None:
+            mask |= 1 << bit
+            texts.append(b'')
+        elif isinstance(value, str):
+            texts.append(value.encode('utf-8'))
+        else:
+            raise TypeError(f"unexpected string field type {type(value).__name__}")
+
+    for values in _lists(item):
+        if not values:
+            texts.append(b'')
+            continue
+        joined = '\x00'.join(sorted(values))
+        # NUL inside an entry would make the packing ambiguous
+        if joined.count('\x00') != len(values) - 1:
+            raise TypeError("subtitle entry contains NUL")
+        texts.append(joined.encode('utf-8'))
+
+    return _PACKED + _HEADER.pack(mask, *numbers, *map(len, texts)) + b''.join(texts)
+
+
+def _tagged(value: Any) -> bytes:
+    """Type-tagged encoding of one value (generic layout)."""
+    if value is None:
+        return b'n'
+    if isinstance(value, bool):
+        return b'b1' if value else b'b0'
+    if isinstance(value, int):
+        digits = str(value).encode('ascii')
+        return b'i' + struct.pack('>I', len(digits)) + digits
+    if isinstance(value, float):
+        return b'f' + struct.pack('>d', value)
+    if isinstance(value, (list, tuple)):
+        # Sorted by encoding, so mixed types sort without errors
+        parts = sorted(_tagged(entry) for entry in value)
+        return b'l' + struct.pack('>I', len(parts)) + b''.join(parts)
+    text = (value if isinstance(value, str) else str(value)).encode('utf-8', 'surrogatepass')
+    return (b's' if isinstance(value, str) else b'r') + struct.pack('>I', len(text)) + text
+
+
+def _generic_encoding(item: Any) -> bytes:
+    """Version 2 encoding for items with unexpected field types."""
+    values = list(_fields(item))
+    for name in _LIST_FIELDS:
+        index = HASH_FIELDS.index(name)
+        values[index] = values[index] or []
+    return _GENERIC + b''.join(_tagged(value) for value in values)
+
+
+def compute_content_hash(item: Any) -> str:
+    """
+    Compute an item's content hash (version `CONTENT_HASH_VERSION`).
+
+    Works for anything with the `HASH_FIELDS` attributes - MediaItem and
+    DatabaseItem give the same hash for the same specifications.
+
+    Args:
+        item: MediaItem, DatabaseItem or compatible object
+
+    Returns:
+        str: 64-character hex Blake2b digest
+
+    Example:
+        ```python
+        if compute_content_hash(stored_item) == compute_content_hash(new_item):
+            return  # Same technical specifications
+        ```
+    """
+    try:
+        data = _packed_encoding(item)
+    except (struct.error, TypeError, AttributeError):
+        data = _generic_encoding(item)
+    return hashlib.blake2b(data, digest_size=32, person=_PERSON).hexdigest()
+
+
+def content_hash_v1(item: Any) -> str:
+    """
+    Compute the version 1 (JSON) content hash.
+
+    Only needed to match rows written before version 2 that haven't been
+    rehashed yet, for example when looking up renamed items by hash.
+
+    Args:
+        item: MediaItem, DatabaseItem or compatible object
+
+    Returns:
+        str: 64-character hex Blake2b digest
+    """
+    hash_data = {name: getattr(item, name) for name in HASH_FIELDS}
+    for name in _LIST_FIELDS:
+        hash_data[name] = sorted(hash_data[name]) if hash_data[name] else []
+    hash_string = json.dumps(hash_data, sort_keys=True, default=str)
+    return hashlib.blake2b(hash_string.encode('utf-8'), digest_size=32).hexdigest()
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Jellynouncer In-Memory Content Hash Index
+
+This module keeps the content hash of every stored item in memory so the
+most common database question - "is this item new, and if not, did it
+change?" - is answered without a SQLite query or building a DatabaseItem.
+
+The index is loaded once at startup and kept current by `DatabaseManager`
+after each committed write. Only when the answer is "changed" does the
+caller need the stored row, to let `ChangeDetector` work out what changed.
+
+**Memory Layout:**
+Jellyfin item ids are 32 hex characters and content hashes 64, so both are
+stored as raw bytes (16 and 32 bytes) instead of strings. This roughly
+halves the footprint; any id or hash that isn't plain lowercase hex is
+kept as the original string, so nothing is ever misfiled.
+
+Classes:
+    ContentHashIndex: item_id -> content hash digest mapping
+
+Author: Mark Newton
+Project: Jellynouncer
+Version: 1.0.0
+License: MIT
+"""
+
+import sys
+from typing import Dict, Iterable, Optional, Tuple, Union
+
+# Answers from ContentHashIndex.status()
+ITEM_NEW = "new"
+ITEM_CHANGED = "changed"
+ITEM_UNCHANGED = "unchanged"
+
+
+def _pack_hex(value: str) -> Union[bytes, str]:
+    """
+    Store a lowercase hex string as raw bytes, anything else as-is.
+
+    Args:
+        value (str): Item id or content hash
+
+    Returns:
+        Union[bytes, str]: Compact key/value; bytes and str never compare equal
+    """
+    try:
+        packed = bytes.fromhex(value)
+    except (TypeError, ValueError):
+        return value
+    # Uppercase or spaced hex would map to the same bytes as a different string
+    return packed if packed.hex() == value else value
+
+
+class ContentHashIndex:
+    """
+    In-memory mapping of item_id to content hash.
+
+    Answers `status(item_id, content_hash)` with `ITEM_NEW`, `ITEM_CHANGED`
+    or `ITEM_UNCHANGED` in a single dictionary lookup.
+
+    The index only reflects committed writes, so it must be updated by
+    whoever commits them (`DatabaseManager` does this for every save and
+    delete) and must not be shared with another process writing the same
+    database.
+
+    Attributes:
+        loaded (bool): True once `load()` has filled the index from the database
+
+    Example:
+        ```python
+        index = ContentHashIndex()
+        index.load([("a1b2...", "9f86..."), ...])
+
+        if index.status(item.item_id, item.content_hash) == ITEM_UNCHANGED:
+            return  # Nothing to compare
+        ```
+    """
+
+    def __init__(self):
+        """Create an empty index."""
+        self._digests: Dict[Union[bytes, str], Union[bytes, str]] = {}
+        self.loaded = False
+
+    def __len__(self) -> int:
+        return len(self._digests)
+
+    def __contains__(self, item_id: str) -> bool:
+        return _pack_hex(item_id) in self._digests
+
+    def load(self, rows: Iterable[Tuple[str, str]]) -> None:
+        """
+        Add (item_id, content_hash) rows, typically everything in media_items.
+
+        Hashes may also be raw digests (bytes), as stored by the compact
+        media_items format; they are kept as-is.
+
+        Args:
+            rows (Iterable[Tuple[str, Union[str, bytes]]]): Stored ids and hashes
+        """
+        digests = self._digests
+        for item_id, content_hash in rows:
+            digests[_pack_hex(item_id)] = _pack_hex(content_hash)
+        self.loaded = True
+
+    def set(self, item_id: str, content_hash: str) -> None:
+        """Record the hash of a newly committed item."""
+        self._digests[_pack_hex(item_id)] = _pack_hex(content_hash)
+
+    def discard(self, item_id: str) -> None:
+        """Forget a deleted item (no error if it isn't indexed)."""
+        self._digests.pop(_pack_hex(item_id), None)
+
+    def get(self, item_id: str) -> Optional[str]:
+        """
+        Look up the stored content hash of an item.
+
+        Args:
+            item_id (str): Item to look up
+
+        Returns:
+            Optional[str]: Stored content hash, or None if the item isn't indexed
+        """
+        digest = self._digests.get(_pack_hex(item_id))
+        if isinstance(digest, bytes):
+            return digest.hex()
+        return digest
+
+    def status(self, item_id: str, content_hash: str) -> str:
+        """
+        Classify an incoming item against the stored one.
+
+        Args:
+            item_id (str): Incoming item id
+            content_hash (str): Incoming item's content hash
+
+        Returns:
+            str: ITEM_NEW, ITEM_CHANGED or ITEM_UNCHANGED
+        """
+        stored = self._digests.get(_pack_hex(item_id))
+        if stored is None:
+            return ITEM_NEW
+        return ITEM_UNCHANGED if stored == _pack_hex(content_hash) else ITEM_CHANGED
+
+    def memory_bytes(self) -> int:
+        """
+        Estimate the memory held by the index.
+
+        Counts the dictionary itself plus one packed id and one packed hash
+        per entry, which is exact for ordinary Jellyfin ids and hashes.
+
+        Returns:
+            int: Approximate size in bytes
+        """
+        per_entry = sys.getsizeof(bytes(16)) + sys.getsizeof(bytes(32))
+        return sys.getsizeof(self._digests) + len(self._digests) * per_entry
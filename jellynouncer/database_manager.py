@@ -12,6 +12,7 @@ connection management, and data serialization.
 
 Classes:
     DatabaseManager: Enhanced SQLite database manager with WAL mode and error handling
+    WriteRequest: A single-item write queued for the group-commit writer task
 
 Author: Mark Newton
 Project: Jellynouncer
@@ -19,21 +20,218 @@ Version: 1.0.0
 License: MIT
 """
 
+import asyncio
+import functools
+import hashlib
 import os
 import json
 import logging
 import time
-from datetime import datetime, timezone
-from dataclasses import asdict
-from typing import Dict, Any, Optional, List
+from contextlib import asynccontextmanager
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from dataclasses import dataclass, fields
+from pathlib import Path
+from typing import Dict, Any, Optional, List, AsyncIterator, Tuple
 
 import aiosqlite
 
+from .compact_storage import (
+    DICTIONARY_COLUMNS, StringDictionary,
+    compile_compact_encoder, expand_row, pack_hash, unpack_hash
+)
 from .config_models import DatabaseConfig
-from .database_models import DatabaseItem
+from .content_hash import CONTENT_HASH_VERSION, HASH_FIELDS
+from .content_index import ContentHashIndex, ITEM_NEW, ITEM_CHANGED, ITEM_UNCHANGED
+from .database_models import DatabaseItem, sync_bucket, sync_token_digest
+from .quality_score import QUALITY_SCORE_VERSION
+from .serializers import compile_row_serializer
 from .utils import get_logger
 
 
+@dataclass
+class WriteRequest:
+    """
+    A single-item write waiting for the group-commit writer task.
+
+    Attributes:
+        operation: "upsert", "delete", "replace" or "event"
+        payload: DatabaseItem to save, item id to delete, (old item id, DatabaseItem),
+            or a notification event dictionary
+        future: Resolved with the write's result after the commit
+    """
+    operation: str
+    payload: Any
+    future: asyncio.Future
+
+    def describe(self) -> str:
+        """Item id for log messages."""
+        if isinstance(self.payload, str):
+            return self.payload
+        if isinstance(self.payload, tuple):
+            return f"{self.payload[0]} -> {self.payload[1].item_id}"
+        if isinstance(self.payload, dict):
+            return f"{self.payload.get('item_id')} ({self.payload.get('action')} event)"
+        return self.payload.item_id
+
+
+# ==================== MEDIA ITEM ROW MAPPING ====================
+# media_items columns, in DatabaseItem field order
+ITEM_COLUMNS = tuple(item_field.name for item_field in fields(DatabaseItem))
+
+# List fields stored as JSON text
+_JSON_COLUMNS = ('subtitle_languages', 'subtitle_formats')
+
+# Fields covered by the content hash. Every other column (series info, file
+# path, sync tracking, the hash version...) has to be compared on its own to
+# decide whether an existing row needs updating. The quality score and tier
+# are computed from hashed fields, and quality_upgraded_at is kept by the
+# database (see _UPDATE_EXPRESSIONS), so none of them needs a comparison.
+_CONTENT_HASH_COLUMNS = frozenset(HASH_FIELDS)
+_UNHASHED_COLUMNS = tuple(
+    column for column in ITEM_COLUMNS
+    if column not in _CONTENT_HASH_COLUMNS and column not in (
+        'item_id', 'content_hash', 'timestamp_created', 'quality_score', 'quality_tier', 'quality_upgraded_at'
+    )
+)
+
+# Update values that aren't simply the saved item's: quality_upgraded_at is
+# stamped (with the saved item's creation time) when the quality score goes
+# up under the same scoring version, and otherwise kept
+_UPDATE_EXPRESSIONS = {
+    'quality_upgraded_at': (
+        "CASE WHEN excluded.quality_version = media_items.quality_version "
+        "AND excluded.quality_score > media_items.quality_score "
+        "THEN excluded.timestamp_created ELSE media_items.quality_upgraded_at END"
+    ),
+}
+
+# Conditional upsert: existing rows are only rewritten when something changed,
+# and keep their original timestamp_created
+UPSERT_ITEM_SQL = (
+    f"INSERT INTO media_items ({', '.join(ITEM_COLUMNS)}) "
+    f"VALUES ({', '.join('?' * len(ITEM_COLUMNS))}) "
+    f"ON CONFLICT(item_id) DO UPDATE SET "
+    + ', '.join(f"{column} = {_UPDATE_EXPRESSIONS.get(column, f'excluded.{column}')}" for column in ITEM_COLUMNS
+                if column not in ('item_id', 'timestamp_created'))
+    + " WHERE excluded.content_hash != media_items.content_hash OR "
+    + ' OR '.join(f"excluded.{column} IS NOT media_items.{column}" for column in _UNHASHED_COLUMNS)
+)
+
+# Columns the upsert's WHERE clause compares, and their positions in a row,
+# so save_items_batch() can tell updated from unchanged rows in Python
+_UPSERT_COMPARED_COLUMNS = ('content_hash',) + _UNHASHED_COLUMNS
+_UPSERT_COMPARED_INDEXES = tuple(ITEM_COLUMNS.index(column) for column in _UPSERT_COMPARED_COLUMNS)
+
+
+# Secondary indexes on media_items (name, indexed columns). Kept in one place
+# so a bulk load can drop them and rebuild them afterwards.
+MEDIA_ITEM_INDEXES = (
+    ("idx_item_type", "item_type"),
+    ("idx_series_name", "series_name"),
+    ("idx_content_hash", "content_hash"),
+    ("idx_series_id", "series_id"),
+    ("idx_video_height", "video_height"),
+    ("idx_video_codec", "video_codec"),
+    ("idx_audio_codec", "audio_codec"),
+    ("idx_year", "year"),
+    ("idx_timestamp_created", "timestamp_created"),
+    ("idx_season_episode", "series_name, season_number, episode_number"),
+    ("idx_video_specs", "video_height, video_codec, video_range"),
+    ("idx_library_id", "library_id"),
+    ("idx_audio_specs", "audio_codec, audio_channels"),
+    # Normalized name lookups for rename/upgrade matching (see get_items_by_name)
+    ("idx_name_type", "lower(trim(name)), item_type"),
+    # Library quality queries (see get_items_below_tier, get_quality_upgrades)
+    ("idx_quality", "item_type, quality_version, quality_tier, quality_score"),
+    ("idx_quality_upgraded_at", "quality_upgraded_at"),
+)
+
+
+# ==================== JELLYFIN STATS RETENTION ====================
+# Numeric jellyfin_stats columns carried into rollups (last value per bucket)
+STATS_METRICS = (
+    ("total_users", "INTEGER"), ("active_users", "INTEGER"), ("total_items", "INTEGER"),
+    ("movie_count", "INTEGER"), ("series_count", "INTEGER"), ("episode_count", "INTEGER"),
+    ("music_count", "INTEGER"), ("music_album_count", "INTEGER"), ("photo_count", "INTEGER"),
+    ("book_count", "INTEGER"), ("total_size_gb", "REAL"), ("total_play_count", "INTEGER"),
+    ("total_watch_time_minutes", "INTEGER"),
+)
+
+# JSON columns stored in stats_blobs and referenced by <column>_hash
+STATS_BLOB_COLUMNS = ("library_stats", "plugin_stats", "system_info")
+
+# Rollup bucket start for a 'YYYY-MM-DD HH:MM:SS' timestamp
+_ROLLUP_BUCKETS = {
+    "hour": lambda timestamp: timestamp[:13] + ":00:00",
+    "day": lambda timestamp: timestamp[:10] + " 00:00:00",
+}
+
+
+# DatabaseItem -> media_items row, with the subtitle lists as JSON text
+item_row = compile_row_serializer(DatabaseItem, ITEM_COLUMNS, json_columns=_JSON_COLUMNS)
+
+# Raw ITEM_COLUMNS values of a DatabaseItem (input to the compact encoder)
+item_values = compile_row_serializer(DatabaseItem, ITEM_COLUMNS)
+
+
+
+def cached_query(method):
+    """
+    Serve a DatabaseManager query method from its short-lived result cache.
+
+    With `result_cache_seconds` set, a result is kept for that long and
+    returned to every caller asking for the same thing (same method and
+    arguments) in the meantime. Callers arriving while the query is still
+    running share it rather than starting their own, so ten open dashboard
+    tabs polling at once cost one query. A query that fails isn't cached.
+
+    The cached value is shared between callers and must not be modified.
+
+    Args:
+        method: Async DatabaseManager method returning a query result
+
+    Returns:
+        The wrapped method (unchanged behaviour when the cache is disabled)
+
+    Example:
+        ```python
+        @cached_query
+        async def get_statistics(self) -> Dict[str, Any]:
+            ...
+        ```
+    """
+    @functools.wraps(method)
+    async def cached(self, *args, **kwargs):
+        if self.result_cache_seconds <= 0:
+            return await method(self, *args, **kwargs)
+
+        key = f"{method.__name__}{args!r}{sorted(kwargs.items())!r}"
+        now = asyncio.get_running_loop().time()
+        entry = self._result_cache.get(key)
+        if entry is None or entry[0] <= now:
+            task = asyncio.ensure_future(method(self, *args, **kwargs))
+
+            def forget_failure(done: asyncio.Future) -> None:
+                if (done.cancelled() or done.exception() is not None) and self._result_cache.get(key, (0, None))[1] is done:
+                    del self._result_cache[key]
+
+            task.add_done_callback(forget_failure)
+            entry = (now + self.result_cache_seconds, task)
+            self._result_cache[key] = entry
+        # One caller being cancelled mustn't cancel the query the others wait on
+        return await asyncio.shield(entry[1])
+
+    return cached
+
+
+# Work table and change-tracking triggers used while media_items is converted
+# between the standard and compact formats (see DatabaseManager.migrate_schema)
+_MIGRATION_TABLE = "media_items_migrating"
+_MIGRATION_DIRTY_TABLE = "media_items_migration_dirty"
+_MIGRATION_TRIGGERS = (("insert", "INSERT", "NEW"), ("update", "UPDATE", "OLD"), ("delete", "DELETE", "OLD"))
+
+
 class DatabaseManager:
     """
     Enhanced SQLite database manager with WAL mode and comprehensive error handling.
@@ -68,7 +266,23 @@ class DatabaseManager:
     - Automatic database maintenance (VACUUM, ANALYZE)
     - Comprehensive error handling and logging
     - JSON serialization for complex data types
-    - Connection pooling through aiosqlite
+    - Long-lived connection pool: one writer, several readers
+
+    **Connection Pool:**
+
+    Opening an aiosqlite connection starts a new thread, and per-connection
+    PRAGMAs (cache size, memory mapping, busy timeout) only apply to the
+    connection that set them. The manager therefore keeps long-lived
+    connections, opened on first use with all PRAGMAs applied:
+    - One writer connection, used by one caller at a time. Writes queue up in
+      the event loop instead of fighting over the SQLite lock.
+    - `reader_connections` read-only connections. With WAL mode, reads run
+      concurrently with each other and with the writer.
+
+    Another process that only reads the database (the web interface) creates
+    its manager with `read_only=True`: no writer, `mode=ro` shared-cache
+    readers, and optionally a short result cache for the dashboard queries
+    (`result_cache_seconds`, see `cached_query`).
 
     **Table Schema:**
     The media_items table stores comprehensive metadata with the following structure:
@@ -78,6 +292,8 @@ class DatabaseManager:
     - JSON fields: genres, studios, tags, artists (stored as JSON strings)
     - Timestamps: date_created, date_modified, timestamp
     - Content tracking: content_hash, file_path, file_size
+    - Optional compact format (`compact_schema`): binary content hashes and
+      dictionary-coded strings, see `compact_storage` and `migrate_schema()`
 
     Attributes:
         config (DatabaseConfig): Database configuration settings
@@ -85,6 +301,8 @@ class DatabaseManager:
         db_path (str): Full path to SQLite database file
         wal_mode (bool): Whether WAL mode is enabled
         _connection_count (int): Track active connections for monitoring
+        _writer (Optional[aiosqlite.Connection]): Pooled writer connection
+        _readers (asyncio.Queue): Idle pooled reader connections
 
     Example:
         ```python
@@ -121,7 +339,7 @@ class DatabaseManager:
         The class handles all WAL-specific configuration and maintenance automatically.
     """
 
-    def __init__(self, config: DatabaseConfig):
+    def __init__(self, config: DatabaseConfig, read_only: bool = False, result_cache_seconds: float = 0):
         """
         Initialize database manager with configuration and logging.
 
@@ -130,6 +348,11 @@ class DatabaseManager:
 
         Args:
             config (DatabaseConfig): Database configuration with path and WAL settings
+            read_only (bool): Open the database for reading only, as another
+                process's manager owns it (see `initialize()`)
+            result_cache_seconds (float): How long the dashboard aggregates
+                (statistics, recent changes, event counts, Jellyfin stats) are
+                served from memory before being queried again; 0 disables it
 
         Note:
             This constructor only sets up the initial state. Actual database
@@ -140,14 +363,299 @@ class DatabaseManager:
         self.logger = get_logger("jellynouncer.database")
         self.db_path = config.path
         self.wal_mode = config.wal_mode
+        self.read_only = read_only
         self._connection_count = 0
 
+        # Connection pool, opened on first use (see _open_pool)
+        self.reader_count = config.reader_connections
+        self._writer: Optional[aiosqlite.Connection] = None
+        self._writer_lock = asyncio.Lock()
+        self._readers: asyncio.Queue = asyncio.Queue()
+        self._all_readers: List[aiosqlite.Connection] = []
+        self._pool_lock = asyncio.Lock()
+        self._pool_open = False
+
+        # Group commit: single-item writes are queued for one writer task
+        self.group_commit_seconds = config.group_commit_ms / 1000
+        self._write_requests: asyncio.Queue = asyncio.Queue()
+        self._writer_task: Optional[asyncio.Task] = None
+        self.group_commit_stats = {'commits': 0, 'writes': 0, 'largest_group': 0}
+
+        # In-memory item_id -> content hash index, filled by initialize()
+        self.content_index: Optional[ContentHashIndex] = (
+            ContentHashIndex() if config.content_index and not read_only else None
+        )
+
+        # Short-lived results of the dashboard aggregate queries (see cached_query)
+        self.result_cache_seconds = result_cache_seconds
+        self._result_cache: Dict[str, tuple] = {}
+
+        # True between begin_bulk_load() and end_bulk_load()
+        self.bulk_loading = False
+
+        # media_items storage format, detected by initialize(). The compact
+        # format stores dictionary codes from media_strings (see compact_storage).
+        self.compact_schema = False
+        self.strings = StringDictionary()
+        self._encode_compact = compile_compact_encoder(ITEM_COLUMNS, self.strings)
+        self._schema_migration_task: Optional[asyncio.Task] = None
+        self.last_schema_migration: Optional[Dict[str, Any]] = None
+
+        # Rows hashed by an older content hash version, and their upgrade
+        # (see rehash_items()). Set by initialize().
+        self.rehash_pending = False
+        self._rehash_task: Optional[asyncio.Task] = None
+        self.last_rehash: Optional[Dict[str, Any]] = None
+
+        # Result of the last checkpoint_wal() call
+        self.last_checkpoint: Optional[Dict[str, Any]] = None
+
         # Ensure the parent directory exists for the database file
         database_dir = os.path.dirname(self.db_path)
-        if database_dir:  # Only create if there's actually a directory path
+        if database_dir and not read_only:  # Only create if there's actually a directory path
             os.makedirs(database_dir, exist_ok=True)
             self.logger.debug(f"Ensured database directory exists: {database_dir}")
 
+    # Most single-item writes committed together in one transaction
+    group_commit_max_requests = 256
+
+    # Bulk load is only used while media_items holds at most this many rows
+    bulk_load_max_items = 1000
+
+    # Rows copied per transaction by a media_items format migration
+    schema_migration_chunk = 2000
+
+    # Rows rehashed per transaction after a content hash version change
+    rehash_chunk = 2000
+
+    # Per-connection settings applied to every pooled connection
+    CONNECTION_PRAGMAS = (
+        "PRAGMA synchronous=NORMAL",
+        "PRAGMA temp_store=memory",
+        "PRAGMA mmap_size=268435456",
+        "PRAGMA cache_size=-256000",  # 256MB page cache (only grows as pages are used)
+        "PRAGMA busy_timeout=30000",
+        # Checkpoint the WAL every ~8MB of changes and truncate the file back to
+        # 64MB afterwards (both are per-connection settings)
+        "PRAGMA wal_autocheckpoint=1000",
+        "PRAGMA journal_size_limit=67108864",
+    )
+
+    # Free pages returned to the filesystem per incremental vacuum step
+    vacuum_slice_pages = 256
+
+    async def _open_connection(self, read_only: bool = False) -> aiosqlite.Connection:
+        """
+        Open a connection with all per-connection PRAGMAs applied.
+
+        A read-only manager opens every connection with a `mode=ro` URI in
+        shared-cache mode: SQLite refuses writes at the file level, and the
+        pooled readers share one page cache instead of holding a copy each.
+
+        Args:
+            read_only: Refuse writes on this connection (`PRAGMA query_only`)
+
+        Returns:
+            aiosqlite.Connection: Ready-to-use connection with `aiosqlite.Row` rows
+        """
+        if self.read_only:
+            uri = f"{Path(os.path.abspath(self.db_path)).as_uri()}?mode=ro&cache=shared"
+            db = await aiosqlite.connect(uri, uri=True)
+            read_only = True
+        else:
+            db = await aiosqlite.connect(self.db_path)
+        db.row_factory = aiosqlite.Row
+        for pragma in self.CONNECTION_PRAGMAS:
+            await db.execute(pragma)
+        if read_only:
+            await db.execute("PRAGMA query_only=ON")
+        return db
+
+    async def _open_pool(self) -> None:
+        """Open the writer and reader connections if they aren't open yet."""
+        async with self._pool_lock:
+            if self._pool_open:
+                return
+            if not self.read_only:
+                self._writer = await self._open_connection()
+            for _ in range(self.reader_count):
+                reader = await self._open_connection(read_only=True)
+                self._all_readers.append(reader)
+                self._readers.put_nowait(reader)
+            self._pool_open = True
+            self.logger.debug(f"Opened database connection pool: {0 if self.read_only else 1} writer, "
+                              f"{self.reader_count} readers")
+
+    @asynccontextmanager
+    async def _write_connection(self) -> AsyncIterator[aiosqlite.Connection]:
+        """
+        Borrow the writer connection.
+
+        Only one caller holds the writer at a time. If the caller leaves a
+        transaction open (for example because an error interrupted it), it
+        is rolled back so the next caller starts clean - the same outcome as
+        closing a short-lived connection without committing.
+
+        Yields:
+            aiosqlite.Connection: The writer connection
+
+        Example:
+            ```python
+            async with self._write_connection() as db:
+                await db.execute("DELETE FROM media_items WHERE item_id = ?", (item_id,))
+                await db.commit()
+            ```
+        """
+        if self.read_only:
+            raise aiosqlite.OperationalError(f"Database {self.db_path} is open read-only")
+        if not self._pool_open:
+            await self._open_pool()
+        async with self._writer_lock:
+            try:
+                yield self._writer
+            finally:
+                if self._writer.in_transaction:
+                    await self._writer.rollback()
+
+    @asynccontextmanager
+    async def _read_connection(self) -> AsyncIterator[aiosqlite.Connection]:
+        """
+        Borrow a read-only connection, waiting if all readers are in use.
+
+        Yields:
+            aiosqlite.Connection: A pooled reader connection
+        """
+        if not self._pool_open:
+            await self._open_pool()
+        reader = await self._readers.get()
+        try:
+            yield reader
+        finally:
+            if reader.in_transaction:
+                await reader.rollback()
+            self._readers.put_nowait(reader)
+
+    def _ensure_writer_task(self) -> None:
+        """Start the group-commit writer task if it isn't running."""
+        if self._writer_task is None or self._writer_task.done():
+            self._writer_task = asyncio.create_task(self._group_commit_loop(), name="database-writer")
+
+    async def _submit_write(self, operation: str, payload: Any) -> bool:
+        """
+        Queue a single-item write for the writer task and wait for its commit.
+
+        Args:
+            operation: "upsert" (payload is a DatabaseItem) or "delete" (payload is an item id)
+            payload: Item or item id
+
+        Returns:
+            bool: Result of the write once committed; False if it or its transaction failed
+        """
+        if self.read_only:
+            self.logger.error(f"Refusing {operation} on read-only database {self.db_path}")
+            return False
+        return await self._queue_write(operation, payload)
+
+    def _queue_write(self, operation: str, payload: Any) -> asyncio.Future:
+        """Queue a write for the writer task; the returned future resolves after its commit."""
+        if self.read_only:
+            raise aiosqlite.OperationalError(f"Database {self.db_path} is open read-only")
+        self._ensure_writer_task()
+        future = asyncio.get_running_loop().create_future()
+        self._write_requests.put_nowait(WriteRequest(operation, payload, future))
+        return future
+
+    async def _group_commit_loop(self) -> None:
+        """
+        Writer task: commit queued single-item writes in groups.
+
+        Waits for a write, then keeps collecting writes for up to
+        `group_commit_ms` (or until `group_commit_max_requests` are queued)
+        and commits them all in one transaction. A `None` request stops the task.
+        """
+        loop = asyncio.get_running_loop()
+        stopping = False
+
+        while not stopping:
+            request = await self._write_requests.get()
+            if request is None:
+                break
+
+            batch = [request]
+            deadline = loop.time() + self.group_commit_seconds
+            while len(batch) < self.group_commit_max_requests:
+                remaining = deadline - loop.time()
+                try:
+                    if remaining <= 0:
+                        # Window over - still take anything already queued
+                        request = self._write_requests.get_nowait()
+                    else:
+                        request = await asyncio.wait_for(self._write_requests.get(), remaining)
+                except (asyncio.QueueEmpty, asyncio.TimeoutError):
+                    break
+                if request is None:
+                    stopping = True
+                    break
+                batch.append(request)
+
+            await self._commit_write_batch(batch)
+
+    async def _commit_write_batch(self, batch: List['WriteRequest']) -> None:
+        """
+        Apply a group of writes in one transaction and resolve their callers.
+
+        Each write runs inside its own savepoint, so one failing write is
+        rolled back and reported as False without affecting the others.
+
+        Args:
+            batch: Queued write requests
+        """
+        results: List[bool] = []
+        try:
+            async with self._write_connection() as db:
+                await db.execute("BEGIN IMMEDIATE")
+                for request in batch:
+                    await db.execute("SAVEPOINT write_request")
+                    try:
+                        if request.operation == "upsert":
+                            result = await self._upsert_item(db, request.payload)
+                        elif request.operation == "replace":
+                            old_item_id, item = request.payload
+                            await self._inherit_quality_history(db, old_item_id, item)
+                            await self._delete_item(db, old_item_id)
+                            result = await self._upsert_item(db, item)
+                        elif request.operation == "event":
+                            result = await self._insert_event(db, request.payload)
+                        else:
+                            result = await self._delete_item(db, request.payload)
+                        await db.execute("RELEASE write_request")
+                    except Exception as e:
+                        self.logger.error(f"Failed to {request.operation} item {request.describe()}: {e}")
+                        await db.execute("ROLLBACK TO write_request")
+                        await db.execute("RELEASE write_request")
+                        result = False
+                    results.append(result)
+                await db.commit()
+
+            committed = [request for request, ok in zip(batch, results) if ok]
+            self._index_committed(
+                saved=[r.payload if r.operation == "upsert" else r.payload[1]
+                       for r in committed if r.operation in ("upsert", "replace")],
+                deleted=[r.payload if r.operation == "delete" else r.payload[0]
+                         for r in committed if r.operation in ("delete", "replace")]
+            )
+
+            self.group_commit_stats['commits'] += 1
+            self.group_commit_stats['writes'] += len(batch)
+            self.group_commit_stats['largest_group'] = max(self.group_commit_stats['largest_group'], len(batch))
+        except Exception as e:
+            self.logger.error(f"Group commit of {len(batch)} writes failed: {e}")
+            results = [False] * len(batch)
+
+        for request, result in zip(batch, results):
+            if not request.future.done():  # The caller may have been cancelled
+                request.future.set_result(result)
+
     async def initialize(self) -> None:
         """
         Initialize database tables and configure SQLite settings.
@@ -197,12 +705,22 @@ class DatabaseManager:
             This method should be called once during application startup.
             Multiple calls are safe but unnecessary.
         """
+        if self.read_only:
+            await self._initialize_read_only()
+            return
+
         try:
             self.logger.info("Initializing database manager with complete webhook field schema...")
 
             async with aiosqlite.connect(self.db_path) as db:
                 self._connection_count += 1
 
+                # Incremental auto-vacuum lets maintenance release free pages in small
+                # steps instead of rewriting the whole file. SQLite only applies this
+                # before the first table is created; existing databases are converted
+                # by their next full VACUUM (see run_maintenance()).
+                await db.execute("PRAGMA auto_vacuum=INCREMENTAL")
+
                 # Enable WAL mode for better concurrent access
                 if self.wal_mode:
                     await db.execute("PRAGMA journal_mode=WAL")
@@ -216,7 +734,6 @@ class DatabaseManager:
                 await db.execute("PRAGMA busy_timeout=30000")
                 await db.execute("PRAGMA page_size=8192")  # Larger pages for better performance
                 await db.execute("PRAGMA journal_size_limit=67108864")  # 64MB journal limit
-                await db.execute("PRAGMA wal_autocheckpoint=10000")  # Less frequent checkpoints
 
                 # Create the slim media_items table with only DatabaseItem fields
                 # This stores only fields needed for change detection, reducing database size by ~70%
@@ -273,33 +790,71 @@ class DatabaseManager:
                         file_size                 INTEGER,                   -- File size in bytes
                         library_name              TEXT,                      -- Jellyfin library name
 
+                        -- =============================================================================
+                        -- SYNC TRACKING (per-library bucket summaries)
+                        -- =============================================================================
+                        library_id                TEXT,                      -- Jellyfin library the item was listed in
+                        server_token              TEXT,                      -- Jellyfin DateLastSaved at last sync
+
                         -- =============================================================================
                         -- INTERNAL TRACKING
                         -- =============================================================================
                         content_hash              TEXT NOT NULL,             -- Blake2b hash for change detection
-                        timestamp_created         TEXT NOT NULL              -- When this record was created
+                        timestamp_created         TEXT NOT NULL,             -- When this record was created
+                        hash_version              INTEGER NOT NULL DEFAULT 1, -- content_hash scheme (see content_hash module)
+
+                        -- =============================================================================
+                        -- QUALITY (see quality_score module)
+                        -- =============================================================================
+                        quality_score             INTEGER NOT NULL DEFAULT 0, -- Overall quality, higher is better
+                        quality_tier              INTEGER NOT NULL DEFAULT 0, -- Resolution class * 10 + HDR rank
+                        quality_version           INTEGER NOT NULL DEFAULT 0, -- Scoring scheme (0: not scored yet)
+                        quality_upgraded_at       TEXT                        -- When quality_score last went up
                     );
                 """)
 
+                # Databases created by older versions lack the sync tracking and
+                # quality columns, and their hashes are all version 1. Their rows
+                # are scored by the upgrade pass (see rehash_items()).
+                await self._add_missing_columns(db, "media_items", {
+                    "library_id": "TEXT",
+                    "server_token": "TEXT",
+                    "hash_version": "INTEGER NOT NULL DEFAULT 1",
+                    "quality_score": "INTEGER NOT NULL DEFAULT 0",
+                    "quality_tier": "INTEGER NOT NULL DEFAULT 0",
+                    "quality_version": "INTEGER NOT NULL DEFAULT 0",
+                    "quality_upgraded_at": "TEXT",
+                })
+
+                # Lookup table for the dictionary-coded strings of the compact format
+                await db.execute("""
+                    CREATE TABLE IF NOT EXISTS media_strings (
+                        id INTEGER PRIMARY KEY,
+                        value TEXT NOT NULL
+                    )
+                """)
+                await self._discard_schema_migration(db)
+                self.compact_schema = await self._is_compact_schema(db)
+                cursor = await db.execute("SELECT id, value FROM media_strings")
+                self.strings.load(await cursor.fetchall())
+
                 # =============================================================================
                 # INDEXES FOR PERFORMANCE OPTIMIZATION
                 # =============================================================================
                 # Create indexes for optimal query performance on DatabaseItem fields only
-                await db.execute("CREATE INDEX IF NOT EXISTS idx_item_type ON media_items(item_type)")
-                await db.execute("CREATE INDEX IF NOT EXISTS idx_series_name ON media_items(series_name)")
-                await db.execute("CREATE INDEX IF NOT EXISTS idx_content_hash ON media_items(content_hash)")
-                await db.execute("CREATE INDEX IF NOT EXISTS idx_series_id ON media_items(series_id)")
-                await db.execute("CREATE INDEX IF NOT EXISTS idx_video_height ON media_items(video_height)")
-                await db.execute("CREATE INDEX IF NOT EXISTS idx_video_codec ON media_items(video_codec)")
-                await db.execute("CREATE INDEX IF NOT EXISTS idx_audio_codec ON media_items(audio_codec)")
-                await db.execute("CREATE INDEX IF NOT EXISTS idx_year ON media_items(year)")
-                await db.execute("CREATE INDEX IF NOT EXISTS idx_timestamp_created ON media_items(timestamp_created)")
-                await db.execute(
-                    "CREATE INDEX IF NOT EXISTS idx_season_episode ON media_items(series_name, season_number, episode_number)")
-                await db.execute(
-                    "CREATE INDEX IF NOT EXISTS idx_video_specs ON media_items(video_height, video_codec, video_range)")
-                await db.execute(
-                    "CREATE INDEX IF NOT EXISTS idx_audio_specs ON media_items(audio_codec, audio_channels)")
+                await self._create_media_item_indexes(db)
+
+                # Per-library bucket summaries: XOR of sync_token_digest() over the
+                # items of each (library, id prefix) bucket, kept up to date on every save
+                await db.execute("""
+                    CREATE TABLE IF NOT EXISTS sync_buckets (
+                        library_id TEXT NOT NULL,
+                        bucket TEXT NOT NULL,
+                        item_count INTEGER NOT NULL DEFAULT 0,
+                        digest INTEGER NOT NULL DEFAULT 0,
+                        PRIMARY KEY (library_id, bucket)
+                    ) WITHOUT ROWID
+                """)
 
                 # Create sync status tracking table for monitoring library synchronization
                 await db.execute("""
@@ -358,6 +913,85 @@ class DatabaseManager:
                     ON jellyfin_stats(timestamp DESC)
                 """)
 
+                # Stats JSON blobs are stored once and referenced by hash, since
+                # plugin and system info rarely change between snapshots
+                await self._add_missing_columns(db, "jellyfin_stats", {
+                    f"{column}_hash": "TEXT" for column in STATS_BLOB_COLUMNS
+                })
+                await db.execute("""
+                    CREATE TABLE IF NOT EXISTS stats_blobs (
+                        blob_hash TEXT PRIMARY KEY,
+                        content TEXT NOT NULL
+                    ) WITHOUT ROWID
+                """)
+
+                # Hourly and daily rollups of snapshots older than the raw retention
+                await db.execute(f"""
+                    CREATE TABLE IF NOT EXISTS jellyfin_stats_rollups (
+                        resolution TEXT NOT NULL,         -- 'hour' or 'day'
+                        bucket_start TEXT NOT NULL,       -- 'YYYY-MM-DD HH:00:00' (UTC)
+                        samples INTEGER NOT NULL,
+                        online_samples INTEGER NOT NULL,
+                        last_timestamp TEXT NOT NULL,
+                        avg_active_users REAL,
+                        max_active_users INTEGER,
+                        server_name TEXT,
+                        server_version TEXT,
+                        server_id TEXT,
+                        {', '.join(f"{metric} {kind}" for metric, kind in STATS_METRICS)},
+                        {', '.join(f"{column}_hash TEXT" for column in STATS_BLOB_COLUMNS)},
+                        PRIMARY KEY (resolution, bucket_start)
+                    ) WITHOUT ROWID
+                """)
+
+                # Append-only log of processed webhooks for the web dashboard.
+                # "Recent N" walks the rowid backwards; time-window counts are
+                # answered from the covering timestamp index alone.
+                await db.execute("""
+                    CREATE TABLE IF NOT EXISTS notification_events (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        timestamp TEXT NOT NULL,          -- 'YYYY-MM-DD HH:MM:SS' (UTC)
+                        event_type TEXT,                  -- Jellyfin NotificationType (ItemAdded, ...)
+                        item_id TEXT,
+                        item_name TEXT,
+                        item_type TEXT,
+                        action TEXT NOT NULL,             -- new_item, upgraded_item, rename_filtered, ...
+                        webhook TEXT,                     -- Discord webhook the item routes to
+                        latency_ms REAL,                  -- Webhook processing time
+                        outcome TEXT NOT NULL             -- success, filtered, queued, error
+                    )
+                """)
+                await db.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_notification_events_window
+                    ON notification_events(timestamp, action, outcome)
+                """)
+                # Per-day counters, maintained with every event
+                await db.execute("""
+                    CREATE TABLE IF NOT EXISTS daily_event_counts (
+                        day TEXT NOT NULL,
+                        action TEXT NOT NULL,
+                        outcome TEXT NOT NULL,
+                        count INTEGER NOT NULL DEFAULT 0,
+                        PRIMARY KEY (day, action, outcome)
+                    ) WITHOUT ROWID
+                """)
+
+                # Create sync quarantine table for items that repeatedly fail to sync
+                await db.execute("""
+                    CREATE TABLE IF NOT EXISTS sync_quarantine (
+                        quarantine_key TEXT PRIMARY KEY,  -- item_id, or "index:N" if the item couldn't be identified
+                        item_id TEXT,
+                        item_name TEXT,
+                        item_type TEXT,
+                        stage TEXT NOT NULL,              -- Pipeline stage that failed (fetch, convert)
+                        start_index INTEGER,              -- Library index the item was fetched at
+                        error TEXT,
+                        failure_count INTEGER DEFAULT 1,
+                        first_failed_at TEXT NOT NULL,
+                        last_failed_at TEXT NOT NULL
+                    )
+                """)
+
                 # Create service state table for tracking maintenance operations
                 await db.execute("""
                                  CREATE TABLE IF NOT EXISTS service_state
@@ -391,6 +1025,11 @@ class DatabaseManager:
                                  OR IGNORE INTO service_state (id, vacuum_timestamp, startup_timestamp) 
                     VALUES (1, ?, ?)
                                  """, (0.0, time.time()))
+                await self._add_missing_columns(db, "service_state", {
+                    "bulk_load_started": "REAL",  # Set while an initial sync bulk load is running
+                    "bulk_load_existing_items": "INTEGER",  # media_items rows when that bulk load began
+                })
+                await self._recover_bulk_load(db)
 
                 await db.commit()
                 self._connection_count -= 1
@@ -398,301 +1037,1494 @@ class DatabaseManager:
             self.logger.info("Database initialization completed successfully with slim DatabaseItem schema")
             self.logger.debug("Schema includes only essential fields for change detection - ~70% size reduction")
 
+            await self._load_content_index()
+
+            if self.config.compact_schema != self.compact_schema:
+                await self._start_schema_migration()
+
+            await self._start_rehash()
+
         except Exception as e:
             self.logger.error(f"Database initialization failed: {e}")
             raise
 
-    async def save_item(self, item: DatabaseItem) -> bool:
+    async def _initialize_read_only(self) -> None:
         """
-        Save or update a media item in the database.
+        Prepare a read-only manager for a database another process owns.
 
-        This method handles both new item insertion and existing item updates
-        using SQLite's INSERT OR REPLACE functionality. It automatically
-        serializes complex data types like lists to JSON format.
+        The web interface runs in its own process and only reads the
+        database the webhook service writes. It must not create tables,
+        run migrations or change file settings, so this only opens the
+        reader pool and loads what decoding rows needs (the media_items
+        format and the compact-format string dictionary).
 
-        **Understanding UPSERT Operations:**
-        UPSERT (UPDATE or INSERT) is a database operation that:
-        - Inserts a new record if the primary key doesn't exist
-        - Updates the existing record if the primary key already exists
-        - Provides atomic operation for concurrent safety
+        Readers see the latest committed data through WAL snapshots, so they
+        never wait for - or hold up - the webhook service's writer.
 
-        Args:
-            item (DatabaseItem): Database item to save or update
+        Raises:
+            aiosqlite.OperationalError: If the database doesn't exist yet
+                (the webhook service hasn't started) or can't be read
+        """
+        if not os.path.exists(self.db_path):
+            raise aiosqlite.OperationalError(f"Database {self.db_path} does not exist yet")
+
+        async with self._read_connection() as db:
+            self.compact_schema = await self._is_compact_schema(db)
+            cursor = await db.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'media_strings'"
+            )
+            if await cursor.fetchone():
+                cursor = await db.execute("SELECT id, value FROM media_strings")
+                self.strings.load(await cursor.fetchall())
+
+        self.logger.info(f"Opened {self.db_path} read-only ({self.reader_count} shared-cache readers)")
+
+    @staticmethod
+    async def _create_media_item_indexes(db) -> None:
+        """Create any missing media_items secondary index (see MEDIA_ITEM_INDEXES)."""
+        for name, columns in MEDIA_ITEM_INDEXES:
+            await db.execute(f"CREATE INDEX IF NOT EXISTS {name} ON media_items({columns})")
+
+    async def begin_bulk_load(self) -> bool:
+        """
+        Switch to bulk-load mode for an initial sync into an empty database.
+
+        Every row written to media_items also updates each secondary index,
+        which dominates the cost of loading a whole library. In bulk-load mode
+        the indexes are dropped and commits skip the disk sync
+        (`synchronous=OFF`); `end_bulk_load()` restores both and runs `ANALYZE`.
+
+        **Crash Safety:**
+        The start of the bulk load is recorded in `service_state`. If the
+        service stops before `end_bulk_load()`, the next `initialize()` checks
+        the database, rebuilds the indexes and clears the mark (see
+        `_recover_bulk_load()`). Without the disk sync, a power failure can
+        lose the last commits; the initial sync is simply run again.
 
         Returns:
-            bool: True if save was successful, False otherwise
+            bool: True if bulk-load mode started, False if the table already
+                holds more than `bulk_load_max_items` rows (or on error)
 
         Example:
             ```python
-            # Save a new movie
-            movie = DatabaseItem(
-                item_id="movie123",
-                name="The Matrix",
-                item_type="Movie",
-                year=1999,
-                video_height=1080
-            )
-
-            success = await db_manager.save_item(movie)
-            if success:
-                logger.info(f"Successfully saved {movie.name}")
+            bulk = await db_manager.begin_bulk_load()
+            try:
+                await run_initial_sync()
+            finally:
+                if bulk:
+                    await db_manager.end_bulk_load()
             ```
-
-        Note:
-            This method handles JSON serialization automatically for
-            list fields like genres, studios, tags, and artists.
         """
-        try:
-            async with aiosqlite.connect(self.db_path) as db:
-                self._connection_count += 1
+        if self.bulk_loading:
+            return True
+        if self._schema_migration_task is not None and not self._schema_migration_task.done():
+            self.logger.info("Not using bulk load: media_items format migration in progress")
+            return False
+        if self._rehash_task is not None and not self._rehash_task.done():
+            self.logger.info("Not using bulk load: content hash upgrade in progress")
+            return False
 
-                # Convert DatabaseItem to dictionary for database insertion
-                item_dict = asdict(item)
-                
-                # Remove private fields that shouldn't be saved to database
-                # _content_hash is internal storage, we need to use the content_hash property
-                if '_content_hash' in item_dict:
-                    del item_dict['_content_hash']
-                    # Add the actual content hash from the property
-                    item_dict['content_hash'] = item.content_hash
-
-                # Serialize list fields to JSON strings
-                for field in ['genres', 'studios', 'tags', 'artists', 'subtitle_languages', 'subtitle_formats']:
-                    if field in item_dict and item_dict[field] is not None:
-                        item_dict[field] = json.dumps(item_dict[field])
-
-                # Insert or replace the item (UPSERT operation)
-                placeholders = ', '.join(['?' for _ in item_dict])
-                columns = ', '.join(item_dict.keys())
+        try:
+            async with self._write_connection() as db:
+                cursor = await db.execute("SELECT COUNT(*) FROM media_items")
+                existing = (await cursor.fetchone())[0]
+                if existing > self.bulk_load_max_items:
+                    self.logger.info(f"Not using bulk load: database already holds {existing:,} items")
+                    return False
 
                 await db.execute(
-                    f"INSERT OR REPLACE INTO media_items ({columns}) VALUES ({placeholders})",
-                    list(item_dict.values())
+                    "UPDATE service_state SET bulk_load_started = ?, bulk_load_existing_items = ?, "
+                    "updated_at = CURRENT_TIMESTAMP WHERE id = 1",
+                    (time.time(), existing)
                 )
-
+                for name, _ in MEDIA_ITEM_INDEXES:
+                    await db.execute(f"DROP INDEX IF EXISTS {name}")
                 await db.commit()
-                self._connection_count -= 1
+                await db.execute("PRAGMA synchronous=OFF")
 
-                self.logger.debug(f"Successfully saved item: {item.name} ({item.item_id})")
-                return True
+            self.bulk_loading = True
+            self.logger.info(f"Bulk load started: {len(MEDIA_ITEM_INDEXES)} indexes deferred, disk sync off")
+            return True
 
         except Exception as e:
-            self.logger.error(f"Failed to save item {item.item_id}: {e}")
+            self.logger.error(f"Failed to start bulk load: {e}")
             return False
 
-    async def get_item(self, item_id: str) -> Optional[DatabaseItem]:
+    async def end_bulk_load(self) -> bool:
         """
-        Retrieve a media item from the database by ID.
+        Leave bulk-load mode: restore disk sync, rebuild indexes, run ANALYZE.
 
-        This method fetches a single media item and handles JSON deserialization
-        for complex fields. It returns None if the item is not found.
+        Returns:
+            bool: True if the database is back to normal operation
+        """
+        if not self.bulk_loading:
+            return True
 
-        Args:
-            item_id (str): Unique identifier of the media item
+        try:
+            started = time.perf_counter()
+            async with self._write_connection() as db:
+                await db.execute(f"PRAGMA synchronous={self._normal_synchronous()}")
+                await self._finish_bulk_load(db)
 
-        Returns:
-            Optional[DatabaseItem]: DatabaseItem object if found, None otherwise
+            self.bulk_loading = False
+            self.logger.info(f"Bulk load finished: indexes rebuilt and analyzed in {time.perf_counter() - started:.1f}s")
+            return True
 
-        Example:
-            ```python
-            # Retrieve an item by ID
-            item = await db_manager.get_item("movie123")
-            if item:
-                logger.info(f"Found: {item.name} ({item.year})")
-            else:
-                logger.warning("Item not found")
-            ```
+        except Exception as e:
+            self.logger.error(f"Failed to finish bulk load (will be retried on restart): {e}")
+            return False
 
-        Note:
-            This method automatically deserializes JSON fields back to
-            Python lists for genres, studios, tags, and artists.
+    def _normal_synchronous(self) -> str:
+        """synchronous setting from CONNECTION_PRAGMAS, restored after a bulk load."""
+        for pragma in self.CONNECTION_PRAGMAS:
+            if pragma.startswith("PRAGMA synchronous="):
+                return pragma.split("=", 1)[1]
+        return "NORMAL"
+
+    async def _finish_bulk_load(self, db) -> None:
+        """Rebuild the media_items indexes, refresh planner statistics and clear the bulk-load mark."""
+        await self._create_media_item_indexes(db)
+        await db.execute("ANALYZE")
+        await db.execute(
+            "UPDATE service_state SET bulk_load_started = NULL, bulk_load_existing_items = NULL, "
+            "updated_at = CURRENT_TIMESTAMP WHERE id = 1"
+        )
+        await db.commit()
+
+    async def _recover_bulk_load(self, db) -> None:
         """
-        try:
-            async with aiosqlite.connect(self.db_path) as db:
-                self._connection_count += 1
-                db.row_factory = aiosqlite.Row  # Enable column access by name
+        Finish a bulk load that was interrupted by a crash or shutdown.
 
-                cursor = await db.execute(
-                    "SELECT * FROM media_items WHERE item_id = ?",
-                    (item_id,)
+        Runs during `initialize()`. If the database fails an integrity check
+        and media_items was empty when the bulk load began, every stored item
+        came from that load: they are discarded, and the initial sync runs
+        again because it never completed. Otherwise the check covers rows
+        this load didn't write (library history, or corruption elsewhere in
+        the file), so nothing is deleted and initialization fails instead.
+
+        Args:
+            db: Initialization connection
+
+        Raises:
+            RuntimeError: The integrity check failed and existing items predate the bulk load
+        """
+        cursor = await db.execute("SELECT bulk_load_started, bulk_load_existing_items FROM service_state WHERE id = 1")
+        row = await cursor.fetchone()
+        if not row or not row[0]:
+            return
+
+        self.logger.warning("Previous bulk load did not finish - checking database and rebuilding indexes")
+        cursor = await db.execute("PRAGMA quick_check")
+        check = (await cursor.fetchone())[0]
+        if check != "ok":
+            if row[1] != 0:
+                # Unknown (NULL) counts as existing items too
+                self.logger.error(
+                    f"Database check failed after interrupted bulk load ({check}); media_items held "
+                    f"{row[1] if row[1] is not None else 'an unknown number of'} items before it began, "
+                    f"so they are kept - restore the database from a backup or repair it before restarting"
                 )
-                row = await cursor.fetchone()
-                self._connection_count -= 1
+                raise RuntimeError(f"Database integrity check failed: {check}")
+            self.logger.error(f"Database check failed after interrupted bulk load ({check}) - discarding loaded items")
+            await db.execute("DELETE FROM media_items")
+            await db.execute("DELETE FROM sync_buckets")
+        await self._finish_bulk_load(db)
+
+    # ==================== COMPACT SCHEMA MIGRATION ====================
+
+    @staticmethod
+    async def _is_compact_schema(db) -> bool:
+        """True if media_items is in the compact format (content_hash stored as BLOB)."""
+        cursor = await db.execute("PRAGMA table_info(media_items)")
+        declared = {row[1]: (row[2] or "").upper() for row in await cursor.fetchall()}
+        return declared.get('content_hash') == "BLOB"
+
+    @staticmethod
+    async def _media_items_ddl(db, table: str, compact: bool) -> str:
+        """
+        CREATE TABLE statement for a copy of media_items in the given format.
 
-                if row:
-                    # Convert row to dictionary
-                    item_dict = dict(row)
-
-                    # Deserialize JSON fields back to lists
-                    for field in ['genres', 'studios', 'tags', 'artists', 'subtitle_languages', 'subtitle_formats']:
-                        if item_dict[field]:
-                            try:
-                                item_dict[field] = json.loads(item_dict[field])
-                            except json.JSONDecodeError:
-                                item_dict[field] = []
-                        else:
-                            item_dict[field] = None
-
-                    # Remove content_hash from dict as it's already computed in DatabaseItem
-                    if 'content_hash' in item_dict:
-                        del item_dict['content_hash']
-                    
-                    self.logger.debug(f"Retrieved item: {item_dict['name']}")
-                    return DatabaseItem.from_dict(item_dict)
-                else:
-                    self.logger.debug(f"Item not found: {item_id}")
-                    return None
+        Built from the live table's columns, so columns added by newer
+        versions are carried over. The compact format declares the
+        dictionary-coded columns INTEGER and content_hash BLOB. (It stays a
+        rowid table: a WITHOUT ROWID table would repeat the 32-character
+        item_id in every secondary index instead of an 8-byte rowid.)
+        """
+        cursor = await db.execute("PRAGMA table_info(media_items)")
+        definitions = []
+        for _, name, declared, not_null, default, primary_key in await cursor.fetchall():
+            if name in DICTIONARY_COLUMNS:
+                declared = "INTEGER" if compact else "TEXT"
+            elif name == 'content_hash':
+                declared = "BLOB" if compact else "TEXT"
+            definition = f"{name} {declared}"
+            if primary_key:
+                definition += " PRIMARY KEY"
+            if not_null:
+                definition += " NOT NULL"
+            if default is not None:
+                definition += f" DEFAULT {default}"
+            definitions.append(definition)
+        return f"CREATE TABLE {table} ({', '.join(definitions)})"
+
+    async def _discard_schema_migration(self, db) -> None:
+        """Remove the work table and triggers of an unfinished format migration (no commit)."""
+        for name, _, _ in _MIGRATION_TRIGGERS:
+            await db.execute(f"DROP TRIGGER IF EXISTS {_MIGRATION_TABLE}_{name}")
+        cursor = await db.execute(
+            "SELECT COUNT(*) FROM sqlite_master WHERE type = 'table' AND name = ?", (_MIGRATION_TABLE,)
+        )
+        if (await cursor.fetchone())[0]:
+            self.logger.warning("Discarding unfinished media_items format migration - it will start over")
+        await db.execute(f"DROP TABLE IF EXISTS {_MIGRATION_TABLE}")
+        await db.execute(f"DROP TABLE IF EXISTS {_MIGRATION_DIRTY_TABLE}")
 
-        except Exception as e:
-            self.logger.error(f"Failed to retrieve item {item_id}: {e}")
-            return None
+    async def _start_schema_migration(self) -> None:
+        """
+        Convert media_items to the configured format after startup.
 
-    async def save_items_batch(self, items: List[DatabaseItem]) -> Dict[str, int]:
+        Small tables (a new install) are converted right away, so an initial
+        sync can still use bulk-load mode. Larger ones are converted by a
+        background task while the service keeps running.
         """
-        Save multiple media items in a single transaction for better performance.
+        async with self._read_connection() as db:
+            cursor = await db.execute("SELECT COUNT(*) FROM media_items")
+            existing = (await cursor.fetchone())[0]
+
+        if existing <= self.bulk_load_max_items:
+            await self.migrate_schema(self.config.compact_schema)
+        else:
+            self._schema_migration_task = asyncio.create_task(
+                self.migrate_schema(self.config.compact_schema), name="media-items-migration"
+            )
 
-        This method provides efficient batch processing for large numbers of
-        items, such as during library synchronization. It uses a single
-        database transaction to improve performance and ensure consistency.
+    async def _start_rehash(self) -> None:
+        """
+        Upgrade content hashes and quality scores stored by older versions after startup.
 
-        **Understanding Database Transactions:**
-        A transaction is a group of database operations that are treated as
-        a single unit. Either all operations succeed, or none of them do.
-        This ensures data consistency and improves performance by reducing
-        the number of individual database commits.
+        Like a format migration, a few outdated rows are rehashed right away
+        and a larger table by a background task while the service keeps
+        running. Until it finishes, `rehash_pending` stays True if hashes
+        are outdated, so rename lookups also try the old hash (see
+        `get_items_by_hash()`).
+        """
+        async with self._read_connection() as db:
+            cursor = await db.execute(
+                "SELECT COALESCE(SUM(hash_version < ?), 0), COUNT(*) FROM media_items "
+                "WHERE hash_version < ? OR quality_version < ?",
+                (CONTENT_HASH_VERSION, CONTENT_HASH_VERSION, QUALITY_SCORE_VERSION)
+            )
+            old_hashes, outdated = await cursor.fetchone()
+        if not outdated:
+            return
+
+        self.rehash_pending = old_hashes > 0
+        self.logger.info(
+            f"Upgrading {outdated:,} items to hash version {CONTENT_HASH_VERSION} and "
+            f"quality score version {QUALITY_SCORE_VERSION} ({old_hashes:,} outdated hashes)"
+        )
+        migrating = self._schema_migration_task is not None and not self._schema_migration_task.done()
+        if outdated <= self.bulk_load_max_items and not migrating:
+            await self.rehash_items()
+        else:
+            self._rehash_task = asyncio.create_task(self.rehash_items(), name="content-hash-upgrade")
 
-        Args:
-            items (List[DatabaseItem]): List of database items to save
+    async def rehash_items(self) -> Optional[Dict[str, Any]]:
+        """
+        Recompute content hashes and quality scores stored by older versions.
+
+        The content hash scheme is versioned (see the content_hash module).
+        After an upgrade, rows still carry hashes of the old version, which
+        never match newly computed ones. Quality scores are versioned the
+        same way (see the quality_score module), and rows stored before
+        scores existed have none (`quality_version` 0), so they would be
+        missing from quality queries. This rewrites both in chunks of
+        `rehash_chunk` rows, each in its own short transaction, so webhook
+        and sync writes carry on in between. Rows saved in the meantime
+        already get the current version and are skipped.
+
+        A running format migration is waited for first, since it replaces
+        media_items at the end. If the service stops part-way, the remaining
+        rows are picked up on the next startup.
 
         Returns:
-            Dict[str, int]: Statistics about the batch operation
-            - 'successful': Number of items saved successfully
-            - 'failed': Number of items that failed to save
-            - 'total': Total number of items processed
+            Optional[Dict[str, Any]]: Report with the number of rows rehashed,
+                the hash and quality score versions and the duration; None if
+                the upgrade failed
 
         Example:
             ```python
-            # Batch save multiple items
-            items = [movie1, movie2, tv_episode1, music_track1]
-            results = await db_manager.save_items_batch(items)
-
-            logger.info(f"Batch save: {results['successful']}/{results['total']} succeeded")
+            report = await db_manager.rehash_items()
+            print(f"Rehashed {report['items']:,} items in {report['seconds']}s")
             ```
-
-        Note:
-            This method is significantly faster than calling save_item()
-            multiple times for large batches due to transaction overhead reduction.
         """
-        if not items:
-            return {'successful': 0, 'failed': 0, 'total': 0}
-
-        successful = 0
-        failed = 0
+        migration = self._schema_migration_task
+        if migration is not None and not migration.done():
+            try:
+                await migration
+            except Exception:
+                pass  # The migration logs its own failure; media_items is unchanged
+
+        started = time.perf_counter()
+        try:
+            rehashed = 0
+            last_item_id = ""
+            while True:
+                async with self._write_connection() as db:
+                    await db.execute("BEGIN IMMEDIATE")
+                    cursor = await db.execute(
+                        "SELECT * FROM media_items WHERE item_id > ? AND (hash_version < ? OR quality_version < ?) "
+                        "ORDER BY item_id LIMIT ?",
+                        (last_item_id, CONTENT_HASH_VERSION, QUALITY_SCORE_VERSION, self.rehash_chunk)
+                    )
+                    rows = await cursor.fetchall()
+                    if not rows:
+                        break
+                    await self._load_unknown_strings(db, rows)
+                    items = [self._item_from_row(row) for row in rows]
+                    await db.executemany(
+                        "UPDATE media_items SET content_hash = ?, hash_version = ?, "
+                        "quality_score = ?, quality_tier = ?, quality_version = ? WHERE item_id = ?",
+                        [(pack_hash(item.content_hash) if self.compact_schema else item.content_hash,
+                          CONTENT_HASH_VERSION, item.quality_score, item.quality_tier,
+                          QUALITY_SCORE_VERSION, item.item_id) for item in items]
+                    )
+                    await db.commit()
+                    # Still holding the writer, so no newer save can be overwritten
+                    if self.content_index is not None:
+                        for item in items:
+                            self.content_index.set(item.item_id, item.content_hash)
+                rehashed += len(rows)
+                last_item_id = rows[-1]['item_id']
+                await asyncio.sleep(0)
+
+            report = {
+                'items': rehashed,
+                'hash_version': CONTENT_HASH_VERSION,
+                'quality_version': QUALITY_SCORE_VERSION,
+                'seconds': round(time.perf_counter() - started, 1),
+            }
+            self.last_rehash = report
+            self.rehash_pending = False
+            self.logger.info(
+                f"Content hash upgrade complete: {rehashed:,} items rehashed to version "
+                f"{CONTENT_HASH_VERSION} (quality score version {QUALITY_SCORE_VERSION}) in {report['seconds']}s"
+            )
+            return report
+
+        except Exception as e:
+            self.logger.error(f"Content hash upgrade failed (will retry on next startup): {e}")
+            return None
+
+    async def _copy_for_migration(self, db, rows, compact: bool) -> None:
+        """
+        Write media_items rows to the migration work table in the target format.
+
+        Args:
+            db: Writer connection, inside a transaction
+            rows: Rows read from media_items (current format)
+            compact: Target format
+        """
+        await self._load_unknown_strings(db, rows)
+        json_indexes = tuple(ITEM_COLUMNS.index(column) for column in _JSON_COLUMNS)
+        used_codes = set()
+        converted = []
+        for row in rows:
+            item_dict = expand_row(dict(row), self.strings)
+            values = [item_dict.get(column) for column in ITEM_COLUMNS]
+            if compact:
+                converted.append(self._encode_compact(values, used_codes))
+            else:
+                for index in json_indexes:
+                    values[index] = json.dumps(values[index])
+                converted.append(tuple(values))
+
+        await self._write_strings(db, used_codes)
+        await db.executemany(
+            f"INSERT OR REPLACE INTO {_MIGRATION_TABLE} ({', '.join(ITEM_COLUMNS)}) "
+            f"VALUES ({', '.join('?' * len(ITEM_COLUMNS))})",
+            converted
+        )
 
+    async def migrate_schema(self, compact: bool) -> Optional[Dict[str, Any]]:
+        """
+        Convert media_items between the standard and compact formats online.
+
+        **How It Works:**
+        1. A work table in the target format is created, and triggers on
+           media_items note the id of every row written from then on.
+        2. Rows are copied over in chunks of `schema_migration_chunk`, each in
+           its own short transaction, so webhook and sync writes carry on
+           between chunks and readers are never blocked.
+        3. One final transaction re-copies the rows noted by the triggers,
+           swaps the work table in and rebuilds the indexes. Writes wait for
+           this step only.
+
+        If the service stops part-way, the work is discarded on the next
+        startup and the migration starts over; media_items is untouched
+        until the final swap.
+
+        Args:
+            compact (bool): True for the compact format, False for the standard one
+
+        Returns:
+            Optional[Dict[str, Any]]: Report with the format, item count, duration
+                and `get_storage_report()` before and after; None if nothing was
+                done or the migration failed
+
+        Example:
+            ```python
+            report = await db_manager.migrate_schema(compact=True)
+            before = report['before']['media_items']['total_bytes']
+            after = report['after']['media_items']['total_bytes']
+            ```
+        """
+        if compact == self.compact_schema:
+            return None
+        if self.bulk_loading:
+            self.logger.warning("Not migrating media_items during a bulk load")
+            return None
+
+        target = "compact" if compact else "standard"
+        started = time.perf_counter()
         try:
-            async with aiosqlite.connect(self.db_path) as db:
+            before = await self.get_storage_report()
+            self.logger.info(f"Migrating media_items to the {target} format...")
+
+            async with self._write_connection() as db:
+                await db.execute("BEGIN IMMEDIATE")
+                await self._discard_schema_migration(db)
+                await db.execute(await self._media_items_ddl(db, _MIGRATION_TABLE, compact))
+                await db.execute(f"CREATE TABLE {_MIGRATION_DIRTY_TABLE} (item_id TEXT PRIMARY KEY) WITHOUT ROWID")
+                for name, event, reference in _MIGRATION_TRIGGERS:
+                    await db.execute(f"""
+                        CREATE TRIGGER {_MIGRATION_TABLE}_{name} AFTER {event} ON media_items
+                        BEGIN
+                            INSERT OR IGNORE INTO {_MIGRATION_DIRTY_TABLE} (item_id) VALUES ({reference}.item_id);
+                        END
+                    """)
+                await db.commit()
+
+            # Copy in key order; rows changed behind the cursor are caught by the triggers
+            copied = 0
+            last_item_id = ""
+            while True:
+                async with self._write_connection() as db:
+                    await db.execute("BEGIN IMMEDIATE")
+                    cursor = await db.execute(
+                        "SELECT * FROM media_items WHERE item_id > ? ORDER BY item_id LIMIT ?",
+                        (last_item_id, self.schema_migration_chunk)
+                    )
+                    rows = await cursor.fetchall()
+                    if not rows:
+                        break
+                    await self._copy_for_migration(db, rows, compact)
+                    await db.commit()
+                copied += len(rows)
+                last_item_id = rows[-1]['item_id']
+                await asyncio.sleep(0)
+
+            async with self._write_connection() as db:
+                await db.execute("BEGIN IMMEDIATE")
+                cursor = await db.execute(f"SELECT item_id FROM {_MIGRATION_DIRTY_TABLE}")
+                dirty = [row[0] for row in await cursor.fetchall()]
+                for chunk_start in range(0, len(dirty), 500):
+                    chunk = dirty[chunk_start:chunk_start + 500]
+                    placeholders = ', '.join('?' * len(chunk))
+                    await db.execute(f"DELETE FROM {_MIGRATION_TABLE} WHERE item_id IN ({placeholders})", chunk)
+                    cursor = await db.execute(f"SELECT * FROM media_items WHERE item_id IN ({placeholders})", chunk)
+                    await self._copy_for_migration(db, await cursor.fetchall(), compact)
+
+                for name, _, _ in _MIGRATION_TRIGGERS:
+                    await db.execute(f"DROP TRIGGER {_MIGRATION_TABLE}_{name}")
+                await db.execute(f"DROP TABLE {_MIGRATION_DIRTY_TABLE}")
+                await db.execute("DROP TABLE media_items")
+                await db.execute(f"ALTER TABLE {_MIGRATION_TABLE} RENAME TO media_items")
+                await self._create_media_item_indexes(db)
+                await db.execute("ANALYZE media_items")
+                await db.commit()
+                self.compact_schema = compact
+
+            report = {
+                'format': target,
+                'items': copied,
+                'rewritten': len(dirty),
+                'seconds': round(time.perf_counter() - started, 1),
+                'before': before,
+                'after': await self.get_storage_report(),
+            }
+            self.last_schema_migration = report
+            self._log_schema_migration(report)
+            return report
+
+        except Exception as e:
+            self.logger.error(f"media_items migration to the {target} format failed: {e}")
+            try:
+                async with self._write_connection() as db:
+                    await self._discard_schema_migration(db)
+                    await db.commit()
+            except Exception as cleanup_error:
+                self.logger.warning(f"Could not remove migration work table: {cleanup_error}")
+            return None
+
+    def _log_schema_migration(self, report: Dict[str, Any]) -> None:
+        """Log the size of media_items and its indexes before and after a migration."""
+        def megabytes(size: Optional[int]) -> str:
+            return f"{size / (1024 * 1024):.1f} MB" if size is not None else "n/a"
+
+        before, after = report['before'], report['after']
+
+        self.logger.info(
+            f"media_items migrated to the {report['format']} format: {report['items']:,} items "
+            f"({report['rewritten']:,} re-copied after concurrent writes) in {report['seconds']}s"
+        )
+        self.logger.info(
+            f"  database in use: {megabytes(before['used_bytes'])} -> {megabytes(after['used_bytes'])} "
+            f"(file space is returned by the next VACUUM)"
+        )
+        if before['media_items'] and after['media_items']:
+            self.logger.info(
+                f"  media_items table: {megabytes(before['media_items']['table_bytes'])} -> "
+                f"{megabytes(after['media_items']['table_bytes'])}, indexes: "
+                f"{megabytes(before['media_items']['index_bytes'])} -> {megabytes(after['media_items']['index_bytes'])}"
+            )
+            for name, size in after['media_items']['indexes'].items():
+                self.logger.info(f"    {name}: {megabytes(before['media_items']['indexes'].get(name))} -> {megabytes(size)}")
+
+    async def get_storage_report(self) -> Dict[str, Any]:
+        """
+        Report how much space the database and media_items take up.
+
+        Per-table and per-index sizes come from SQLite's `dbstat` table,
+        which reads every page - fine for occasional reports, too slow for
+        a health check on a large database. If SQLite was built without
+        `dbstat`, only the totals are reported.
+
+        Returns:
+            Dict[str, Any]: Report including:
+                - file_bytes: Size of the database (page count x page size)
+                - used_bytes: File size minus free pages
+                - objects: Bytes per table and index (None without dbstat)
+                - media_items: table_bytes, index_bytes, total_bytes and
+                  indexes (name -> bytes) for media_items (None without dbstat)
+
+        Example:
+            ```python
+            report = await db_manager.get_storage_report()
+            logger.info(f"media_items: {report['media_items']['total_bytes'] / 1e6:.1f} MB")
+            ```
+        """
+        report: Dict[str, Any] = {'file_bytes': 0, 'used_bytes': 0, 'objects': None, 'media_items': None}
+        try:
+            async with self._read_connection() as db:
+                page_size = (await (await db.execute("PRAGMA page_size")).fetchone())[0]
+                page_count = (await (await db.execute("PRAGMA page_count")).fetchone())[0]
+                free_pages = (await (await db.execute("PRAGMA freelist_count")).fetchone())[0]
+                report['file_bytes'] = page_count * page_size
+                report['used_bytes'] = (page_count - free_pages) * page_size
+
+                try:
+                    cursor = await db.execute("SELECT name, SUM(pgsize) FROM dbstat GROUP BY name")
+                    report['objects'] = {name: size for name, size in await cursor.fetchall()}
+                except Exception as e:
+                    self.logger.debug(f"dbstat not available, reporting totals only: {e}")
+                    return report
+
+                cursor = await db.execute(
+                    "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'media_items'"
+                )
+                indexes = {row[0]: report['objects'].get(row[0], 0) for row in await cursor.fetchall()}
+            table_bytes = report['objects'].get('media_items', 0)
+            report['media_items'] = {
+                'table_bytes': table_bytes,
+                'index_bytes': sum(indexes.values()),
+                'total_bytes': table_bytes + sum(indexes.values()),
+                'indexes': indexes,
+            }
+        except Exception as e:
+            self.logger.error(f"Failed to build storage report: {e}")
+        return report
+
+    async def _load_content_index(self) -> None:
+        """
+        Fill the in-memory content hash index from media_items.
+
+        Rows are streamed in chunks so a large library never has to be held
+        as a list of SQLite rows at once. The index is built aside and swapped
+        in whole, so lookups never see a half-loaded index.
+        """
+        if self.content_index is None:
+            return
+
+        started = time.perf_counter()
+        index = ContentHashIndex()
+        # Holding the writer keeps commits (and their index updates) out until the swap
+        async with self._write_connection() as db:
+            cursor = await db.execute("SELECT item_id, content_hash FROM media_items")
+            while True:
+                rows = await cursor.fetchmany(10000)
+                if not rows:
+                    break
+                index.load(tuple(row) for row in rows)
+            await cursor.close()
+            index.loaded = True
+            self.content_index = index
+
+        self.logger.info(
+            f"Loaded content index: {len(index):,} items, "
+            f"{index.memory_bytes() / (1024 * 1024):.1f} MB "
+            f"({time.perf_counter() - started:.2f}s)"
+        )
+
+    async def get_change_status(self, item) -> str:
+        """
+        Check whether an item is new, changed or unchanged compared to the database.
+
+        This is the cheap first step of change detection. With the content
+        index enabled it is a dictionary lookup; otherwise only the stored
+        content hash is queried. Load the full row with `get_item()` only when
+        the answer is `"changed"` and the details are needed.
+
+        Args:
+            item (Union[MediaItem, DatabaseItem]): Incoming item
+
+        Returns:
+            str: "new", "changed" or "unchanged"
+
+        Example:
+            ```python
+            status = await db_manager.get_change_status(media_item)
+            if status == "changed":
+                existing = await db_manager.get_item(media_item.item_id)
+                changes = change_detector.detect_changes(existing, media_item)
+            ```
+        """
+        if self.content_index is not None and self.content_index.loaded:
+            return self.content_index.status(item.item_id, item.content_hash)
+
+        try:
+            async with self._read_connection() as db:
+                cursor = await db.execute(
+                    "SELECT content_hash FROM media_items WHERE item_id = ?", (item.item_id,)
+                )
+                row = await cursor.fetchone()
+        except Exception as e:
+            self.logger.error(f"Failed to check stored hash for item {item.item_id}: {e}")
+            # Treated as changed so the caller falls back to a full comparison
+            return ITEM_CHANGED
+
+        if row is None:
+            return ITEM_NEW
+        return ITEM_UNCHANGED if unpack_hash(row[0]) == item.content_hash else ITEM_CHANGED
+
+    def _index_committed(self, saved: List[DatabaseItem] = (), deleted: List[str] = ()) -> None:
+        """
+        Bring the content index up to date after a commit.
+
+        Args:
+            saved: Items whose upsert was committed
+            deleted: Ids whose delete was committed
+        """
+        if self.content_index is None:
+            return
+        for item in saved:
+            self.content_index.set(item.item_id, item.content_hash)
+        for item_id in deleted:
+            self.content_index.discard(item_id)
+
+    async def _add_missing_columns(self, db, table: str, columns: Dict[str, str]) -> None:
+        """
+        Add columns introduced by newer versions to an existing table.
+
+        `CREATE TABLE IF NOT EXISTS` leaves existing tables untouched, so new
+        columns have to be added explicitly when an older database is opened.
+
+        Args:
+            db: Open aiosqlite connection
+            table: Table to migrate
+            columns: Column name to SQL type/declaration
+        """
+        cursor = await db.execute(f"PRAGMA table_info({table})")
+        existing = {row[1] for row in await cursor.fetchall()}
+        for name, declaration in columns.items():
+            if name not in existing:
+                await db.execute(f"ALTER TABLE {table} ADD COLUMN {name} {declaration}")
+                self.logger.info(f"Database migration: added column {table}.{name}")
+
+    @staticmethod
+    async def _load_sync_tokens(db, item_ids: List[str]) -> Dict[str, tuple]:
+        """
+        Load the stored (library_id, server_token) of the given items.
+
+        Args:
+            db: Open aiosqlite connection
+            item_ids: Item ids to look up
+
+        Returns:
+            Dict[str, tuple]: item_id -> (library_id, server_token) for items that exist
+        """
+        tokens = {}
+        # Stay well below SQLite's bound parameter limit
+        for start in range(0, len(item_ids), 500):
+            chunk = item_ids[start:start + 500]
+            cursor = await db.execute(
+                f"SELECT item_id, library_id, server_token FROM media_items "
+                f"WHERE item_id IN ({','.join('?' * len(chunk))})",
+                chunk
+            )
+            for item_id, library_id, server_token in await cursor.fetchall():
+                tokens[item_id] = (library_id, server_token)
+        return tokens
+
+    @staticmethod
+    async def _load_compared_values(db, item_ids: List[str]) -> Dict[str, tuple]:
+        """
+        Load the stored values the conditional upsert compares.
+
+        Args:
+            db: Open aiosqlite connection
+            item_ids: Item ids to look up
+
+        Returns:
+            Dict[str, tuple]: item_id -> values of `_UPSERT_COMPARED_COLUMNS`
+            (in the table's storage format) for items that exist
+        """
+        stored = {}
+        # Stay well below SQLite's bound parameter limit
+        for start in range(0, len(item_ids), 500):
+            chunk = item_ids[start:start + 500]
+            cursor = await db.execute(
+                f"SELECT item_id, {', '.join(_UPSERT_COMPARED_COLUMNS)} FROM media_items "
+                f"WHERE item_id IN ({','.join('?' * len(chunk))})",
+                chunk
+            )
+            for row in await cursor.fetchall():
+                stored[row[0]] = tuple(row[1:])
+        return stored
+
+    @staticmethod
+    def _row_differs(row: tuple, stored: tuple) -> bool:
+        """
+        Whether the conditional upsert rewrites a stored row (its WHERE clause, in Python).
+
+        Args:
+            row: Row about to be upserted, in ITEM_COLUMNS order
+            stored: The row's stored values from `_load_compared_values()`
+
+        Returns:
+            bool: True if the upsert updates the row, False if it leaves it alone
+        """
+        new_hash, *new_unhashed = (row[index] for index in _UPSERT_COMPARED_INDEXES)
+        old_hash, *old_unhashed = stored
+        # SQL's != is never true when either side is NULL; IS NOT is plain inequality
+        if new_hash is not None and old_hash is not None and new_hash != old_hash:
+            return True
+        return new_unhashed != old_unhashed
+
+    @staticmethod
+    def _inherit_sync_tracking(item: DatabaseItem, old_tokens: Dict[str, tuple]) -> Optional[tuple]:
+        """
+        Fill in sync tracking an item doesn't carry, and describe the summary change.
+
+        Items from webhooks or page-based syncs don't know which library they
+        belong to, so they keep the library stored for them. If they don't carry
+        a save token either, the old one is kept; the next bucket comparison
+        then sees that Jellyfin's token differs and refreshes the item.
+
+        Args:
+            item: Item about to be saved (updated in place)
+            old_tokens: Result of `_load_sync_tokens()` for the batch
+
+        Returns:
+            Optional[tuple]: (item_id, old_library, old_token, new_library, new_token),
+            or None if the item's bucket summary doesn't change
+        """
+        old_library, old_token = old_tokens.get(item.item_id, (None, None))
+        if item.library_id is None and old_library is not None:
+            item.library_id = old_library
+            if item.server_token is None:
+                item.server_token = old_token
+        if old_library == item.library_id and old_token == item.server_token:
+            return None
+        return item.item_id, old_library, old_token, item.library_id, item.server_token
+
+    @staticmethod
+    async def _apply_bucket_changes(db, changes: List[tuple]) -> None:
+        """
+        Update the per-library bucket summaries for changed items.
+
+        XOR is its own inverse, so an item's old digest is removed and its new
+        digest added without rescanning the bucket.
+
+        Args:
+            db: Open aiosqlite connection (inside the saving transaction)
+            changes: Tuples from `_inherit_sync_tracking()`
+        """
+        deltas: Dict[tuple, List[int]] = {}
+        for item_id, old_library, old_token, new_library, new_token in changes:
+            bucket = sync_bucket(item_id)
+            if old_library is not None:
+                delta = deltas.setdefault((old_library, bucket), [0, 0])
+                delta[0] -= 1
+                delta[1] ^= sync_token_digest(item_id, old_token)
+            if new_library is not None:
+                delta = deltas.setdefault((new_library, bucket), [0, 0])
+                delta[0] += 1
+                delta[1] ^= sync_token_digest(item_id, new_token)
+
+        if deltas:
+            # SQLite has no XOR operator: (a | b) - (a & b) is a XOR b
+            await db.executemany("""
+                INSERT INTO sync_buckets (library_id, bucket, item_count, digest)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT(library_id, bucket) DO UPDATE SET
+                    item_count = item_count + excluded.item_count,
+                    digest = (digest | excluded.digest) - (digest & excluded.digest)
+            """, [(library_id, bucket, count, digest) for (library_id, bucket), (count, digest) in deltas.items()])
+
+    async def save_item(self, item: DatabaseItem) -> bool:
+        """
+        Save or update a media item in the database.
+
+        This method handles both new item insertion and existing item updates
+        using SQLite's upsert (`INSERT ... ON CONFLICT DO UPDATE`). It
+        automatically serializes complex data types like lists to JSON format.
+
+        **Group Commit:**
+        The save is handed to the database writer task, which commits every
+        write queued within `group_commit_ms` in one transaction. A burst of
+        webhooks therefore shares one commit (and one disk sync) instead of
+        each caller taking the SQLite lock in turn. The call returns once the
+        transaction containing this save has committed.
+
+        **Understanding UPSERT Operations:**
+        UPSERT (UPDATE or INSERT) is a database operation that:
+        - Inserts a new record if the primary key doesn't exist
+        - Updates the existing record if the primary key already exists
+        - Provides atomic operation for concurrent safety
+
+        Args:
+            item (DatabaseItem): Database item to save or update
+
+        Returns:
+            bool: True if save was successful, False otherwise
+
+        Example:
+            ```python
+            # Save a new movie
+            movie = DatabaseItem(
+                item_id="movie123",
+                name="The Matrix",
+                item_type="Movie",
+                year=1999,
+                video_height=1080
+            )
+
+            success = await db_manager.save_item(movie)
+            if success:
+                logger.info(f"Successfully saved {movie.name}")
+            ```
+
+        Note:
+            This method handles JSON serialization automatically for
+            the subtitle language and format lists. A full MediaItem (as
+            built from a webhook) is slimmed down to a DatabaseItem first.
+        """
+        if not isinstance(item, DatabaseItem):
+            item = DatabaseItem.from_media_item(item)
+        return await self._submit_write("upsert", item)
+
+    async def _upsert_item(self, db, item: DatabaseItem) -> bool:
+        """
+        Upsert one item on the writer connection (no commit).
+
+        Args:
+            db: Writer connection, inside a transaction
+            item: Item to save
+
+        Returns:
+            bool: True once the row is written
+        """
+        old_tokens = await self._load_sync_tokens(db, [item.item_id])
+        bucket_change = self._inherit_sync_tracking(item, old_tokens)
+
+        # Same conditional upsert as save_items_batch(); lists are serialized to JSON
+        used_codes = set()
+        row = self._storage_row(item, used_codes)
+        await self._write_strings(db, used_codes)
+        await db.execute(UPSERT_ITEM_SQL, row)
+        if bucket_change:
+            await self._apply_bucket_changes(db, [bucket_change])
+
+        self.logger.debug(f"Successfully saved item: {item.name} ({item.item_id})")
+        return True
+
+    def _storage_row(self, item: DatabaseItem, used_codes: set) -> tuple:
+        """
+        Build the media_items row for an item in the table's current format.
+
+        Args:
+            item: Item to store
+            used_codes: Collects the media_strings codes the row refers to (compact format)
+
+        Returns:
+            tuple: Values in ITEM_COLUMNS order
+        """
+        if self.compact_schema:
+            return self._encode_compact(item_values(item), used_codes)
+        return item_row(item)
+
+    async def _write_strings(self, db, codes: set) -> None:
+        """
+        Store the media_strings entries for `codes` in the current transaction.
+
+        Written with every row that uses them (`INSERT OR IGNORE`, so known
+        entries cost one lookup), which keeps rows and lookup entries in the
+        same transaction even when part of it is rolled back.
+        """
+        if codes:
+            await db.executemany(
+                "INSERT OR IGNORE INTO media_strings (id, value) VALUES (?, ?)", self.strings.entries(codes)
+            )
+
+    async def get_item(self, item_id: str) -> Optional[DatabaseItem]:
+        """
+        Retrieve a media item from the database by ID.
+
+        This method fetches a single media item and handles JSON deserialization
+        for complex fields. It returns None if the item is not found.
+
+        Args:
+            item_id (str): Unique identifier of the media item
+
+        Returns:
+            Optional[DatabaseItem]: DatabaseItem object if found, None otherwise
+
+        Example:
+            ```python
+            # Retrieve an item by ID
+            item = await db_manager.get_item("movie123")
+            if item:
+                logger.info(f"Found: {item.name} ({item.year})")
+            else:
+                logger.warning("Item not found")
+            ```
+
+        Note:
+            This method automatically deserializes the JSON subtitle
+            language and format lists back to Python lists.
+        """
+        try:
+            async with self._read_connection() as db:
+                self._connection_count += 1
+
+                cursor = await db.execute(
+                    "SELECT * FROM media_items WHERE item_id = ?",
+                    (item_id,)
+                )
+                row = await cursor.fetchone()
+                if row:
+                    await self._load_unknown_strings(db, [row])
+                self._connection_count -= 1
+
+                if row:
+                    item = self._item_from_row(row)
+                    self.logger.debug(f"Retrieved item: {item.name}")
+                    return item
+                else:
+                    self.logger.debug(f"Item not found: {item_id}")
+                    return None
+
+        except Exception as e:
+            self.logger.error(f"Failed to retrieve item {item_id}: {e}")
+            return None
+
+    def _item_from_row(self, row) -> DatabaseItem:
+        """
+        Convert a media_items row into a DatabaseItem.
+
+        Deserializes the subtitle list columns, resolves dictionary codes
+        (compact format) and drops the stored content_hash, which
+        DatabaseItem recomputes from the fields.
+
+        Args:
+            row (aiosqlite.Row): Full media_items row (`SELECT *`)
+
+        Returns:
+            DatabaseItem: Reconstructed item
+        """
+        item_dict = expand_row(dict(row), self.strings)
+
+        # Remove content_hash from dict as it's already computed in DatabaseItem
+        item_dict.pop('content_hash', None)
+        return DatabaseItem.from_dict(item_dict)
+
+    async def _load_unknown_strings(self, db, rows) -> None:
+        """Load media_strings entries for codes in `rows` added by another process."""
+        unknown = self.strings.unknown_codes(rows)
+        if unknown:
+            cursor = await db.execute(
+                f"SELECT id, value FROM media_strings WHERE id IN ({', '.join('?' * len(unknown))})", tuple(unknown)
+            )
+            self.strings.load(await cursor.fetchall())
+
+    async def _query_items(self, where: str, params: tuple, description: str, limit: int,
+                           order_by: str = "timestamp_created DESC") -> List[DatabaseItem]:
+        """
+        Run an indexed candidate lookup and convert the rows.
+
+        Args:
+            where: SQL condition on media_items
+            params: Condition parameters
+            description: What was looked up, for the error log
+            limit: Maximum items returned
+            order_by: SQL sort order (default newest first)
+
+        Returns:
+            List[DatabaseItem]: Matching items, empty on error
+        """
+        try:
+            async with self._read_connection() as db:
+                cursor = await db.execute(
+                    f"SELECT * FROM media_items WHERE {where} ORDER BY {order_by} LIMIT ?",
+                    (*params, limit)
+                )
+                rows = await cursor.fetchall()
+                await self._load_unknown_strings(db, rows)
+            return [self._item_from_row(row) for row in rows]
+
+        except Exception as e:
+            self.logger.error(f"Failed to look up items by {description}: {e}")
+            return []
+
+    async def get_changed_items(self, items: List[DatabaseItem]) -> List[Tuple[DatabaseItem, DatabaseItem]]:
+        """
+        Pair the items of a sync batch with their stored versions, where the content differs.
+
+        With the content index loaded, unchanged and new items are skipped
+        without touching the database; otherwise the stored rows of the whole
+        batch are read (500 ids per query) and compared by content hash.
+        Call it before saving the batch, while the old rows are still stored.
+
+        Args:
+            items (List[DatabaseItem]): Items about to be saved
+
+        Returns:
+            List[Tuple[DatabaseItem, DatabaseItem]]: (stored item, incoming item)
+                for every item whose content hash changed, in batch order;
+                empty on error
+
+        Example:
+            ```python
+            pairs = await db_manager.get_changed_items(db_items)
+            if pairs:
+                stored, synced = zip(*pairs)
+                batch = detector.detect_changes_batch(
+                    ChangeDetector.item_columns(stored), ChangeDetector.item_columns(synced)
+                )
+            ```
+        """
+        if self.content_index is not None and self.content_index.loaded:
+            candidates = [
+                item for item in items
+                if self.content_index.status(item.item_id, item.content_hash) == ITEM_CHANGED
+            ]
+        else:
+            candidates = items
+        if not candidates:
+            return []
+
+        stored: Dict[str, DatabaseItem] = {}
+        for start in range(0, len(candidates), 500):
+            ids = list({item.item_id for item in candidates[start:start + 500]})
+            for item in await self._query_items(
+                    f"item_id IN ({','.join('?' * len(ids))})", tuple(ids), "item id", len(ids), order_by="item_id"):
+                stored[item.item_id] = item
+
+        return [
+            (stored[item.item_id], item) for item in candidates
+            if item.item_id in stored and stored[item.item_id].content_hash != item.content_hash
+        ]
+
+    async def get_items_by_name(self, name: str, item_type: Optional[str] = None,
+                                limit: int = 20) -> List[DatabaseItem]:
+        """
+        Find items by normalized name, optionally of one type.
+
+        Names are compared ignoring surrounding whitespace and (ASCII) case,
+        using the `idx_name_type` expression index. Used to find the item a
+        new file replaced, e.g. a movie re-added under a new id.
+
+        Args:
+            name (str): Item name
+            item_type (Optional[str]): Restrict to this type ("Movie", "Episode", ...)
+            limit (int): Maximum items returned (newest first)
+
+        Returns:
+            List[DatabaseItem]: Matching items
+
+        Example:
+            ```python
+            existing = await db_manager.get_items_by_name(new_item.name, new_item.item_type)
+            is_rename, old_item = await change_detector.is_rename(new_item, existing)
+            ```
+        """
+        if item_type is None:
+            return await self._query_items("lower(trim(name)) = lower(trim(?))", (name,), f"name '{name}'", limit)
+        return await self._query_items(
+            "lower(trim(name)) = lower(trim(?)) AND item_type = ?", (name, item_type),
+            f"name '{name}' ({item_type})", limit
+        )
+
+    async def get_items_by_hash(self, content_hash: str, exclude_item_id: Optional[str] = None,
+                                limit: int = 20, legacy_hash: Optional[str] = None) -> List[DatabaseItem]:
+        """
+        Find items with a given content hash.
+
+        The content hash covers the name, type and technical specifications
+        but not the file path or item id, so another item with the same hash
+        is the same content stored elsewhere - a rename or move.
+
+        Args:
+            content_hash (str): Content hash to match
+            exclude_item_id (Optional[str]): Leave this item out (usually the new item itself)
+            limit (int): Maximum items returned (newest first)
+            legacy_hash (Optional[str]): The item's hash under the previous hash
+                version, also matched while stored hashes are being upgraded
+                (`rehash_pending`); ignored otherwise
+
+        Returns:
+            List[DatabaseItem]: Matching items
+        """
+        # Stored as hex text or, in the compact format, as the raw digest
+        hashes = (content_hash, pack_hash(content_hash))
+        if legacy_hash and self.rehash_pending:
+            hashes += (legacy_hash, pack_hash(legacy_hash))
+        where = f"content_hash IN ({', '.join('?' * len(hashes))})"
+        if exclude_item_id is None:
+            return await self._query_items(where, hashes, "content hash", limit)
+        return await self._query_items(
+            f"{where} AND item_id != ?", (*hashes, exclude_item_id), "content hash", limit
+        )
+
+    async def get_items_by_episode(self, series_name: str, season_number: int, episode_number: int,
+                                   limit: int = 20) -> List[DatabaseItem]:
+        """
+        Find the stored episodes for one series/season/episode slot.
+
+        Args:
+            series_name (str): Series name
+            season_number (int): Season number
+            episode_number (int): Episode number
+            limit (int): Maximum items returned (newest first)
+
+        Returns:
+            List[DatabaseItem]: Episodes in that slot (normally zero or one)
+        """
+        return await self._query_items(
+            "series_name = ? AND season_number = ? AND episode_number = ?",
+            (series_name, season_number, episode_number),
+            f"episode {series_name} S{season_number}E{episode_number}", limit
+        )
+
+    async def get_items_below_tier(self, tier: int, item_type: Optional[str] = None,
+                                   limit: int = 100) -> List[DatabaseItem]:
+        """
+        Find items below a quality tier, lowest quality first.
+
+        Answers library questions such as "all movies below 1080p SDR" with
+        a range scan of the `idx_quality` index instead of re-deriving the
+        quality of every row. Rows not yet scored by the current version
+        (right after an upgrade, see `rehash_items()`) are left out.
+
+        Args:
+            tier (int): Quality tier; items with a lower tier are returned
+                (see `quality_score.parse_tier()`)
+            item_type (Optional[str]): Restrict to this type ("Movie", "Episode", ...)
+            limit (int): Maximum items returned
+
+        Returns:
+            List[DatabaseItem]: Matching items, lowest quality score first
+
+        Example:
+            ```python
+            from jellynouncer.quality_score import parse_tier
+
+            movies = await db_manager.get_items_below_tier(parse_tier("1080p SDR"), "Movie")
+            ```
+        """
+        if item_type is None:
+            return await self._query_items(
+                "quality_tier < ? AND quality_version = ?", (tier, QUALITY_SCORE_VERSION),
+                f"quality tier below {tier}", limit, order_by="quality_score"
+            )
+        return await self._query_items(
+            "item_type = ? AND quality_tier < ? AND quality_version = ?", (item_type, tier, QUALITY_SCORE_VERSION),
+            f"quality tier below {tier} ({item_type})", limit, order_by="quality_score"
+        )
+
+    async def get_quality_upgrades(self, since: str, item_type: Optional[str] = None,
+                                   limit: int = 100) -> List[DatabaseItem]:
+        """
+        Find items whose quality score went up since a point in time.
+
+        `quality_upgraded_at` is stamped by the database when a save raises
+        an item's score (or a higher-scoring file replaces it), so this is an
+        index range scan on `idx_quality_upgraded_at`.
+
+        Args:
+            since (str): ISO 8601 UTC timestamp (as `datetime.isoformat()` gives)
+            item_type (Optional[str]): Restrict to this type ("Movie", "Episode", ...)
+            limit (int): Maximum items returned
+
+        Returns:
+            List[DatabaseItem]: Upgraded items, most recent upgrade first
+
+        Example:
+            ```python
+            week_ago = (datetime.now(timezone.utc) - timedelta(days=7)).isoformat()
+            upgraded = await db_manager.get_quality_upgrades(week_ago)
+            ```
+        """
+        if item_type is None:
+            return await self._query_items(
+                "quality_upgraded_at >= ?", (since,), f"quality upgrades since {since}", limit,
+                order_by="quality_upgraded_at DESC"
+            )
+        return await self._query_items(
+            "quality_upgraded_at >= ? AND item_type = ?", (since, item_type),
+            f"quality upgrades since {since} ({item_type})", limit, order_by="quality_upgraded_at DESC"
+        )
+
+    async def get_quality_distribution(self, item_type: Optional[str] = None) -> Dict[int, int]:
+        """
+        Count the items in each quality tier.
+
+        Counted from the `idx_quality` index alone, without reading rows.
+
+        Args:
+            item_type (Optional[str]): Restrict to this type ("Movie", "Episode", ...)
+
+        Returns:
+            Dict[int, int]: Tier -> number of items, lowest tier first; empty on error
+        """
+        where = "quality_version = ?"
+        params: tuple = (QUALITY_SCORE_VERSION,)
+        if item_type is not None:
+            where = "item_type = ? AND " + where
+            params = (item_type,) + params
+        try:
+            async with self._read_connection() as db:
+                cursor = await db.execute(
+                    f"SELECT quality_tier, COUNT(*) FROM media_items WHERE {where} "
+                    f"GROUP BY quality_tier ORDER BY quality_tier",
+                    params
+                )
+                return {tier: count for tier, count in await cursor.fetchall()}
+        except Exception as e:
+            self.logger.error(f"Failed to count items by quality tier: {e}")
+            return {}
+
+    async def replace_item(self, old_item_id: str, item: DatabaseItem) -> bool:
+        """
+        Replace one item with another in a single transaction.
+
+        Used when a file was renamed or upgraded and Jellyfin gave it a new
+        id: the old row is deleted and the new item saved together, so the
+        database never holds both or neither. Group-committed like `save_item()`.
+
+        Args:
+            old_item_id (str): Id of the item being replaced
+            item (DatabaseItem): The item that replaces it (MediaItem accepted)
+
+        Returns:
+            bool: True if the new item was saved
+        """
+        if not isinstance(item, DatabaseItem):
+            item = DatabaseItem.from_media_item(item)
+        return await self._submit_write("replace", (old_item_id, item))
+
+    async def save_items_batch(self, items: List[DatabaseItem]) -> Dict[str, int]:
+        """
+        Save multiple media items in a single transaction for better performance.
+
+        This method provides efficient batch processing for large numbers of
+        items, such as during library synchronization. It uses a single
+        database transaction to improve performance and ensure consistency.
+
+        **Understanding Database Transactions:**
+        A transaction is a group of database operations that are treated as
+        a single unit. Either all operations succeed, or none of them do.
+        This ensures data consistency and improves performance by reducing
+        the number of individual database commits.
+
+        **Conditional Upsert:**
+        Items are written with one prepared `INSERT ... ON CONFLICT DO UPDATE`
+        statement run through `executemany`. The update only happens when the
+        content hash (or one of the few columns the hash doesn't cover, such as
+        the file path) differs, so re-syncing an unchanged library writes
+        almost nothing. Existing rows keep their original `timestamp_created`.
+
+        Args:
+            items (List[DatabaseItem]): List of database items to save
+
+        Returns:
+            Dict[str, int]: Statistics about the batch operation
+            - 'successful': Number of items saved successfully
+            - 'failed': Number of items that failed to save
+            - 'total': Total number of items processed
+            - 'inserted': Items that were new to the database
+            - 'updated': Existing items whose stored row changed
+            - 'unchanged': Existing items that were already up to date
+
+        Example:
+            ```python
+            # Batch save multiple items
+            items = [movie1, movie2, tv_episode1, music_track1]
+            results = await db_manager.save_items_batch(items)
+
+            logger.info(f"Batch save: {results['successful']}/{results['total']} succeeded, "
+                        f"{results['inserted']} new, {results['updated']} changed")
+            ```
+
+        Note:
+            This method is significantly faster than calling save_item()
+            multiple times for large batches due to transaction overhead reduction.
+        """
+        results = {'successful': 0, 'failed': 0, 'total': len(items), 'inserted': 0, 'updated': 0, 'unchanged': 0}
+        if not items:
+            return results
+
+        try:
+            async with self._write_connection() as db:
                 self._connection_count += 1
 
                 # Begin transaction for all items with immediate lock
                 await db.execute("BEGIN IMMEDIATE")
 
-                # Process items in chunks matching API batch size for consistency
-                # Uses same adaptive sizing as API calls for optimal performance
-                chunk_size = 500  # Maximum batch size, matches API's max batch size
-                
+                # Chunks bound the size of the sync token lookup, not the statement
+                chunk_size = 500
+                saved: List[DatabaseItem] = []
                 for chunk_start in range(0, len(items), chunk_size):
-                    chunk = items[chunk_start:chunk_start + chunk_size]
-                    
-                    try:
-                        # Prepare all items in chunk
-                        columns = None
-                        items_to_insert = []
-                        
-                        for item in chunk:
-                            try:
-                                # Convert to dictionary and serialize JSON fields efficiently
-                                item_dict = asdict(item)
-                                
-                                # Remove private fields that shouldn't be saved to database
-                                # _content_hash is internal storage, we need to use the content_hash property
-                                if '_content_hash' in item_dict:
-                                    del item_dict['_content_hash']
-                                    # Add the actual content hash from the property
-                                    item_dict['content_hash'] = item.content_hash
-                                
-                                # Optimize JSON serialization with set lookup
-                                json_fields = {'genres', 'studios', 'tags', 'artists', 'subtitle_languages', 'subtitle_formats'}
-                                for field in json_fields:
-                                    if field in item_dict and item_dict[field] is not None:
-                                        item_dict[field] = json.dumps(item_dict[field])
-                                
-                                if columns is None:
-                                    columns = list(item_dict.keys())
-                                
-                                items_to_insert.append(list(item_dict.values()))
-                                
-                            except Exception as e:
-                                self.logger.warning(f"Failed to prepare item {item.item_id}: {e}")
-                                failed += 1
-                        
-                        if items_to_insert and columns:
-                            # Build optimized batch INSERT with multiple VALUES
-                            placeholders_per_item = f"({','.join('?' * len(columns))})"
-                            all_placeholders = ','.join([placeholders_per_item] * len(items_to_insert))
-                            columns_str = ','.join(columns)
-                            
-                            # Flatten values list
-                            all_values = [val for item_values in items_to_insert for val in item_values]
-                            
-                            sql = f"INSERT OR REPLACE INTO media_items ({columns_str}) VALUES {all_placeholders}"
-                            
-                            await db.execute(sql, all_values)
-                            successful += len(items_to_insert)
-                            
-                    except Exception as e:
-                        # Fall back to individual inserts for this chunk if batch fails
-                        self.logger.warning(f"Batch insert failed, using fallback: {e}")
-                        
-                        for item in chunk:
-                            try:
-                                item_dict = asdict(item)
-                                json_fields = {'genres', 'studios', 'tags', 'artists', 'subtitle_languages', 'subtitle_formats'}
-                                for field in json_fields:
-                                    if field in item_dict and item_dict[field] is not None:
-                                        item_dict[field] = json.dumps(item_dict[field])
-                                
-                                placeholders = ','.join('?' * len(item_dict))
-                                columns = ','.join(item_dict.keys())
-                                
-                                await db.execute(
-                                    f"INSERT OR REPLACE INTO media_items ({columns}) VALUES ({placeholders})",
-                                    list(item_dict.values())
-                                )
-                                successful += 1
-                                
-                            except Exception as e:
-                                self.logger.warning(f"Failed to save item {item.item_id}: {e}")
-                                failed += 1
+                    saved += await self._upsert_chunk(db, items[chunk_start:chunk_start + chunk_size], results)
 
                 # Commit the entire transaction
                 await db.commit()
                 self._connection_count -= 1
 
-            self.logger.info(f"Batch save completed: {successful} successful, {failed} failed")
-            return {
-                'successful': successful,
-                'failed': failed,
-                'total': len(items)
-            }
+            self._index_committed(saved=saved)
+
+            self.logger.info(
+                f"Batch save completed: {results['successful']} successful, {results['failed']} failed "
+                f"({results['inserted']} new, {results['updated']} updated, {results['unchanged']} unchanged)"
+            )
+            return results
 
         except Exception as e:
             self.logger.error(f"Batch save transaction failed: {e}")
             return {
                 'successful': 0,
                 'failed': len(items),
-                'total': len(items)
+                'total': len(items),
+                'inserted': 0,
+                'updated': 0,
+                'unchanged': 0
             }
 
+    async def _upsert_chunk(self, db, chunk: List[DatabaseItem], results: Dict[str, int]) -> List[DatabaseItem]:
+        """
+        Upsert one chunk of items inside the current transaction.
+
+        The whole chunk goes through one `executemany`. If any row fails, the
+        chunk is rolled back to a savepoint and retried row by row so only the
+        bad rows are counted as failed.
+
+        Rows are classified as inserted, updated or unchanged from their stored
+        values, read before the upsert. The connection's change counter can't
+        be used: it also counts rows written by triggers, such as the ones
+        `migrate_schema()` installs while it runs.
+
+        If the chunk holds an item more than once, only its last copy is
+        written: every copy's bucket change would start from the same stored
+        sync token, and their XOR deltas would cancel out. The earlier copies
+        count as unchanged if the last one is saved, and as failed otherwise.
+
+        Args:
+            db: Writer connection, inside a transaction
+            chunk: Items to save
+            results: Counters to update (see `save_items_batch()`)
+
+        Returns:
+            List[DatabaseItem]: Items written (not yet committed)
+        """
+        copies = Counter(item.item_id for item in chunk)
+        if len(copies) < len(chunk):
+            # Last copy wins, as it would have in the table
+            chunk = list({item.item_id: item for item in chunk}.values())
+
+        stored = await self._load_compared_values(db, list(copies))
+        library_index = _UPSERT_COMPARED_COLUMNS.index('library_id')
+        token_index = _UPSERT_COMPARED_COLUMNS.index('server_token')
+        old_tokens = {item_id: (values[library_index], values[token_index]) for item_id, values in stored.items()}
+
+        rows = []
+        prepared = []
+        used_codes = set()
+        for item in chunk:
+            try:
+                bucket_change = self._inherit_sync_tracking(item, old_tokens)
+                row = self._storage_row(item, used_codes)
+                if item.item_id not in stored:
+                    outcome = 'inserted'
+                elif self._row_differs(row, stored[item.item_id]):
+                    outcome = 'updated'
+                else:
+                    outcome = 'unchanged'
+                rows.append(row)
+                prepared.append((item, bucket_change, outcome))
+            except Exception as e:
+                self.logger.warning(f"Failed to prepare item {getattr(item, 'item_id', 'unknown')}: {e}")
+                results['failed'] += 1
+
+        if not rows:
+            results['failed'] += sum(copies.values()) - len(copies)
+            return []
+
+        # Outside the savepoint, so the row-by-row retry below still has them
+        await self._write_strings(db, used_codes)
+        await db.execute("SAVEPOINT upsert_chunk")
+        try:
+            await db.executemany(UPSERT_ITEM_SQL, rows)
+            await db.execute("RELEASE upsert_chunk")
+            saved = prepared
+        except Exception as e:
+            await db.execute("ROLLBACK TO upsert_chunk")
+            await db.execute("RELEASE upsert_chunk")
+            self.logger.warning(f"Batch upsert failed, saving items one by one: {e}")
+
+            saved = []
+            for row, prepared_item in zip(rows, prepared):
+                try:
+                    await db.execute(UPSERT_ITEM_SQL, row)
+                except Exception as row_error:
+                    self.logger.warning(f"Failed to save item {prepared_item[0].item_id}: {row_error}")
+                    results['failed'] += 1
+                    continue
+                saved.append(prepared_item)
+
+        await self._apply_bucket_changes(db, [change for _, change, _ in saved if change])
+
+        results['successful'] += len(saved)
+        for _, _, outcome in saved:
+            results[outcome] += 1
+        superseded = sum(copies.values()) - len(copies)
+        if superseded:
+            superseded_saved = sum(copies[item.item_id] - 1 for item, _, _ in saved)
+            results['successful'] += superseded_saved
+            results['unchanged'] += superseded_saved
+            results['failed'] += superseded - superseded_saved
+        return [item for item, _, _ in saved]
+
     async def get_items_by_type(self, item_type: str, limit: Optional[int] = None) -> List[DatabaseItem]:
         """
         Retrieve all media items of a specific type.
@@ -723,9 +2555,8 @@ class DatabaseManager:
             for consistent behavior across different query types.
         """
         try:
-            async with aiosqlite.connect(self.db_path) as db:
+            async with self._read_connection() as db:
                 self._connection_count += 1
-                db.row_factory = aiosqlite.Row
 
                 # Build query with optional limit
                 sql = "SELECT * FROM media_items WHERE item_type = ? ORDER BY timestamp_created DESC"
@@ -737,26 +2568,9 @@ class DatabaseManager:
 
                 cursor = await db.execute(sql, params)
                 rows = await cursor.fetchall()
+                await self._load_unknown_strings(db, rows)
 
-                items = []
-                for row in rows:
-                    item_dict = dict(row)
-
-                    # Deserialize JSON fields
-                    for field in ['genres', 'studios', 'tags', 'artists', 'subtitle_languages', 'subtitle_formats']:
-                        if item_dict.get(field):
-                            try:
-                                item_dict[field] = json.loads(item_dict[field])
-                            except json.JSONDecodeError:
-                                item_dict[field] = []
-                        else:
-                            item_dict[field] = None
-
-                    # Remove content_hash from dict as it's already computed in DatabaseItem
-                    if 'content_hash' in item_dict:
-                        del item_dict['content_hash']
-                    
-                    items.append(DatabaseItem.from_dict(item_dict))
+                items = [self._item_from_row(row) for row in rows]
 
                 self._connection_count -= 1
                 return items
@@ -770,7 +2584,8 @@ class DatabaseManager:
         Delete a media item from the database.
 
         This method removes an item completely from the database. Use with caution
-        as this operation cannot be undone.
+        as this operation cannot be undone. Like `save_item()`, the delete is
+        group-committed by the writer task.
 
         Args:
             item_id (str): Unique identifier of item to delete
@@ -786,29 +2601,60 @@ class DatabaseManager:
                 logger.info("Item deleted successfully")
             ```
         """
-        try:
-            async with aiosqlite.connect(self.db_path) as db:
-                self._connection_count += 1
+        return await self._submit_write("delete", item_id)
 
-                cursor = await db.execute(
-                    "DELETE FROM media_items WHERE item_id = ?",
-                    (item_id,)
-                )
-                await db.commit()
+    @staticmethod
+    async def _inherit_quality_history(db, old_item_id: str, item: DatabaseItem) -> None:
+        """
+        Carry a replaced row's quality history over to the item replacing it.
 
-                deleted_count = cursor.rowcount
-                self._connection_count -= 1
+        A replacement that scores higher (under the same scoring version) is
+        a quality upgrade as of the new item's creation; otherwise the new row
+        keeps the old row's last upgrade time.
 
-                if deleted_count > 0:
-                    self.logger.debug(f"Deleted item: {item_id}")
-                    return True
-                else:
-                    self.logger.warning(f"Item not found for deletion: {item_id}")
-                    return False
+        Args:
+            db: Writer connection, inside a transaction
+            old_item_id: Item being replaced
+            item: Item replacing it (its quality_upgraded_at is set)
+        """
+        cursor = await db.execute(
+            "SELECT quality_score, quality_version, quality_upgraded_at FROM media_items WHERE item_id = ?",
+            (old_item_id,)
+        )
+        row = await cursor.fetchone()
+        if row is None:
+            return
+        old_score, old_version, old_upgraded_at = row
+        if old_version == item.quality_version and item.quality_score > old_score:
+            item.quality_upgraded_at = item.timestamp_created
+        else:
+            item.quality_upgraded_at = old_upgraded_at
+
+    async def _delete_item(self, db, item_id: str) -> bool:
+        """
+        Delete one item on the writer connection (no commit).
 
-        except Exception as e:
-            self.logger.error(f"Failed to delete item {item_id}: {e}")
-            return False
+        Args:
+            db: Writer connection, inside a transaction
+            item_id: Item to delete
+
+        Returns:
+            bool: True if the item existed
+        """
+        old_tokens = await self._load_sync_tokens(db, [item_id])
+        cursor = await db.execute(
+            "DELETE FROM media_items WHERE item_id = ?",
+            (item_id,)
+        )
+        old_library, old_token = old_tokens.get(item_id, (None, None))
+        if old_library is not None:
+            await self._apply_bucket_changes(db, [(item_id, old_library, old_token, None, None)])
+
+        if cursor.rowcount > 0:
+            self.logger.debug(f"Deleted item: {item_id}")
+            return True
+        self.logger.warning(f"Item not found for deletion: {item_id}")
+        return False
 
     async def get_stats(self) -> Dict[str, Any]:
         """
@@ -829,9 +2675,8 @@ class DatabaseManager:
             ```
         """
         try:
-            async with aiosqlite.connect(self.db_path) as db:
+            async with self._read_connection() as db:
                 self._connection_count += 1
-                db.row_factory = aiosqlite.Row
 
                 stats = {}
 
@@ -862,6 +2707,9 @@ class DatabaseManager:
                 row = await cursor.fetchone()
                 stats['wal_mode'] = row[0].upper() == 'WAL' if row else False
 
+                # Free space waiting for incremental vacuum, and WAL growth
+                stats['storage'] = await self._storage_metrics(db)
+
                 # Get recent activity (items added in last 24 hours)
                 cursor = await db.execute("""
                                           SELECT COUNT(*) as count
@@ -871,6 +2719,26 @@ class DatabaseManager:
                 row = await cursor.fetchone()
                 stats['recent_additions'] = row['count'] if row else 0
 
+                # Single-item writes per commit show how well webhook bursts are grouped
+                stats['group_commit'] = dict(self.group_commit_stats)
+
+                stats['schema'] = {
+                    'format': 'compact' if self.compact_schema else 'standard',
+                    'migrating': self._schema_migration_task is not None and not self._schema_migration_task.done(),
+                    'strings': len(self.strings),
+                    'last_migration': self.last_schema_migration,
+                    'hash_version': CONTENT_HASH_VERSION,
+                    'quality_version': QUALITY_SCORE_VERSION,
+                    'rehashing': self.rehash_pending,
+                    'last_rehash': self.last_rehash,
+                }
+
+                if self.content_index is not None:
+                    stats['content_index'] = {
+                        'items': len(self.content_index),
+                        'memory_mb': round(self.content_index.memory_bytes() / (1024 * 1024), 1)
+                    }
+
                 self._connection_count -= 1
                 return stats
 
@@ -892,7 +2760,7 @@ class DatabaseManager:
             ```
         """
         try:
-            async with aiosqlite.connect(self.db_path) as db:
+            async with self._write_connection() as db:
                 self._connection_count += 1
 
                 current_time = datetime.now(timezone.utc).isoformat()
@@ -912,17 +2780,19 @@ class DatabaseManager:
 
     async def vacuum_database(self) -> bool:
         """
-        Perform database maintenance (VACUUM operation).
+        Perform a full database VACUUM (explicit admin action).
 
         The VACUUM command rebuilds the database, reclaiming space from deleted
-        records and optimizing the internal structure. This should be run periodically,
-        especially after large numbers of deletions or updates.
+        records and optimizing the internal structure. It rewrites the whole
+        file and blocks all writes while it runs, so it is no longer scheduled:
+        routine maintenance uses `run_maintenance()` (incremental vacuum) and
+        `checkpoint_wal()`. A full VACUUM also switches a database created by
+        an older version to incremental auto-vacuum.
 
         **When to VACUUM:**
-        - After bulk deletions
-        - Periodically (weekly/monthly) for maintenance
+        - After bulk deletions, to defragment as well as shrink the file
         - When database file size seems larger than expected
-        - As part of regular maintenance routines
+        - Via `POST /vacuum` on the webhook service
 
         Returns:
             bool: True if VACUUM completed successfully, False otherwise
@@ -945,10 +2815,11 @@ class DatabaseManager:
         try:
             self.logger.info("Starting database VACUUM operation...")
 
-            async with aiosqlite.connect(self.db_path) as db:
+            async with self._write_connection() as db:
                 self._connection_count += 1
 
-                # VACUUM rebuilds the database file
+                # VACUUM rebuilds the database file (and applies the auto_vacuum mode)
+                await db.execute("PRAGMA auto_vacuum=INCREMENTAL")
                 await db.execute("VACUUM")
 
                 # Update table statistics for query optimization
@@ -959,8 +2830,147 @@ class DatabaseManager:
                 return True
 
         except Exception as e:
-            self.logger.error(f"Database VACUUM failed: {e}")
-            return False
+            self.logger.error(f"Database VACUUM failed: {e}")
+            return False
+
+    async def run_maintenance(self) -> Dict[str, Any]:
+        """
+        Routine database maintenance: incremental vacuum and planner statistics.
+
+        Free pages are returned to the filesystem `vacuum_slice_pages` at a
+        time, each step a short write of its own, so webhook saves carry on
+        between steps instead of waiting for a full VACUUM. `PRAGMA optimize`
+        then refreshes query planner statistics where they are out of date.
+
+        A database created before incremental auto-vacuum was enabled is
+        converted by one full VACUUM on its first maintenance run.
+
+        Returns:
+            Dict[str, Any]: 'pages_freed', 'free_pages' left and 'converted'
+                (True if the one-time full VACUUM ran)
+
+        Example:
+            ```python
+            result = await db_manager.run_maintenance()
+            logger.info(f"Released {result['pages_freed']} free pages")
+            ```
+        """
+        result = {'pages_freed': 0, 'free_pages': 0, 'converted': False}
+        try:
+            # Read on the writer: other connections can report the mode from before a VACUUM
+            async with self._write_connection() as db:
+                auto_vacuum = (await (await db.execute("PRAGMA auto_vacuum")).fetchone())[0]
+            if auto_vacuum != 2:
+                self.logger.info("Converting database to incremental auto-vacuum (one-time full VACUUM)")
+                result['converted'] = await self.vacuum_database()
+                return result
+
+            result['pages_freed'] = await self.incremental_vacuum()
+            async with self._write_connection() as db:
+                await db.execute("PRAGMA optimize")
+                result['free_pages'] = (await (await db.execute("PRAGMA freelist_count")).fetchone())[0]
+        except Exception as e:
+            self.logger.error(f"Database maintenance failed: {e}")
+        return result
+
+    async def incremental_vacuum(self, max_pages: Optional[int] = None) -> int:
+        """
+        Return free pages to the filesystem in small steps.
+
+        Each step runs `PRAGMA incremental_vacuum(vacuum_slice_pages)` with
+        the writer connection and then releases it, so queued writes run
+        between steps.
+
+        Args:
+            max_pages (Optional[int]): Stop after about this many pages (None for all)
+
+        Returns:
+            int: Pages released
+        """
+        freed = 0
+        while max_pages is None or freed < max_pages:
+            async with self._write_connection() as db:
+                before = (await (await db.execute("PRAGMA freelist_count")).fetchone())[0]
+                if before == 0:
+                    break
+                # The pragma frees one page per result row; it only runs to completion when fully read
+                cursor = await db.execute(f"PRAGMA incremental_vacuum({self.vacuum_slice_pages})")
+                await cursor.fetchall()
+                after = (await (await db.execute("PRAGMA freelist_count")).fetchone())[0]
+            if after >= before:
+                break  # auto_vacuum is not INCREMENTAL
+            freed += before - after
+            await asyncio.sleep(0)
+
+        if freed:
+            self.logger.info(f"Incremental vacuum released {freed:,} pages")
+        return freed
+
+    async def checkpoint_wal(self, truncate: bool = True) -> Dict[str, Any]:
+        """
+        Copy the WAL back into the database file, and optionally truncate it.
+
+        A PASSIVE checkpoint never waits for readers or blocks writers. When
+        it has copied every frame and `truncate` is set, a TRUNCATE checkpoint
+        follows to shrink the WAL file to zero bytes. Meant for idle periods
+        (the scheduler's `wal_checkpoint` job) - SQLite's automatic checkpoints
+        handle the busy times.
+
+        Args:
+            truncate (bool): Reset the WAL file after a complete checkpoint
+
+        Returns:
+            Dict[str, Any]: 'wal_frames', 'checkpointed' frames, 'busy' (a
+                reader or writer prevented a complete checkpoint), 'truncated'
+                and the resulting 'wal_bytes'
+
+        Example:
+            ```python
+            result = await db_manager.checkpoint_wal()
+            if result['busy']:
+                logger.debug("Readers still using the WAL, will retry later")
+            ```
+        """
+        result: Dict[str, Any] = {'wal_frames': 0, 'checkpointed': 0, 'busy': False, 'truncated': False, 'wal_bytes': 0}
+        if not self.wal_mode:
+            return result
+        try:
+            async with self._write_connection() as db:
+                busy, frames, checkpointed = await (await db.execute("PRAGMA wal_checkpoint(PASSIVE)")).fetchone()
+                result.update(wal_frames=frames, checkpointed=checkpointed, busy=bool(busy) or checkpointed < frames)
+                if truncate and not result['busy']:
+                    busy, _, _ = await (await db.execute("PRAGMA wal_checkpoint(TRUNCATE)")).fetchone()
+                    result['truncated'] = not busy
+            result['wal_bytes'] = self._wal_bytes()
+            result['timestamp'] = datetime.now(timezone.utc).isoformat()
+            self.last_checkpoint = result
+            self.logger.debug(f"WAL checkpoint: {checkpointed}/{frames} frames, truncated={result['truncated']}")
+        except Exception as e:
+            self.logger.error(f"WAL checkpoint failed: {e}")
+        return result
+
+    def _wal_bytes(self) -> int:
+        """Current size of the WAL file (0 if there is none)."""
+        try:
+            return os.path.getsize(self.db_path + "-wal")
+        except OSError:
+            return 0
+
+    async def _storage_metrics(self, db) -> Dict[str, Any]:
+        """Free page, auto-vacuum and WAL figures for get_stats()."""
+        page_size = (await (await db.execute("PRAGMA page_size")).fetchone())[0]
+        page_count = (await (await db.execute("PRAGMA page_count")).fetchone())[0]
+        free_pages = (await (await db.execute("PRAGMA freelist_count")).fetchone())[0]
+        auto_vacuum = (await (await db.execute("PRAGMA auto_vacuum")).fetchone())[0]
+        return {
+            'page_size': page_size,
+            'page_count': page_count,
+            'free_pages': free_pages,
+            'free_mb': round(free_pages * page_size / (1024 * 1024), 2),
+            'auto_vacuum': {0: 'none', 1: 'full', 2: 'incremental'}.get(auto_vacuum, str(auto_vacuum)),
+            'wal_mb': round(self._wal_bytes() / (1024 * 1024), 2),
+            'last_checkpoint': self.last_checkpoint,
+        }
 
     async def get_vacuum_timestamp(self) -> Optional[float]:
         """
@@ -970,7 +2980,7 @@ class DatabaseManager:
             Optional[float]: Unix timestamp of last vacuum, or None if not found
         """
         try:
-            async with aiosqlite.connect(self.db_path) as db:
+            async with self._read_connection() as db:
                 cursor = await db.execute("""
                                           SELECT vacuum_timestamp
                                           FROM service_state
@@ -994,10 +3004,13 @@ class DatabaseManager:
         """
         try:
             current_time = time.time()
-            async with aiosqlite.connect(self.db_path) as db:
+            async with self._write_connection() as db:
+                # Upsert so the other service_state columns (e.g. the bulk-load mark) survive
                 await db.execute("""
-                    INSERT OR REPLACE INTO service_state (id, vacuum_timestamp, updated_at)
+                    INSERT INTO service_state (id, vacuum_timestamp, updated_at)
                     VALUES (1, ?, CURRENT_TIMESTAMP)
+                    ON CONFLICT(id) DO UPDATE SET vacuum_timestamp = excluded.vacuum_timestamp,
+                                                  updated_at = excluded.updated_at
                 """, (current_time,))
                 await db.commit()
 
@@ -1011,11 +3024,18 @@ class DatabaseManager:
     async def save_jellyfin_stats(self, stats: Dict[str, Any]) -> None:
         """
         Save Jellyfin server statistics to database.
+
+        The library, plugin and system JSON blobs are stored once in
+        `stats_blobs` and referenced by hash, so unchanged blobs cost nothing
+        per snapshot. Old snapshots are rolled up by `compact_jellyfin_stats()`.
         
         Args:
             stats: Dictionary containing server statistics
         """
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._write_connection() as db:
+            blob_hashes = [
+                await self._store_stats_blob(db, stats.get(column, {})) for column in STATS_BLOB_COLUMNS
+            ]
             await db.execute("""
                 INSERT INTO jellyfin_stats (
                     server_name, server_version, server_id, server_status,
@@ -1023,7 +3043,7 @@ class DatabaseManager:
                     movie_count, series_count, episode_count,
                     music_count, music_album_count, photo_count, book_count,
                     total_size_gb, total_play_count, total_watch_time_minutes,
-                    library_stats, plugin_stats, system_info,
+                    library_stats_hash, plugin_stats_hash, system_info_hash,
                     last_error, last_check
                 ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             """, (
@@ -1044,14 +3064,32 @@ class DatabaseManager:
                 stats.get('total_size_gb', 0),
                 stats.get('total_play_count', 0),
                 stats.get('total_watch_time_minutes', 0),
-                json.dumps(stats.get('library_stats', {})),
-                json.dumps(stats.get('plugin_stats', {})),
-                json.dumps(stats.get('system_info', {})),
+                *blob_hashes,
                 stats.get('last_error'),
                 datetime.now(timezone.utc).isoformat()
             ))
             await db.commit()
+
+    @staticmethod
+    async def _store_stats_blob(db, value: Any) -> str:
+        """
+        Store a stats JSON blob once and return its hash reference.
+
+        Args:
+            db: Writer connection
+            value: JSON-serializable value
+
+        Returns:
+            str: blob_hash of the stored content
+        """
+        content = json.dumps(value, sort_keys=True, separators=(',', ':'))
+        blob_hash = hashlib.blake2b(content.encode('utf-8'), digest_size=16).hexdigest()
+        await db.execute(
+            "INSERT OR IGNORE INTO stats_blobs (blob_hash, content) VALUES (?, ?)", (blob_hash, content)
+        )
+        return blob_hash
     
+    @cached_query
     async def get_latest_jellyfin_stats(self) -> Optional[Dict[str, Any]]:
         """
         Get the most recent Jellyfin server statistics.
@@ -1059,27 +3097,732 @@ class DatabaseManager:
         Returns:
             Dictionary with server stats or None if not available
         """
-        async with aiosqlite.connect(self.db_path) as db:
-            db.row_factory = aiosqlite.Row
-            cursor = await db.execute("""
-                SELECT * FROM jellyfin_stats 
-                ORDER BY timestamp DESC 
+        async with self._read_connection() as db:
+            cursor = await db.execute(f"""
+                SELECT s.*, {', '.join(f"b_{c}.content AS {c}_content" for c in STATS_BLOB_COLUMNS)}
+                FROM jellyfin_stats s
+                {' '.join(f"LEFT JOIN stats_blobs b_{c} ON b_{c}.blob_hash = s.{c}_hash" for c in STATS_BLOB_COLUMNS)}
+                ORDER BY s.timestamp DESC 
                 LIMIT 1
             """)
             row = await cursor.fetchone()
             
             if row:
                 stats = dict(row)
-                # Parse JSON fields
-                if stats.get('library_stats'):
-                    stats['library_stats'] = json.loads(stats['library_stats'])
-                if stats.get('plugin_stats'):
-                    stats['plugin_stats'] = json.loads(stats['plugin_stats'])
-                if stats.get('system_info'):
-                    stats['system_info'] = json.loads(stats['system_info'])
+                # Parse JSON fields (snapshots from older versions hold the JSON inline)
+                for column in STATS_BLOB_COLUMNS:
+                    content = stats.pop(f"{column}_content") or stats.get(column)
+                    stats.pop(f"{column}_hash", None)
+                    stats[column] = json.loads(content) if content else None
                 return stats
             return None
+
+    async def get_jellyfin_stats_rollups(self, resolution: str = "day", limit: int = 90) -> List[Dict[str, Any]]:
+        """
+        Get hourly or daily rollups of older Jellyfin statistics, newest first.
+
+        Args:
+            resolution (str): "hour" or "day"
+            limit (int): Maximum rollups returned
+
+        Returns:
+            List[Dict[str, Any]]: Rollup rows (metrics are the last value in each period)
+        """
+        async with self._read_connection() as db:
+            cursor = await db.execute("""
+                SELECT * FROM jellyfin_stats_rollups
+                WHERE resolution = ?
+                ORDER BY bucket_start DESC
+                LIMIT ?
+            """, (resolution, limit))
+            return [dict(row) for row in await cursor.fetchall()]
+
+    async def compact_jellyfin_stats(self) -> Dict[str, int]:
+        """
+        Apply the Jellyfin statistics retention policy.
+
+        - Snapshots older than `stats_raw_days` are folded into hourly rollups
+        - Hourly rollups older than `stats_hourly_days` are folded into daily
+          rollups, which are kept indefinitely (one small row per day)
+        - Inline JSON from older versions is moved into `stats_blobs`
+        - Blobs no longer referenced by any snapshot or rollup are deleted
+
+        Rollups keep, per period, the number of samples, how many saw the
+        server online, average and peak active users, and the last value of
+        every other metric.
+
+        Returns:
+            Dict[str, int]: Counts of snapshots_rolled_up, hourly_rolled_up,
+                blobs_migrated and blobs_deleted
+
+        Example:
+            ```python
+            result = await db_manager.compact_jellyfin_stats()
+            logger.info(f"Rolled up {result['snapshots_rolled_up']} stats snapshots")
+            ```
+        """
+        result = {'snapshots_rolled_up': 0, 'hourly_rolled_up': 0, 'blobs_migrated': 0, 'blobs_deleted': 0}
+        try:
+            async with self._write_connection() as db:
+                await db.execute("BEGIN IMMEDIATE")
+
+                # Older versions stored the JSON inline; move it into blobs first
+                cursor = await db.execute(f"""
+                    SELECT id, {', '.join(STATS_BLOB_COLUMNS)} FROM jellyfin_stats
+                    WHERE {' OR '.join(f"{c} IS NOT NULL" for c in STATS_BLOB_COLUMNS)}
+                """)
+                for row in await cursor.fetchall():
+                    hashes = []
+                    for column in STATS_BLOB_COLUMNS:
+                        try:
+                            value = json.loads(row[column]) if row[column] else {}
+                        except json.JSONDecodeError:
+                            value = {}
+                        hashes.append(await self._store_stats_blob(db, value))
+                    await db.execute(f"""
+                        UPDATE jellyfin_stats SET
+                        {', '.join(f"{c}_hash = ?, {c} = NULL" for c in STATS_BLOB_COLUMNS)}
+                        WHERE id = ?
+                    """, (*hashes, row['id']))
+                    result['blobs_migrated'] += 1
+
+                # Raw snapshots -> hourly rollups
+                cursor = await db.execute(
+                    "SELECT * FROM jellyfin_stats WHERE timestamp < datetime('now', ?) ORDER BY timestamp",
+                    (f"-{self.config.stats_raw_days} days",)
+                )
+                snapshots = [dict(row) for row in await cursor.fetchall()]
+                if snapshots:
+                    await self._merge_stats_rollups(db, "hour", [self._snapshot_rollup(row) for row in snapshots])
+                    await db.execute(
+                        "DELETE FROM jellyfin_stats WHERE timestamp < datetime('now', ?)",
+                        (f"-{self.config.stats_raw_days} days",)
+                    )
+                    result['snapshots_rolled_up'] = len(snapshots)
+
+                # Hourly rollups -> daily rollups
+                cursor = await db.execute("""
+                    SELECT * FROM jellyfin_stats_rollups
+                    WHERE resolution = 'hour' AND bucket_start < datetime('now', ?)
+                    ORDER BY bucket_start
+                """, (f"-{self.config.stats_hourly_days} days",))
+                hourly = [dict(row) for row in await cursor.fetchall()]
+                if hourly:
+                    await self._merge_stats_rollups(db, "day", hourly)
+                    await db.execute(
+                        "DELETE FROM jellyfin_stats_rollups WHERE resolution = 'hour' AND bucket_start < datetime('now', ?)",
+                        (f"-{self.config.stats_hourly_days} days",)
+                    )
+                    result['hourly_rolled_up'] = len(hourly)
+
+                # Drop blobs nothing refers to any more
+                references = ' UNION '.join(
+                    f"SELECT {c}_hash FROM {table} WHERE {c}_hash IS NOT NULL"
+                    for table in ("jellyfin_stats", "jellyfin_stats_rollups") for c in STATS_BLOB_COLUMNS
+                )
+                cursor = await db.execute(f"DELETE FROM stats_blobs WHERE blob_hash NOT IN ({references})")
+                result['blobs_deleted'] = cursor.rowcount
+
+                await db.commit()
+
+            self.logger.info(
+                f"Stats compaction: {result['snapshots_rolled_up']} snapshots and "
+                f"{result['hourly_rolled_up']} hourly rollups rolled up, {result['blobs_deleted']} blobs removed"
+            )
+        except Exception as e:
+            self.logger.error(f"Stats compaction failed: {e}")
+        return result
+
+    @staticmethod
+    def _snapshot_rollup(snapshot: Dict[str, Any]) -> Dict[str, Any]:
+        """Express one raw snapshot as a single-sample rollup."""
+        timestamp = str(snapshot['timestamp'])
+        rollup = {
+            'samples': 1,
+            'online_samples': 1 if snapshot.get('server_status') == 'online' else 0,
+            'last_timestamp': timestamp,
+            'avg_active_users': snapshot.get('active_users') or 0,
+            'max_active_users': snapshot.get('active_users') or 0,
+            'bucket_source': timestamp,
+        }
+        for key in ('server_name', 'server_version', 'server_id'):
+            rollup[key] = snapshot.get(key)
+        for metric, _ in STATS_METRICS:
+            rollup[metric] = snapshot.get(metric)
+        for column in STATS_BLOB_COLUMNS:
+            rollup[f"{column}_hash"] = snapshot.get(f"{column}_hash")
+        return rollup
+
+    async def _merge_stats_rollups(self, db, resolution: str, rollups: List[Dict[str, Any]]) -> None:
+        """
+        Fold rollups (or single snapshots) into `resolution` buckets.
+
+        Counts add up, averages are weighted by samples, peaks take the
+        maximum, and every other value comes from the latest input. Buckets
+        that already exist are merged the same way.
+
+        Args:
+            db: Writer connection, inside a transaction
+            resolution: Target resolution ("hour" or "day")
+            rollups: Inputs ordered oldest first
+        """
+        bucket_of = _ROLLUP_BUCKETS[resolution]
+        merged: Dict[str, Dict[str, Any]] = {}
+        for rollup in rollups:
+            bucket = bucket_of(rollup.get('bucket_source') or rollup['bucket_start'])
+            if bucket not in merged:
+                cursor = await db.execute(
+                    "SELECT * FROM jellyfin_stats_rollups WHERE resolution = ? AND bucket_start = ?",
+                    (resolution, bucket)
+                )
+                existing = await cursor.fetchone()
+                if existing is None:
+                    merged[bucket] = dict(rollup, resolution=resolution, bucket_start=bucket)
+                    continue
+                merged[bucket] = dict(existing)
+
+            target = merged[bucket]
+            samples = target['samples'] + rollup['samples']
+            target['avg_active_users'] = (
+                (target['avg_active_users'] or 0) * target['samples']
+                + (rollup['avg_active_users'] or 0) * rollup['samples']
+            ) / samples
+            target['max_active_users'] = max(target['max_active_users'] or 0, rollup['max_active_users'] or 0)
+            target['samples'] = samples
+            target['online_samples'] += rollup['online_samples']
+            if rollup['last_timestamp'] >= target['last_timestamp']:
+                for key, value in rollup.items():
+                    if key not in ('samples', 'online_samples', 'avg_active_users', 'max_active_users',
+                                   'bucket_source', 'resolution', 'bucket_start'):
+                        target[key] = value
+
+        columns = ['resolution', 'bucket_start', 'samples', 'online_samples', 'last_timestamp',
+                   'avg_active_users', 'max_active_users', 'server_name', 'server_version', 'server_id',
+                   *(metric for metric, _ in STATS_METRICS), *(f"{c}_hash" for c in STATS_BLOB_COLUMNS)]
+        await db.executemany(
+            f"INSERT OR REPLACE INTO jellyfin_stats_rollups ({', '.join(columns)}) "
+            f"VALUES ({', '.join('?' * len(columns))})",
+            [tuple(rollup.get(column) for column in columns) for rollup in merged.values()]
+        )
     
+    def record_event(self, action: str, outcome: str, item_id: Optional[str] = None,
+                     item_name: Optional[str] = None, item_type: Optional[str] = None,
+                     event_type: Optional[str] = None, webhook: Optional[str] = None,
+                     latency_ms: Optional[float] = None) -> None:
+        """
+        Append a processed webhook to the notification event log.
+
+        The event is handed to the database writer task and committed with
+        the next group of writes; the caller doesn't wait for it, so logging
+        never slows down webhook handling.
+
+        Args:
+            action (str): What was done (new_item, upgraded_item, metadata_updated, ...)
+            outcome (str): Result status (success, filtered, queued, error)
+            item_id (Optional[str]): Jellyfin item id
+            item_name (Optional[str]): Item name
+            item_type (Optional[str]): Item type
+            event_type (Optional[str]): Jellyfin notification type (ItemAdded, ItemDeleted, ...)
+            webhook (Optional[str]): Discord webhook the item routes to
+            latency_ms (Optional[float]): Processing time in milliseconds
+
+        Example:
+            ```python
+            db_manager.record_event("new_item", "success", item_id=item.item_id,
+                                    item_name=item.name, item_type=item.item_type,
+                                    event_type="ItemAdded", webhook="movies", latency_ms=412.0)
+            ```
+        """
+        if self.read_only:
+            return
+        self._queue_write("event", {
+            'timestamp': datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S'),
+            'event_type': event_type,
+            'item_id': item_id,
+            'item_name': item_name,
+            'item_type': item_type,
+            'action': action,
+            'webhook': webhook,
+            'latency_ms': latency_ms,
+            'outcome': outcome,
+        })
+
+    @staticmethod
+    async def _insert_event(db, event: Dict[str, Any]) -> bool:
+        """Append one notification event and bump its daily counter (no commit)."""
+        await db.execute("""
+            INSERT INTO notification_events
+                (timestamp, event_type, item_id, item_name, item_type, action, webhook, latency_ms, outcome)
+            VALUES (:timestamp, :event_type, :item_id, :item_name, :item_type, :action, :webhook, :latency_ms, :outcome)
+        """, event)
+        await db.execute("""
+            INSERT INTO daily_event_counts (day, action, outcome, count) VALUES (?, ?, ?, 1)
+            ON CONFLICT(day, action, outcome) DO UPDATE SET count = count + 1
+        """, (event['timestamp'][:10], event['action'], event['outcome']))
+        return True
+
+    @cached_query
+    async def get_recent_changes(self, limit: int = 10, actions: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """
+        Get the most recent notification events, newest first.
+
+        Reads backwards along the rowid, so the cost depends on `limit`, not
+        on how long the log is.
+
+        Args:
+            limit (int): Maximum events returned
+            actions (Optional[List[str]]): Only these actions (e.g. ["new_item", "upgraded_item"])
+
+        Returns:
+            List[Dict[str, Any]]: Events with id (item id), name, media_type,
+                last_event (action), last_updated (timestamp), outcome, webhook
+                and latency_ms
+
+        Example:
+            ```python
+            for event in await db_manager.get_recent_changes(limit=5):
+                print(f"{event['last_updated']} {event['last_event']}: {event['name']}")
+            ```
+        """
+        where = ""
+        params: List[Any] = []
+        if actions:
+            where = f"WHERE action IN ({', '.join('?' * len(actions))})"
+            params.extend(actions)
+        try:
+            async with self._read_connection() as db:
+                cursor = await db.execute(f"""
+                    SELECT item_id, item_name, item_type, action, timestamp, outcome, webhook, latency_ms, event_type
+                    FROM notification_events {where}
+                    ORDER BY id DESC
+                    LIMIT ?
+                """, (*params, limit))
+                rows = await cursor.fetchall()
+            return [
+                {
+                    'id': row['item_id'],
+                    'name': row['item_name'],
+                    'media_type': row['item_type'],
+                    'last_event': row['action'],
+                    'last_updated': row['timestamp'],
+                    'event_type': row['event_type'],
+                    'outcome': row['outcome'],
+                    'webhook': row['webhook'],
+                    'latency_ms': row['latency_ms'],
+                }
+                for row in rows
+            ]
+        except Exception as e:
+            self.logger.error(f"Failed to get recent changes: {e}")
+            return []
+
+    @cached_query
+    async def get_event_counts(self, hours: int = 24) -> Dict[str, Dict[str, int]]:
+        """
+        Count notification events in the last `hours`, by action and outcome.
+
+        Answered from the covering `idx_notification_events_window` index
+        without touching the table rows.
+
+        Args:
+            hours (int): Window length in hours
+
+        Returns:
+            Dict[str, Dict[str, int]]: action -> outcome -> count
+        """
+        since = (datetime.now(timezone.utc) - timedelta(hours=hours)).strftime('%Y-%m-%d %H:%M:%S')
+        counts: Dict[str, Dict[str, int]] = {}
+        try:
+            async with self._read_connection() as db:
+                cursor = await db.execute("""
+                    SELECT action, outcome, COUNT(*) FROM notification_events
+                    WHERE timestamp >= ?
+                    GROUP BY action, outcome
+                """, (since,))
+                for action, outcome, count in await cursor.fetchall():
+                    counts.setdefault(action, {})[outcome] = count
+        except Exception as e:
+            self.logger.error(f"Failed to count notification events: {e}")
+        return counts
+
+    @cached_query
+    async def get_statistics(self) -> Dict[str, Any]:
+        """
+        Get item and notification counts for the web dashboard.
+
+        Everything comes from the in-memory content index and the daily
+        event counters, so the cost doesn't grow with library size or
+        notification history.
+
+        Returns:
+            Dict[str, Any]: Statistics including:
+                - total_items: Items in the database
+                - items_added_today / items_added_week: New-item events (UTC days)
+                - upgrades_today / upgrades_week: Upgrade events
+                - notifications_today: Events of any kind today
+                - errors_today: Events that failed today
+                - daily_counts: day -> action -> count for the last 7 days
+
+        Example:
+            ```python
+            stats = await db_manager.get_statistics()
+            logger.info(f"{stats['items_added_today']} items added today")
+            ```
+        """
+        today = datetime.now(timezone.utc).date()
+        week_start = (today - timedelta(days=6)).isoformat()
+        stats: Dict[str, Any] = {
+            'total_items': 0,
+            'items_added_today': 0,
+            'items_added_week': 0,
+            'upgrades_today': 0,
+            'upgrades_week': 0,
+            'notifications_today': 0,
+            'errors_today': 0,
+            'daily_counts': {},
+        }
+        try:
+            async with self._read_connection() as db:
+                if self.content_index is not None and self.content_index.loaded:
+                    stats['total_items'] = len(self.content_index)
+                else:
+                    cursor = await db.execute("SELECT COUNT(*) FROM media_items")
+                    stats['total_items'] = (await cursor.fetchone())[0]
+
+                cursor = await db.execute(
+                    "SELECT day, action, outcome, count FROM daily_event_counts WHERE day >= ?", (week_start,)
+                )
+                rows = await cursor.fetchall()
+
+            for day, action, outcome, count in rows:
+                day_counts = stats['daily_counts'].setdefault(day, {})
+                day_counts[action] = day_counts.get(action, 0) + count
+                is_today = day == today.isoformat()
+                if action == 'new_item':
+                    stats['items_added_week'] += count
+                    stats['items_added_today'] += count if is_today else 0
+                elif action == 'upgraded_item':
+                    stats['upgrades_week'] += count
+                    stats['upgrades_today'] += count if is_today else 0
+                if is_today:
+                    stats['notifications_today'] += count
+                    stats['errors_today'] += count if outcome == 'error' else 0
+        except Exception as e:
+            self.logger.error(f"Failed to get dashboard statistics: {e}")
+        return stats
+
+    async def has_sync_buckets(self) -> bool:
+        """
+        Check whether per-library bucket summaries have been established.
+
+        Returns:
+            bool: True if at least one library has a bucket summary
+        """
+        try:
+            async with self._read_connection() as db:
+                cursor = await db.execute("SELECT 1 FROM sync_buckets WHERE item_count > 0 LIMIT 1")
+                return await cursor.fetchone() is not None
+        except Exception as e:
+            self.logger.error(f"Failed to check sync bucket summaries: {e}")
+            return False
+
+    async def get_sync_buckets(self, library_id: str) -> Dict[str, tuple]:
+        """
+        Get the stored bucket summaries of one library.
+
+        Args:
+            library_id: Jellyfin library id
+
+        Returns:
+            Dict[str, tuple]: bucket -> (item_count, digest); empty buckets are omitted
+
+        Example:
+            ```python
+            summaries = await db.get_sync_buckets(library_id)
+            count, digest = summaries.get("a1", (0, 0))
+            ```
+        """
+        try:
+            async with self._read_connection() as db:
+                cursor = await db.execute(
+                    "SELECT bucket, item_count, digest FROM sync_buckets "
+                    "WHERE library_id = ? AND item_count > 0",
+                    (library_id,)
+                )
+                return {bucket: (count, digest) for bucket, count, digest in await cursor.fetchall()}
+        except Exception as e:
+            self.logger.error(f"Failed to get sync buckets for library {library_id}: {e}")
+            return {}
+
+    async def get_sync_tokens(self, item_ids: List[str]) -> Dict[str, tuple]:
+        """
+        Get the stored library and save token of specific items.
+
+        Args:
+            item_ids: Item ids to look up
+
+        Returns:
+            Dict[str, tuple]: item_id -> (library_id, server_token) for items in the database
+        """
+        try:
+            async with self._read_connection() as db:
+                return await self._load_sync_tokens(db, item_ids)
+        except Exception as e:
+            self.logger.error(f"Failed to get sync tokens: {e}")
+            return {}
+
+    async def get_library_bucket_items(self, library_id: str, buckets: List[str]) -> Dict[str, Optional[str]]:
+        """
+        Get the items stored for a library in the given buckets.
+
+        Args:
+            library_id: Jellyfin library id
+            buckets: Bucket keys from `sync_bucket()`
+
+        Returns:
+            Dict[str, Optional[str]]: item_id -> server_token
+        """
+        if not buckets:
+            return {}
+
+        wanted = set(buckets)
+        try:
+            async with self._read_connection() as db:
+                cursor = await db.execute(
+                    "SELECT item_id, server_token FROM media_items WHERE library_id = ?",
+                    (library_id,)
+                )
+                return {
+                    item_id: token for item_id, token in await cursor.fetchall()
+                    if sync_bucket(item_id) in wanted
+                }
+        except Exception as e:
+            self.logger.error(f"Failed to get bucket items for library {library_id}: {e}")
+            return {}
+
+    async def set_items_library(self, item_ids: List[str], library_id: Optional[str]) -> int:
+        """
+        Move items into a library's bucket summaries, or out of all of them.
+
+        Used when a bucket comparison finds items that are already up to date
+        but recorded under another (or no) library, and for items that are no
+        longer listed in the library they were recorded under (`library_id=None`).
+
+        Args:
+            item_ids: Items to update
+            library_id: New library id, or None to detach the items
+
+        Returns:
+            int: Number of items updated
+        """
+        if not item_ids:
+            return 0
+
+        try:
+            async with self._write_connection() as db:
+                await db.execute("BEGIN IMMEDIATE")
+                old_tokens = await self._load_sync_tokens(db, item_ids)
+                changes = [
+                    (item_id, old_library, token, library_id, token)
+                    for item_id, (old_library, token) in old_tokens.items()
+                    if old_library != library_id
+                ]
+                await db.executemany(
+                    "UPDATE media_items SET library_id = ? WHERE item_id = ?",
+                    [(library_id, change[0]) for change in changes]
+                )
+                await self._apply_bucket_changes(db, changes)
+                await db.commit()
+                return len(changes)
+        except Exception as e:
+            self.logger.error(f"Failed to update library of {len(item_ids)} items: {e}")
+            return 0
+
+    async def rebuild_sync_buckets(self) -> int:
+        """
+        Recompute every bucket summary from the media_items table.
+
+        The summaries are maintained incrementally on every save; this is a
+        repair tool for when they are suspected to have drifted.
+
+        Returns:
+            int: Number of non-empty buckets written
+        """
+        try:
+            async with self._write_connection() as db:
+                await db.execute("BEGIN IMMEDIATE")
+                cursor = await db.execute(
+                    "SELECT item_id, library_id, server_token FROM media_items WHERE library_id IS NOT NULL"
+                )
+                summaries: Dict[tuple, List[int]] = {}
+                for item_id, library_id, token in await cursor.fetchall():
+                    summary = summaries.setdefault((library_id, sync_bucket(item_id)), [0, 0])
+                    summary[0] += 1
+                    summary[1] ^= sync_token_digest(item_id, token)
+
+                await db.execute("DELETE FROM sync_buckets")
+                await db.executemany(
+                    "INSERT INTO sync_buckets (library_id, bucket, item_count, digest) VALUES (?, ?, ?, ?)",
+                    [(library_id, bucket, count, digest) for (library_id, bucket), (count, digest) in summaries.items()]
+                )
+                await db.commit()
+                self.logger.info(f"Rebuilt {len(summaries)} sync bucket summaries")
+                return len(summaries)
+        except Exception as e:
+            self.logger.error(f"Failed to rebuild sync bucket summaries: {e}")
+            return 0
+
+    async def quarantine_sync_items(self, entries: List[Dict[str, Any]]) -> int:
+        """
+        Record items that could not be synced, with the error that stopped them.
+
+        Items that fail again are updated in place: the error and timestamp are
+        refreshed and the failure count goes up, so persistent problems stand out.
+
+        Args:
+            entries: Quarantine records with keys item_id (may be None), item_name,
+                item_type, stage, start_index and error
+
+        Returns:
+            int: Number of entries written
+
+        Example:
+            ```python
+            await db.quarantine_sync_items([{
+                "item_id": "abc123", "item_name": "Broken Movie", "item_type": "Movie",
+                "stage": "convert", "start_index": 4200, "error": "invalid literal for int()"
+            }])
+            ```
+        """
+        if not entries:
+            return 0
+
+        now = datetime.now(timezone.utc).isoformat()
+        rows = [
+            (
+                entry.get('item_id') or f"index:{entry.get('start_index')}",
+                entry.get('item_id'),
+                entry.get('item_name'),
+                entry.get('item_type'),
+                entry.get('stage', 'unknown'),
+                entry.get('start_index'),
+                str(entry.get('error', ''))[:1000],
+                now,
+                now
+            )
+            for entry in entries
+        ]
+
+        try:
+            async with self._write_connection() as db:
+                await db.executemany("""
+                    INSERT INTO sync_quarantine (
+                        quarantine_key, item_id, item_name, item_type, stage,
+                        start_index, error, first_failed_at, last_failed_at
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(quarantine_key) DO UPDATE SET
+                        item_name = COALESCE(excluded.item_name, item_name),
+                        item_type = COALESCE(excluded.item_type, item_type),
+                        stage = excluded.stage,
+                        start_index = excluded.start_index,
+                        error = excluded.error,
+                        failure_count = failure_count + 1,
+                        last_failed_at = excluded.last_failed_at
+                """, rows)
+                await db.commit()
+            self.logger.warning(f"Quarantined {len(rows)} item(s) that could not be synced")
+            return len(rows)
+        except Exception as e:
+            self.logger.error(f"Failed to record quarantined sync items: {e}")
+            return 0
+
+    async def get_quarantined_items(self, limit: int = 100) -> List[Dict[str, Any]]:
+        """
+        Get items currently quarantined by the library sync.
+
+        Args:
+            limit: Maximum number of entries to return (most recent failures first)
+
+        Returns:
+            List[Dict[str, Any]]: Quarantine records
+        """
+        try:
+            async with self._read_connection() as db:
+                cursor = await db.execute("""
+                    SELECT * FROM sync_quarantine
+                    ORDER BY last_failed_at DESC
+                    LIMIT ?
+                """, (limit,))
+                return [dict(row) for row in await cursor.fetchall()]
+        except Exception as e:
+            self.logger.error(f"Failed to get quarantined items: {e}")
+            return []
+
+    async def get_quarantined_item_ids(self) -> set:
+        """
+        Get the ids of all quarantined items whose id is known.
+
+        Returns:
+            set: Quarantined item ids
+        """
+        try:
+            async with self._read_connection() as db:
+                cursor = await db.execute("SELECT item_id FROM sync_quarantine WHERE item_id IS NOT NULL")
+                return {row[0] for row in await cursor.fetchall()}
+        except Exception as e:
+            self.logger.error(f"Failed to get quarantined item ids: {e}")
+            return set()
+
+    async def release_quarantined_items(self, item_ids: List[str]) -> int:
+        """
+        Remove items from quarantine after they synced successfully.
+
+        Args:
+            item_ids: Ids of items that were saved
+
+        Returns:
+            int: Number of quarantine entries removed
+        """
+        if not item_ids:
+            return 0
+
+        try:
+            async with self._write_connection() as db:
+                cursor = await db.executemany(
+                    "DELETE FROM sync_quarantine WHERE quarantine_key = ?",
+                    [(item_id,) for item_id in item_ids]
+                )
+                await db.commit()
+                return cursor.rowcount
+        except Exception as e:
+            self.logger.error(f"Failed to release quarantined items: {e}")
+            return 0
+
+    async def clear_resolved_quarantine(self, sync_started_at: str) -> int:
+        """
+        Remove quarantine entries that did not fail again during a full sync.
+
+        After a complete library sync, anything that wasn't re-quarantined either
+        synced successfully or no longer exists in Jellyfin.
+
+        Args:
+            sync_started_at: ISO timestamp of when the full sync started
+
+        Returns:
+            int: Number of entries removed
+        """
+        try:
+            async with self._write_connection() as db:
+                cursor = await db.execute(
+                    "DELETE FROM sync_quarantine WHERE last_failed_at < ?",
+                    (sync_started_at,)
+                )
+                await db.commit()
+                return cursor.rowcount
+        except Exception as e:
+            self.logger.error(f"Failed to clear resolved quarantine entries: {e}")
+            return 0
+
     async def close(self) -> None:
         """
         Clean shutdown of database manager.
@@ -1094,8 +3837,48 @@ class DatabaseManager:
             ```
         """
         self.logger.info(f"Database manager shutdown. Final connection count: {self._connection_count}")
+
+        for _, query in self._result_cache.values():
+            query.cancel()
+        self._result_cache.clear()
         if self._connection_count > 0:
             self.logger.warning(f"Shutdown with {self._connection_count} active connections")
 
-        # WAL mode connections will be automatically closed by SQLite
-        # No explicit cleanup needed for aiosqlite connections
\ No newline at end of file
+        # An unfinished format migration is discarded and restarted on the next
+        # startup; a content hash upgrade continues where it stopped
+        for task in (self._rehash_task, self._schema_migration_task):
+            if task is not None and not task.done():
+                task.cancel()
+                try:
+                    await task
+                except (asyncio.CancelledError, Exception):
+                    pass
+
+        # Let the writer task commit everything already queued, then stop it
+        if self._writer_task is not None and not self._writer_task.done():
+            self._write_requests.put_nowait(None)
+            try:
+                await self._writer_task
+            except Exception as e:
+                self.logger.warning(f"Database writer task ended with an error: {e}")
+        self._writer_task = None
+
+        # Close the pooled connections (waits for the writer to finish its current work)
+        async with self._pool_lock:
+            if not self._pool_open:
+                return
+            async with self._writer_lock:
+                try:
+                    if self._writer is not None:
+                        await self._writer.close()
+                except Exception as e:
+                    self.logger.warning(f"Error closing writer connection: {e}")
+            for reader in self._all_readers:
+                try:
+                    await reader.close()
+                except Exception as e:
+                    self.logger.warning(f"Error closing reader connection: {e}")
+            self._writer = None
+            self._all_readers = []
+            self._readers = asyncio.Queue()
+            self._pool_open = False
\ No newline at end of file
@@ -12,6 +12,10 @@ with additional metadata from the Jellyfin API.
 Classes:
     DatabaseItem: Slim media representation for database storage
 
+Functions:
+    sync_bucket: Bucket an item id belongs to in the per-library sync summaries
+    sync_token_digest: Digest of an item's id and Jellyfin save token for those summaries
+
 Author: Mark Newton
 Project: Jellynouncer
 Version: 1.0.0
@@ -19,13 +23,16 @@ License: MIT
 """
 
 import hashlib
-import json
-from dataclasses import dataclass, field, asdict
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from typing import Optional, List, Dict, Any
 
+from .content_hash import CONTENT_HASH_VERSION, compute_content_hash
+from .quality_score import QUALITY_SCORE_VERSION, compute_quality
+from .serializers import to_dict
+
 
-@dataclass
+@dataclass(slots=True)
 class DatabaseItem:
     """
     Slim media item representation for database storage.
@@ -44,6 +51,17 @@ class DatabaseItem:
     - Focuses on what matters: detecting quality upgrades
     - Clear separation between persisted and ephemeral data
     
+    **Memory Layout:**
+    Like MediaItem, DatabaseItem is a slotted dataclass (`slots=True`): its
+    fields are stored in fixed slots instead of a per-instance `__dict__`,
+    so an instance takes about 280 bytes instead of about 1.6KB (not
+    counting the strings it refers to), and construction and attribute
+    access are slightly faster. This matters during library syncs,
+    which build one DatabaseItem per library item. Attribute access,
+    `dataclasses.asdict()`, `replace()`, equality and pickling work as
+    before; the only difference is that attributes which aren't fields
+    can't be added to an instance.
+    
     Attributes:
         item_id: Unique Jellyfin identifier (primary key)
         name: Display name of the item
@@ -83,9 +101,22 @@ class DatabaseItem:
         file_size: File size in bytes
         library_name: Jellyfin library name
         
+        # Sync Tracking (not part of the content hash)
+        library_id: Jellyfin library the item was last listed in
+        server_token: Jellyfin's DateLastSaved for the item when it was synced
+        
         # Internal Tracking
         content_hash: Hash for change detection
         timestamp_created: When this record was created
+        hash_version: Content hash scheme content_hash was computed with
+            (`CONTENT_HASH_VERSION` for new items; older for rows stored by
+            previous versions until they are rehashed)
+        quality_score: Overall quality as one number, higher is better (see
+            the `quality_score` module)
+        quality_tier: Resolution class and HDR format as one number (30 = 1080p SDR)
+        quality_version: Scoring scheme quality_score was computed with
+        quality_upgraded_at: When the stored item's quality score last went up
+            (set by the database on save; None if it never did)
     """
     
     # ==================== CORE IDENTIFICATION ====================
@@ -127,66 +158,43 @@ class DatabaseItem:
     file_size: Optional[int] = None
     library_name: Optional[str] = None
     
+    # ==================== SYNC TRACKING ====================
+    library_id: Optional[str] = None
+    server_token: Optional[str] = None
+    
     # ==================== INTERNAL TRACKING ====================
     content_hash: str = field(default="", init=False)
     timestamp_created: str = field(default="", init=False)
+    hash_version: int = field(default=CONTENT_HASH_VERSION, init=False)
+    quality_score: int = field(default=0, init=False)
+    quality_tier: int = field(default=0, init=False)
+    quality_version: int = field(default=QUALITY_SCORE_VERSION, init=False)
+    quality_upgraded_at: Optional[str] = field(default=None, init=False)
     
     def __post_init__(self) -> None:
-        """Initialize timestamp and generate content hash after dataclass construction."""
+        """Initialize timestamp, content hash and quality score after dataclass construction."""
         if not self.timestamp_created:
             self.timestamp_created = datetime.now(timezone.utc).isoformat()
         
         # Generate content hash immediately
         if not self.content_hash:
             self.content_hash = self._generate_content_hash()
+
+        # Scored once here, so upgrade checks and the quality index compare integers
+        self.quality_score, self.quality_tier = compute_quality(self)
     
     def _generate_content_hash(self) -> str:
         """
         Generate content hash for change detection.
         
-        Uses the same hashing algorithm as MediaItem to ensure compatibility
-        when comparing DatabaseItem from database with MediaItem from webhook.
+        Uses the same hashing algorithm as MediaItem (see the `content_hash`
+        module) to ensure compatibility when comparing DatabaseItem from
+        database with MediaItem from webhook.
         
         Returns:
             str: Blake2b hash of technical specifications
         """
-        # Same hash data structure as MediaItem for compatibility
-        hash_data = {
-            # Core identification
-            "name": self.name,
-            "item_type": self.item_type,
-            
-            # Video specifications
-            "video_height": self.video_height,
-            "video_width": self.video_width,
-            "video_codec": self.video_codec,
-            "video_profile": self.video_profile,
-            "video_range": self.video_range,
-            "video_framerate": self.video_framerate,
-            "video_bitrate": self.video_bitrate,
-            "video_bitdepth": self.video_bitdepth,
-            
-            # Audio specifications
-            "audio_codec": self.audio_codec,
-            "audio_channels": self.audio_channels,
-            "audio_bitrate": self.audio_bitrate,
-            "audio_samplerate": self.audio_samplerate,
-            
-            # Subtitle information
-            "subtitle_count": self.subtitle_count,
-            "subtitle_languages": sorted(self.subtitle_languages) if self.subtitle_languages else [],
-            "subtitle_formats": sorted(self.subtitle_formats) if self.subtitle_formats else [],
-            
-            # File size
-            "file_size": self.file_size,
-        }
-        
-        # Use Blake2b for faster hashing
-        hash_string = json.dumps(hash_data, sort_keys=True, default=str)
-        return hashlib.blake2b(
-            hash_string.encode('utf-8'), 
-            digest_size=32
-        ).hexdigest()
+        return compute_content_hash(self)
     
     @classmethod
     def from_media_item(cls, media_item) -> 'DatabaseItem':
@@ -316,9 +324,9 @@ class DatabaseItem:
         Convert to dictionary for database storage.
         
         Returns:
-            dict: All fields as a dictionary
+            dict: All fields as a dictionary (same result as `dataclasses.asdict()`)
         """
-        return asdict(self)
+        return to_dict(self)
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'DatabaseItem':
@@ -334,14 +342,68 @@ class DatabaseItem:
         # Remove computed fields that shouldn't be passed to __init__
         content_hash = data.pop('content_hash', None)
         timestamp_created = data.pop('timestamp_created', None)
+        hash_version = data.pop('hash_version', None)
+        quality_upgraded_at = data.pop('quality_upgraded_at', None)
+        # Scores are recomputed with the current version
+        for computed in ('quality_score', 'quality_tier', 'quality_version'):
+            data.pop(computed, None)
         
         # Create instance
         instance = cls(**data)
         
-        # Set computed fields directly using setattr to avoid IDE warnings
+        # Set computed fields directly using setattr to avoid IDE warnings.
+        # A stored hash keeps the version it was made with.
         if content_hash:
             setattr(instance, 'content_hash', content_hash)
+            if hash_version:
+                setattr(instance, 'hash_version', hash_version)
         if timestamp_created:
             setattr(instance, 'timestamp_created', timestamp_created)
+        if quality_upgraded_at:
+            setattr(instance, 'quality_upgraded_at', quality_upgraded_at)
             
-        return instance
\ No newline at end of file
+        return instance
+
+
+# Number of leading item id characters that make up a sync bucket. Jellyfin ids
+# are hex GUIDs, so two characters give 256 buckets per library.
+SYNC_BUCKET_PREFIX_LENGTH = 2
+
+
+def sync_bucket(item_id: str) -> str:
+    """
+    Get the per-library summary bucket an item id belongs to.
+
+    Args:
+        item_id: Jellyfin item id
+
+    Returns:
+        str: Bucket key (the lower-cased id prefix)
+
+    Example:
+        ```python
+        sync_bucket("A1B2C3...")  # "a1"
+        ```
+    """
+    return item_id[:SYNC_BUCKET_PREFIX_LENGTH].lower()
+
+
+def sync_token_digest(item_id: str, server_token: Optional[str]) -> int:
+    """
+    Digest an item's id and Jellyfin save token for the bucket summaries.
+
+    Bucket summaries XOR these digests together, so the same value can be
+    computed from the database or from a lightweight Jellyfin listing, and an
+    item can be added to or removed from a summary without rescanning the
+    bucket. Digests are 62-bit so SQLite can combine them without overflowing
+    its signed 64-bit integers.
+
+    Args:
+        item_id: Jellyfin item id
+        server_token: The item's DateLastSaved as reported by Jellyfin
+
+    Returns:
+        int: Non-negative 62-bit digest
+    """
+    data = f"{item_id}|{server_token or ''}".encode('utf-8')
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), 'big') >> 2
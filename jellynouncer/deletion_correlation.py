@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+Jellynouncer Deletion Correlation Index
+
+When a file is upgraded or renamed, Jellyfin usually sends an ItemDeleted
+webhook for the old item followed by an ItemAdded webhook for the new one,
+with a new item id. WebhookService holds deletions back for a short while
+(`deletion_timeout`) so the add that follows can be paired with them and
+reported as an upgrade or filtered as a rename, instead of announcing a
+deletion and a new item.
+
+This module pairs them. Every pending deletion is filed under several
+*correlation keys*, and an incoming add looks up its own keys - a fixed
+handful of dictionary lookups, however many deletions are pending.
+
+**Matching Strategies** (tried in this order, the first hit wins):
+1. **Provider ids** (`imdb`, `tmdb`, `tvdb`): the `Provider_*` webhook
+   fields. They survive renames and re-encodes, and are the most reliable
+2. **Episode slot** (`episode`): series name, season and episode number,
+   so episodes with generic titles ("Pilot", "Episode 1") of different
+   series no longer collide
+3. **File path stem** (`path_stem`): the file name without directory,
+   extension and quality tags, so "Movie (2020) - 1080p.mkv" moved to
+   another folder or replaced by "Movie (2020) [2160p HDR].mkv" still matches
+4. **Name** (`name`): normalized name, type and year - the original
+   pairing, kept as a fallback for items without ids or path (never used
+   for episodes, whose names are too generic)
+
+Provider id, path and name keys include the item type (episode keys only
+exist for episodes), so a movie and an episode sharing a TMDb number
+(different TMDb namespaces) never match.
+
+Classes:
+    PendingDeletions: Pending ItemDeleted webhooks with their correlation keys
+
+Functions:
+    normalize_path_stem: Comparable form of a media file name
+    correlation_keys: Correlation keys of a webhook payload
+
+Author: Mark Newton
+Project: Jellynouncer
+Version: 1.0.0
+License: MIT
+"""
+
+import re
+from typing import Any, Dict, ItemsView, List, Optional, Tuple
+
+# Matching strategies, best first (reported as "matched_by" in webhook results)
+MATCH_IMDB = "imdb"
+MATCH_TMDB = "tmdb"
+MATCH_TVDB = "tvdb"
+MATCH_EPISODE = "episode"
+MATCH_PATH_STEM = "path_stem"
+MATCH_NAME = "name"
+
+MATCH_STRATEGIES = (MATCH_IMDB, MATCH_TMDB, MATCH_TVDB, MATCH_EPISODE, MATCH_PATH_STEM, MATCH_NAME)
+
+# Payload field of each provider id strategy
+_PROVIDER_FIELDS = ((MATCH_IMDB, 'Provider_imdb'), (MATCH_TMDB, 'Provider_tmdb'), (MATCH_TVDB, 'Provider_tvdb'))
+
+# (strategy, key values) - the strategy is part of the key, so values of
+# different strategies never collide
+CorrelationKey = Tuple[str, tuple]
+
+# Bracketed tags added by renamers: [1080p], [HDR10], {imdb-tt0133093}, ...
+_BRACKETED = re.compile(r"\[[^\]]*\]|\{[^}]*\}")
+_WORDS = re.compile(r"[^\W_]+")
+_RESOLUTION_WORD = re.compile(r"\d{3,4}[pi]")
+
+# Release/quality words that change when a file is upgraded
+_QUALITY_WORDS = frozenset((
+    "4k", "8k", "uhd", "hd", "sd", "fhd",
+    "sdr", "hdr", "hdr10", "hdr10plus", "dv", "dovi", "hlg",
+    "x264", "x265", "h264", "h265", "hevc", "avc", "av1", "xvid", "divx", "vp9",
+    "bluray", "bdrip", "brrip", "remux", "web", "webdl", "webrip", "dl", "hdtv", "dvdrip", "dvd",
+    "aac", "ac3", "eac3", "dts", "ma", "truehd", "atmos", "flac", "ddp", "dd",
+    "10bit", "8bit", "proper", "repack",
+))
+
+
+def normalize_path_stem(path: Optional[str]) -> Optional[str]:
+    """
+    Turn a media file path into a comparable file name stem.
+
+    Drops the directory and extension, bracketed tags and resolution or
+    release words, and ignores case and punctuation, so the same title
+    matches after a move or a quality upgrade.
+
+    Args:
+        path (Optional[str]): File path (Windows or POSIX separators)
+
+    Returns:
+        Optional[str]: Normalized stem, or None if nothing is left
+
+    Example:
+        ```python
+        normalize_path_stem("/movies/The Matrix (1999)/The Matrix (1999) - 1080p.mkv")
+        # "the matrix 1999"
+        normalize_path_stem("/new/The.Matrix.1999.2160p.HDR.x265.mkv")
+        # "the matrix 1999"
+        ```
+    """
+    if not path:
+        return None
+    name = path.replace("\\", "/").rsplit("/", 1)[-1]
+    stem = name.rsplit(".", 1)[0] if "." in name else name
+    words = [
+        word for word in _WORDS.findall(_BRACKETED.sub(" ", stem.casefold()))
+        if word not in _QUALITY_WORDS and not _RESOLUTION_WORD.fullmatch(word)
+    ]
+    return " ".join(words) or None
+
+
+def _normalize_text(value: Any) -> Optional[str]:
+    if not isinstance(value, str):
+        return None
+    return " ".join(value.split()).casefold() or None
+
+
+def _number(value: Any, padded: Any) -> Optional[int]:
+    """Season/episode number from the numeric field or its zero-padded text form."""
+    if isinstance(value, int):
+        return value
+    if isinstance(padded, str) and padded.strip().isdigit():
+        return int(padded)
+    return None
+
+
+def correlation_keys(payload: Any, file_path: Optional[str] = None) -> List[CorrelationKey]:
+    """
+    Build the correlation keys of a webhook payload, best strategy first.
+
+    Args:
+        payload: WebhookPayload (or anything with the same attributes)
+        file_path (Optional[str]): File path to use when the payload has none
+            (e.g. the stored path of a deleted item)
+
+    Returns:
+        List[CorrelationKey]: Keys for every strategy the payload has data for
+
+    Example:
+        ```python
+        correlation_keys(payload)
+        # [("imdb", ("Movie", "tt0133093")), ("path_stem", ("Movie", "the matrix 1999")),
+        #  ("name", ("Movie", "the matrix", 1999))]
+        ```
+    """
+    item_type = payload.ItemType
+    keys: List[CorrelationKey] = []
+
+    for strategy, field in _PROVIDER_FIELDS:
+        provider_id = _normalize_text(getattr(payload, field, None))
+        if provider_id:
+            keys.append((strategy, (item_type, provider_id)))
+
+    if item_type == "Episode":
+        series = _normalize_text(getattr(payload, 'SeriesName', None)) or getattr(payload, 'SeriesId', None)
+        season = _number(getattr(payload, 'SeasonNumber', None), getattr(payload, 'SeasonNumber00', None))
+        episode = _number(getattr(payload, 'EpisodeNumber', None), getattr(payload, 'EpisodeNumber00', None))
+        if series and season is not None and episode is not None:
+            keys.append((MATCH_EPISODE, (series, season, episode)))
+
+    stem = normalize_path_stem(getattr(payload, 'Path', None) or file_path)
+    if stem:
+        keys.append((MATCH_PATH_STEM, (item_type, stem)))
+
+    if item_type != "Episode":
+        name = _normalize_text(payload.Name)
+        if name:
+            keys.append((MATCH_NAME, (item_type, name, getattr(payload, 'Year', None))))
+
+    return keys
+
+
+class PendingDeletions:
+    """
+    Pending ItemDeleted webhooks, indexed by their correlation keys.
+
+    Entries are kept by deleted item id. Each entry's correlation keys point
+    back to it, so `match()` costs one dictionary lookup per key of the
+    incoming add. If two pending deletions share a key (two copies of a
+    movie deleted together), the key belongs to the most recent one; the
+    other can still match through its remaining keys.
+
+    Attributes:
+        key_collisions (int): Keys taken over by a later deletion
+
+    Example:
+        ```python
+        pending = PendingDeletions()
+        pending.add(delete_payload, time.time())
+
+        matched = pending.match(add_payload)
+        if matched:
+            strategy, deletion_info = matched
+            pending.pop(deletion_info['item_id'])
+        ```
+    """
+
+    def __init__(self):
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._by_key: Dict[CorrelationKey, str] = {}
+        self.key_collisions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, item_id: str) -> bool:
+        return item_id in self._entries
+
+    def items(self) -> ItemsView[str, Dict[str, Any]]:
+        """Deleted item id -> deletion info, oldest first."""
+        return self._entries.items()
+
+    def add(self, payload: Any, timestamp: float, file_path: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Queue a deletion and file it under its correlation keys.
+
+        A second deletion of the same item replaces the first.
+
+        Args:
+            payload: The ItemDeleted WebhookPayload
+            timestamp (float): When the deletion arrived (`time.time()`)
+            file_path (Optional[str]): The item's file path, if the payload has none
+
+        Returns:
+            Dict[str, Any]: Deletion info (`payload`, `timestamp`, `item_id`,
+                `file_path` and the correlation `keys`)
+        """
+        self.pop(payload.ItemId)
+        keys = correlation_keys(payload, file_path)
+        info = {
+            'payload': payload,
+            'timestamp': timestamp,
+            'item_id': payload.ItemId,
+            'file_path': getattr(payload, 'Path', None) or file_path,
+            'keys': keys,
+        }
+        self._entries[payload.ItemId] = info
+        for key in keys:
+            if key in self._by_key:
+                self.key_collisions += 1
+            self._by_key[key] = payload.ItemId
+        return info
+
+    def match(self, payload: Any) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """
+        Find the pending deletion an added item most likely replaces.
+
+        Args:
+            payload: The ItemAdded WebhookPayload
+
+        Returns:
+            Optional[Tuple[str, Dict[str, Any]]]: (matching strategy, deletion
+                info) for the best strategy that matched, or None
+        """
+        if not self._entries:
+            return None
+        for key in correlation_keys(payload):
+            item_id = self._by_key.get(key)
+            if item_id is not None:
+                return key[0], self._entries[item_id]
+        return None
+
+    def pop(self, item_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Remove a pending deletion and its keys.
+
+        Args:
+            item_id (str): Deleted item id
+
+        Returns:
+            Optional[Dict[str, Any]]: The deletion info, or None if it wasn't pending
+        """
+        info = self._entries.pop(item_id, None)
+        if info is not None:
+            for key in info['keys']:
+                # Only if a later deletion hasn't taken the key over
+                if self._by_key.get(key) == item_id:
+                    del self._by_key[key]
+        return info
@@ -32,13 +32,13 @@ import re
 from datetime import datetime, timezone
 from typing import Dict, Any, Optional, List, Tuple
 from collections import OrderedDict
-from dataclasses import asdict
 
 import aiohttp
 from jinja2 import Environment, FileSystemLoader, TemplateNotFound, TemplateSyntaxError
 
 from .config_models import DiscordConfig
 from .media_models import MediaItem
+from .serializers import to_dict, to_json_dict
 from .utils import get_logger
 
 
@@ -323,7 +323,24 @@ class ThumbnailManager:
         self.cache[key] = (value, time.time())
         # Move to end for LRU
         self.cache.move_to_end(key)
-    
+
+    def prune_expired(self) -> int:
+        """
+        Remove expired entries from the thumbnail URL cache.
+
+        Expired entries are normally only dropped when they are looked up again,
+        so URLs for items that are never requested again would otherwise sit in
+        memory until LRU eviction pushes them out.
+
+        Returns:
+            int: Number of cache entries removed
+        """
+        cutoff = time.time() - self.cache_ttl
+        expired_keys = [key for key, (_, cached_time) in self.cache.items() if cached_time < cutoff]
+        for key in expired_keys:
+            del self.cache[key]
+        return len(expired_keys)
+
     async def verify_thumbnail(self, url: str) -> bool:
         """
         Verify that a thumbnail URL is accessible and returns valid image data.
@@ -701,22 +718,39 @@ class DiscordNotifier:
             ```
         """
 
-        def _get_webhook_url_if_enabled(webhook_name: str) -> Optional[str]:
-            """
-            Helper function to safely get webhook URL if webhook exists, is enabled, and has URL.
+        webhook_name = self.get_webhook_name(media_type)
+        if webhook_name is None:
+            self.logger.warning(f"No webhook configured for media type: {media_type}")
+            return None
 
-            Args:
-                webhook_name (str): Key name in the webhooks dictionary
+        self.logger.debug(f"Using {webhook_name} webhook for {media_type}")
+        return self.config.webhooks[webhook_name].url
 
-            Returns:
-                Optional[str]: Webhook URL if available and enabled, None otherwise
-            """
+    def get_webhook_name(self, media_type: str) -> Optional[str]:
+        """
+        Get the name of the webhook a media type is routed to.
+
+        Same routing as `get_webhook_url()` (specific webhook first, then
+        "default"), but returns the configuration key instead of the URL so
+        it can be logged or shown without exposing the webhook token.
+
+        Args:
+            media_type (str): Type of media content (Movie, Series, Episode, Audio, etc.)
+
+        Returns:
+            Optional[str]: Webhook key ("movies", "tv", "music" or "default"),
+                or None if no enabled webhook applies
+
+        Example:
+            ```python
+            notifier.get_webhook_name("Episode")  # "tv", or "default" if tv is disabled
+            ```
+        """
+
+        def _is_enabled(webhook_name: str) -> bool:
+            """Check that a webhook exists, is enabled, and has a URL."""
             webhook_config = self.config.webhooks.get(webhook_name)
-            if (webhook_config and
-                    webhook_config.enabled and
-                    webhook_config.url):
-                return webhook_config.url
-            return None
+            return bool(webhook_config and webhook_config.enabled and webhook_config.url)
 
         # Map media types to webhook configuration keys
         webhook_type_mapping = {
@@ -729,22 +763,12 @@ class DiscordNotifier:
             "MusicArtist": "music"
         }
 
-        # Try to get specific webhook for this media type
+        # Try the specific webhook for this media type, then the general/default one
         webhook_key = webhook_type_mapping.get(media_type)
-        if webhook_key:
-            specific_webhook_url = _get_webhook_url_if_enabled(webhook_key)
-            if specific_webhook_url:
-                self.logger.debug(f"Using specific {webhook_key} webhook for {media_type}")
-                return specific_webhook_url
-
-        # Fall back to general/default webhook
-        default_webhook_url = _get_webhook_url_if_enabled("default")
-        if default_webhook_url:
-            self.logger.debug(f"Using default webhook for {media_type}")
-            return default_webhook_url
-
-        # No webhook configured
-        self.logger.warning(f"No webhook configured for media type: {media_type}")
+        if webhook_key and _is_enabled(webhook_key):
+            return webhook_key
+        if _is_enabled("default"):
+            return "default"
         return None
     
     def get_queue_stats(self) -> Dict[str, Any]:
@@ -779,8 +803,31 @@ class DiscordNotifier:
         # Add configuration info
         stats['max_queue_size'] = self.max_queue_size
         stats['max_retries'] = self.max_retries
-        
+
         return stats
+
+    def get_pending_notification_count(self) -> int:
+        """
+        Get the number of notifications waiting in the retry queue.
+
+        Used by the maintenance scheduler to hold back heavy jobs while
+        notifications are still being delivered.
+
+        Returns:
+            int: Number of queued notifications (0 if the queue isn't running)
+        """
+        return self.notification_queue.qsize() if self.notification_queue else 0
+
+    def prune_caches(self) -> int:
+        """
+        Remove expired entries from the notifier's in-memory caches.
+
+        Returns:
+            int: Number of cache entries removed
+        """
+        if not self.thumbnail_manager:
+            return 0
+        return self.thumbnail_manager.prune_expired()
     
     def get_template_performance_stats(self) -> Dict[str, Any]:
         """
@@ -1252,7 +1299,7 @@ class DiscordNotifier:
             ```
         """
         # Convert item to dictionary for template
-        item_dict = asdict(item)
+        item_dict = to_dict(item)
 
         # Add metadata from the passed parameter if available
         if metadata:
@@ -1278,25 +1325,25 @@ class DiscordNotifier:
         else:
             # Try to get metadata from item attributes (backward compatibility)
             if hasattr(item, 'omdb') and 'omdb' not in item_dict:
-                self.logger.debug("⚠️ OMDb metadata lost in asdict() - manually adding")
+                self.logger.debug("⚠️ OMDb metadata lost in to_dict() - manually adding")
                 omdb_data = getattr(item, 'omdb', None)
                 if omdb_data:
                     item_dict['omdb'] = omdb_data.to_dict() if hasattr(omdb_data, 'to_dict') else omdb_data
 
             if hasattr(item, 'tmdb') and 'tmdb' not in item_dict:
-                self.logger.debug("⚠️ TMDb metadata lost in asdict() - manually adding")
+                self.logger.debug("⚠️ TMDb metadata lost in to_dict() - manually adding")
                 tmdb_data = getattr(item, 'tmdb', None)
                 if tmdb_data:
                     item_dict['tmdb'] = tmdb_data.to_dict() if hasattr(tmdb_data, 'to_dict') else tmdb_data
 
             if hasattr(item, 'tvdb') and 'tvdb' not in item_dict:
-                self.logger.debug("⚠️ TVDb metadata lost in asdict() - manually adding")
+                self.logger.debug("⚠️ TVDb metadata lost in to_dict() - manually adding")
                 tvdb_data = getattr(item, 'tvdb', None)
                 if tvdb_data:
                     item_dict['tvdb'] = tvdb_data.to_dict() if hasattr(tvdb_data, 'to_dict') else tvdb_data
 
             if hasattr(item, 'ratings') and 'ratings' not in item_dict:
-                self.logger.debug("⚠️ Ratings data lost in asdict() - manually adding")
+                self.logger.debug("⚠️ Ratings data lost in to_dict() - manually adding")
                 item_dict['ratings'] = getattr(item, 'ratings', {})
 
         self.logger.debug(f"Final item_dict keys: {list(item_dict.keys())}")
@@ -1548,7 +1595,7 @@ class DiscordNotifier:
         from datetime import datetime, date
         
         if dataclasses.is_dataclass(obj):
-            return dataclasses.asdict(obj)
+            return to_json_dict(obj)
         elif isinstance(obj, (datetime, date)):
             return obj.isoformat()
         elif isinstance(obj, dict):
@@ -2052,13 +2099,13 @@ class DiscordNotifier:
         }
         
         # Convert item to dict and manually add metadata (since it's not a dataclass field)
-        item_dict = asdict(sample_item)
+        item_dict = to_dict(sample_item)
         
         # Add metadata to dict (matching what happens in render_embed)
         if sample_item.omdb:
-            item_dict['omdb'] = sample_omdb.to_dict() if hasattr(sample_omdb, 'to_dict') else asdict(sample_omdb)
+            item_dict['omdb'] = sample_omdb.to_dict() if hasattr(sample_omdb, 'to_dict') else to_dict(sample_omdb)
         if sample_item.tmdb:
-            item_dict['tmdb'] = sample_tmdb.to_dict() if hasattr(sample_tmdb, 'to_dict') else asdict(sample_tmdb)
+            item_dict['tmdb'] = sample_tmdb.to_dict() if hasattr(sample_tmdb, 'to_dict') else to_dict(sample_tmdb)
         if hasattr(sample_item, 'ratings'):
             item_dict['ratings'] = sample_item.ratings
         
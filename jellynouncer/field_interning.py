@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Jellynouncer Field Value Interning
+
+This module keeps one shared copy of each value of the low-cardinality item
+fields (codecs, ranges, languages, item types, library and series names)
+so that items converted during a sync don't each carry their own copy.
+
+**Why?**
+`json.loads()` creates a new string for every value in every API response,
+so a library of 500,000 items holds 500,000 separate "hevc" strings, another
+500,000 "eng" strings and so on, although these fields only take a handful
+of distinct values. Passing each value through its field's intern table
+replaces the copy with the table's shared string, and the copy is freed
+together with the API response.
+
+**Bounded Tables:**
+Every field has its own table with a size limit. Once a table is full, new
+values are returned unchanged (and counted as overflow) instead of being
+added, so a field with unexpectedly many distinct values can't grow a
+table without limit - it simply stops benefiting from interning. A table
+lookup is a plain dictionary lookup; only values that aren't in the table
+yet run any Python code.
+
+Classes:
+    InternTable: Bounded value -> shared value table for one field
+
+Attributes:
+    INTERN_TABLE_LIMITS: Maximum distinct values kept per field
+    field_values: The shared tables, keyed by field name
+
+Author: Mark Newton
+Project: Jellynouncer
+Version: 1.0.0
+License: MIT
+"""
+
+from typing import Any, Dict
+
+# Maximum number of distinct values kept per field. Series names are the
+# only field whose cardinality grows with the library, hence the larger limit.
+INTERN_TABLE_LIMITS: Dict[str, int] = {
+    'item_type': 64,
+    'library_name': 256,
+    'series_name': 16384,
+    'video_codec': 256,
+    'video_profile': 256,
+    'video_range': 64,
+    'audio_codec': 256,
+    'audio_language': 512,
+    'subtitle_language': 512,
+    'subtitle_format': 128,
+}
+
+
+class InternTable(dict):
+    """
+    Bounded intern table for the values of one item field.
+
+    `table[value]` returns the table's copy of an equal string, adding
+    `value` first if it's new and the table isn't full. Values that aren't
+    strings (None, numbers) are returned as they are.
+
+    Because this is a dict subclass that only overrides `__missing__`,
+    looking up a value that's already in the table runs entirely in C.
+
+    Attributes:
+        field (str): Item field the table belongs to
+        max_size (int): Maximum number of values kept
+        overflow (int): Lookups that couldn't be added because the table was full
+
+    Example:
+        ```python
+        codecs = InternTable('video_codec', max_size=256)
+        first = codecs[json.loads('"hevc"')]
+        second = codecs[json.loads('"hevc"')]
+        assert first is second
+        ```
+    """
+
+    __slots__ = ('field', 'max_size', 'overflow')
+
+    def __init__(self, field: str, max_size: int) -> None:
+        super().__init__()
+        self.field = field
+        self.max_size = max_size
+        self.overflow = 0
+
+    def __missing__(self, value: Any) -> Any:
+        if value.__class__ is not str:
+            return value
+        if len(self) < self.max_size:
+            self[value] = value
+        else:
+            self.overflow += 1
+        return value
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get the table's fill level.
+
+        Returns:
+            Dict[str, int]: `values` held, `max_size` and `overflow` count
+        """
+        return {'values': len(self), 'max_size': self.max_size, 'overflow': self.overflow}
+
+
+# One table per field, shared by every converter in the process
+field_values: Dict[str, InternTable] = {
+    field: InternTable(field, limit) for field, limit in INTERN_TABLE_LIMITS.items()
+}
@@ -30,6 +30,8 @@ from jellyfin_apiclient_python import JellyfinClient
 
 from .config_models import JellyfinConfig
 from .media_models import MediaItem
+from .field_interning import field_values
+from .media_item_view import LazyMediaItem
 from .utils import get_logger
 
 
@@ -812,9 +814,187 @@ class JellyfinAPI:
             self.logger.error(f"Failed to retrieve library items: {e}")
             return []
 
+    # Fields needed for DatabaseItem conversion and content hashing during syncs
+    SYNC_FIELDS = ",".join([
+        # Media stream information (required for change detection)
+        "MediaStreams",  # → Video/Audio/Subtitle specs for content hash
+        "MediaSources",  # → File size and container info
+        # TV Series hierarchy (required for episode identification)
+        "IndexNumber",  # → Episode/Season number
+        "ParentIndexNumber",  # → Season number for episodes
+        "SeriesName",  # → Series name for episodes
+        "SeriesId",  # → Series ID for hierarchy
+        "SeasonId",  # → Season ID for hierarchy
+        "ProductionYear",  # → Year for identification
+        # Sync tracking
+        "DateLastSaved"  # → Save token for per-library bucket summaries
+    ])
+    SYNC_ITEM_TYPES = 'Movie,Series,Season,Episode,Audio,MusicAlbum,Book,Photo'
+    # Library views that only reference items stored in other libraries
+    SYNC_SKIP_COLLECTION_TYPES = {'boxsets', 'playlists', 'livetv'}
+
+    async def get_items_page(
+        self,
+        start_index: int,
+        limit: int,
+        min_date_last_saved: Optional[datetime] = None,
+        minimal: bool = False
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Fetch a single page of library items for syncing.
+
+        The Jellyfin client library is synchronous, so the request runs in a
+        worker thread. This keeps the event loop free to process webhooks while
+        a sync is fetching, and lets several pages be fetched concurrently.
+
+        Args:
+            start_index (int): Index of the first item in the page
+            limit (int): Maximum number of items to return
+            min_date_last_saved (Optional[datetime]): Only return items saved in
+                Jellyfin at or after this time (incremental syncs)
+            minimal (bool): Skip the extra metadata fields and return only the
+                basic item (Id, Name, Type). Used to identify an item whose full
+                record makes the server fail.
+
+        Returns:
+            Tuple[List[Dict[str, Any]], int]: (page_items, total_record_count)
+
+        Raises:
+            Exception: Any error from the Jellyfin client is propagated so the
+                caller can decide whether to retry, split or skip the page
+
+        Example:
+            ```python
+            items, total = await jellyfin_api.get_items_page(0, 200)
+            logger.info(f"First page: {len(items)} of {total} items")
+            ```
+        """
+        params = {
+            'StartIndex': start_index,
+            'Limit': limit,
+            'Recursive': True,
+            'IncludeItemTypes': self.SYNC_ITEM_TYPES,
+            'EnableTotalRecordCount': True
+        }
+        if not minimal:
+            params['Fields'] = self.SYNC_FIELDS
+        if min_date_last_saved is not None:
+            # Jellyfin expects ISO 8601 UTC timestamps
+            if min_date_last_saved.tzinfo is None:
+                min_date_last_saved = min_date_last_saved.replace(tzinfo=timezone.utc)
+            params['MinDateLastSaved'] = min_date_last_saved.astimezone(timezone.utc).strftime(
+                '%Y-%m-%dT%H:%M:%S.0000000Z'
+            )
+
+        response = await asyncio.to_thread(self.client.jellyfin.user_items, params=params)
+        if not isinstance(response, dict):
+            raise ValueError(f"Invalid response for page at index {start_index}")
+
+        return response.get('Items', []), response.get('TotalRecordCount', 0)
+
+    async def get_sync_libraries(self) -> List[Dict[str, Any]]:
+        """
+        Get the libraries that own items, for per-library bucket syncs.
+
+        Collections, playlists and Live TV are skipped: they only reference
+        items that already belong to another library.
+
+        Returns:
+            List[Dict[str, Any]]: Library views (Id, Name, CollectionType), sorted by id
+
+        Raises:
+            Exception: If the library views can't be retrieved
+        """
+        views = await asyncio.to_thread(self.client.jellyfin.get_user_views, self.config.user_id)
+        libraries = [
+            view for view in (views or {}).get('Items', [])
+            if view.get('Id') and view.get('CollectionType') not in self.SYNC_SKIP_COLLECTION_TYPES
+        ]
+        return sorted(libraries, key=lambda view: view['Id'])
+
+    async def get_library_listing(self, library_id: str, page_size: int = 2000) -> Dict[str, Optional[str]]:
+        """
+        List the ids and save tokens of every item in a library.
+
+        This is the lightweight side of the bucket comparison: no media streams
+        or other metadata are requested, only each item's DateLastSaved, so a
+        large library can be listed in a few requests.
+
+        Args:
+            library_id (str): Jellyfin library (view) id
+            page_size (int): Items per request
+
+        Returns:
+            Dict[str, Optional[str]]: item_id -> DateLastSaved (None if Jellyfin didn't report one)
+
+        Raises:
+            Exception: If any page can't be retrieved - a partial listing
+                would make unchanged items look deleted
+
+        Example:
+            ```python
+            listing = await jellyfin_api.get_library_listing(library_id)
+            logger.info(f"Library has {len(listing)} items")
+            ```
+        """
+        listing: Dict[str, Optional[str]] = {}
+        start_index = 0
+        while True:
+            params = {
+                'ParentId': library_id,
+                'StartIndex': start_index,
+                'Limit': page_size,
+                'Recursive': True,
+                'Fields': 'DateLastSaved',
+                'IncludeItemTypes': self.SYNC_ITEM_TYPES,
+                'EnableImages': False,
+                'EnableUserData': False,
+                'EnableTotalRecordCount': True
+            }
+            response = await asyncio.to_thread(self.client.jellyfin.user_items, params=params)
+            if not isinstance(response, dict):
+                raise ValueError(f"Invalid listing response for library {library_id}")
+
+            items = response.get('Items', [])
+            for item in items:
+                if item.get('Id'):
+                    listing[item['Id']] = item.get('DateLastSaved')
+
+            start_index += len(items)
+            if not items or start_index >= response.get('TotalRecordCount', 0):
+                return listing
+
+    async def get_items_by_ids(self, item_ids: List[str]) -> List[Dict[str, Any]]:
+        """
+        Fetch specific items with the full sync fields.
+
+        Args:
+            item_ids (List[str]): Item ids to fetch (keep requests to a few hundred ids
+                so the URL stays a reasonable length)
+
+        Returns:
+            List[Dict[str, Any]]: Items Jellyfin returned (deleted ids are simply missing)
+
+        Raises:
+            Exception: Any error from the Jellyfin client
+        """
+        if not item_ids:
+            return []
+
+        params = {
+            'Ids': ','.join(item_ids),
+            'Fields': self.SYNC_FIELDS,
+            'EnableTotalRecordCount': False
+        }
+        response = await asyncio.to_thread(self.client.jellyfin.user_items, params=params)
+        if not isinstance(response, dict):
+            raise ValueError("Invalid response when fetching items by id")
+        return response.get('Items', [])
+
     async def get_items_stream(
         self,
-        batch_size: Optional[int] = None
+        batch_size: Optional[int] = None,
+        min_date_last_saved: Optional[datetime] = None
     ) -> AsyncGenerator[Tuple[List[Dict[str, Any]], int], None]:
         """
         Stream library items in batches as an async generator.
@@ -841,6 +1021,8 @@ class JellyfinAPI:
         
         Args:
             batch_size (Optional[int]): Number of items per request. If None, uses adaptive sizing
+            min_date_last_saved (Optional[datetime]): Only stream items saved in Jellyfin at or
+                after this time. Used by incremental syncs; None streams the whole library.
             
         Yields:
             Tuple[List[Dict[str, Any]], int]: Tuple of (batch_items, total_record_count)
@@ -897,40 +1079,19 @@ class JellyfinAPI:
             else:
                 self.logger.info(f"Library streaming: using specified batch size of {batch_size}")
             
+            if min_date_last_saved is not None:
+                self.logger.info(f"Library streaming: only items saved since {min_date_last_saved.isoformat()}")
+            
             while True:
                 try:
-                    # Use minimal sync fields for streaming (same as get_all_items)
-                    sync_fields = ",".join([
-                        # Media stream information (required for change detection)
-                        "MediaStreams",  # → Video/Audio/Subtitle specs for content hash
-                        "MediaSources",  # → File size and container info
-                        # TV Series hierarchy (required for episode identification)
-                        "IndexNumber",  # → Episode/Season number
-                        "ParentIndexNumber",  # → Season number for episodes
-                        "SeriesName",  # → Series name for episodes
-                        "SeriesId",  # → Series ID for hierarchy
-                        "SeasonId",  # → Season ID for hierarchy
-                        "ProductionYear"  # → Year for identification
-                    ])
-                    
                     # Add delay between requests to avoid overwhelming the server
                     if start_index > 0:  # No delay for first request
                         await asyncio.sleep(api_request_delay)
                     
-                    response = self.client.jellyfin.user_items(
-                        params={
-                            'StartIndex': start_index,
-                            'Limit': batch_size,
-                            'Recursive': True,
-                            'Fields': sync_fields,
-                            'IncludeItemTypes': 'Movie,Series,Season,Episode,Audio,MusicAlbum,Book,Photo',
-                            'EnableTotalRecordCount': True
-                        }
+                    batch_items, total_record_count = await self.get_items_page(
+                        start_index, batch_size, min_date_last_saved
                     )
                     
-                    batch_items = response.get('Items', [])
-                    total_record_count = response.get('TotalRecordCount', 0)
-                    
                     if not batch_items:
                         self.logger.debug("No more items to retrieve")
                         break
@@ -973,6 +1134,11 @@ class JellyfinAPI:
         This method extracts only the essential fields needed for database storage
         and change detection, skipping all the extra metadata that's not needed
         during syncs. This significantly speeds up sync operations.
+
+        Low-cardinality values (item type, series name, codecs, profile, range,
+        languages) are passed through the shared intern tables in
+        field_interning, so the items of a large library share one copy of
+        each value instead of holding one per item.
         
         Args:
             item_data: Raw item data from Jellyfin API
@@ -994,10 +1160,10 @@ class JellyfinAPI:
             # Extract only essential fields for database storage
             item_id = item_data.get('Id', 'unknown')
             name = item_data.get('Name', 'Unknown Item')
-            item_type = item_data.get('Type', 'Unknown')
+            item_type = field_values['item_type'][item_data.get('Type', 'Unknown')]
             
             # TV series data
-            series_name = item_data.get('SeriesName')
+            series_name = field_values['series_name'][item_data.get('SeriesName')]
             series_id = item_data.get('SeriesId')
             season_number = item_data.get('ParentIndexNumber')
             episode_number = item_data.get('IndexNumber')
@@ -1039,9 +1205,9 @@ class JellyfinAPI:
                 video = video_streams[0]
                 video_height = video.get('Height')
                 video_width = video.get('Width')
-                video_codec = video.get('Codec')
-                video_profile = video.get('Profile')
-                video_range = video.get('VideoRange')
+                video_codec = field_values['video_codec'][video.get('Codec')]
+                video_profile = field_values['video_profile'][video.get('Profile')]
+                video_range = field_values['video_range'][video.get('VideoRange')]
                 video_framerate = video.get('RealFrameRate')
                 video_bitrate = video.get('BitRate')
                 video_bitdepth = video.get('BitDepth')
@@ -1056,9 +1222,9 @@ class JellyfinAPI:
             audio_streams = [s for s in media_streams if s.get('Type') == 'Audio']
             if audio_streams:
                 audio = audio_streams[0]
-                audio_codec = audio.get('Codec')
+                audio_codec = field_values['audio_codec'][audio.get('Codec')]
                 audio_channels = audio.get('Channels')
-                audio_language = audio.get('Language')
+                audio_language = field_values['audio_language'][audio.get('Language')]
                 audio_bitrate = audio.get('BitRate')
                 audio_samplerate = audio.get('SampleRate')
             
@@ -1067,13 +1233,15 @@ class JellyfinAPI:
             subtitle_count = len(subtitle_streams)
             subtitle_languages = []
             subtitle_formats = []
+            subtitle_language_values = field_values['subtitle_language']
+            subtitle_format_values = field_values['subtitle_format']
             
             for sub_stream in subtitle_streams:
-                lang = sub_stream.get('Language')
+                lang = subtitle_language_values[sub_stream.get('Language')]
                 if lang and lang not in subtitle_languages:
                     subtitle_languages.append(lang)
                 
-                codec = sub_stream.get('Codec')
+                codec = subtitle_format_values[sub_stream.get('Codec')]
                 if codec and codec not in subtitle_formats:
                     subtitle_formats.append(codec)
             
@@ -1105,7 +1273,8 @@ class JellyfinAPI:
                 subtitle_formats=subtitle_formats,
                 file_path=file_path,
                 file_size=file_size,
-                library_name=library_name
+                library_name=library_name,
+                server_token=item_data.get('DateLastSaved')
             )
             
         except Exception as e:
@@ -1125,23 +1294,23 @@ class JellyfinAPI:
         our simplified MediaItem dataclass, extracting and normalizing the
         most important metadata fields for notification purposes.
 
-        **Data Transformation Process:**
-        1. Extract basic metadata (name, type, year, etc.)
-        2. Parse media stream information (video/audio specs)
-        3. Extract provider IDs (IMDb, TMDb, TVDb)
-        4. Normalize and clean data values
-        5. Generate content hash for change detection
+        **Lazy Conversion:**
+        The result is a LazyMediaItem (see media_item_view), a MediaItem
+        backed by `item_data`. Only the fields that change detection and the
+        database need are extracted here: identity, TV series data, the
+        video/audio/subtitle specifications, file information and server
+        details. The remaining fields (image tags, provider IDs, extra
+        stream details, genres, timestamps, ...) are extracted the first
+        time they are read, so a webhook that ends in a metadata-only update
+        never pays for them.
 
         **Stream Processing:**
         Jellyfin provides detailed media stream information including multiple
-        video and audio tracks. This method extracts the primary streams and
-        their technical specifications.
-
-        **Enhanced Field Mapping:**
-        This method now maps ALL webhook fields to ensure complete database
-        synchronization and template compatibility. It includes server information,
-        comprehensive media stream data, TV series hierarchy, timestamps, and
-        all technical specifications that appear in webhook payloads.
+        video and audio tracks. The first stream of each type provides the
+        technical specifications (webhook Video_0_*, Audio_0_*, Subtitle_0_*
+        fields). Subtitle languages and formats are not collected (they are
+        left empty and `subtitle_count` unset), so subtitle changes of items
+        converted here don't show in change detection or the content hash.
 
         Args:
             item_data (Dict[str, Any]): Raw item data from Jellyfin API
@@ -1168,470 +1337,49 @@ class JellyfinAPI:
         """
         try:
             # ==================== DEBUG LOGGING ====================
-            self.logger.debug("=" * 60)
-            self.logger.debug(f"JELLYFIN API RESPONSE DEBUG for item: {item_data.get('Name', 'Unknown')}")
-            self.logger.debug(f"Item Type: {item_data.get('Type', 'Unknown')}")
-            self.logger.debug(f"Item ID: {item_data.get('Id', 'Unknown')}")
+            # Guarded so the dumps aren't formatted at all unless debug logging is on
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug("=" * 60)
+                self.logger.debug(f"JELLYFIN API RESPONSE DEBUG for item: {item_data.get('Name', 'Unknown')}")
+                self.logger.debug(f"Item Type: {item_data.get('Type', 'Unknown')}")
+                self.logger.debug(f"Item ID: {item_data.get('Id', 'Unknown')}")
+
+                image_tags = item_data.get('ImageTags', {})
+                self.logger.debug(f"ImageTags present: {bool(image_tags)}")
+                if image_tags:
+                    self.logger.debug(f"ImageTags content: {image_tags}")
+                else:
+                    self.logger.debug("No ImageTags in API response!")
 
-            # Log the ImageTags structure
-            image_tags = item_data.get('ImageTags', {})
-            self.logger.debug(f"ImageTags present: {bool(image_tags)}")
-            if image_tags:
-                self.logger.debug(f"ImageTags content: {image_tags}")
-                self.logger.debug(f"  - Primary: {image_tags.get('Primary', 'NOT SET')}")
-                self.logger.debug(f"  - Backdrop: {image_tags.get('Backdrop', 'NOT SET')}")
-                self.logger.debug(f"  - Logo: {image_tags.get('Logo', 'NOT SET')}")
-                self.logger.debug(f"  - Thumb: {image_tags.get('Thumb', 'NOT SET')}")
-                self.logger.debug(f"  - Banner: {image_tags.get('Banner', 'NOT SET')}")
-            else:
-                self.logger.debug("No ImageTags in API response!")
-
-            # Log episode-specific tags
-            if item_data.get('Type') == 'Episode':
-                self.logger.debug(f"SeriesPrimaryImageTag: {item_data.get('SeriesPrimaryImageTag', 'NOT SET')}")
-                self.logger.debug(f"ParentBackdropImageTags: {item_data.get('ParentBackdropImageTags', 'NOT SET')}")
-                self.logger.debug(f"ParentLogoImageTag: {item_data.get('ParentLogoImageTag', 'NOT SET')}")
-
-            self.logger.debug("=" * 60)
-            # ==================== CORE IDENTIFICATION ====================
-            # Extract basic item information (always required)
-            item_id = item_data.get('Id', '')
-            name = item_data.get('Name', 'Unknown')
-            item_type = item_data.get('Type', 'Unknown')
-            year = item_data.get('ProductionYear')
-            overview = item_data.get('Overview', '')
+                if item_data.get('Type') == 'Episode':
+                    self.logger.debug(f"SeriesPrimaryImageTag: {item_data.get('SeriesPrimaryImageTag', 'NOT SET')}")
+                    self.logger.debug(f"ParentBackdropImageTags: {item_data.get('ParentBackdropImageTags', 'NOT SET')}")
+                    self.logger.debug(f"ParentLogoImageTag: {item_data.get('ParentLogoImageTag', 'NOT SET')}")
+
+                provider_ids = item_data.get('ProviderIds', {})
+                if provider_ids:
+                    self.logger.debug(f"Provider IDs from Jellyfin: {provider_ids}")
+                else:
+                    self.logger.debug(f"No provider IDs found for {item_data.get('Name', 'Unknown')}")
+                self.logger.debug("=" * 60)
 
             # ==================== SERVER INFORMATION ====================
             # Server info for webhook compatibility (fetch if needed)
-            server_id = None
-            server_name = None
-            server_version = None
-            server_url = self.config.server_url
+            server = {'server_url': self.config.server_url}
 
             # Try to get server info (using cached version if available)
             try:
                 # get_system_info now handles caching internally
                 server_info = await self.get_system_info()
                 if server_info:
-                    server_id = server_info.get('Id')
-                    server_name = server_info.get('ServerName')
-                    server_version = server_info.get('Version')
+                    server['server_id'] = server_info.get('Id')
+                    server['server_name'] = server_info.get('ServerName')
+                    server['server_version'] = server_info.get('Version')
             except Exception as e:
                 self.logger.debug(f"Could not fetch server info: {e}")
 
-            # ==================== THUMBNAILS ====================
-            # Add image tags from webhook data
-            primary_image_tag = item_data.get('ImageTags', {}).get('Primary')
-            backdrop_image_tag = item_data.get('ImageTags', {}).get('Backdrop')
-            logo_image_tag = item_data.get('ImageTags', {}).get('Logo')
-            thumb_image_tag = item_data.get('ImageTags', {}).get('Thumb')
-            banner_image_tag = item_data.get('ImageTags', {}).get('Banner')
-
-            # For episodes, also capture series image tags
-            series_primary_image_tag = item_data.get('SeriesPrimaryImageTag')
-            parent_backdrop_image_tag = item_data.get('ParentBackdropImageTags', [None])[0] if item_data.get(
-                'ParentBackdropImageTags') else None
-            parent_logo_image_tag = item_data.get('ParentLogoImageTag')
-
-            # DEBUG: Log what we extracted
-            self.logger.debug(f"Extracted image tags:")
-            self.logger.debug(f"  primary_image_tag: {primary_image_tag}")
-            self.logger.debug(f"  backdrop_image_tag: {backdrop_image_tag}")
-            self.logger.debug(f"  logo_image_tag: {logo_image_tag}")
-            self.logger.debug(f"  Type of primary_image_tag: {type(primary_image_tag)}")
-
-            # ==================== PROVIDER IDS ====================
-            # Extract external provider IDs (IMDb, TMDb, TVDb, etc.)
-            provider_ids = item_data.get('ProviderIds', {})
-            imdb_id = provider_ids.get('Imdb')
-            tmdb_id = provider_ids.get('Tmdb')
-            tvdb_id = provider_ids.get('Tvdb')
-            tvdb_slug = provider_ids.get('Tvdbslug')
-            
-            # Debug logging for provider IDs
-            if provider_ids:
-                self.logger.debug(f"Provider IDs from Jellyfin for {item_data.get('Name', 'Unknown')}:")
-                self.logger.debug(f"  - Raw ProviderIds: {provider_ids}")
-                self.logger.debug(f"  - IMDB: {imdb_id}")
-                self.logger.debug(f"  - TMDB: {tmdb_id}")
-                self.logger.debug(f"  - TVDB: {tvdb_id}")
-                self.logger.debug(f"  - TVDB Slug: {tvdb_slug}")
-            else:
-                self.logger.debug(f"No provider IDs found for {item_data.get('Name', 'Unknown')}")
-
-            # ==================== TV SERIES HIERARCHY ====================
-            # Extract TV series information for episodes and seasons
-            series_name = item_data.get('SeriesName')
-            series_id = item_data.get('SeriesId')
-            series_premiere_date = None
-            season_id = item_data.get('SeasonId')
-            season_number = item_data.get('ParentIndexNumber')  # Season number for episodes
-            episode_number = item_data.get('IndexNumber')  # Episode number for episodes
-            air_time = item_data.get('AirTime')
-
-            # For seasons, IndexNumber is the season number
-            if item_type == 'Season':
-                season_number = item_data.get('IndexNumber')
-
-            # Generate padded season/episode numbers (webhook SeasonNumber00, etc.)
-            season_number_padded = None
-            season_number_padded_3 = None
-            episode_number_padded = None
-            episode_number_padded_3 = None
-
-            if season_number is not None:
-                season_number_padded = f"{season_number:02d}"
-                season_number_padded_3 = f"{season_number:03d}"
-
-            if episode_number is not None:
-                episode_number_padded = f"{episode_number:02d}"
-                episode_number_padded_3 = f"{episode_number:03d}"
-
-            # ==================== RUNTIME INFORMATION ====================
-            # Extract runtime and convert to different formats
-            runtime_ticks = item_data.get('RunTimeTicks')
-            runtime_formatted = None
-
-            if runtime_ticks:
-                # Convert ticks to HH:MM:SS format (10,000 ticks = 1ms)
-                total_seconds = runtime_ticks // 10000000
-                hours = total_seconds // 3600
-                minutes = (total_seconds % 3600) // 60
-                seconds = total_seconds % 60
-                runtime_formatted = f"{hours:02d}:{minutes:02d}:{seconds:02d}"
-
-            # ==================== MEDIA STREAM PROCESSING ====================
-            # Extract comprehensive media stream information
-            video_height = None
-            video_width = None
-            video_codec = None
-            video_profile = None
-            video_level = None
-            video_framerate = None
-            video_range = None
-            video_interlaced = None
-            video_bitrate = None
-            video_bitdepth = None
-            video_colorspace = None
-            video_colortransfer = None
-            video_colorprimaries = None
-            video_pixelformat = None
-            video_refframes = None
-            aspect_ratio = None
-
-            # Video stream properties for webhook compatibility
-            video_title = None
-            video_type = None
-            video_language = None
-
-            # Audio stream properties
-            audio_codec = None
-            audio_channels = None
-            audio_bitrate = None
-            audio_samplerate = None
-            audio_title = None
-            audio_type = None
-            audio_language = None
-            audio_default = None
-
-            # Subtitle stream properties are extracted later from media_streams
-
-            # Get media streams from different possible locations
-            media_streams = []
-
-            # Try MediaSources first (most common)
-            if item_data.get('MediaSources'):
-                for source in item_data['MediaSources']:
-                    if 'MediaStreams' in source:
-                        media_streams.extend(source['MediaStreams'])
-            # Fallback to direct MediaStreams
-            elif 'MediaStreams' in item_data:
-                media_streams = item_data['MediaStreams']
-
-            # Process video streams (map to Video_0_* webhook fields)
-            video_streams = [s for s in media_streams if s.get('Type') == 'Video']
-            if video_streams:
-                video_stream = video_streams[0]  # Primary video stream
-
-                # Core video properties
-                video_height = video_stream.get('Height')
-                video_width = video_stream.get('Width')
-                video_codec = video_stream.get('Codec', '').lower()
-                video_profile = video_stream.get('Profile')
-                video_level = video_stream.get('Level')
-                video_framerate = video_stream.get('RealFrameRate')
-                video_range = video_stream.get('VideoRange', 'SDR')
-                video_interlaced = video_stream.get('IsInterlaced')
-                video_bitrate = video_stream.get('BitRate')
-                aspect_ratio = video_stream.get('AspectRatio')
-
-                # Extended video properties for webhook compatibility
-                video_title = video_stream.get('DisplayTitle')
-                video_type = 'Video'
-                video_language = video_stream.get('Language')
-                video_bitdepth = video_stream.get('BitDepth')
-                video_colorspace = video_stream.get('ColorSpace')
-                video_colortransfer = video_stream.get('ColorTransfer')
-                video_colorprimaries = video_stream.get('ColorPrimaries')
-                video_pixelformat = video_stream.get('PixelFormat')
-                video_refframes = video_stream.get('RefFrames')
-
-            # Process audio streams (map to Audio_0_* webhook fields)
-            audio_streams = [s for s in media_streams if s.get('Type') == 'Audio']
-            if audio_streams:
-                audio_stream = audio_streams[0]  # Primary audio stream
-
-                # Core audio properties
-                audio_codec = audio_stream.get('Codec', '').lower()
-                audio_channels = audio_stream.get('Channels')
-                audio_bitrate = audio_stream.get('BitRate')
-                audio_samplerate = audio_stream.get('SampleRate')
-
-                # Extended audio properties for webhook compatibility
-                audio_title = audio_stream.get('DisplayTitle')
-                audio_type = 'Audio'
-                audio_language = audio_stream.get('Language')
-                audio_default = audio_stream.get('IsDefault')
-
-            # Process subtitle streams for both single-stream webhook fields and aggregation
-            subtitle_streams = [s for s in media_streams if s.get('Type') == 'Subtitle']
-            
-            # Single subtitle stream properties (for webhook compatibility)
-            subtitle_title = None
-            subtitle_type = None
-            subtitle_language = None
-            subtitle_codec = None
-            subtitle_default = None
-            subtitle_forced = None
-            subtitle_external = None
-            
-            if subtitle_streams:
-                # First subtitle stream for webhook compatibility
-                subtitle_stream = subtitle_streams[0]
-                subtitle_title = subtitle_stream.get('DisplayTitle')
-                subtitle_type = 'Subtitle'
-                subtitle_language = subtitle_stream.get('Language')
-                subtitle_codec = subtitle_stream.get('Codec')
-                subtitle_default = subtitle_stream.get('IsDefault')
-                subtitle_forced = subtitle_stream.get('IsForced')
-                subtitle_external = subtitle_stream.get('IsExternal')
-            
-            # Aggregate subtitle information for change detection
-            subtitle_languages = []
-            subtitle_formats = []
-            
-            for sub_stream in subtitle_streams:
-                # Collect unique languages
-                lang = sub_stream.get('Language')
-                if lang and lang not in subtitle_languages:
-                    subtitle_languages.append(lang)
-                
-                # Collect unique formats/codecs
-                codec = sub_stream.get('Codec')
-                if codec and codec not in subtitle_formats:
-                    subtitle_formats.append(codec)
-
-            # ==================== FILE INFORMATION ====================
-            # Extract file system information
-            file_path = item_data.get('Path')
-            file_size = None
-            library_name = None
-
-            # Try to get file size from MediaSources
-            if item_data.get('MediaSources'):
-                for source in item_data['MediaSources']:
-                    if 'Size' in source:
-                        file_size = source['Size']
-                        break
-
-            # Try to extract library name from path or other sources
-            # This may require additional API calls in some cases
-            if 'ParentId' in item_data:
-                # For episodes/seasons, the library info might be in parent data
-                pass  # Could enhance this with additional API calls if needed
-
-            # ==================== METADATA COLLECTIONS ====================
-            # Extract collection information (genres, studios, tags)
-            genres = []
-            if 'Genres' in item_data:
-                genres = [genre.get('Name', '') if isinstance(genre, dict) else str(genre)
-                          for genre in item_data['Genres']]
-
-            studios = []
-            if 'Studios' in item_data:
-                studios = [studio.get('Name', '') if isinstance(studio, dict) else str(studio)
-                           for studio in item_data['Studios']]
-
-            tags = item_data.get('Tags', [])
-
-            # ==================== MUSIC-SPECIFIC FIELDS ====================
-            # Handle music-specific metadata
-            album = item_data.get('Album')
-            album_artist = item_data.get('AlbumArtist')
-            artists = []
-
-            if item_type in ['Audio', 'MusicVideo', 'MusicAlbum']:
-                # Extract artists from ArtistItems or Artists field
-                if 'ArtistItems' in item_data:
-                    artists = [artist.get('Name', '') for artist in item_data['ArtistItems']]
-                elif 'Artists' in item_data:
-                    artists = item_data['Artists']
-
-            # ==================== TIMESTAMP INFORMATION ====================
-            # Extract and format timestamp information
-            current_time = datetime.now(timezone.utc)
-
-            # Use current time for webhook-style timestamps
-            timestamp = current_time.strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3] + current_time.strftime('%z')
-            if not timestamp.endswith('Z') and not timestamp[-6] in ['+', '-']:
-                # Ensure proper timezone format
-                utc_timestamp = current_time.strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3] + 'Z'
-            else:
-                utc_timestamp = current_time.strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3] + 'Z'
-
-            # Extract creation and modification dates
-            date_created = item_data.get('DateCreated')
-            date_modified = item_data.get('DateLastMediaAdded') or item_data.get('DateModified')
-            premiere_date = item_data.get('PremiereDate', '')
-
-            # ==================== ADDITIONAL METADATA ====================
-            # Extract additional metadata fields
-            official_rating = item_data.get('OfficialRating')
-            tagline = item_data.get('Tagline', '')
-
-            # ==================== PHOTO-SPECIFIC METADATA ====================
-            # For image/photo content
-            width = None
-            height = None
-            if item_type in ['Photo', 'Image']:
-                width = item_data.get('Width')
-                height = item_data.get('Height')
-
-            # ==================== CREATE COMPREHENSIVE MEDIAITEM ====================
-            # Create MediaItem with ALL webhook fields mapped
-            media_item = MediaItem(
-                # Core identification (required fields)
-                item_id=item_id,
-                name=name,
-                item_type=item_type,
-
-                # Server information
-                server_id=server_id,
-                server_name=server_name,
-                server_version=server_version,
-                server_url=server_url,
-
-                # Content metadata
-                year=year,
-                series_name=series_name,
-                season_number=season_number,
-                episode_number=episode_number,
-                overview=overview,
-
-                # Image/thumbnail metadata
-                primary_image_tag=primary_image_tag,
-                backdrop_image_tag=backdrop_image_tag,
-                logo_image_tag=logo_image_tag,
-                thumb_image_tag=thumb_image_tag,
-                banner_image_tag=banner_image_tag,
-                series_primary_image_tag=series_primary_image_tag,
-                parent_backdrop_image_tag=parent_backdrop_image_tag,
-                parent_logo_image_tag=parent_logo_image_tag,
-
-                # Video technical specifications
-                video_height=video_height,
-                video_width=video_width,
-                video_codec=video_codec,
-                video_profile=video_profile,
-                video_range=video_range,
-                video_framerate=video_framerate,
-                aspect_ratio=aspect_ratio,
-
-                # Additional video properties for webhook compatibility
-                video_title=video_title,
-                video_type=video_type,
-                video_language=video_language,
-                video_level=video_level,
-                video_interlaced=video_interlaced,
-                video_bitrate=video_bitrate,
-                video_bitdepth=video_bitdepth,
-                video_colorspace=video_colorspace,
-                video_colortransfer=video_colortransfer,
-                video_colorprimaries=video_colorprimaries,
-                video_pixelformat=video_pixelformat,
-                video_refframes=video_refframes,
-
-                # Audio technical specifications
-                audio_codec=audio_codec,
-                audio_channels=audio_channels,
-                audio_bitrate=audio_bitrate,
-                audio_samplerate=audio_samplerate,
-
-                # Additional audio properties for webhook compatibility
-                audio_title=audio_title,
-                audio_type=audio_type,
-                audio_language=audio_language,
-                audio_default=audio_default,
-
-                # Subtitle information for webhook compatibility
-                subtitle_title=subtitle_title,
-                subtitle_type=subtitle_type,
-                subtitle_language=subtitle_language,
-                subtitle_codec=subtitle_codec,
-                subtitle_default=subtitle_default,
-                subtitle_forced=subtitle_forced,
-                subtitle_external=subtitle_external,
-
-                # External provider IDs
-                imdb_id=imdb_id,
-                tmdb_id=tmdb_id,
-                tvdb_id=tvdb_id,
-                tvdb_slug=tvdb_slug,
-
-                # TV series hierarchy fields
-                series_id=series_id,
-                series_premiere_date=series_premiere_date,
-                season_id=season_id,
-                season_number_padded=season_number_padded,
-                season_number_padded_3=season_number_padded_3,
-                episode_number_padded=episode_number_padded,
-                episode_number_padded_3=episode_number_padded_3,
-                air_time=air_time,
-
-                # File system information
-                file_path=file_path,
-                library_name=library_name,
-
-                # Timestamp information
-                timestamp=timestamp,
-                utc_timestamp=utc_timestamp,
-                premiere_date=premiere_date,
-
-                # Extended metadata from API
-                date_created=date_created,
-                date_modified=date_modified,
-                runtime_ticks=runtime_ticks,
-                runtime_formatted=runtime_formatted,
-                official_rating=official_rating,
-                tagline=tagline,
-                genres=genres,
-                studios=studios,
-                tags=tags,
-
-                # Music-specific metadata
-                album=album,
-                artists=artists,
-                album_artist=album_artist,
-
-                # Photo-specific metadata
-                width=width,
-                height=height,
-
-                # Internal tracking
-                file_size=file_size
-            )
-
-            self.logger.debug(f"Converted Jellyfin item to comprehensive MediaItem: {name}")
+            media_item = LazyMediaItem.from_jellyfin(item_data, **server)
+            self.logger.debug(f"Converted Jellyfin item to MediaItem: {media_item.name}")
             return media_item
 
         except Exception as e:
@@ -1671,6 +1419,10 @@ class JellyfinAPI:
             Only fetches fields that webhooks don't provide.
         """
         try:
+            # A converted item carries the data it was converted from
+            if not item_data and isinstance(media_item, LazyMediaItem):
+                item_data = media_item.raw
+
             # Fetch full item data if not provided
             if not item_data:
                 self.logger.debug(
@@ -0,0 +1,362 @@
+#!/usr/bin/env python3
+"""
+Jellynouncer Lazy Media Item View
+
+This module provides LazyMediaItem, a MediaItem backed by the raw item
+dictionary from the Jellyfin API. It is what
+`JellyfinAPI.convert_to_media_item()` returns.
+
+A MediaItem has about 90 fields, but most webhooks never use most of them:
+a metadata-only update is hashed, compared and saved, and nothing is
+rendered. LazyMediaItem therefore extracts only the fields that change
+detection and database storage need when it is created (identity, TV
+hierarchy, video/audio/subtitle specifications, file information and
+server details). The remaining fields are read from the raw dictionary
+together, the first time any of them is accessed, and kept in their slots
+from then on.
+
+**Compatibility:**
+LazyMediaItem is a real MediaItem subclass with the same fields, so
+`isinstance()` checks, attribute access, assignment, `dataclasses.fields()`,
+`to_dict()` (which templates use) and `DatabaseItem.from_media_item()` all
+work unchanged. Converting to a dictionary reads every field, which
+extracts whatever was still pending. Unlike a plain MediaItem it can also
+hold attributes that aren't fields (the notification enrichment adds some).
+
+Classes:
+    LazyMediaItem: MediaItem view over a raw Jellyfin item dictionary
+
+Author: Mark Newton
+Project: Jellynouncer
+Version: 1.0.0
+License: MIT
+"""
+
+from dataclasses import MISSING, fields
+from datetime import datetime, timezone
+from typing import Any, Dict
+
+from .field_interning import field_values
+from .media_models import MediaItem
+from .utils import get_logger
+
+logger = get_logger("jellynouncer.media_view")
+
+
+# ==================== LAZY FIELDS ====================
+
+def _lazy_fields(view: 'LazyMediaItem') -> Dict[str, Any]:
+    """
+    Extract every field that isn't set when the view is created.
+
+    The mappings are the ones convert_to_media_item() has always used.
+    Fields not returned here keep their dataclass default.
+
+    Args:
+        view (LazyMediaItem): View to read `raw` and `first_streams` from
+
+    Returns:
+        Dict[str, Any]: Field name -> value
+    """
+    item_data = view.raw
+    item_type = item_data.get('Type')
+    image_tags = item_data.get('ImageTags') or {}
+    provider_ids = item_data.get('ProviderIds') or {}
+    values = {
+        'overview': item_data.get('Overview', ''),
+
+        # Image tags (series tags for episodes)
+        'primary_image_tag': image_tags.get('Primary'),
+        'backdrop_image_tag': image_tags.get('Backdrop'),
+        'logo_image_tag': image_tags.get('Logo'),
+        'thumb_image_tag': image_tags.get('Thumb'),
+        'banner_image_tag': image_tags.get('Banner'),
+        'series_primary_image_tag': item_data.get('SeriesPrimaryImageTag'),
+        'parent_backdrop_image_tag': (item_data.get('ParentBackdropImageTags') or [None])[0],
+        'parent_logo_image_tag': item_data.get('ParentLogoImageTag'),
+
+        # External provider IDs
+        'imdb_id': provider_ids.get('Imdb'),
+        'tmdb_id': provider_ids.get('Tmdb'),
+        'tvdb_id': provider_ids.get('Tvdb'),
+        'tvdb_slug': provider_ids.get('Tvdbslug'),
+
+        # TV series hierarchy
+        'season_id': item_data.get('SeasonId'),
+        'air_time': item_data.get('AirTime'),
+
+        # Timestamps (webhook style, at conversion time)
+        'date_created': item_data.get('DateCreated'),
+        'date_modified': item_data.get('DateLastMediaAdded') or item_data.get('DateModified'),
+        'premiere_date': item_data.get('PremiereDate', ''),
+
+        # Additional metadata
+        'runtime_ticks': item_data.get('RunTimeTicks'),
+        'official_rating': item_data.get('OfficialRating'),
+        'tagline': item_data.get('Tagline', ''),
+        'genres': [genre.get('Name', '') if isinstance(genre, dict) else str(genre)
+                   for genre in item_data.get('Genres', ())],
+        'studios': [studio.get('Name', '') if isinstance(studio, dict) else str(studio)
+                    for studio in item_data.get('Studios', ())],
+        'tags': item_data.get('Tags', []),
+        'album': item_data.get('Album'),
+        'album_artist': item_data.get('AlbumArtist'),
+    }
+
+    # Padded season/episode numbers (webhook SeasonNumber00, etc.)
+    season_number, episode_number = view.season_number, view.episode_number
+    if season_number is not None:
+        values['season_number_padded'] = f"{season_number:02d}"
+        values['season_number_padded_3'] = f"{season_number:03d}"
+    if episode_number is not None:
+        values['episode_number_padded'] = f"{episode_number:02d}"
+        values['episode_number_padded_3'] = f"{episode_number:03d}"
+
+    # Runtime as HH:MM:SS (10,000 ticks = 1ms)
+    if values['runtime_ticks']:
+        total_seconds = values['runtime_ticks'] // 10000000
+        values['runtime_formatted'] = (
+            f"{total_seconds // 3600:02d}:{(total_seconds % 3600) // 60:02d}:{total_seconds % 60:02d}"
+        )
+
+    converted = view.converted_at.strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3]
+    values['timestamp'] = converted + view.converted_at.strftime('%z')
+    values['utc_timestamp'] = converted + 'Z'
+
+    # Video stream details beyond the change detection specs (Video_0_* fields)
+    video = view.first_streams.get('Video')
+    if video is not None:
+        values.update(
+            video_level=video.get('Level'),
+            video_interlaced=video.get('IsInterlaced'),
+            aspect_ratio=video.get('AspectRatio'),
+            video_title=video.get('DisplayTitle'),
+            video_type='Video',
+            video_language=video.get('Language'),
+            video_colorspace=video.get('ColorSpace'),
+            video_colortransfer=video.get('ColorTransfer'),
+            video_colorprimaries=video.get('ColorPrimaries'),
+            video_pixelformat=video.get('PixelFormat'),
+            video_refframes=video.get('RefFrames'),
+        )
+
+    # Audio stream details (Audio_0_* fields)
+    audio = view.first_streams.get('Audio')
+    if audio is not None:
+        values.update(
+            audio_title=audio.get('DisplayTitle'),
+            audio_type='Audio',
+            audio_default=audio.get('IsDefault'),
+        )
+
+    # First subtitle stream (Subtitle_0_* fields)
+    subtitle = view.first_streams.get('Subtitle')
+    if subtitle is not None:
+        values.update(
+            subtitle_title=subtitle.get('DisplayTitle'),
+            subtitle_type='Subtitle',
+            subtitle_language=subtitle.get('Language'),
+            subtitle_codec=subtitle.get('Codec'),
+            subtitle_default=subtitle.get('IsDefault'),
+            subtitle_forced=subtitle.get('IsForced'),
+            subtitle_external=subtitle.get('IsExternal'),
+        )
+
+    # Music: artists from ArtistItems or Artists
+    if item_type in ('Audio', 'MusicVideo', 'MusicAlbum'):
+        if 'ArtistItems' in item_data:
+            values['artists'] = [artist.get('Name', '') for artist in item_data['ArtistItems']]
+        elif 'Artists' in item_data:
+            values['artists'] = item_data['Artists']
+
+    # Photos: image dimensions
+    if item_type in ('Photo', 'Image'):
+        values['width'] = item_data.get('Width')
+        values['height'] = item_data.get('Height')
+
+    return values
+
+
+# Fields set when the view is created: everything change detection, the
+# content hash and DatabaseItem.from_media_item() read, plus the server
+# details. Their values when the item has no such stream:
+_EAGER_DEFAULTS = {
+    'item_id': '', 'name': 'Unknown', 'item_type': 'Unknown', 'year': None,
+    'series_name': None, 'series_id': None, 'season_number': None, 'episode_number': None,
+    'video_height': None, 'video_width': None, 'video_codec': None, 'video_profile': None,
+    'video_range': None, 'video_framerate': None, 'video_bitrate': None, 'video_bitdepth': None,
+    'audio_codec': None, 'audio_channels': None, 'audio_bitrate': None, 'audio_samplerate': None,
+    'audio_language': None, 'subtitle_count': None,
+    'file_path': None, 'file_size': None, 'library_name': None,
+    'server_id': None, 'server_name': None, 'server_version': None, 'server_url': None,
+    '_content_hash': None,
+}
+
+
+class LazyMediaItem(MediaItem):
+    """
+    MediaItem that extracts most fields from raw Jellyfin data on first access.
+
+    Create it with `from_jellyfin()` (or `JellyfinAPI.convert_to_media_item()`),
+    not by calling the class: the dataclass constructor would set every field
+    up front. The fields needed for change detection and storage are set
+    right away. The rest are extracted together, using the same mappings
+    convert_to_media_item() always used, the first time any of them is
+    read - a template or change comparison that reads one nearly always
+    reads the others - and are plain slot reads from then on. Codec, range,
+    language, type and series values go through the shared field intern
+    tables, like in `JellyfinAPI.convert_to_database_item()`. Assigning a
+    field works as on any MediaItem; an assigned value is never replaced
+    by extraction.
+
+    Attributes:
+        raw (Dict[str, Any]): Jellyfin item dictionary the view reads from
+        first_streams (Dict[str, Dict]): First video/audio/subtitle stream by type
+        converted_at (datetime): When the view was created (for the timestamp fields)
+
+    Example:
+        ```python
+        media_item = LazyMediaItem.from_jellyfin(item_data, server_url="http://jellyfin:8096")
+        await db.save_item(media_item)            # Only the eager fields are used
+        embed_vars = {"item": to_dict(media_item)}  # Extracts everything else
+        ```
+    """
+
+    @classmethod
+    def from_jellyfin(cls, item_data: Dict[str, Any], **fields_to_set: Any) -> 'LazyMediaItem':
+        """
+        Create a view over a Jellyfin item dictionary.
+
+        Args:
+            item_data (Dict[str, Any]): Raw item data from the Jellyfin API
+            **fields_to_set: Field values known from elsewhere (server details)
+
+        Returns:
+            LazyMediaItem: View with the change detection fields extracted
+        """
+        # Media streams from all media sources, or directly on the item
+        media_streams = []
+        if item_data.get('MediaSources'):
+            for source in item_data['MediaSources']:
+                if 'MediaStreams' in source:
+                    media_streams.extend(source['MediaStreams'])
+        elif 'MediaStreams' in item_data:
+            media_streams = item_data['MediaStreams']
+
+        first_streams = {}
+        for stream in media_streams:
+            first_streams.setdefault(stream.get('Type'), stream)
+
+        eager = dict(_EAGER_DEFAULTS)
+        eager.update(
+            item_id=item_data.get('Id', ''),
+            name=item_data.get('Name', 'Unknown'),
+            item_type=field_values['item_type'][item_data.get('Type', 'Unknown')],
+            year=item_data.get('ProductionYear'),
+            series_name=field_values['series_name'][item_data.get('SeriesName')],
+            series_id=item_data.get('SeriesId'),
+            season_number=item_data.get('ParentIndexNumber'),  # Season number for episodes
+            episode_number=item_data.get('IndexNumber'),
+            file_path=item_data.get('Path'),
+            file_size=next((source['Size'] for source in item_data.get('MediaSources') or ()
+                            if 'Size' in source), None),
+        )
+        # Not filled from the streams (convert_to_media_item never has)
+        eager['subtitle_languages'] = []
+        eager['subtitle_formats'] = []
+        if eager['item_type'] == 'Season':
+            eager['season_number'] = item_data.get('IndexNumber')  # For seasons, IndexNumber is the season number
+
+        video = first_streams.get('Video')
+        if video is not None:
+            eager.update(
+                video_height=video.get('Height'),
+                video_width=video.get('Width'),
+                video_codec=field_values['video_codec'][video.get('Codec', '').lower()],
+                video_profile=field_values['video_profile'][video.get('Profile')],
+                video_range=field_values['video_range'][video.get('VideoRange', 'SDR')],
+                video_framerate=video.get('RealFrameRate'),
+                video_bitrate=video.get('BitRate'),
+                video_bitdepth=video.get('BitDepth'),
+            )
+
+        audio = first_streams.get('Audio')
+        if audio is not None:
+            eager.update(
+                audio_codec=field_values['audio_codec'][audio.get('Codec', '').lower()],
+                audio_channels=audio.get('Channels'),
+                audio_bitrate=audio.get('BitRate'),
+                audio_samplerate=audio.get('SampleRate'),
+                audio_language=field_values['audio_language'][audio.get('Language')],
+            )
+        eager.update(fields_to_set)
+
+        view = cls.__new__(cls)
+        converted_at = datetime.now(timezone.utc)
+        eager['timestamp_created'] = converted_at.isoformat()
+        for name, value in eager.items():
+            _SLOTS[name].__set__(view, value)
+        # Written straight to the instance dict, bypassing __setattr__
+        view.__dict__.update(
+            raw=item_data,
+            first_streams=first_streams,
+            converted_at=converted_at,
+            _pending=set(_SLOTS).difference(eager),
+        )
+        return view
+
+    def __getattr__(self, name: str) -> Any:
+        """
+        Extract the pending fields on first access to one of them.
+
+        Python only calls `__getattr__` when normal lookup fails, which for
+        a field means its slot is still empty.
+        """
+        if name not in _SLOTS:
+            raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+        self._extract_pending()
+        return _SLOTS[name].__get__(self, MediaItem)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        # An assigned field is no longer pending, so extraction won't replace it
+        pending = self.__dict__.get('_pending')
+        if pending:
+            pending.discard(name)
+        super().__setattr__(name, value)
+
+    def _extract_pending(self) -> None:
+        """Fill every pending field from the raw data (or the field default)."""
+        pending = self.__dict__.get('_pending') or ()
+        self.__dict__['_pending'] = set()
+        try:
+            values = _lazy_fields(self)
+        except Exception as e:
+            # Same fallback as a failed conversion: the fields keep their defaults
+            logger.warning(f"Could not extract fields for {self.item_id}: {e}")
+            values = {}
+        for name in pending:
+            _SLOTS[name].__set__(self, values[name] if name in values else _DEFAULTS[name]())
+
+    def materialize(self) -> MediaItem:
+        """
+        Copy into a plain MediaItem with every field extracted.
+
+        Useful when the item outlives its raw data or needs
+        `dataclasses.replace()`, which a LazyMediaItem doesn't support.
+
+        Returns:
+            MediaItem: Independent copy with the same field values
+        """
+        item = MediaItem.__new__(MediaItem)
+        for name, slot in _SLOTS.items():
+            slot.__set__(item, getattr(self, name))
+        return item
+
+
+# MediaItem's field slots, and a default factory per field
+_SLOTS = {item_field.name: MediaItem.__dict__[item_field.name] for item_field in fields(MediaItem)}
+_DEFAULTS = {
+    item_field.name: (item_field.default_factory if item_field.default_factory is not MISSING
+                      else (lambda default=item_field.default: default))
+    for item_field in fields(MediaItem)
+}
@@ -19,12 +19,12 @@ Version: 1.0.0
 License: MIT
 """
 
-import hashlib
-import json
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from typing import Optional, List
 
+from .content_hash import compute_content_hash
+
 
 @dataclass(slots=True)
 class MediaItem:
@@ -421,58 +421,22 @@ class MediaItem:
         
         Blake2b is faster than MD5 and cryptographically secure.
         This hash is generated only when first accessed, improving batch sync performance.
+        The encoding is defined in the `content_hash` module, so MediaItem and
+        DatabaseItem always produce the same hash for the same specifications.
         
         **Fields included in hash:**
         - Video specifications: height, width, codec, profile, range
         - Audio specifications: codec, channels, language
         - File size (for detecting complete file replacements)
         
+        NOTE: file_path and item_id are deliberately excluded because file_path
+        changes when files are moved/renamed, and item_id changes when files
+        are renamed (Jellyfin generates a new ID from the path).
+        
         Returns:
             str: Blake2b hash of technical specifications
         """
-        # Return cached value if available
-        if self._content_hash is not None:
-            return self._content_hash
-        
-        # Generate hash data with only technical specifications
-        # NOTE: We deliberately exclude file_path AND item_id because:
-        # - file_path changes when files are moved/renamed
-        # - item_id changes when files are renamed (Jellyfin generates new ID from path)
-        hash_data = {
-            # Core identification (name and type only)
-            "name": self.name,
-            "item_type": self.item_type,
-
-            # Video specifications (all technical properties for change detection)
-            "video_height": self.video_height,
-            "video_width": self.video_width,
-            "video_codec": self.video_codec,
-            "video_profile": self.video_profile,
-            "video_range": self.video_range,
-            "video_framerate": self.video_framerate,
-            "video_bitrate": self.video_bitrate,
-            "video_bitdepth": self.video_bitdepth,
-
-            # Audio specifications (all technical properties for change detection)
-            "audio_codec": self.audio_codec,
-            "audio_channels": self.audio_channels,
-            "audio_bitrate": self.audio_bitrate,
-            "audio_samplerate": self.audio_samplerate,
-            
-            # Subtitle information for change detection
-            "subtitle_count": self.subtitle_count,
-            "subtitle_languages": sorted(self.subtitle_languages) if self.subtitle_languages else [],
-            "subtitle_formats": sorted(self.subtitle_formats) if self.subtitle_formats else [],
-
-            # File size can indicate a different encode of the same quality
-            "file_size": self.file_size,
-        }
-
-        # Use Blake2b for faster hashing (2-3x faster than MD5)
-        hash_string = json.dumps(hash_data, sort_keys=True, default=str)
-        self._content_hash = hashlib.blake2b(
-            hash_string.encode('utf-8'), 
-            digest_size=32  # 256-bit hash
-        ).hexdigest()
-        
+        # Generate on first access, then return the cached value
+        if self._content_hash is None:
+            self._content_hash = compute_content_hash(self)
         return self._content_hash
\ No newline at end of file
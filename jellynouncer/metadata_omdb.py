@@ -24,11 +24,12 @@ License: MIT
 import os
 import logging
 from typing import Dict, Any, Optional, List
-from dataclasses import dataclass, field, asdict
+from dataclasses import dataclass, field
 
 import omdb
 
 from .media_models import MediaItem
+from .serializers import to_dict
 from .utils import get_logger
 
 
@@ -192,7 +193,7 @@ class OMDbMetadata:
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for template context."""
-        return asdict(self)
+        return to_dict(self)
 
 
 class OMDbAPI:
@@ -658,6 +658,23 @@ class MetadataService:
         except (ValueError, AttributeError, IndexError, TypeError):
             return 0.0
 
+    def prune_caches(self) -> int:
+        """
+        Remove expired entries from the metadata caches.
+
+        The TVDB client expires entries lazily on lookup; this sweeps out entries
+        that would otherwise stay in memory until they happen to be requested again.
+
+        Returns:
+            int: Number of cache entries removed
+        """
+        if not self.tvdb_client or not hasattr(self.tvdb_client, 'cache'):
+            return 0
+
+        entries_before = len(self.tvdb_client.cache)
+        self.tvdb_client._clean_old_cache_entries()
+        return entries_before - len(self.tvdb_client.cache)
+
     async def cleanup(self) -> None:
         """
         Clean up metadata service resources.
@@ -23,12 +23,13 @@ License: MIT
 import os
 import logging
 from typing import Dict, Any, Optional, List
-from dataclasses import dataclass, field, asdict
+from dataclasses import dataclass, field
 
 from tmdbv3api import TMDb, Movie, TV, Season, Episode, Search, Configuration
 from tmdbv3api.exceptions import TMDbException
 
 from .media_models import MediaItem
+from .serializers import to_dict
 from .utils import get_logger
 
 
@@ -178,7 +179,7 @@ class TMDbMetadata:
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for template context, including computed properties."""
-        data = asdict(self)
+        data = to_dict(self)
         # Add the computed property
         data['rating_display'] = self.rating_display
         return data
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+Jellynouncer Quality Scores
+
+This module turns an item's technical specifications into one number, the
+quality score, so that "is the new file better?" is a single integer
+comparison and the library can be queried by quality with an index
+instead of re-deriving it from the raw fields of every row.
+
+**Score Layout:**
+The score is built from five parts, most important first, each in its own
+decimal digits so a larger score always means better quality:
+
+    score = tier * 1000 + video codec * 100 + audio channels * 10 + audio codec
+
+- **Tier** (`resolution class * 10 + HDR rank`): the resolution class
+  (0 unknown, 1 SD, 2 720p, 3 1080p, 4 1440p, 5 4K, 6 8K) and the rank of the
+  normalized HDR format (SDR 0, HLG 1, HDR10 2, HDR10+ 3, Dolby Vision 4).
+  Tier 30 is "1080p SDR", tier 54 is "4K Dolby Vision"
+- **Video codec rank** 0-6 (unknown, MPEG-2, MPEG-4/VC-1, H.264, HEVC/VP9, AV1, VVC)
+- **Audio channels**, capped at 9
+- **Audio codec rank** 0-6 (unknown, MP3, AAC, AC-3, E-AC-3/DTS, lossless, TrueHD)
+
+A 4K Dolby Vision HEVC file with 7.1 TrueHD audio scores 54486; a 1080p SDR
+H.264 file with stereo AAC scores 30322.
+
+**Resolution Classes:**
+Classes go by height *or* width, so cropped films count as their nominal
+resolution: 1920x800 (2.40:1 "scope") is 1080p and 3840x1600 is 4K.
+
+**Score Versions:**
+Changing the layout or the ranks changes the scores of existing items, so
+the database stores which version each row's score was computed with
+(`quality_version`) and recomputes old rows after an upgrade, like content
+hashes (see `DatabaseManager.rehash_items()`). Scores of different versions
+are never compared with each other.
+
+Functions:
+    normalize_hdr_status: Standard name of a Jellyfin video range
+    compute_quality: Quality score and tier of an item
+    item_quality_score: Quality score, using a stored score when it's current
+    tier_label: Display name of a tier ("1080p SDR")
+    parse_tier: Tier of a display name
+
+Author: Mark Newton
+Project: Jellynouncer
+Version: 1.0.0
+License: MIT
+"""
+
+from functools import lru_cache
+from typing import Any, Optional, Tuple
+
+# Version of the scores compute_quality() returns
+QUALITY_SCORE_VERSION = 1
+
+# Order of the normalized HDR formats
+HDR_RANK = {"SDR": 0, "HLG": 1, "HDR10": 2, "HDR10+": 3, "Dolby Vision": 4}
+
+# Resolution classes, best first: (class, name, minimum height, minimum width).
+# The minimums leave room for cropped and slightly undersized encodes.
+RESOLUTION_CLASSES = (
+    (6, "8K", 3800, 7200),
+    (5, "4K", 1900, 3600),
+    (4, "1440p", 1300, 2400),
+    (3, "1080p", 900, 1800),
+    (2, "720p", 600, 1200),
+    (1, "SD", 1, 1),
+)
+RESOLUTION_NAMES = {0: "Unknown", **{rank: name for rank, name, _, _ in RESOLUTION_CLASSES}}
+
+# Jellyfin codec names (lowercase) -> rank; unknown codecs rank 0
+VIDEO_CODEC_RANK = {
+    "mpeg1video": 1, "mpeg2video": 1,
+    "mpeg4": 2, "msmpeg4v3": 2, "xvid": 2, "divx": 2, "vc1": 2, "wmv3": 2,
+    "h264": 3, "avc": 3, "vp8": 3,
+    "hevc": 4, "h265": 4, "vp9": 4,
+    "av1": 5,
+    "vvc": 6, "h266": 6,
+}
+AUDIO_CODEC_RANK = {
+    "mp2": 1, "mp3": 1,
+    "aac": 2, "vorbis": 2,
+    "ac3": 3, "opus": 3,
+    "eac3": 4, "dts": 4,
+    "flac": 5, "alac": 5,
+    "truehd": 6, "mlp": 6,
+}
+
+
+def normalize_hdr_status(video_range: Optional[str]) -> str:
+    """
+    Normalize a video range to one of the `HDR_RANK` names.
+
+    Different sources name the same HDR format differently ("SMPTE2084",
+    "HDR", "DOVI", ...). Change detection and quality scores both compare
+    the normalized names.
+
+    Args:
+        video_range (Optional[str]): Raw video range from the media metadata
+
+    Returns:
+        str: "SDR", "HLG", "HDR10", "HDR10+" or "Dolby Vision"
+
+    Example:
+        ```python
+        normalize_hdr_status("SMPTE2084")  # "HDR10"
+        normalize_hdr_status("DOVI")       # "Dolby Vision"
+        normalize_hdr_status(None)         # "SDR"
+        ```
+    """
+    if not video_range:
+        return "SDR"
+
+    # Convert to lowercase for case-insensitive comparison
+    range_lower = video_range.lower()
+
+    # Map various HDR format indicators to standard names
+    if any(hdr_indicator in range_lower for hdr_indicator in ['dovi', 'dolby', 'vision']):
+        return "Dolby Vision"
+    elif any(hdr_indicator in range_lower for hdr_indicator in ['hdr10+', 'hdr10plus']):
+        return "HDR10+"
+    elif any(hdr_indicator in range_lower for hdr_indicator in ['hdr10', 'hdr', 'smpte2084', 'bt2020']):
+        return "HDR10"
+    elif any(hdr_indicator in range_lower for hdr_indicator in ['hlg', 'hybrid']):
+        return "HLG"
+    else:
+        return "SDR"
+
+
+@lru_cache(maxsize=256)
+def _hdr_rank(video_range: Optional[str]) -> int:
+    # A library only has a handful of distinct video ranges
+    return HDR_RANK[normalize_hdr_status(video_range)]
+
+
+def _resolution_class(height: Optional[int], width: Optional[int]) -> int:
+    height = height or 0
+    width = width or 0
+    for rank, _, min_height, min_width in RESOLUTION_CLASSES:
+        if height >= min_height or width >= min_width:
+            return rank
+    return 0
+
+
+def compute_quality(item: Any) -> Tuple[int, int]:
+    """
+    Compute the quality score and tier of an item.
+
+    Reads `video_height`, `video_width`, `video_range`, `video_codec`,
+    `audio_channels` and `audio_codec`, so it works for MediaItem and
+    DatabaseItem alike. Missing values count as the lowest rank; values of
+    an unexpected type (a text height, a numeric codec) give an unknown
+    quality of (0, 0) instead of an error.
+
+    Args:
+        item: MediaItem, DatabaseItem or anything with those attributes
+
+    Returns:
+        Tuple[int, int]: (score, tier), see the module docstring
+
+    Example:
+        ```python
+        score, tier = compute_quality(db_item)
+        print(f"{tier_label(tier)} ({score})")  # "4K HDR10 (52484)"
+        ```
+    """
+    try:
+        tier = _resolution_class(item.video_height, item.video_width) * 10 + _hdr_rank(item.video_range)
+        video_codec = VIDEO_CODEC_RANK.get(item.video_codec.lower(), 0) if item.video_codec else 0
+        audio_codec = item.audio_codec.lower() if item.audio_codec else ""
+        if audio_codec.startswith("pcm"):
+            audio_rank = 5  # pcm_s16le, pcm_s24le, ... (uncompressed)
+        else:
+            audio_rank = AUDIO_CODEC_RANK.get(audio_codec, 0)
+        channels = min(max(item.audio_channels or 0, 0), 9)
+    except (AttributeError, TypeError):
+        return 0, 0
+    return tier * 1000 + video_codec * 100 + channels * 10 + audio_rank, tier
+
+
+def item_quality_score(item: Any) -> int:
+    """
+    Get an item's quality score, using its stored score when it's current.
+
+    DatabaseItem carries its score (computed when it was created); items
+    without one, such as a MediaItem built from a webhook, are scored here.
+
+    Args:
+        item: MediaItem, DatabaseItem or anything with the scored attributes
+
+    Returns:
+        int: Quality score of the current version
+    """
+    score = getattr(item, 'quality_score', None)
+    if score is not None and getattr(item, 'quality_version', None) == QUALITY_SCORE_VERSION:
+        return score
+    return compute_quality(item)[0]
+
+
+def tier_label(tier: int) -> str:
+    """
+    Get the display name of a tier.
+
+    Args:
+        tier (int): Quality tier
+
+    Returns:
+        str: Resolution and HDR format, e.g. "1080p SDR" or "4K Dolby Vision"
+    """
+    resolution, hdr = divmod(tier, 10)
+    hdr_name = next((name for name, rank in HDR_RANK.items() if rank == hdr), "SDR")
+    return f"{RESOLUTION_NAMES.get(resolution, 'Unknown')} {hdr_name}"
+
+
+def parse_tier(label: str) -> int:
+    """
+    Get the tier of a display name, as used in library queries.
+
+    The HDR format is optional and defaults to SDR; both parts ignore case.
+
+    Args:
+        label (str): Resolution and optional HDR format, e.g. "1080p SDR",
+            "4k hdr10" or "720p"
+
+    Returns:
+        int: Quality tier
+
+    Raises:
+        ValueError: Unknown resolution or HDR format
+
+    Example:
+        ```python
+        parse_tier("1080p SDR")        # 30
+        parse_tier("4K Dolby Vision")  # 54
+        ```
+    """
+    text = " ".join(label.split()).lower()
+    hdr = 0
+    for name, rank in HDR_RANK.items():
+        if text.endswith(" " + name.lower()):
+            text, hdr = text[:-len(name) - 1], rank
+            break
+    for rank, name in RESOLUTION_NAMES.items():
+        if text == name.lower():
+            return rank * 10 + hdr
+    raise ValueError(
+        f"Unknown quality tier '{label}' - expected a resolution "
+        f"({', '.join(name for _, name, _, _ in RESOLUTION_CLASSES)}) and optionally an HDR format "
+        f"({', '.join(HDR_RANK)})"
+    )
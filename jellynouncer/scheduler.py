@@ -0,0 +1,520 @@
+#!/usr/bin/env python3
+"""
+Jellynouncer Task Scheduler
+
+This module contains the load-aware scheduler that runs Jellynouncer's periodic
+maintenance jobs (library syncs, database vacuum, statistics refresh and cache
+pruning). It replaces the old fixed "sleep 5 minutes and check everything" loop
+with per-job schedules that are configured in the `scheduler` config section.
+
+**Why a Scheduler?**
+    Maintenance jobs are expensive: a full library sync hammers the Jellyfin API
+    and the database, and a VACUUM locks the database while it rewrites it. If
+    one of these lands in the middle of a burst of webhooks (for example when a
+    whole season is imported at once), notifications are delayed. The scheduler
+    checks whether the service is busy before starting a job and defers the job
+    until things calm down.
+
+**Schedules:**
+    Each job is driven either by a fixed interval (`interval_minutes`) or by a
+    cron-like expression (`cron`, five fields: minute hour day month weekday).
+    Random jitter can be added so that several instances pointed at the same
+    Jellyfin server don't all sync at exactly the same moment.
+
+Classes:
+    CronSchedule: Minimal five-field cron expression parser
+    ScheduledJob: Runtime state for a single scheduled job
+    TaskScheduler: Runs scheduled jobs and defers them while the service is busy
+
+Author: Mark Newton
+Project: Jellynouncer
+Version: 1.0.0
+License: MIT
+"""
+
+import asyncio
+import random
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, Optional, Set
+
+from .config_models import JobScheduleConfig, SchedulerConfig
+from .utils import get_logger
+
+
+class CronSchedule:
+    """
+    Minimal five-field cron expression parser.
+
+    Supports the common cron syntax without any external dependency:
+    `*`, single values, lists (`1,15`), ranges (`1-5`) and steps (`*/15`,
+    `0-30/10`). Fields are minute, hour, day of month, month and day of week
+    (0 = Sunday, 7 is also accepted as Sunday). Times are evaluated in the
+    container's local time zone, the same way the system cron daemon does.
+
+    Attributes:
+        expression (str): Original cron expression
+
+    Example:
+        ```python
+        # Every day at 03:30
+        schedule = CronSchedule("30 3 * * *")
+        next_run = schedule.next_after(datetime.now())
+
+        # Every 15 minutes during the night
+        schedule = CronSchedule("*/15 0-6 * * *")
+        ```
+    """
+
+    _FIELD_RANGES = (
+        (0, 59),  # minute
+        (0, 23),  # hour
+        (1, 31),  # day of month
+        (1, 12),  # month
+        (0, 7),   # day of week (0 and 7 are both Sunday)
+    )
+
+    def __init__(self, expression: str):
+        """
+        Parse a cron expression.
+
+        Args:
+            expression (str): Five-field cron expression
+
+        Raises:
+            ValueError: If the expression is malformed or values are out of range
+        """
+        self.expression = expression.strip()
+        parts = self.expression.split()
+        if len(parts) != 5:
+            raise ValueError(
+                f"Cron expression must have 5 fields (minute hour day month weekday), got: '{expression}'"
+            )
+
+        parsed = [self._parse_field(part, low, high) for part, (low, high) in zip(parts, self._FIELD_RANGES)]
+        self.minutes, self.hours, self.days, self.months, weekdays = parsed
+        # Normalize Sunday and convert to Python's weekday numbering (Monday = 0)
+        self.weekdays = {(day % 7 + 6) % 7 for day in weekdays}
+
+        # Standard cron semantics: if both day fields are restricted, either may match
+        self._day_restricted = parts[2] != "*"
+        self._weekday_restricted = parts[4] != "*"
+
+    @staticmethod
+    def _parse_field(value: str, low: int, high: int) -> Set[int]:
+        """
+        Expand a single cron field into the set of values it matches.
+
+        Args:
+            value (str): Field text such as `*/15` or `1-5,10`
+            low (int): Smallest allowed value
+            high (int): Largest allowed value
+
+        Returns:
+            Set[int]: All values matched by the field
+
+        Raises:
+            ValueError: If the field cannot be parsed or is out of range
+        """
+        result: Set[int] = set()
+        for part in value.split(","):
+            step = 1
+            if "/" in part:
+                part, step_text = part.split("/", 1)
+                step = int(step_text)
+                if step < 1:
+                    raise ValueError(f"Invalid cron step: '{value}'")
+
+            if part == "*":
+                start, end = low, high
+            elif "-" in part:
+                start_text, end_text = part.split("-", 1)
+                start, end = int(start_text), int(end_text)
+            else:
+                start = int(part)
+                end = high if step > 1 else start
+
+            if start < low or end > high or start > end:
+                raise ValueError(f"Cron value '{value}' out of range {low}-{high}")
+
+            result.update(range(start, end + 1, step))
+        return result
+
+    def _day_matches(self, moment: datetime) -> bool:
+        """Check the day-of-month / day-of-week fields using cron's OR rule."""
+        day_ok = moment.day in self.days
+        weekday_ok = moment.weekday() in self.weekdays
+        if self._day_restricted and self._weekday_restricted:
+            return day_ok or weekday_ok
+        return day_ok and weekday_ok
+
+    def next_after(self, moment: datetime) -> datetime:
+        """
+        Find the next time (strictly after `moment`) matching the expression.
+
+        The search walks forward day by day and only inspects the matching
+        hours/minutes of matching days, so even sparse schedules resolve in
+        a handful of iterations.
+
+        Args:
+            moment (datetime): Reference time (naive local time)
+
+        Returns:
+            datetime: Next matching time, truncated to the minute
+
+        Raises:
+            ValueError: If no matching time exists within four years (e.g. Feb 31)
+        """
+        start = moment.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        day = start.replace(hour=0, minute=0)
+        hours = sorted(self.hours)
+        minutes = sorted(self.minutes)
+
+        for _ in range(366 * 4):
+            if day.month in self.months and self._day_matches(day):
+                for hour in hours:
+                    for minute in minutes:
+                        candidate = day.replace(hour=hour, minute=minute)
+                        if candidate >= start:
+                            return candidate
+            day += timedelta(days=1)
+
+        raise ValueError(f"Cron expression '{self.expression}' never matches")
+
+
+@dataclass
+class ScheduledJob:
+    """
+    Runtime state of a single scheduled job.
+
+    Attributes:
+        name (str): Unique job name (e.g. "full_sync")
+        func (Callable): Coroutine function that performs the job
+        config (JobScheduleConfig): Schedule configuration for the job
+        cron (Optional[CronSchedule]): Parsed cron schedule if one is configured
+        next_run (float): Unix timestamp of the next planned run
+        last_run (Optional[float]): Unix timestamp when the job last started
+        last_duration (Optional[float]): How long the last run took in seconds
+        last_status (Optional[str]): Status of the last run (success, error, skipped...)
+        last_error (Optional[str]): Error message of the last failed run
+        run_count (int): Number of completed runs since startup
+        deferral_count (int): Number of times the job was postponed due to load
+        deferred_since (Optional[float]): When the current deferral streak began
+        running (bool): Whether the job is executing right now
+    """
+    name: str
+    func: Callable[[], Awaitable[Any]]
+    config: JobScheduleConfig
+    cron: Optional[CronSchedule] = None
+    next_run: float = 0.0
+    last_run: Optional[float] = None
+    last_duration: Optional[float] = None
+    last_status: Optional[str] = None
+    last_error: Optional[str] = None
+    run_count: int = 0
+    deferral_count: int = 0
+    deferred_since: Optional[float] = None
+    running: bool = False
+
+
+class TaskScheduler:
+    """
+    Load-aware scheduler for periodic maintenance jobs.
+
+    Jobs are registered with `add_job()` and executed one at a time by `run()`.
+    Running jobs sequentially is deliberate: two heavy jobs (say a full sync and
+    a VACUUM) fighting over the database is exactly the kind of load spike the
+    scheduler exists to avoid.
+
+    **Load-Aware Deferral:**
+        Before a job starts, the scheduler calls the `busy_check` callback. If it
+        returns a reason (e.g. "notification queue has 25 pending items"), jobs
+        with `defer_when_busy` enabled are pushed back by `defer_retry_seconds`.
+        To make sure maintenance eventually happens on a constantly busy server,
+        a job that has been deferred for longer than `max_defer_minutes` runs
+        anyway.
+
+    Attributes:
+        config (SchedulerConfig): Scheduler configuration
+        jobs (Dict[str, ScheduledJob]): Registered jobs keyed by name
+        busy_check (Optional[Callable]): Returns a reason string while the service is busy
+
+    Example:
+        ```python
+        scheduler = TaskScheduler(config.scheduler, busy_check=service.get_busy_reason)
+        scheduler.add_job("vacuum", service.run_vacuum, config.scheduler.vacuum)
+
+        # Runs until the shutdown event is set
+        await scheduler.run(shutdown_event)
+
+        # Inspect job state
+        for name, status in scheduler.get_status().items():
+            print(name, status["next_run"], status["last_duration_seconds"])
+        ```
+    """
+
+    # Upper bound for a single sleep so config changes and shutdown are noticed promptly
+    _MAX_SLEEP_SECONDS = 60.0
+
+    def __init__(self, config: SchedulerConfig, busy_check: Optional[Callable[[], Optional[str]]] = None):
+        """
+        Initialize the scheduler.
+
+        Args:
+            config (SchedulerConfig): Scheduler configuration
+            busy_check (Optional[Callable[[], Optional[str]]]): Callback returning a
+                human readable reason when the service is too busy for maintenance,
+                or None when jobs may run
+        """
+        self.logger = get_logger("jellynouncer.scheduler")
+        self.config = config
+        self.busy_check = busy_check
+        self.jobs: Dict[str, ScheduledJob] = {}
+        self._wake_event = asyncio.Event()
+
+    def add_job(
+        self,
+        name: str,
+        func: Callable[[], Awaitable[Any]],
+        job_config: JobScheduleConfig,
+        last_run: Optional[float] = None,
+        default_interval_minutes: Optional[int] = None
+    ) -> Optional[ScheduledJob]:
+        """
+        Register a job with the scheduler.
+
+        The first run is planned relative to `last_run` so that persisted state
+        (like the last vacuum timestamp stored in the database) survives restarts.
+        Pass `last_run=0.0` to run the job as soon as possible, or leave it as
+        None to wait one full interval before the first run.
+
+        Args:
+            name (str): Unique job name
+            func (Callable[[], Awaitable[Any]]): Coroutine function performing the job.
+                If it returns a dict with a "status" key, that status is recorded.
+            job_config (JobScheduleConfig): Schedule for this job
+            last_run (Optional[float]): Unix timestamp of the previous run, if known
+            default_interval_minutes (Optional[int]): Interval used when the job
+                config specifies neither an interval nor a cron expression
+
+        Returns:
+            Optional[ScheduledJob]: The registered job, or None if it is disabled
+        """
+        if not job_config.enabled:
+            self.logger.info(f"Scheduled job '{name}' is disabled")
+            return None
+
+        if job_config.interval_minutes is None and not job_config.cron:
+            if default_interval_minutes is None:
+                self.logger.warning(f"Scheduled job '{name}' has no interval or cron schedule - not registered")
+                return None
+            job_config = job_config.model_copy(update={"interval_minutes": default_interval_minutes})
+
+        job = ScheduledJob(
+            name=name,
+            func=func,
+            config=job_config,
+            cron=CronSchedule(job_config.cron) if job_config.cron else None,
+            last_run=last_run or None
+        )
+        job.next_run = self._calculate_next_run(job, reference=last_run)
+        self.jobs[name] = job
+        self._wake_event.set()
+
+        self.logger.info(
+            f"Scheduled job '{name}' registered ({self._describe_schedule(job)}), "
+            f"next run {self._format_timestamp(job.next_run)}"
+        )
+        return job
+
+    def _calculate_next_run(self, job: ScheduledJob, reference: Optional[float] = None) -> float:
+        """
+        Calculate the next run time for a job, including jitter.
+
+        Args:
+            job (ScheduledJob): Job to schedule
+            reference (Optional[float]): Time the previous run started. None means
+                "never ran, wait a full interval", 0 means "run as soon as possible".
+
+        Returns:
+            float: Unix timestamp of the next run
+        """
+        now = time.time()
+        jitter = random.uniform(0, job.config.jitter_seconds) if job.config.jitter_seconds else 0.0
+
+        if job.cron:
+            next_time = job.cron.next_after(datetime.fromtimestamp(now)).timestamp()
+        else:
+            interval = job.config.interval_minutes * 60
+            base = now if reference is None else reference
+            next_time = base + interval if reference != 0 else now
+            # A run that should have happened while we were down happens now
+            next_time = max(next_time, now)
+
+        return next_time + jitter
+
+    async def run(self, shutdown_event: asyncio.Event) -> None:
+        """
+        Run scheduled jobs until the shutdown event is set.
+
+        Args:
+            shutdown_event (asyncio.Event): Service-wide shutdown signal
+        """
+        self.logger.info(f"Task scheduler started with {len(self.jobs)} job(s)")
+
+        while not shutdown_event.is_set():
+            try:
+                now = time.time()
+                due_jobs = sorted(
+                    (job for job in self.jobs.values() if job.next_run <= now),
+                    key=lambda j: j.next_run
+                )
+
+                for job in due_jobs:
+                    if shutdown_event.is_set():
+                        break
+                    await self._run_if_not_busy(job)
+
+                await self._sleep_until_next_job(shutdown_event)
+
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                self.logger.error(f"Scheduler loop error: {e}", exc_info=True)
+                await asyncio.sleep(self._MAX_SLEEP_SECONDS)
+
+        self.logger.info("Task scheduler stopped")
+
+    async def _sleep_until_next_job(self, shutdown_event: asyncio.Event) -> None:
+        """Sleep until the next job is due, waking early on shutdown or new jobs."""
+        if self.jobs:
+            delay = min(job.next_run for job in self.jobs.values()) - time.time()
+        else:
+            delay = self._MAX_SLEEP_SECONDS
+        delay = min(max(delay, 0.0), self._MAX_SLEEP_SECONDS)
+        if delay <= 0:
+            return
+
+        self._wake_event.clear()
+        shutdown_wait = asyncio.create_task(shutdown_event.wait())
+        wake_wait = asyncio.create_task(self._wake_event.wait())
+        try:
+            await asyncio.wait({shutdown_wait, wake_wait}, timeout=delay, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            shutdown_wait.cancel()
+            wake_wait.cancel()
+
+    async def _run_if_not_busy(self, job: ScheduledJob) -> None:
+        """
+        Run a due job unless the service is busy and the job may be deferred.
+
+        Args:
+            job (ScheduledJob): Job that is due
+        """
+        now = time.time()
+        busy_reason = self.busy_check() if (self.busy_check and job.config.defer_when_busy) else None
+
+        if busy_reason:
+            if job.deferred_since is None:
+                job.deferred_since = now
+            deferred_for = now - job.deferred_since
+
+            if deferred_for < self.config.max_defer_minutes * 60:
+                job.deferral_count += 1
+                job.next_run = now + self.config.defer_retry_seconds
+                self.logger.debug(
+                    f"Deferring job '{job.name}' for {self.config.defer_retry_seconds}s: {busy_reason}"
+                )
+                return
+
+            self.logger.warning(
+                f"Job '{job.name}' deferred for {deferred_for / 60:.0f} minutes - running despite load ({busy_reason})"
+            )
+
+        await self._execute(job)
+
+    async def _execute(self, job: ScheduledJob) -> Optional[Any]:
+        """
+        Execute a job and record its timing and outcome.
+
+        Args:
+            job (ScheduledJob): Job to execute
+
+        Returns:
+            Optional[Any]: Whatever the job function returned, or None on error
+        """
+        started = time.time()
+        job.running = True
+        job.deferred_since = None
+        result = None
+        self.logger.info(f"Running scheduled job '{job.name}'")
+
+        try:
+            result = await job.func()
+            status = result.get("status", "success") if isinstance(result, dict) else "success"
+            job.last_status = status
+            job.last_error = result.get("message") if isinstance(result, dict) and status == "error" else None
+        except asyncio.CancelledError:
+            job.last_status = "cancelled"
+            raise
+        except Exception as e:
+            self.logger.error(f"Scheduled job '{job.name}' failed: {e}", exc_info=True)
+            job.last_status = "error"
+            job.last_error = str(e)
+        finally:
+            job.running = False
+            job.last_run = started
+            job.last_duration = time.time() - started
+            job.run_count += 1
+            job.next_run = self._calculate_next_run(job, reference=started)
+
+        self.logger.info(
+            f"Scheduled job '{job.name}' finished with status '{job.last_status}' "
+            f"in {job.last_duration:.1f}s, next run {self._format_timestamp(job.next_run)}"
+        )
+        return result
+
+    def get_status(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get the state of every registered job.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: Per-job status including schedule,
+                next_run, last_run, last_duration_seconds and last_status
+
+        Example:
+            ```python
+            status = scheduler.get_status()
+            print(status["full_sync"]["next_run"])  # "2024-01-15T03:12:45"
+            ```
+        """
+        return {
+            name: {
+                "schedule": self._describe_schedule(job),
+                "running": job.running,
+                "next_run": self._format_timestamp(job.next_run),
+                "seconds_until_next_run": max(0, round(job.next_run - time.time())),
+                "last_run": self._format_timestamp(job.last_run) if job.last_run else None,
+                "last_duration_seconds": round(job.last_duration, 2) if job.last_duration is not None else None,
+                "last_status": job.last_status,
+                "last_error": job.last_error,
+                "run_count": job.run_count,
+                "deferral_count": job.deferral_count,
+                "deferred": job.deferred_since is not None,
+            }
+            for name, job in self.jobs.items()
+        }
+
+    @staticmethod
+    def _describe_schedule(job: ScheduledJob) -> str:
+        """Build a short human readable description of a job's schedule."""
+        description = f"cron '{job.cron.expression}'" if job.cron else f"every {job.config.interval_minutes} min"
+        if job.config.jitter_seconds:
+            description += f" +{job.config.jitter_seconds}s jitter"
+        return description
+
+    @staticmethod
+    def _format_timestamp(timestamp: float) -> str:
+        """Format a Unix timestamp as a local ISO string."""
+        return datetime.fromtimestamp(timestamp).isoformat(timespec="seconds")
@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Jellynouncer Per-Library Bucket Sync
+
+This module proves cheaply that parts of the library are unchanged, so a full
+sync only fetches the items that actually changed.
+
+Every item in the database is assigned to a bucket by the first characters of
+its id, per Jellyfin library. For each bucket the database keeps a summary:
+the item count and the XOR of a digest over each item's (id, DateLastSaved).
+The summaries are updated on every save (see `DatabaseManager`), so they are
+always current without rescanning.
+
+A bucket sync lists each library from Jellyfin with only ids and save dates,
+computes the same summaries, and compares. Matching buckets are skipped.
+In a mismatching bucket, items are compared one by one and only new or
+changed items are fetched with full metadata.
+
+Classes:
+    BucketedLibrarySync: Runs one bucket-summary sync over all libraries
+
+Functions:
+    summarize_listing: Build bucket summaries from a lightweight library listing
+
+Author: Mark Newton
+Project: Jellynouncer
+Version: 1.0.0
+License: MIT
+"""
+
+import asyncio
+import time
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from .config_models import SyncConfig
+from .database_models import sync_bucket, sync_token_digest
+from .utils import get_logger
+
+
+def summarize_listing(listing: Dict[str, Optional[str]]) -> Dict[str, Tuple[int, int]]:
+    """
+    Build bucket summaries from a lightweight library listing.
+
+    Produces exactly what `DatabaseManager.get_sync_buckets()` stores for the
+    same items, so the two can be compared bucket by bucket.
+
+    Args:
+        listing (Dict[str, Optional[str]]): item_id -> DateLastSaved
+
+    Returns:
+        Dict[str, Tuple[int, int]]: bucket -> (item_count, digest)
+
+    Example:
+        ```python
+        listing = await jellyfin.get_library_listing(library_id)
+        remote = summarize_listing(listing)
+        local = await db.get_sync_buckets(library_id)
+        changed = [b for b in remote if remote[b] != local.get(b)]
+        ```
+    """
+    summaries: Dict[str, Tuple[int, int]] = {}
+    for item_id, token in listing.items():
+        bucket = sync_bucket(item_id)
+        count, digest = summaries.get(bucket, (0, 0))
+        summaries[bucket] = (count + 1, digest ^ sync_token_digest(item_id, token))
+    return summaries
+
+
+class BucketedLibrarySync:
+    """
+    Sync the library by comparing per-library bucket summaries.
+
+    A sync object is single-use: create one, call `run()`, and read the
+    counters from `state`.
+
+    **How a Library is Synced:**
+        1. List the library's item ids and save dates (a few cheap requests)
+        2. Summarize the listing per bucket and compare with the database
+        3. For mismatching buckets, compare item by item:
+           - new or changed items are fetched in full and saved
+           - up-to-date items recorded under another library are re-assigned
+           - items no longer listed are detached from the library summary
+        4. Matching buckets are skipped entirely
+
+    Items without a save date can't be verified, so their buckets are always
+    compared item by item and the items always refetched.
+
+    Attributes:
+        state (Dict[str, Any]): Sync counters (libraries, buckets, buckets_mismatched,
+            total_items, items_fetched, items_processed, items_adopted,
+            items_detached, errors)
+
+    Example:
+        ```python
+        bucket_sync = BucketedLibrarySync(jellyfin, db, config.sync)
+        state = await bucket_sync.run()
+        logger.info(f"Skipped {state['buckets'] - state['buckets_mismatched']} unchanged buckets")
+        ```
+    """
+
+    # Ids per full-metadata request (keeps request URLs a reasonable length)
+    ids_per_request = 100
+
+    def __init__(self, jellyfin, db, config: SyncConfig):
+        """
+        Initialize the bucket sync.
+
+        Args:
+            jellyfin (JellyfinAPI): Connected Jellyfin API client
+            db (DatabaseManager): Initialized database manager
+            config (SyncConfig): Sync configuration (fetch_workers limits concurrency)
+        """
+        self.logger = get_logger("jellynouncer.sync")
+        self.jellyfin = jellyfin
+        self.db = db
+        self.config = config
+
+        self.state: Dict[str, Any] = {
+            'libraries': 0,
+            'buckets': 0,
+            'buckets_mismatched': 0,
+            'total_items': 0,
+            'items_fetched': 0,
+            'items_processed': 0,
+            'items_adopted': 0,
+            'items_detached': 0,
+            'errors': 0,
+            'failed_libraries': []
+        }
+        self._fetch_slots = asyncio.Semaphore(config.fetch_workers)
+
+    async def run(self) -> Dict[str, Any]:
+        """
+        Sync every library by bucket comparison.
+
+        Returns:
+            Dict[str, Any]: The state dictionary with final counters
+        """
+        libraries = await self.jellyfin.get_sync_libraries()
+        # An item listed by two libraries belongs to the first, so it can't
+        # flip between libraries and keep both summaries mismatching
+        seen_ids: Set[str] = set()
+
+        for library in libraries:
+            library_name = library.get('Name', library['Id'])
+            try:
+                await self._sync_library(library['Id'], library_name, seen_ids)
+                self.state['libraries'] += 1
+            except Exception as e:
+                self.logger.error(f"Bucket sync of library '{library_name}' failed: {e}")
+                self.state['failed_libraries'].append(library_name)
+
+        return self.state
+
+    async def _sync_library(self, library_id: str, library_name: str, seen_ids: Set[str]) -> None:
+        """
+        Compare one library's bucket summaries and sync mismatching buckets.
+
+        Args:
+            library_id (str): Jellyfin library id
+            library_name (str): Library name (stored on refreshed items, and for logs)
+            seen_ids (Set[str]): Ids already claimed by earlier libraries (updated)
+        """
+        started = time.perf_counter()
+        listing = await self.jellyfin.get_library_listing(library_id)
+        listing = {item_id: token for item_id, token in listing.items() if item_id not in seen_ids}
+        seen_ids.update(listing)
+
+        remote = summarize_listing(listing)
+        local = await self.db.get_sync_buckets(library_id)
+        unverifiable = {sync_bucket(item_id) for item_id, token in listing.items() if token is None}
+
+        buckets = set(remote) | set(local)
+        mismatched = sorted(
+            bucket for bucket in buckets
+            if bucket in unverifiable or remote.get(bucket) != local.get(bucket)
+        )
+        self.state['buckets'] += len(buckets)
+        self.state['buckets_mismatched'] += len(mismatched)
+        self.state['total_items'] += len(listing)
+
+        if not mismatched:
+            self.logger.info(
+                f"Library '{library_name}': all {len(buckets)} buckets unchanged "
+                f"({len(listing):,} items, {time.perf_counter() - started:.1f}s)"
+            )
+            return
+
+        wanted = set(mismatched)
+        listed = {item_id: token for item_id, token in listing.items() if sync_bucket(item_id) in wanted}
+        stored = await self.db.get_sync_tokens(list(listed))
+        recorded = await self.db.get_library_bucket_items(library_id, mismatched)
+
+        stale = [
+            item_id for item_id, token in listed.items()
+            if token is None or item_id not in stored or stored[item_id][1] != token
+        ]
+        stale_set = set(stale)
+        adopt = [
+            item_id for item_id in listed
+            if item_id not in stale_set and stored[item_id][0] != library_id
+        ]
+        departed = [item_id for item_id in recorded if item_id not in listing]
+
+        self.state['items_adopted'] += await self.db.set_items_library(adopt, library_id)
+        self.state['items_detached'] += await self.db.set_items_library(departed, None)
+        await self._refresh_items(stale, library_id, library_name)
+
+        self.logger.info(
+            f"Library '{library_name}': {len(mismatched)}/{len(buckets)} buckets changed, "
+            f"{len(stale):,} items refreshed, {len(adopt):,} re-assigned, {len(departed):,} no longer listed "
+            f"({time.perf_counter() - started:.1f}s)"
+        )
+
+    async def _refresh_items(self, item_ids: List[str], library_id: str, library_name: str) -> None:
+        """
+        Fetch items with full metadata and save them under their library.
+
+        Args:
+            item_ids (List[str]): Items to fetch
+            library_id (str): Library the items were listed in
+            library_name (str): Library name
+        """
+        chunks = [item_ids[i:i + self.ids_per_request] for i in range(0, len(item_ids), self.ids_per_request)]
+        await asyncio.gather(*(self._refresh_chunk(chunk, library_id, library_name) for chunk in chunks))
+
+    async def _refresh_chunk(self, item_ids: List[str], library_id: str, library_name: str) -> None:
+        """Fetch, convert and save one request's worth of items."""
+        async with self._fetch_slots:
+            try:
+                items = await self.jellyfin.get_items_by_ids(item_ids)
+            except Exception as e:
+                self.logger.error(f"Error fetching {len(item_ids)} changed items: {e}")
+                self.state['errors'] += len(item_ids)
+                return
+
+        self.state['items_fetched'] += len(items)
+        db_items = []
+        for item_data in items:
+            try:
+                db_item = await self.jellyfin.convert_to_database_item(item_data)
+            except Exception as e:
+                self.logger.debug(f"Failed to convert item {item_data.get('Id', 'unknown')}: {e}")
+                self.state['errors'] += 1
+                continue
+            db_item.library_id = library_id
+            db_item.library_name = library_name
+            db_items.append(db_item)
+
+        if db_items:
+            results = await self.db.save_items_batch(db_items)
+            self.state['items_processed'] += results['successful']
+            self.state['errors'] += results['failed']
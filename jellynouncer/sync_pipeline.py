@@ -0,0 +1,1029 @@
+#!/usr/bin/env python3
+"""
+Jellynouncer Library Sync Pipeline
+
+This module contains the staged pipeline that copies the Jellyfin library into
+the local database. A sync is split into three stages that run concurrently and
+are connected by bounded queues:
+
+    fetch  ──queue──▶  convert  ──queue──▶  write
+    (Jellyfin API)     (CPU: parse+hash)    (SQLite)
+
+**Why a Pipeline?**
+    The old sync had a single consumer that converted, hashed and saved each
+    batch in series, so the API sat idle while the database was busy and vice
+    versa. With separate stages every resource works at the same time, and the
+    bounded queues provide backpressure: when SQLite falls behind, the convert
+    queue fills up, conversion blocks, and fetching pauses until there is room.
+
+**Memory Budget:**
+    The queues are bounded by an estimated number of bytes rather than a
+    number of batches, because a page of 500 episodes with many audio and
+    subtitle streams is far larger than a page of 100 photos. Batch sizes are
+    estimated by measuring a small sample of items, and the process's actual
+    peak memory (RSS) is sampled during the sync and reported in the summary.
+
+**Finding the Bottleneck:**
+    Every stage records how long its workers spent working, waiting for input
+    (starved) and waiting for space downstream (blocked). The stage with the
+    highest utilisation is the bottleneck on that deployment - a slow Jellyfin
+    server shows up as a busy `fetch` stage, a slow disk as a busy `write` stage.
+
+Classes:
+    StageStats: Timing and throughput counters for one pipeline stage
+    ByteBudgetQueue: Async FIFO queue bounded by estimated payload bytes
+    LibrarySyncPipeline: Runs the fetch/convert/write stages for one sync
+
+Functions:
+    estimate_payload_bytes: Approximate in-memory size of a batch of items
+
+Author: Mark Newton
+Project: Jellynouncer
+Version: 1.0.0
+License: MIT
+"""
+
+import asyncio
+import collections
+import os
+import sys
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from .config_models import SyncConfig
+from .sync_progress import SyncProgressDisplay
+from .utils import get_logger
+
+
+def _deep_sizeof(obj: Any, seen: set) -> int:
+    """
+    Recursively measure the memory used by an object graph.
+
+    Follows dicts, lists, tuples, sets and dataclass-style objects (both
+    `__dict__` and `__slots__`). Objects reachable twice are counted once.
+
+    Args:
+        obj (Any): Object to measure
+        seen (set): ids of objects already counted
+
+    Returns:
+        int: Approximate size in bytes
+    """
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+
+    if isinstance(obj, dict):
+        for key, value in obj.items():
+            size += _deep_sizeof(key, seen) + _deep_sizeof(value, seen)
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        for value in obj:
+            size += _deep_sizeof(value, seen)
+    elif hasattr(obj, '__dict__'):
+        size += _deep_sizeof(vars(obj), seen)
+    elif hasattr(obj, '__slots__'):
+        for slot in obj.__slots__:
+            if hasattr(obj, slot):
+                size += _deep_sizeof(getattr(obj, slot), seen)
+    return size
+
+
+def estimate_payload_bytes(items: List[Any], sample_size: int = 8) -> int:
+    """
+    Estimate the in-memory size of a batch of items.
+
+    Measuring every item would cost more than the conversion itself on big
+    pages, so a handful of evenly spaced items is measured and the average
+    is scaled up to the batch size.
+
+    Args:
+        items (List[Any]): Batch of API dicts or DatabaseItems
+        sample_size (int): Number of items to measure
+
+    Returns:
+        int: Estimated size of the batch in bytes
+
+    Example:
+        ```python
+        batch_bytes = estimate_payload_bytes(api_items)
+        logger.debug(f"Page is roughly {batch_bytes / 1024:.0f} KB")
+        ```
+    """
+    if not items:
+        return 0
+
+    step = max(1, len(items) // sample_size)
+    sample = items[::step][:sample_size]
+    sampled_bytes = sum(_deep_sizeof(item, set()) for item in sample)
+    return sys.getsizeof(items) + (sampled_bytes * len(items)) // len(sample)
+
+
+def _first_error(error: BaseException) -> BaseException:
+    """
+    Get the first underlying error of a (possibly nested) TaskGroup failure.
+
+    Args:
+        error (BaseException): Error raised by a TaskGroup, or any other error
+
+    Returns:
+        BaseException: The first non-group error inside it (or `error` itself)
+    """
+    while isinstance(error, BaseExceptionGroup) and error.exceptions:
+        error = error.exceptions[0]
+    return error
+
+
+def _current_rss_bytes() -> int:
+    """
+    Get the current resident memory of this process.
+
+    Reads /proc/self/statm on Linux (the Docker image). Elsewhere falls back
+    to the lifetime peak reported by the resource module, which is still an
+    upper bound for the sync.
+
+    Returns:
+        int: Resident memory in bytes (0 if it can't be determined)
+    """
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # macOS reports bytes, Linux reports kilobytes
+        return peak if sys.platform == 'darwin' else peak * 1024
+    except (ImportError, OSError):
+        return 0
+
+
+class ByteBudgetQueue:
+    """
+    Async FIFO queue bounded by estimated payload bytes instead of item count.
+
+    `put()` waits until the queued bytes plus the new item fit in the budget.
+    An item larger than the whole budget is still admitted when the queue is
+    empty, so an unusually large batch slows the pipeline down instead of
+    deadlocking it.
+
+    Attributes:
+        budget_bytes (int): Maximum bytes queued at once
+        queued_bytes (int): Bytes currently queued
+        peak_bytes (int): Highest queued_bytes seen
+
+    Example:
+        ```python
+        queue = ByteBudgetQueue(budget_bytes=32 * 1024 * 1024)
+        await queue.put(batch, estimate_payload_bytes(batch))
+        batch = await queue.get()
+        ```
+    """
+
+    def __init__(self, budget_bytes: int, on_change: Optional[Callable[[int], None]] = None):
+        """
+        Initialize the queue.
+
+        Args:
+            budget_bytes (int): Maximum bytes queued at once
+            on_change (Optional[Callable[[int], None]]): Called with the byte delta
+                whenever bytes are added or removed (used for pipeline-wide totals)
+        """
+        self.budget_bytes = budget_bytes
+        self.queued_bytes = 0
+        self.peak_bytes = 0
+        self._items: Deque[Tuple[Any, int]] = collections.deque()
+        self._condition = asyncio.Condition()
+        self._on_change = on_change
+
+    def qsize(self) -> int:
+        """Number of items currently queued."""
+        return len(self._items)
+
+    async def put(self, item: Any, nbytes: int = 0) -> None:
+        """
+        Add an item, waiting until it fits in the byte budget.
+
+        Args:
+            item (Any): Item to queue
+            nbytes (int): Estimated size of the item in bytes
+        """
+        async with self._condition:
+            await self._condition.wait_for(
+                lambda: not self._items or self.queued_bytes + nbytes <= self.budget_bytes
+            )
+            self._items.append((item, nbytes))
+            self._adjust(nbytes)
+            self._condition.notify_all()
+
+    async def get(self) -> Any:
+        """
+        Remove and return the oldest item, waiting if the queue is empty.
+
+        Returns:
+            Any: The queued item
+        """
+        async with self._condition:
+            await self._condition.wait_for(lambda: bool(self._items))
+            item, nbytes = self._items.popleft()
+            self._adjust(-nbytes)
+            self._condition.notify_all()
+            return item
+
+    def _adjust(self, delta: int) -> None:
+        """Update byte accounting and report the change."""
+        self.queued_bytes += delta
+        self.peak_bytes = max(self.peak_bytes, self.queued_bytes)
+        if self._on_change:
+            self._on_change(delta)
+
+
+@dataclass
+class StageStats:
+    """
+    Timing and throughput counters for one pipeline stage.
+
+    All times are summed across the stage's workers, so a stage with two
+    workers that were both busy for the whole sync has busy_seconds equal
+    to twice the wall-clock time.
+
+    Attributes:
+        name (str): Stage name (fetch, convert, write)
+        workers (int): Number of concurrent workers in the stage
+        busy_seconds (float): Time spent doing the stage's actual work
+        starved_seconds (float): Time spent waiting for input from upstream
+        blocked_seconds (float): Time spent waiting for room in the downstream queue
+        batches (int): Batches handled by the stage
+        items (int): Items handled by the stage
+    """
+    name: str
+    workers: int
+    busy_seconds: float = 0.0
+    starved_seconds: float = 0.0
+    blocked_seconds: float = 0.0
+    batches: int = 0
+    items: int = 0
+
+    def utilization(self, wall_seconds: float) -> float:
+        """
+        Fraction of available worker time spent working.
+
+        Args:
+            wall_seconds (float): Wall-clock duration of the pipeline
+
+        Returns:
+            float: Utilisation between 0.0 and 1.0
+        """
+        capacity = wall_seconds * self.workers
+        return min(self.busy_seconds / capacity, 1.0) if capacity > 0 else 0.0
+
+    def to_dict(self, wall_seconds: float) -> Dict[str, Any]:
+        """
+        Convert the counters to a JSON-friendly summary.
+
+        Args:
+            wall_seconds (float): Wall-clock duration of the pipeline
+
+        Returns:
+            Dict[str, Any]: Summary with utilisation percentage and timings
+        """
+        return {
+            "workers": self.workers,
+            "utilization_percent": round(self.utilization(wall_seconds) * 100, 1),
+            "busy_seconds": round(self.busy_seconds, 2),
+            "starved_seconds": round(self.starved_seconds, 2),
+            "blocked_seconds": round(self.blocked_seconds, 2),
+            "batches": self.batches,
+            "items": self.items,
+            "items_per_second": round(self.items / self.busy_seconds, 1) if self.busy_seconds > 0 else 0
+        }
+
+
+class LibrarySyncPipeline:
+    """
+    Runs one library sync as concurrent fetch, convert and write stages.
+
+    A pipeline object is single-use: create one per sync, call `run()`, then
+    read the results from `state` and `get_stage_summary()`.
+
+    **Stages:**
+        - fetch: `fetch_workers` tasks request pages from Jellyfin concurrently
+        - convert: `convert_workers` tasks turn API items into DatabaseItems
+          (content hashes are computed here, during construction)
+        - write: `write_workers` tasks save batches with `save_items_batch()`,
+          first diffing them against the stored items with
+          `ChangeDetector.detect_changes_batch()` if a change detector is given
+
+    **Failed Pages:**
+        A page that fails is retried `page_retries` times with exponential
+        backoff. If it still fails it is split in half, and each half fetched
+        on its own; halves that fail are split again until the failing items
+        are isolated. Those items, and items that fail conversion, are written
+        to the `sync_quarantine` table so one bad item no longer costs the
+        whole page. Splitting is capped at `bisect_request_limit` requests per
+        page so a server outage can't turn into thousands of requests.
+
+    **Early Exit:**
+        If too many consecutive batches fail completely, or more than
+        `error_threshold_percent` of processed items fail, `state['should_stop']`
+        is set. Upstream stages stop producing and downstream stages drain their
+        queues without doing further work, so nothing is left blocked.
+
+    Attributes:
+        config (SyncConfig): Pipeline tuning (workers, page size, memory budget)
+        state (Dict[str, Any]): Shared progress counters (same keys the sync
+            summary has always used: total_items, items_processed, new_items...)
+        stage_stats (Dict[str, StageStats]): Per-stage timing counters
+        progress_display (Optional[SyncProgressDisplay]): Created once the
+            library size is known
+
+    Example:
+        ```python
+        pipeline = LibrarySyncPipeline(jellyfin, db, config.sync, sync_type="background")
+        await pipeline.run()
+        print(pipeline.state["items_processed"])
+        print(pipeline.get_stage_summary()["bottleneck"])  # e.g. "fetch"
+        ```
+    """
+
+    # Stop the sync if more than this percentage of processed items fail
+    error_threshold_percent = 10
+    # Stop the sync after this many consecutive completely failed batches
+    consecutive_batch_error_limit = 3
+    # Maximum requests spent splitting one failed page
+    bisect_request_limit = 64
+    # Retries for each half while splitting (the full page already had its retries)
+    bisect_retries = 1
+
+    def __init__(self, jellyfin, db, config: SyncConfig, sync_type: str = "background",
+                 since: Optional[datetime] = None, change_detector=None):
+        """
+        Initialize the pipeline for one sync run.
+
+        Args:
+            jellyfin (JellyfinAPI): Connected Jellyfin API client
+            db (DatabaseManager): Initialized database manager
+            config (SyncConfig): Pipeline configuration
+            sync_type (str): "initial", "background" or "incremental" (for progress display)
+            since (Optional[datetime]): Only sync items saved since this time
+            change_detector (Optional[ChangeDetector]): Reports what changed in
+                items whose content differs from the stored version (no diff if None)
+        """
+        self.logger = get_logger("jellynouncer.sync")
+        self.jellyfin = jellyfin
+        self.db = db
+        self.config = config
+        self.sync_type = sync_type
+        self.since = since
+        self.change_detector = change_detector
+
+        self.state: Dict[str, Any] = {
+            'total_items': 0,
+            'items_fetched': 0,
+            'items_processed': 0,
+            'batch_errors': 0,
+            'total_individual_errors': 0,
+            'new_items': 0,
+            'updated_items': 0,
+            'items_changed': 0,  # Updated items with watched changes (quality, codecs...)
+            'consecutive_batch_errors': 0,
+            'fatal_error': '',  # Empty string instead of None for type consistency
+            'should_stop': False,  # Early exit flag for high error rates
+            'batch_size': 0,
+            'pages_recovered': 0,  # Failed pages that were partly synced by splitting
+            'quarantined': 0
+        }
+        self.stage_stats: Dict[str, StageStats] = {
+            "fetch": StageStats("fetch", config.fetch_workers),
+            "convert": StageStats("convert", config.convert_workers),
+            "write": StageStats("write", config.write_workers),
+        }
+        self.progress_display: Optional[SyncProgressDisplay] = None
+        self.wall_seconds = 0.0
+
+        # Memory accounting: estimated bytes queued between stages, and sampled RSS
+        self.memory_budget_bytes = config.queue_memory_mb * 1024 * 1024
+        self.queued_bytes = 0
+        self.queued_bytes_peak = 0
+        self.rss_start_bytes = 0
+        self.rss_peak_bytes = 0
+
+        self._pages_fetched = 0
+
+        # Items that couldn't be synced this run, and ids quarantined by earlier runs
+        self.quarantine: List[Dict[str, Any]] = []
+        self._quarantined_ids: set = set()
+
+    async def run(self) -> Dict[str, Any]:
+        """
+        Run the sync pipeline to completion.
+
+        Returns:
+            Dict[str, Any]: The shared state dictionary with final counters
+        """
+        started = time.perf_counter()
+        started_at = datetime.now(timezone.utc).isoformat()
+        self.rss_start_bytes = self.rss_peak_bytes = _current_rss_bytes()
+
+        # Raw API pages are much larger than converted items, so the fetch->convert
+        # queue gets the larger share of the budget
+        convert_queue = ByteBudgetQueue(self.memory_budget_bytes * 2 // 3, on_change=self._track_queued_bytes)
+        write_queue = ByteBudgetQueue(self.memory_budget_bytes // 3, on_change=self._track_queued_bytes)
+
+        try:
+            self._quarantined_ids = await self.db.get_quarantined_item_ids()
+            page_size, total = await self._plan_pages()
+            page_starts = iter(range(0, total, page_size))
+            self.state['batch_size'] = page_size
+
+            # A failing stage cancels the others, so no worker is left waiting
+            # on a queue nobody reads or fills any more
+            async with asyncio.TaskGroup() as stages:
+                stages.create_task(self._run_stage(
+                    [self._fetch_worker(page_starts, page_size, convert_queue)
+                     for _ in range(self.config.fetch_workers)],
+                    convert_queue, self.config.convert_workers
+                ))
+                stages.create_task(self._run_stage(
+                    [self._convert_worker(convert_queue, write_queue)
+                     for _ in range(self.config.convert_workers)],
+                    write_queue, self.config.write_workers
+                ))
+                stages.create_task(self._run_stage(
+                    [self._write_worker(write_queue) for _ in range(self.config.write_workers)]
+                ))
+        except Exception as e:
+            error = _first_error(e)
+            self.logger.error(f"Sync pipeline failed: {error}", exc_info=error)
+            self.state['fatal_error'] = str(error)
+        finally:
+            self.wall_seconds = time.perf_counter() - started
+
+        await self._update_quarantine(started_at)
+        self._log_stage_summary()
+        return self.state
+
+    async def _plan_pages(self) -> Tuple[int, int]:
+        """
+        Determine the page size and total number of items to sync.
+
+        Returns:
+            Tuple[int, int]: (page_size, total_items)
+        """
+        _, total = await self.jellyfin.get_items_page(0, 1, self.since)
+        page_size = self.config.page_size or self.jellyfin._calculate_optimal_batch_size(total)
+        self.state['total_items'] = total
+
+        self.logger.info(
+            f"Sync pipeline: {total:,} items, page size {page_size}, workers "
+            f"fetch={self.config.fetch_workers} convert={self.config.convert_workers} "
+            f"write={self.config.write_workers}"
+        )
+        if total:
+            self.progress_display = SyncProgressDisplay(
+                total_items=total,
+                batch_size=page_size,
+                sync_type=self.sync_type,
+                logger=self.logger
+            )
+            self.progress_display.log_sync_start()
+        return page_size, total
+
+    def _track_queued_bytes(self, delta: int) -> None:
+        """Keep a pipeline-wide total of queued bytes and its high-water mark."""
+        self.queued_bytes += delta
+        self.queued_bytes_peak = max(self.queued_bytes_peak, self.queued_bytes)
+
+    def _sample_rss(self) -> None:
+        """Record the process's current resident memory if it's a new peak."""
+        self.rss_peak_bytes = max(self.rss_peak_bytes, _current_rss_bytes())
+
+    @staticmethod
+    async def _run_stage(workers: List, downstream: Optional[ByteBudgetQueue] = None,
+                         downstream_workers: int = 0) -> None:
+        """
+        Run all workers of a stage, then signal completion downstream.
+
+        One `None` sentinel is queued per downstream worker once every worker
+        of this stage has finished, so downstream workers exit cleanly. If a
+        worker fails, the stage's other workers are cancelled and the error
+        propagates (no sentinels - `run()` cancels the other stages).
+
+        Args:
+            workers (List): Worker coroutines for this stage
+            downstream (Optional[ByteBudgetQueue]): Queue feeding the next stage
+            downstream_workers (int): Number of workers reading that queue
+        """
+        async with asyncio.TaskGroup() as stage:
+            for worker in workers:
+                stage.create_task(worker)
+        if downstream is not None:
+            for _ in range(downstream_workers):
+                await downstream.put(None)
+
+    async def _fetch_worker(self, page_starts, page_size: int, out_queue: ByteBudgetQueue) -> None:
+        """
+        Fetch pages from Jellyfin until none are left.
+
+        Workers share one iterator of page start indexes; taking the next
+        index never awaits, so two workers can't claim the same page.
+
+        Args:
+            page_starts: Shared iterator of page start indexes
+            page_size (int): Items per page
+            out_queue (ByteBudgetQueue): Queue feeding the convert stage
+        """
+        stats = self.stage_stats["fetch"]
+
+        for start_index in page_starts:
+            if self.state['should_stop']:
+                break
+
+            work_start = time.perf_counter()
+            batch_items = await self._fetch_page_with_recovery(start_index, page_size)
+            stats.busy_seconds += time.perf_counter() - work_start
+
+            if not batch_items:
+                continue
+
+            self._pages_fetched += 1
+            batch_num = self._pages_fetched
+            stats.batches += 1
+            stats.items += len(batch_items)
+            self.state['items_fetched'] += len(batch_items)
+
+            if self.progress_display:
+                self.progress_display.log_batch_progress(
+                    batch_num=batch_num,
+                    items_in_batch=len(batch_items),
+                    total_fetched=self.state['items_fetched'],
+                    items_processed=self.state['items_processed'],
+                    errors=self.state['total_individual_errors'],
+                    new_items=self.state['new_items'],
+                    updated_items=self.state['updated_items']
+                )
+
+            batch_bytes = estimate_payload_bytes(batch_items)
+            self._sample_rss()
+
+            wait_start = time.perf_counter()
+            await out_queue.put((batch_num, batch_items), batch_bytes)
+            stats.blocked_seconds += time.perf_counter() - wait_start
+
+    async def _convert_worker(self, in_queue: ByteBudgetQueue, out_queue: ByteBudgetQueue) -> None:
+        """
+        Convert fetched API items to DatabaseItems.
+
+        Args:
+            in_queue (ByteBudgetQueue): Queue of (batch_num, api_items) from fetch
+            out_queue (ByteBudgetQueue): Queue of (batch_num, db_items) for write
+        """
+        stats = self.stage_stats["convert"]
+
+        while True:
+            wait_start = time.perf_counter()
+            batch = await in_queue.get()
+            stats.starved_seconds += time.perf_counter() - wait_start
+            if batch is None:
+                break
+            if self.state['should_stop']:
+                continue  # Drain without working so upstream never blocks
+
+            batch_num, batch_items = batch
+            work_start = time.perf_counter()
+            db_items = []
+            failed_items = []
+            for item_data in batch_items:
+                db_item, error = await self._convert_item_safe(item_data)
+                if db_item is not None:
+                    db_items.append(db_item)
+                else:
+                    failed_items.append((item_data.get('Id', 'unknown'), item_data.get('Name', 'unknown')))
+                    self._quarantine_item(item_data, "convert", None, error)
+            stats.busy_seconds += time.perf_counter() - work_start
+            stats.batches += 1
+            stats.items += len(batch_items)
+
+            if failed_items:
+                self.state['total_individual_errors'] += len(failed_items)
+                self.logger.warning(f"Batch {batch_num}: {len(failed_items)} items failed conversion")
+                # Log first few failed items for debugging
+                for item_id, item_name in failed_items[:3]:
+                    self.logger.debug(f"  - Failed item: {item_name} (ID: {item_id})")
+                if len(failed_items) > 3:
+                    self.logger.debug(f"  ... and {len(failed_items) - 3} more")
+
+            if not db_items:
+                self.logger.warning(f"Batch {batch_num}: All {len(batch_items)} items failed conversion")
+                self._record_failed_batch()
+                continue
+
+            # Drop the raw page before waiting for queue space
+            del batch, batch_items
+            batch_bytes = estimate_payload_bytes(db_items)
+
+            wait_start = time.perf_counter()
+            await out_queue.put((batch_num, db_items), batch_bytes)
+            stats.blocked_seconds += time.perf_counter() - wait_start
+
+    async def _write_worker(self, in_queue: ByteBudgetQueue) -> None:
+        """
+        Save converted batches to the database.
+
+        Args:
+            in_queue (ByteBudgetQueue): Queue of (batch_num, db_items) from convert
+        """
+        stats = self.stage_stats["write"]
+
+        while True:
+            wait_start = time.perf_counter()
+            batch = await in_queue.get()
+            stats.starved_seconds += time.perf_counter() - wait_start
+            if batch is None:
+                break
+            if self.state['should_stop']:
+                continue
+
+            batch_num, db_items = batch
+            work_start = time.perf_counter()
+            if self.change_detector is not None:
+                # Before the save, while the previous versions are still stored
+                await self._detect_batch_changes(batch_num, db_items)
+            try:
+                batch_results = await self.db.save_items_batch(db_items)
+            except Exception as e:
+                self.logger.error(f"Error saving batch {batch_num}: {e}")
+                batch_results = {'successful': 0, 'failed': len(db_items)}
+            db_save_time = time.perf_counter() - work_start
+            stats.busy_seconds += db_save_time
+            stats.batches += 1
+            stats.items += len(db_items)
+
+            self.state['total_individual_errors'] += batch_results['failed']
+
+            # Check if entire batch failed
+            if batch_results['failed'] == len(db_items) and batch_results['successful'] == 0:
+                self.logger.error(
+                    f"Batch {batch_num}: ENTIRE BATCH FAILED - "
+                    f"likely schema mismatch or database issue. "
+                    f"{batch_results['failed']} items could not be saved."
+                )
+                self._record_failed_batch()
+                continue
+
+            # Reset consecutive error counter on successful batch
+            if batch_results['successful'] > 0:
+                self.state['consecutive_batch_errors'] = 0
+
+            self.state['items_processed'] += batch_results['successful']
+            if self._quarantined_ids:
+                # Items quarantined by an earlier sync that have now saved fine
+                recovered = [item.item_id for item in db_items if item.item_id in self._quarantined_ids]
+                if recovered:
+                    try:
+                        await self.db.release_quarantined_items(recovered)
+                        self._quarantined_ids.difference_update(recovered)
+                    except Exception as e:
+                        # The items are saved; they stay quarantined until a later sync
+                        self.logger.error(f"Error releasing quarantined items of batch {batch_num}: {e}")
+            # Track new vs updated items
+            self.state['new_items'] += batch_results.get('inserted', 0)
+            self.state['updated_items'] += batch_results.get('updated', 0)
+
+            self.logger.debug(
+                f"Batch {batch_num} saved to database: "
+                f"{batch_results['successful']}/{len(db_items)} items (DB: {db_save_time:.2f}s)"
+            )
+            if batch_results['failed'] > 0:
+                self.logger.warning(f"Batch {batch_num}: {batch_results['failed']} items failed to save")
+
+            self._sample_rss()
+            if self.progress_display:
+                self.progress_display.items_processed = self.state['items_processed']
+                self.progress_display.errors = self.state['total_individual_errors']
+                self.progress_display.new_items = self.state['new_items']
+                self.progress_display.updated_items = self.state['updated_items']
+
+            self._check_error_rate()
+
+    async def _detect_batch_changes(self, batch_num: int, db_items: List[Any]) -> None:
+        """
+        Report the watched changes of a batch against the stored items.
+
+        Items whose content hash changed are compared with their stored
+        versions in one `detect_changes_batch()` call; change descriptions are
+        only built (and logged) for the items that actually changed. Changes
+        made while the service wasn't receiving webhooks show up here.
+
+        Args:
+            batch_num (int): Batch number, for log messages
+            db_items (List[DatabaseItem]): Items about to be saved
+        """
+        try:
+            pairs = await self.db.get_changed_items(db_items)
+            if not pairs:
+                return
+            stored, synced = zip(*pairs)
+            batch = self.change_detector.detect_changes_batch(
+                self.change_detector.item_columns(stored), self.change_detector.item_columns(synced)
+            )
+            changed = batch.changed_indexes()
+        except Exception as e:
+            self.logger.warning(f"Batch {batch_num}: change detection failed, saving without it: {e}")
+            return
+
+        self.state['items_changed'] += len(changed)
+        if changed:
+            self.logger.info(f"Batch {batch_num}: {len(changed)} item(s) changed since they were stored")
+        for index in changed:
+            self.logger.debug(
+                f"  {synced[index].name} ({synced[index].item_id}): "
+                f"{self.change_detector.get_change_summary(batch.changes(index))}"
+            )
+
+    async def _convert_item_safe(self, item_data: Dict[str, Any]) -> Tuple[Any, Optional[str]]:
+        """
+        Convert one Jellyfin API item to a DatabaseItem without raising.
+
+        Args:
+            item_data (Dict[str, Any]): Raw item data from the Jellyfin API
+
+        Returns:
+            Tuple[Any, Optional[str]]: (DatabaseItem, None) if conversion succeeded,
+            (None, error message) if it failed
+        """
+        try:
+            db_item = await self.jellyfin.convert_to_database_item(item_data)
+        except Exception as e:
+            self.logger.debug(
+                f"Failed to convert item {item_data.get('Name', 'unknown')} "
+                f"(ID: {item_data.get('Id', 'unknown')}, Type: {item_data.get('Type', 'unknown')}): {e}"
+            )
+            return None, f"{type(e).__name__}: {e}"
+        if db_item is None:
+            return None, "Conversion returned no item"
+        return db_item, None
+
+    async def _fetch_range(self, start_index: int, limit: int, retries: int,
+                           minimal: bool = False) -> List[Dict[str, Any]]:
+        """
+        Fetch one range of items, retrying with exponential backoff.
+
+        Args:
+            start_index (int): Index of the first item
+            limit (int): Number of items to fetch
+            retries (int): Extra attempts after the first failure
+            minimal (bool): Request only basic item fields
+
+        Returns:
+            List[Dict[str, Any]]: Fetched items
+
+        Raises:
+            Exception: The last error if every attempt failed
+        """
+        for attempt in range(retries + 1):
+            try:
+                items, _ = await self.jellyfin.get_items_page(start_index, limit, self.since, minimal=minimal)
+                return items
+            except Exception as e:
+                if attempt >= retries or self.state['should_stop']:
+                    raise
+                delay = self.config.retry_backoff_seconds * (2 ** attempt)
+                self.logger.debug(
+                    f"Fetching {limit} items at index {start_index} failed ({e}), "
+                    f"retrying in {delay:.1f}s ({attempt + 1}/{retries})"
+                )
+                await asyncio.sleep(delay)
+        return []
+
+    async def _fetch_page_with_recovery(self, start_index: int, page_size: int) -> List[Dict[str, Any]]:
+        """
+        Fetch a page, falling back to splitting it if it keeps failing.
+
+        Args:
+            start_index (int): Index of the first item in the page
+            page_size (int): Items per page
+
+        Returns:
+            List[Dict[str, Any]]: Every item of the page that could be fetched
+            (empty if nothing could be recovered)
+        """
+        try:
+            return await self._fetch_range(start_index, page_size, self.config.page_retries)
+        except Exception as e:
+            if page_size <= 1 or self.state['should_stop']:
+                self.logger.error(f"Error retrieving page at index {start_index}: {e}")
+                self._record_failed_batch()
+                return []
+            self.logger.warning(
+                f"Page at index {start_index} failed after {self.config.page_retries} retries ({e}), "
+                f"splitting it to isolate the failing items"
+            )
+
+        budget = {'requests': self.bisect_request_limit, 'exhausted': False, 'failed': []}
+        items = await self._bisect_range(start_index, page_size, budget)
+
+        if budget['exhausted'] or not items:
+            # Nothing (or too little) came back - more likely the server is down
+            # than every item being broken, so don't quarantine anything
+            self.logger.error(
+                f"Page at index {start_index}: splitting didn't isolate the failure, "
+                f"recovered {len(items)}/{page_size} items"
+            )
+            self._record_failed_batch()
+            return items
+
+        self.state['pages_recovered'] += 1
+        self.logger.info(
+            f"Page at index {start_index}: recovered {len(items)}/{page_size} items by splitting, "
+            f"{len(budget['failed'])} item(s) quarantined"
+        )
+        for index, error in budget['failed']:
+            await self._quarantine_index(index, error)
+        return items
+
+    async def _bisect_range(self, start_index: int, limit: int, budget: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Fetch a failed range as two halves, splitting failing halves again.
+
+        Args:
+            start_index (int): Index of the first item in the failed range
+            limit (int): Number of items in the range
+            budget (Dict[str, Any]): Remaining request budget for this page, and
+                the (index, error) pairs of single items that failed
+
+        Returns:
+            List[Dict[str, Any]]: Items recovered from the range
+        """
+        half = limit // 2
+        items: List[Dict[str, Any]] = []
+
+        for sub_start, sub_limit in ((start_index, half), (start_index + half, limit - half)):
+            if budget['requests'] <= 0 or self.state['should_stop']:
+                budget['exhausted'] = True
+                break
+            budget['requests'] -= 1
+            try:
+                items.extend(await self._fetch_range(sub_start, sub_limit, self.bisect_retries))
+            except Exception as e:
+                if sub_limit == 1:
+                    budget['failed'].append((sub_start, e))
+                else:
+                    items.extend(await self._bisect_range(sub_start, sub_limit, budget))
+
+        return items
+
+    async def _quarantine_index(self, index: int, error: Exception) -> None:
+        """
+        Quarantine the single item at `index` that the server fails to return.
+
+        A request for only the basic fields usually still works, which tells us
+        which item it is; otherwise the entry is keyed by its library index.
+
+        Args:
+            index (int): Library index of the failing item
+            error (Exception): The error from the full request
+        """
+        item_data: Dict[str, Any] = {}
+        try:
+            basic_items = await self._fetch_range(index, 1, 0, minimal=True)
+            if basic_items:
+                item_data = basic_items[0]
+        except Exception:
+            pass
+
+        self.state['total_individual_errors'] += 1
+        self._quarantine_item(item_data, "fetch", index, f"{type(error).__name__}: {error}")
+
+    def _quarantine_item(self, item_data: Dict[str, Any], stage: str,
+                         index: Optional[int], error: Optional[str]) -> None:
+        """Remember an item that couldn't be synced so it can be quarantined."""
+        self.quarantine.append({
+            'item_id': item_data.get('Id'),
+            'item_name': item_data.get('Name'),
+            'item_type': item_data.get('Type'),
+            'stage': stage,
+            'start_index': index,
+            'error': error or 'unknown error'
+        })
+        self.state['quarantined'] = len(self.quarantine)
+
+    async def _update_quarantine(self, started_at: str) -> None:
+        """
+        Write this run's quarantined items and clear entries that have recovered.
+
+        After a complete full sync, anything still in quarantine that didn't fail
+        this time either synced or no longer exists, so it is removed.
+
+        Args:
+            started_at (str): ISO timestamp of when this sync started
+        """
+        try:
+            if self.quarantine:
+                await self.db.quarantine_sync_items(self.quarantine)
+                for entry in self.quarantine[:5]:
+                    self.logger.warning(
+                        f"  - Quarantined {entry['item_name'] or 'unknown item'} "
+                        f"(ID: {entry['item_id'] or 'unknown'}, index: {entry['start_index']}, "
+                        f"stage: {entry['stage']}): {entry['error']}"
+                    )
+                if len(self.quarantine) > 5:
+                    self.logger.warning(f"  ... and {len(self.quarantine) - 5} more")
+
+            if self.since is None and not self.state['should_stop'] and not self.state['fatal_error']:
+                cleared = await self.db.clear_resolved_quarantine(started_at)
+                if cleared:
+                    self.logger.info(f"Released {cleared} item(s) from sync quarantine")
+        except Exception as e:
+            self.logger.error(f"Failed to update sync quarantine: {e}")
+
+    def _record_failed_batch(self) -> None:
+        """Count a completely failed batch and stop after too many in a row."""
+        self.state['batch_errors'] += 1
+        self.state['consecutive_batch_errors'] += 1
+
+        consecutive = self.state['consecutive_batch_errors']
+        if consecutive >= self.consecutive_batch_error_limit and not self.state['should_stop']:
+            self.logger.error(f"Stopping sync: {consecutive} consecutive batches failed completely")
+            self.state['should_stop'] = True
+            self.state['fatal_error'] = f"Too many consecutive batch failures: {consecutive}"
+
+    def _check_error_rate(self) -> None:
+        """Stop the sync if the item error rate exceeds the threshold."""
+        processed = self.state['items_processed']
+        # Only check after processing some items
+        if processed <= 100 or self.state['should_stop']:
+            return
+
+        error_rate = (self.state['total_individual_errors'] / processed) * 100
+        if error_rate > self.error_threshold_percent:
+            self.logger.error(
+                f"Stopping sync: Error rate {error_rate:.1f}% exceeds threshold {self.error_threshold_percent}%"
+            )
+            self.state['should_stop'] = True
+            self.state['fatal_error'] = f"Error rate too high: {error_rate:.1f}%"
+
+    def get_stage_summary(self) -> Dict[str, Any]:
+        """
+        Get per-stage utilisation and the likely bottleneck.
+
+        Returns:
+            Dict[str, Any]: Stage statistics keyed by stage name, plus
+                "bottleneck" (the most utilised stage) and "wall_seconds"
+
+        Example:
+            ```python
+            summary = pipeline.get_stage_summary()
+            # {"fetch": {"utilization_percent": 92.1, ...}, ..., "bottleneck": "fetch"}
+            ```
+        """
+        summary: Dict[str, Any] = {
+            name: stats.to_dict(self.wall_seconds) for name, stats in self.stage_stats.items()
+        }
+        summary["bottleneck"] = max(
+            self.stage_stats.values(), key=lambda s: s.utilization(self.wall_seconds)
+        ).name if self.wall_seconds > 0 else None
+        summary["wall_seconds"] = round(self.wall_seconds, 2)
+        return summary
+
+    def get_memory_summary(self) -> Dict[str, Any]:
+        """
+        Get memory usage of the sync.
+
+        Returns:
+            Dict[str, Any]: Configured queue budget, estimated peak of queued
+                batches, and the sampled process RSS at start and at its peak
+
+        Example:
+            ```python
+            memory = pipeline.get_memory_summary()
+            # {"budget_mb": 64, "queue_peak_mb": 41.2, "rss_start_mb": 88.0, "rss_peak_mb": 151.3, ...}
+            ```
+        """
+        mb = 1024 * 1024
+        return {
+            "budget_mb": round(self.memory_budget_bytes / mb, 1),
+            "queue_peak_mb": round(self.queued_bytes_peak / mb, 1),
+            "rss_start_mb": round(self.rss_start_bytes / mb, 1),
+            "rss_peak_mb": round(self.rss_peak_bytes / mb, 1),
+            "rss_growth_mb": round(max(0, self.rss_peak_bytes - self.rss_start_bytes) / mb, 1)
+        }
+
+    def _log_stage_summary(self) -> None:
+        """Log how busy each stage was so the bottleneck is visible in the logs."""
+        summary = self.get_stage_summary()
+        parts = [
+            f"{name}: {summary[name]['utilization_percent']:.0f}% busy "
+            f"({summary[name]['workers']} worker{'s' if summary[name]['workers'] != 1 else ''})"
+            for name in self.stage_stats
+        ]
+        self.logger.info(f"Sync pipeline stages - {', '.join(parts)}; bottleneck: {summary['bottleneck']}")
+
+        memory = self.get_memory_summary()
+        self.logger.info(
+            f"Sync memory - queued peak {memory['queue_peak_mb']} MB of {memory['budget_mb']} MB budget, "
+            f"process RSS peak {memory['rss_peak_mb']} MB (+{memory['rss_growth_mb']} MB during sync)"
+        )
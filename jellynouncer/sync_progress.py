@@ -103,7 +103,7 @@ class SyncProgressDisplay:
         Args:
             total_items: Total number of items to sync
             batch_size: Size of each batch (for error coloring)
-            sync_type: Type of sync ("initial" or "background")
+            sync_type: Type of sync ("initial", "background" or "incremental")
             logger: Logger instance for output
         """
         self.total_items = total_items
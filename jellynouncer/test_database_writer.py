@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Test script for the DatabaseManager writer task (group commit) under
+concurrent writes, against a real database in a temporary directory.
+
+Each scenario prints [OK] or [X]; the exit status is 1 if any failed.
+
+Usage:
+    python jellynouncer/test_database_writer.py
+"""
+
+import asyncio
+import logging
+import os
+import sys
+import tempfile
+
+# Add parent directory to path so we can import jellynouncer modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from jellynouncer.config_models import DatabaseConfig  # noqa: E402
+from jellynouncer.database_manager import DatabaseManager  # noqa: E402
+from jellynouncer.database_models import DatabaseItem  # noqa: E402
+
+WRITERS = 60
+
+
+def movie(number: int) -> DatabaseItem:
+    return DatabaseItem(item_id=f"{number:032x}", name=f"Movie {number}", item_type="Movie",
+                        year=2000 + number % 25, video_height=1080, video_codec="h264",
+                        file_path=f"/movies/Movie {number}.mkv")
+
+
+def unsaveable(number: int) -> DatabaseItem:
+    """An item whose row SQLite can't bind, so its upsert raises inside the transaction."""
+    item = movie(number)
+    item.file_path = object()
+    return item
+
+
+async def open_db(directory: str) -> DatabaseManager:
+    db = DatabaseManager(DatabaseConfig(path=os.path.join(directory, "jellynouncer.db")))
+    await db.initialize()
+    return db
+
+
+async def check_concurrent_writes(directory):
+    """Concurrent saves and deletes with one failing write all resolve, in shared commits."""
+    db = await open_db(directory)
+    try:
+        doomed = [movie(1000 + number) for number in range(10)]
+        for item in doomed:
+            assert await db.save_item(item), "setup save failed"
+        commits_before = db.group_commit_stats['commits']
+
+        bad = unsaveable(999)
+        writes = [db.save_item(movie(number)) for number in range(WRITERS)]
+        writes[WRITERS // 2:WRITERS // 2] = [db.save_item(bad)]
+        writes += [db.delete_item(item.item_id) for item in doomed]
+        # Reads share the pool with the writer and must not block it
+        reads = [db.get_item(doomed[0].item_id) for _ in range(5)]
+        results = await asyncio.wait_for(asyncio.gather(*writes, *reads), timeout=30)
+        write_results = results[:len(writes)]
+
+        expected = [True] * len(writes)
+        expected[WRITERS // 2] = False
+        assert write_results == expected, write_results
+        for number in range(WRITERS):
+            assert await db.get_item(movie(number).item_id) is not None, f"movie {number} rolled back"
+        for item in doomed:
+            assert await db.get_item(item.item_id) is None, f"{item.item_id} not deleted"
+        assert await db.get_item(bad.item_id) is None, "failed write was stored"
+
+        commits = db.group_commit_stats['commits'] - commits_before
+        assert commits < len(writes), f"{len(writes)} writes took {commits} commits"
+        assert db.group_commit_stats['largest_group'] > 1, db.group_commit_stats
+    finally:
+        await db.close()
+
+
+async def check_failure_shares_commit(directory):
+    """A failing write in the same group as good ones only rolls back itself."""
+    db = await open_db(directory)
+    try:
+        commits_before = db.group_commit_stats['commits']
+        results = await asyncio.wait_for(asyncio.gather(
+            db.save_item(movie(1)), db.save_item(unsaveable(2)), db.save_item(movie(3))
+        ), timeout=30)
+        assert results == [True, False, True], results
+        assert db.group_commit_stats['commits'] - commits_before == 1, "writes were not group-committed"
+        assert await db.get_item(movie(1).item_id) is not None
+        assert await db.get_item(movie(2).item_id) is None
+        assert await db.get_item(movie(3).item_id) is not None
+    finally:
+        await db.close()
+
+
+async def check_close_drains_queue(directory):
+    """close() commits every queued write before stopping the writer."""
+    db = await open_db(directory)
+    writes = [asyncio.create_task(db.save_item(movie(number))) for number in range(WRITERS)]
+    await asyncio.sleep(0)  # Let every save queue its request
+    await asyncio.wait_for(db.close(), timeout=30)
+    assert all(write.done() for write in writes), "close() returned with writes pending"
+    assert [write.result() for write in writes] == [True] * WRITERS
+
+    db = await open_db(directory)
+    try:
+        for number in range(WRITERS):
+            assert await db.get_item(movie(number).item_id) is not None, f"movie {number} lost on close"
+    finally:
+        await db.close()
+
+
+async def main() -> int:
+    logging.disable(logging.CRITICAL)
+    failed = 0
+    for check in (check_concurrent_writes, check_failure_shares_commit, check_close_drains_queue):
+        with tempfile.TemporaryDirectory() as directory:
+            try:
+                await check(directory)
+                print(f"   [OK] {check.__doc__}")
+            except Exception as e:
+                failed += 1
+                print(f"   [X] {check.__doc__}\n       {type(e).__name__}: {e}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Test script that drives ItemAdded/ItemDeleted webhooks through WebhookService
+end to end, against a real database in a temporary directory.
+
+Jellyfin and Discord are replaced by small in-process fakes, so no server is
+needed. Each scenario prints [OK] or [X]; the exit status is 1 if any failed.
+
+Usage:
+    python jellynouncer/test_webhook_flow.py
+"""
+
+import asyncio
+import logging
+import os
+import sys
+import tempfile
+import time
+from types import SimpleNamespace
+
+# Add parent directory to path so we can import jellynouncer modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from jellynouncer.change_detector import ChangeDetector  # noqa: E402
+from jellynouncer.config_models import DatabaseConfig, JellyfinConfig, NotificationsConfig  # noqa: E402
+from jellynouncer.database_manager import DatabaseManager  # noqa: E402
+from jellynouncer.jellyfin_api import JellyfinAPI  # noqa: E402
+from jellynouncer.webhook_models import WebhookPayload  # noqa: E402
+from jellynouncer.webhook_service import WebhookService  # noqa: E402
+
+
+class FakeJellyfin(JellyfinAPI):
+    """JellyfinAPI whose server is a dictionary of item data."""
+
+    def __init__(self):
+        super().__init__(JellyfinConfig(server_url="http://jellyfin:8096", api_key="test", user_id="test"))
+        self.items = {}
+
+    async def get_item(self, item_id):
+        return self.items.get(item_id)
+
+    async def get_items_by_ids(self, item_ids):
+        return [self.items[item_id] for item_id in item_ids if item_id in self.items]
+
+    async def enrich_media_item_for_notification(self, media_item, item_data=None, retry_on_failure=False):
+        return media_item
+
+
+class FakeDiscord:
+    """Records notifications instead of sending them."""
+
+    def __init__(self):
+        self.sent = []
+
+    async def send_notification(self, item, action, changes=None, **kwargs):
+        self.sent.append((item.item_id, action, changes))
+        return {"success": True}
+
+
+def movie_data(item_id, name, height, width, path, video_range="SDR"):
+    """Jellyfin /Items data of a movie."""
+    return {
+        "Id": item_id, "Name": name, "Type": "Movie", "ProductionYear": 1999, "Path": path,
+        "MediaSources": [{
+            "Size": 10_000_000_000 + height,
+            "MediaStreams": [
+                {"Type": "Video", "Height": height, "Width": width, "Codec": "hevc",
+                 "VideoRange": video_range, "BitRate": 20_000_000},
+                {"Type": "Audio", "Codec": "eac3", "Channels": 6, "Language": "eng"},
+            ],
+        }],
+    }
+
+
+def payload(notification_type, data, **fields):
+    fields = {"ItemId": data["Id"], "Name": data["Name"], "ItemType": data["Type"],
+              "Year": data.get("ProductionYear"), "Path": data.get("Path"), **fields}
+    return WebhookPayload(NotificationType=notification_type, **fields)
+
+
+async def make_service(directory):
+    service = WebhookService()
+    service.config = SimpleNamespace(notifications=NotificationsConfig(filter_renames=True, filter_deletes=True))
+    service.db = DatabaseManager(DatabaseConfig(path=os.path.join(directory, "jellynouncer.db")))
+    await service.db.initialize()
+    service.jellyfin = FakeJellyfin()
+    service.change_detector = ChangeDetector(service.config.notifications)
+    service.discord = FakeDiscord()
+    return service
+
+
+async def store(service, data):
+    """Save an item as a previous sync would have."""
+    await service.db.save_item(await service.jellyfin.convert_to_media_item(data))
+
+
+async def check_upgrade_without_deletion(directory):
+    """A better file under a new id, with no ItemDeleted webhook before it."""
+    service = await make_service(directory)
+    try:
+        old = movie_data("a" * 32, "The Matrix", 1080, 1920, "/movies/The Matrix (1999) - 1080p.mkv")
+        new = movie_data("b" * 32, "The Matrix", 2160, 3840, "/movies/The Matrix (1999) - 2160p.mkv", "HDR10")
+        await store(service, old)
+        service.jellyfin.items[new["Id"]] = new  # The old id is gone from Jellyfin
+
+        result = await service._route_webhook(payload("ItemAdded", new), time.time())
+        assert result["action"] == "upgraded_item", result
+        assert result["quality_upgrade"] is True, result
+        assert await service.db.get_item(old["Id"]) is None, "replaced item still stored"
+        assert await service.db.get_item(new["Id"]) is not None, "new item not saved"
+        assert [action for _, action, _ in service.discord.sent] == ["upgraded_item"], service.discord.sent
+    finally:
+        await service.db.close()
+
+
+async def check_upgrade_after_deletion(directory):
+    """A better file whose ItemDeleted webhook is still pending, matched by IMDb id."""
+    service = await make_service(directory)
+    try:
+        old = movie_data("c" * 32, "The Matrix", 1080, 1920, "/movies/The Matrix (1999) - 1080p.mkv")
+        new = movie_data("d" * 32, "The Matrix", 2160, 3840, "/movies/Matrix, The (1999) [2160p].mkv", "HDR10")
+        await store(service, old)
+        service.jellyfin.items[new["Id"]] = new
+
+        result = await service._route_webhook(payload("ItemDeleted", old, Provider_imdb="tt0133093"), time.time())
+        assert old["Id"] in service.pending_deletions, result
+        result = await service._route_webhook(payload("ItemAdded", new, Provider_imdb="tt0133093"), time.time())
+        assert result["action"] == "upgraded_item", result
+        assert result["matched_by"] == "imdb", result
+        assert old["Id"] not in service.pending_deletions, "deletion still pending"
+        assert await service.db.get_item(old["Id"]) is None, "replaced item still stored"
+        assert [action for _, action, _ in service.discord.sent] == ["upgraded_item"], service.discord.sent
+    finally:
+        await service.db.close()
+
+
+async def check_rename_after_deletion(directory):
+    """The same file moved to another folder, matched by its path stem."""
+    service = await make_service(directory)
+    try:
+        old = movie_data("e" * 32, "The Matrix", 2160, 3840, "/movies/The Matrix (1999) - 2160p.mkv")
+        new = dict(old, Id="f" * 32, Path="/archive/The Matrix (1999) - 2160p.mkv")
+        await store(service, old)
+        service.jellyfin.items[new["Id"]] = new
+
+        await service._route_webhook(payload("ItemDeleted", old), time.time())
+        result = await service._route_webhook(payload("ItemAdded", new, Name="Matrix"), time.time())
+        assert result["action"] == "rename_filtered", result
+        assert result["matched_by"] == "path_stem", result
+        assert await service.db.get_item(new["Id"]) is not None, "renamed item not stored under its new id"
+        assert service.discord.sent == [], service.discord.sent
+    finally:
+        await service.db.close()
+
+
+async def check_upgrade_in_place(directory):
+    """An ItemChanged webhook for an item whose file got better under the same id."""
+    service = await make_service(directory)
+    try:
+        old = movie_data("1" * 32, "The Matrix", 1080, 1920, "/movies/The Matrix (1999).mkv")
+        new = movie_data("1" * 32, "The Matrix", 2160, 3840, "/movies/The Matrix (1999).mkv", "HDR10")
+        await store(service, old)
+        service.jellyfin.items[new["Id"]] = new
+
+        result = await service._route_webhook(payload("ItemChanged", new), time.time())
+        assert result["action"] == "upgraded_item", result
+        assert result["quality_upgrade"] is True, result
+        assert (await service.db.get_item(new["Id"])).video_height == 2160, "new specs not saved"
+        assert [action for _, action, _ in service.discord.sent] == ["upgraded_item"], service.discord.sent
+    finally:
+        await service.db.close()
+
+
+async def main() -> int:
+    logging.disable(logging.CRITICAL)
+    failed = 0
+    for check in (check_upgrade_without_deletion, check_upgrade_after_deletion,
+                  check_rename_after_deletion, check_upgrade_in_place):
+        with tempfile.TemporaryDirectory() as directory:
+            try:
+                await check(directory)
+                print(f"   [OK] {check.__doc__}")
+            except Exception as e:
+                failed += 1
+                print(f"   [X] {check.__doc__}\n       {type(e).__name__}: {e}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -52,6 +52,8 @@ import bcrypt
 
 # Import Jellynouncer modules
 from jellynouncer.config_models import ConfigurationValidator
+from jellynouncer.database_manager import DatabaseManager
+from jellynouncer.quality_score import parse_tier, tier_label
 from jellynouncer.utils import get_logger
 from jellynouncer.webhook_service import WebhookService
 from jellynouncer.ssl_manager import SSLManager, setup_ssl_routes
@@ -153,6 +155,13 @@ class WebDatabaseManager:
         self.db_path = db_path
         self.logger = get_logger("jellynouncer.web_db")
         self.logger.debug(f"Initializing WebDatabaseManager with path: {db_path}")
+        # Security settings are checked on every authenticated request; this
+        # process is their only writer, so they are kept until updated
+        self._security_settings: Optional[Dict[str, bool]] = None
+        
+    def connect_read_only(self) -> aiosqlite.Connection:
+        """Open a read-only connection (mode=ro URI) for lookups that never write"""
+        return aiosqlite.connect(f"{Path(self.db_path).resolve().as_uri()}?mode=ro", uri=True)
         
     async def initialize(self):
         """Initialize the web database with required tables"""
@@ -235,16 +244,21 @@ class WebDatabaseManager:
     
     async def get_security_settings(self) -> Dict[str, bool]:
         """Get current security settings"""
-        async with aiosqlite.connect(self.db_path) as db:
+        if self._security_settings is not None:
+            return dict(self._security_settings)
+        
+        async with self.connect_read_only() as db:
             db.row_factory = aiosqlite.Row
+            await db.execute("PRAGMA query_only=ON")
             cursor = await db.execute("SELECT * FROM security_settings WHERE id = 1")
             settings = await cursor.fetchone()
             
             if settings:
-                return {
+                self._security_settings = {
                     "auth_enabled": bool(settings["auth_enabled"]),
                     "require_webhook_auth": bool(settings["require_webhook_auth"])
                 }
+                return dict(self._security_settings)
             return {"auth_enabled": False, "require_webhook_auth": False}
     
     async def update_security_settings(self, auth_enabled: bool, require_webhook_auth: bool):
@@ -257,6 +271,7 @@ class WebDatabaseManager:
                 (auth_enabled, require_webhook_auth)
             )
             await db.commit()
+        self._security_settings = None
     
     @staticmethod
     def _generate_salt() -> str:
@@ -409,8 +424,7 @@ async def get_current_user_optional(credentials: Optional[HTTPAuthorizationCrede
 async def check_auth_required(user: Optional[Dict[str, Any]] = Depends(get_current_user_optional)) -> Optional[Dict[str, Any]]:
     """Check if authentication is required and validate user"""
     # Check if auth is enabled
-    web_db = WebDatabaseManager()
-    settings = await web_db.get_security_settings()
+    settings = await web_service.web_db.get_security_settings()
     
     if settings["auth_enabled"]:
         if not user:
@@ -433,6 +447,9 @@ class WebInterfaceService:
     def __init__(self, webhook_service: Optional[WebhookService] = None):
         self.webhook_service = webhook_service
         self.config = None
+        # Main Jellynouncer database: the webhook service's own manager when it
+        # runs in this process, otherwise a read-only one (see get_media_db)
+        self.media_db: Optional[DatabaseManager] = webhook_service.db if webhook_service else None
         self.web_db = WebDatabaseManager()
         self.ssl_manager = SSLManager(WEB_DB_PATH)
         self.logger = get_logger("jellynouncer.web_interface")
@@ -478,6 +495,43 @@ class WebInterfaceService:
         asyncio.create_task(self._periodic_stats_refresh())
         self.logger.info("Started periodic Jellyfin stats refresh task")
     
+    async def get_media_db(self) -> Optional[DatabaseManager]:
+        """
+        Get a manager for reading the main Jellynouncer database.
+        
+        When the webhook service runs in another process (the normal setup),
+        the database is opened read-only: pooled `mode=ro` shared-cache
+        connections that read WAL snapshots and never take the write lock,
+        with dashboard aggregates cached for `web_interface.overview_cache_seconds`.
+        If the database doesn't exist yet, None is returned and opening is
+        retried on the next call.
+        
+        Returns:
+            Optional[DatabaseManager]: Manager to read from, or None if unavailable
+        """
+        if self.media_db is not None or self.config is None:
+            return self.media_db
+        
+        media_db = DatabaseManager(
+            self.config.database,
+            read_only=True,
+            result_cache_seconds=self.config.web_interface.overview_cache_seconds
+        )
+        try:
+            await media_db.initialize()
+        except Exception as e:
+            self.logger.debug(f"Main database not available yet: {e}")
+            await media_db.close()
+            return None
+        self.media_db = media_db
+        return media_db
+    
+    async def close(self):
+        """Close the read-only main database connections (if this service opened them)"""
+        if self.media_db is not None and self.media_db.read_only:
+            await self.media_db.close()
+            self.media_db = None
+    
     async def _periodic_stats_refresh(self):
         """Periodically refresh Jellyfin stats"""
         while True:
@@ -515,8 +569,9 @@ class WebInterfaceService:
                 return stats
             else:
                 # Try to get from database
-                if self.webhook_service and self.webhook_service.db:
-                    return await self.webhook_service.db.get_latest_jellyfin_stats()
+                media_db = await self.get_media_db()
+                if media_db:
+                    return await media_db.get_latest_jellyfin_stats()
                 
             return {}
         except Exception as e:
@@ -582,9 +637,13 @@ class WebInterfaceService:
             self.logger.warning(f"Could not get system metrics: {e}")
         
         # Get Jellyfin stats from database
+        media_db = await self.get_media_db()
+        if media_db is None:
+            stats["system_health"]["database"] = "unavailable"
+        
         try:
-            if self.webhook_service and self.webhook_service.db:
-                jellyfin_stats = await self.webhook_service.db.get_latest_jellyfin_stats()
+            if media_db:
+                jellyfin_stats = await media_db.get_latest_jellyfin_stats()
                 if jellyfin_stats:
                     # Check if stats are stale (older than 1 hour)
                     if 'last_check' in jellyfin_stats:
@@ -601,15 +660,15 @@ class WebInterfaceService:
             self.logger.warning(f"Could not get Jellyfin stats: {e}")
         
         # Get statistics from main database if webhook service is available
-        if self.webhook_service and self.webhook_service.db:
+        if media_db:
             try:
-                db_stats = await self.webhook_service.db.get_statistics()
+                db_stats = await media_db.get_statistics()
                 stats["total_items"] = db_stats.get("total_items", 0)
                 stats["items_today"] = db_stats.get("items_added_today", 0)
                 stats["items_week"] = db_stats.get("items_added_week", 0)
                 
                 # Get recent notifications
-                recent = await self.webhook_service.db.get_recent_changes(limit=10)
+                recent = await media_db.get_recent_changes(limit=10)
                 stats["recent_notifications"] = [
                     {
                         "id": item.get("id"),
@@ -622,7 +681,7 @@ class WebInterfaceService:
                 ]
                 
                 # Discord webhook status
-                if self.webhook_service.discord:
+                if self.webhook_service and self.webhook_service.discord:
                     for webhook_name, webhook_url in self.webhook_service.discord.webhooks.items():
                         stats["discord_webhooks"][webhook_name] = {
                             "configured": bool(webhook_url),
@@ -764,6 +823,61 @@ class WebInterfaceService:
         # For now, we'll just indicate this needs implementation
         raise NotImplementedError("Default template restoration not yet implemented")
     
+    @staticmethod
+    def _quality_entry(item) -> Dict[str, Any]:
+        """Library item as listed by the quality endpoints"""
+        return {
+            "item_id": item.item_id,
+            "name": item.name,
+            "type": item.item_type,
+            "series_name": item.series_name,
+            "season_number": item.season_number,
+            "episode_number": item.episode_number,
+            "year": item.year,
+            "quality": tier_label(item.quality_tier),
+            "quality_score": item.quality_score,
+            "upgraded_at": item.quality_upgraded_at,
+        }
+
+    async def get_library_quality(self, below: str, item_type: Optional[str], limit: int) -> Dict[str, Any]:
+        """
+        Get the items below a quality tier and the library's tier counts.
+
+        Raises:
+            ValueError: Unknown tier name
+            RuntimeError: Media database unavailable
+        """
+        tier = parse_tier(below)
+        media_db = await self.get_media_db()
+        if media_db is None:
+            raise RuntimeError("Media database unavailable")
+        items = await media_db.get_items_below_tier(tier, item_type, limit)
+        distribution = await media_db.get_quality_distribution(item_type)
+        return {
+            "below": tier_label(tier),
+            "items": [self._quality_entry(item) for item in items],
+            "count": len(items),
+            "distribution": {tier_label(tier): count for tier, count in distribution.items()},
+        }
+
+    async def get_quality_upgrades(self, days: int, item_type: Optional[str], limit: int) -> Dict[str, Any]:
+        """
+        Get the items whose quality went up in the last `days` days.
+
+        Raises:
+            RuntimeError: Media database unavailable
+        """
+        media_db = await self.get_media_db()
+        if media_db is None:
+            raise RuntimeError("Media database unavailable")
+        since = (datetime.now(timezone.utc) - timedelta(days=days)).isoformat()
+        items = await media_db.get_quality_upgrades(since, item_type, limit)
+        return {
+            "since": since,
+            "items": [self._quality_entry(item) for item in items],
+            "count": len(items),
+        }
+
     async def get_logs(self, query: LogQuery) -> List[Dict[str, Any]]:
         """Get log entries based on query parameters"""
         # Use the configured log directory
@@ -864,6 +978,7 @@ async def lifespan(app_instance: FastAPI):
     
     # Shutdown
     logger.info("Shutting down web interface...")
+    await web_service.close()
 
 
 # Create FastAPI app
@@ -1027,7 +1142,7 @@ async def refresh_token(token_string: str):
         )
     
     # Get user details
-    async with aiosqlite.connect(WEB_DB_PATH) as db:
+    async with web_service.web_db.connect_read_only() as db:
         db.row_factory = aiosqlite.Row
         cursor = await db.execute("SELECT username FROM users WHERE id = ?", (user_id,))
         user = await cursor.fetchone()
@@ -1061,7 +1176,7 @@ async def get_auth_status():
 async def setup_authentication(user_create: UserCreate):
     """Initial authentication setup - only works when no users exist"""
     # Check if any users exist
-    async with aiosqlite.connect(WEB_DB_PATH) as db:
+    async with web_service.web_db.connect_read_only() as db:
         cursor = await db.execute("SELECT COUNT(*) FROM users")
         user_count = (await cursor.fetchone())[0]
     
@@ -1279,6 +1394,29 @@ async def get_logs(log_query: LogQuery, current_user: Optional[Dict] = Depends(c
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
 
 
+@app.get("/api/library/quality")
+async def get_library_quality(below: str = "1080p SDR", item_type: Optional[str] = None, limit: int = 100,
+                              current_user: Optional[Dict] = Depends(check_auth_required)):
+    """Get items below a quality tier (e.g. "1080p SDR", "4K HDR10"), lowest quality first"""
+    try:
+        return await web_service.get_library_quality(below, item_type, min(max(limit, 1), 1000))
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except RuntimeError as e:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e))
+
+
+@app.get("/api/library/upgrades")
+async def get_quality_upgrades(days: int = 7, item_type: Optional[str] = None, limit: int = 100,
+                               current_user: Optional[Dict] = Depends(check_auth_required)):
+    """Get items whose quality went up in the last `days` days (at most 10 years), most recent first"""
+    try:
+        # Clamped both ways: timedelta() overflows for huge day counts
+        return await web_service.get_quality_upgrades(min(max(days, 0), 3650), item_type, min(max(limit, 1), 1000))
+    except RuntimeError as e:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e))
+
+
 @app.get("/api/health")
 async def health_check():
     """Health check endpoint (no auth required)"""
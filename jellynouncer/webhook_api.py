@@ -645,6 +645,44 @@ async def trigger_manual_sync():
         )
 
 
+@app.post("/vacuum")
+async def trigger_full_vacuum():
+    """
+    Run a full database VACUUM.
+
+    Routine maintenance only releases free pages incrementally. A full VACUUM
+    also defragments the database, but rewrites the whole file and holds
+    back webhook processing until it finishes, so it only runs on request.
+
+    Returns:
+        dict: Result with the database size before and after
+
+    Raises:
+        HTTPException:
+            - 503 if service is not ready
+            - 409 if a library sync is running
+            - 500 if the VACUUM fails
+
+    Example:
+        ```bash
+        curl -X POST http://jellynouncer:1984/vacuum
+        # Returns: {"status": "success", "size_before_mb": 412.3, "size_after_mb": 298.0, ...}
+        ```
+    """
+    if webhook_service is None:
+        raise HTTPException(
+            status_code=503,
+            detail="Service not ready - still initializing"
+        )
+
+    result = await webhook_service.run_full_vacuum()
+    if result.get("status") == "success":
+        return result
+    elif result.get("status") == "warning":
+        raise HTTPException(status_code=409, detail=result.get("message"))
+    raise HTTPException(status_code=500, detail=result.get("message"))
+
+
 @app.exception_handler(RequestValidationError)
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
     """
@@ -20,11 +20,12 @@ License: MIT
 """
 
 import asyncio
+import os
 import time
 import logging
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 
 import aiohttp
 import aiosqlite
@@ -33,12 +34,17 @@ from .config_models import AppConfig, ConfigurationValidator
 from .webhook_models import WebhookPayload
 from .media_models import MediaItem
 from .database_manager import DatabaseManager
+from .content_index import ITEM_NEW, ITEM_CHANGED
+from .content_hash import content_hash_v1
+from .deletion_correlation import PendingDeletions
 from .jellyfin_api import JellyfinAPI
 from .discord_services import DiscordNotifier
 from .metadata_services import MetadataService
 from .change_detector import ChangeDetector
 from .utils import get_logger
-from .sync_progress import SyncProgressDisplay
+from .scheduler import TaskScheduler
+from .sync_pipeline import LibrarySyncPipeline
+from .sync_buckets import BucketedLibrarySync
 
 
 class WebhookService:
@@ -117,6 +123,9 @@ class WebhookService:
         the database and background tasks.
     """
 
+    # Stored items checked against Jellyfin when looking for the item a new file replaced
+    replacement_candidate_limit = 5
+
     def __init__(self):
         """
         Initialize webhook service with logging and configuration loading.
@@ -161,12 +170,17 @@ class WebhookService:
         self.initial_sync_complete = False  # Have we done our first sync?
         self.shutdown_event = asyncio.Event()  # Graceful shutdown coordination
 
+        # Maintenance scheduling and load tracking (used to defer heavy jobs)
+        self.scheduler: Optional[TaskScheduler] = None
+        self._active_webhooks: int = 0  # Webhooks currently being processed
+        self._last_webhook_time: float = 0.0  # When the last webhook arrived
+
         # Record service startup time for uptime tracking
         self._start_time: float = time.time()
         self._last_sync_time: float = 0.0  # Initialize sync time
         
         # Deletion tracking for filtering upgrades/renames
-        self.pending_deletions = {}  # Track recent deletions to filter upgrades
+        self.pending_deletions = PendingDeletions()  # Recent deletions, indexed for pairing with adds
         self.deletion_timeout = 30  # Wait 30 seconds before processing deletions
         self.deletion_cleanup_task = None  # Background task for cleaning old deletions
 
@@ -434,6 +448,29 @@ class WebhookService:
         # Initialize timing variable
         start_time = time.time()
 
+        # Track webhook load so the scheduler can hold back maintenance jobs
+        self._active_webhooks += 1
+        self._last_webhook_time = start_time
+
+        result = None
+        try:
+            result = await self._route_webhook(payload, start_time)
+            return result
+        finally:
+            self._active_webhooks -= 1
+            self._record_event(payload, result, start_time)
+
+    async def _route_webhook(self, payload: WebhookPayload, start_time: float) -> Dict[str, Any]:
+        """
+        Run the processing pipeline for one webhook (see `process_webhook()`).
+
+        Args:
+            payload (WebhookPayload): Validated webhook data from Jellyfin
+            start_time (float): When the webhook was received, for processing_time
+
+        Returns:
+            Dict[str, Any]: Processing result with details about the action taken
+        """
         try:
             self.logger.debug(f"Processing webhook for {payload.Name} ({payload.ItemType}) - Event: {payload.NotificationType}")
             
@@ -444,10 +481,11 @@ class WebhookService:
             # Handle ItemAdded notifications with rename/upgrade filtering
             if payload.NotificationType == "ItemAdded":
                 # Check if this might be a rename or upgrade
-                deletion_info = await self._check_pending_deletion(payload.Name, payload.ItemType)
-                if deletion_info:
+                matched = await self._check_pending_deletion(payload)
+                if matched:
                     # This might be an upgrade or rename
-                    return await self._handle_potential_upgrade(payload, deletion_info)
+                    strategy, deletion_info = matched
+                    return await self._handle_potential_upgrade(payload, deletion_info, strategy)
                 else:
                     # Normal add without prior deletion
                     return await self._process_item_added(payload)
@@ -490,16 +528,24 @@ class WebhookService:
                 media_item.tvdb_slug = payload.Provider_tvdbslug
                 self.logger.debug(f"Using TVDB slug from webhook: {payload.Provider_tvdbslug}")
 
-            # Check if this is a new item or an update
-            existing_item = await self.db.get_item(media_item.item_id)
+            # Check if this is a new item or an update. The stored row is only
+            # loaded when the content hash differs and the changes need detail.
+            change_status = await self.db.get_change_status(media_item)
 
-            if existing_item:
-                # Check for changes
-                changes = await self.change_detector.detect_changes(existing_item, media_item)
+            if change_status != ITEM_NEW:
+                changes = []
+                if change_status == ITEM_CHANGED:
+                    existing_item = await self.db.get_item(media_item.item_id)
+                    if existing_item:
+                        changes = self.change_detector.detect_changes(existing_item, media_item)
 
                 if changes:
-                    # This is an upgrade - update database with basic fields
-                    self.logger.info(f"Quality upgrade detected for: {media_item.name}")
+                    # Worth notifying - whether it's better overall is one score comparison
+                    quality_upgrade = self.change_detector.is_quality_upgrade(existing_item, media_item)
+                    if quality_upgrade:
+                        self.logger.info(f"Quality upgrade detected for: {media_item.name}")
+                    else:
+                        self.logger.info(f"Technical changes detected for: {media_item.name}")
                     await self.db.save_item(media_item)
 
                     # Enrich with ALL type-specific fields for notification
@@ -533,6 +579,7 @@ class WebhookService:
                         "item_name": media_item.name,
                         "item_type": media_item.item_type,
                         "changes": len(changes),
+                        "quality_upgrade": quality_upgrade,
                         "enriched": getattr(enriched_item, 'is_enriched', False),
                         "processing_time": round(time.time() - start_time, 3)
                     }
@@ -594,6 +641,33 @@ class WebhookService:
                 "processing_time": round(processing_time, 3)
             }
 
+    def _record_event(self, payload: WebhookPayload, result: Optional[Dict[str, Any]], start_time: float) -> None:
+        """
+        Add a processed webhook to the database notification event log.
+
+        The log feeds the web dashboard's recent activity and daily counts.
+        Recording never raises - a logging failure must not fail the webhook.
+
+        Args:
+            payload (WebhookPayload): Webhook that was processed
+            result (Optional[Dict[str, Any]]): Processing result (None if processing raised)
+            start_time (float): When processing started
+        """
+        try:
+            result = result or {"status": "error", "action": "processing_failed"}
+            self.db.record_event(
+                action=result.get("action", "unknown"),
+                outcome=result.get("status", "unknown"),
+                item_id=result.get("item_id", payload.ItemId),
+                item_name=result.get("item_name", payload.Name),
+                item_type=result.get("item_type", payload.ItemType),
+                event_type=payload.NotificationType,
+                webhook=self.discord.get_webhook_name(payload.ItemType) if self.discord else None,
+                latency_ms=round((time.time() - start_time) * 1000, 1)
+            )
+        except Exception as e:
+            self.logger.debug(f"Could not record notification event for {payload.Name}: {e}")
+
     async def trigger_manual_sync(self) -> Dict[str, Any]:
         """
         Trigger a manual library synchronization with Jellyfin.
@@ -810,6 +884,7 @@ class WebhookService:
                 - service: Version, uptime, and operational status
                 - database: Item counts, performance metrics
                 - webhooks: Configuration and status information
+                - scheduler: Next run, last duration and status of each maintenance job
                 - jellyfin: Connection status and server information
 
         Example:
@@ -858,6 +933,14 @@ class WebhookService:
                 self.logger.warning(f"Could not get queue stats: {e}")
                 stats["notification_queue"] = {"error": str(e)}
 
+            # Get maintenance scheduler job status
+            if self.scheduler:
+                stats["scheduler"] = {
+                    "busy_reason": self.get_busy_reason(),
+                    "active_webhooks": self._active_webhooks,
+                    "jobs": self.scheduler.get_status()
+                }
+
             # Get Jellyfin connection status
             try:
                 jellyfin_connected = await self.jellyfin.is_connected()
@@ -961,15 +1044,16 @@ class WebhookService:
         to run as a background task alongside webhook processing.
 
         **Background Tasks:**
-            - Periodic library synchronization with Jellyfin
-            - Database maintenance (VACUUM, cleanup)
-            - Connection health monitoring
-            - Performance optimization tasks
+            - Scheduled jobs run by the TaskScheduler (see `_setup_scheduler`):
+              full and incremental library syncs, database maintenance,
+              Jellyfin statistics refresh and cache pruning
+            - Jellyfin connectivity monitoring (every `connectivity_check_seconds`)
 
         **Task Scheduling:**
-            Tasks are scheduled based on time intervals and system load.
-            Critical tasks run more frequently, while maintenance tasks
-            run during low-activity periods.
+            Each job has its own interval or cron schedule from the `scheduler`
+            config section. Jobs are postponed while the service is busy with
+            webhooks or queued notifications, so heavy maintenance doesn't delay
+            notifications during large imports.
 
         Note:
             This method runs indefinitely until the service is shut down.
@@ -978,142 +1062,283 @@ class WebhookService:
         """
         self.logger.info("Starting background maintenance tasks")
 
-        while not self.shutdown_event.is_set():
-            try:
-                # Task 1: Periodic library sync (every 6 hours)
-                if not self.sync_in_progress and self.initial_sync_complete:
-                    sync_interval = 6 * 3600  # 6 hours in seconds
+        scheduler_config = self.config.scheduler
+        self._setup_scheduler()
+        scheduler_task = asyncio.create_task(self.scheduler.run(self.shutdown_event))
 
-                    # Ensure _last_sync_time is always a float
-                    last_sync = getattr(self, '_last_sync_time', 0.0)
-                    if not isinstance(last_sync, (int, float)):
-                        last_sync = 0.0
-                        self._last_sync_time = 0.0
+        try:
+            while not self.shutdown_event.is_set():
+                try:
+                    await self._check_jellyfin_connectivity()
+                except Exception as e:
+                    self.logger.error(f"Background task error: {e}", exc_info=True)
 
-                    time_since_last_sync = time.time() - last_sync
+                # Wait before next connectivity check, waking immediately on shutdown
+                try:
+                    await asyncio.wait_for(
+                        self.shutdown_event.wait(),
+                        timeout=scheduler_config.connectivity_check_seconds
+                    )
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            scheduler_task.cancel()
+            try:
+                await scheduler_task
+            except asyncio.CancelledError:
+                pass
 
-                    if time_since_last_sync > sync_interval:
-                        self.logger.info("Starting scheduled background library sync")
-                        try:
-                            result = await self.sync_jellyfin_library(background=True)
-                            self.logger.info(f"Background sync completed: {result.get('status', 'unknown')}")
-                            self._last_sync_time = time.time()
-                        except Exception as e:
-                            self.logger.error(f"Background sync failed: {e}")
+        self.logger.info("Background tasks stopped - service is shutting down")
 
-                # Task 2: Database maintenance (weekly) - WITH TYPE SAFETY
-                vacuum_interval = 7 * 24 * 3600  # 1 week in seconds
+    def _setup_scheduler(self) -> None:
+        """
+        Create the task scheduler and register all maintenance jobs.
+
+        Job start times are seeded from persisted state where we have it, so a
+        restart doesn't trigger an immediate sync or vacuum:
+            - full_sync: last library sync time from the database
+            - incremental_sync: one interval after startup
+            - vacuum: last vacuum timestamp from service_state
+            - stats_refresh: as soon as possible (the web overview needs data)
+            - cache_pruning: one interval after startup
+            - stats_compaction: one interval after startup
+            - wal_checkpoint: one interval after startup
+        """
+        scheduler_config = self.config.scheduler
+        self.scheduler = TaskScheduler(scheduler_config, busy_check=self.get_busy_reason)
+
+        self.scheduler.add_job(
+            "full_sync", self._run_full_sync_job, scheduler_config.full_sync,
+            last_run=self._last_sync_time
+        )
+        self.scheduler.add_job(
+            "incremental_sync", self._run_incremental_sync_job, scheduler_config.incremental_sync
+        )
+        self.scheduler.add_job(
+            "vacuum", self._run_vacuum_job, scheduler_config.vacuum,
+            last_run=self.last_vacuum,
+            default_interval_minutes=self.config.database.vacuum_interval_hours * 60
+        )
+        self.scheduler.add_job(
+            "stats_refresh", self._run_stats_refresh_job, scheduler_config.stats_refresh,
+            last_run=0.0
+        )
+        self.scheduler.add_job(
+            "cache_pruning", self._run_cache_pruning_job, scheduler_config.cache_pruning
+        )
+        self.scheduler.add_job(
+            "stats_compaction", self._run_stats_compaction_job, scheduler_config.stats_compaction
+        )
+        self.scheduler.add_job(
+            "wal_checkpoint", self._run_wal_checkpoint_job, scheduler_config.wal_checkpoint
+        )
+
+    def get_busy_reason(self) -> Optional[str]:
+        """
+        Check whether the service is too busy for heavy maintenance work.
 
-                # Ensure last_vacuum is always a float
-                if not isinstance(self.last_vacuum, (int, float)) or self.last_vacuum is None:
-                    self.logger.warning("last_vacuum was None or invalid, resetting to current time")
-                    self.last_vacuum = time.time()
+        Used by the scheduler to decide whether a due job should be deferred.
+        Thresholds come from the `scheduler` configuration section.
 
-                time_since_vacuum = time.time() - self.last_vacuum
+        Returns:
+            Optional[str]: Human readable reason if busy, None if jobs may run
+        """
+        scheduler_config = self.config.scheduler
 
-                if time_since_vacuum > vacuum_interval:
-                    self.logger.info("Starting scheduled database maintenance")
-                    try:
-                        if await self.db.vacuum_database():
-                            await self.db.update_vacuum_timestamp()  # Update in database too
-                            self.last_vacuum = time.time()
-                            self.logger.info("Database maintenance completed successfully")
-                        else:
-                            self.logger.warning("Database maintenance completed with warnings")
-                    except Exception as e:
-                        self.logger.error(f"Database maintenance failed: {e}")
+        if self.sync_in_progress:
+            return "library sync in progress"
 
-                # Task 3: Jellyfin connectivity monitoring (UPDATED)
-                try:
-                    is_connected = await self.jellyfin.is_connected()
+        if self._active_webhooks >= scheduler_config.busy_active_webhooks:
+            return f"{self._active_webhooks} webhook(s) being processed"
 
-                    # Server went offline
-                    if not is_connected and not self.server_was_offline:
-                        self.logger.warning("Jellyfin server appears to be offline")
-                        self.server_was_offline = True
+        if self.discord:
+            pending = self.discord.get_pending_notification_count()
+            if pending >= scheduler_config.busy_notification_queue_size:
+                return f"{pending} notifications queued"
 
-                        # Send offline notification with enhanced data
-                        await self.send_server_status_notification(
-                            is_online=False,
-                            error=Exception("Connection timeout or refused")
-                        )
+        if self._last_webhook_time:
+            idle_seconds = time.time() - self._last_webhook_time
+            if idle_seconds < scheduler_config.quiet_period_seconds:
+                return f"last webhook {idle_seconds:.0f}s ago"
 
-                    # Server came back online
-                    elif is_connected and self.server_was_offline:
-                        self.logger.info("Jellyfin server is back online")
-                        self.server_was_offline = False
+        return None
 
-                        # Send online notification with recovery info
-                        await self.send_server_status_notification(
-                            is_online=True
-                        )
+    async def _run_full_sync_job(self) -> Dict[str, Any]:
+        """
+        Scheduled job: complete library sync with Jellyfin.
 
-                except Exception as e:
-                    self.logger.debug(f"Connection check failed: {e}")
+        With bucket summaries enabled and established, only the parts of the
+        library whose summaries differ are fetched. Otherwise the whole library
+        is scanned, and a bucket sync afterwards establishes the summaries
+        (cheap, since every item is already up to date).
+        """
+        if not self.initial_sync_complete:
+            return {"status": "skipped", "message": "Initial sync not complete"}
 
-                    if not self.server_was_offline:
-                        self.server_was_offline = True
-                        await self.send_server_status_notification(
-                            is_online=False,
-                            error=e
-                        )
+        started = time.time()
+        if self.config.sync.bucket_summaries and await self.db.has_sync_buckets():
+            result = await self.sync_library_buckets()
+        else:
+            result = await self.sync_jellyfin_library(background=True)
+            if self.config.sync.bucket_summaries and result.get("status") == "success":
+                await self.sync_library_buckets()
 
-                # Wait before next iteration (5 minutes)
-                await asyncio.sleep(300)
+        if result.get("status") in ("success", "partial"):
+            self._last_sync_time = started
+        return result
 
-            except Exception as e:
-                self.logger.error(f"Background task error: {e}", exc_info=True)
-                await asyncio.sleep(60)  # Wait 1 minute before retrying
+    async def _run_incremental_sync_job(self) -> Dict[str, Any]:
+        """
+        Scheduled job: sync only items Jellyfin saved since the last sync.
 
-        self.logger.info("Background tasks stopped - service is shutting down")
-    
-    async def _convert_item_safe(self, item_data: Dict[str, Any]):
+        Catches webhooks that were missed (service restarts, network blips)
+        without paying for a full library scan. A small overlap with the
+        previous sync covers clock differences between us and Jellyfin.
         """
-        Safely convert Jellyfin API item to DatabaseItem for efficient sync storage.
-        
-        This wrapper method ensures that conversion errors don't crash the batch
-        processing and provides detailed error information for debugging.
-        Uses DatabaseItem for efficient storage during syncs.
-        
-        Args:
-            item_data: Raw item data from Jellyfin API
-            
+        if not self.initial_sync_complete or not self._last_sync_time:
+            return {"status": "skipped", "message": "No previous sync to continue from"}
+
+        overlap_seconds = 300
+        since = datetime.fromtimestamp(self._last_sync_time - overlap_seconds, tz=timezone.utc)
+
+        started = time.time()
+        result = await self.sync_jellyfin_library(background=True, since=since)
+        if result.get("status") in ("success", "partial"):
+            self._last_sync_time = started
+        return result
+
+    async def _run_vacuum_job(self) -> Dict[str, Any]:
+        """Scheduled job: incremental vacuum and planner statistics (no full VACUUM)."""
+        result = await self.db.run_maintenance()
+        await self.db.update_vacuum_timestamp()
+        self.last_vacuum = time.time()
+        return {"status": "success", **result}
+
+    async def _run_wal_checkpoint_job(self) -> Dict[str, Any]:
+        """Scheduled job: checkpoint and truncate the database WAL while idle."""
+        result = await self.db.checkpoint_wal(truncate=True)
+        return {"status": "success" if not result['busy'] else "partial", **result}
+
+    async def run_full_vacuum(self) -> Dict[str, Any]:
+        """
+        Run a full database VACUUM now (admin action, `POST /vacuum`).
+
+        Rewrites the whole database file, which blocks webhook saves until it
+        finishes - minutes on a very large library. Routine maintenance
+        doesn't need it; it is for reclaiming space and defragmenting after
+        large deletions.
+
         Returns:
-            DatabaseItem if conversion successful, None if failed
+            Dict[str, Any]: Status and database size before and after
+        """
+        if self.sync_in_progress:
+            return {"status": "warning", "message": "Library sync in progress, try again when it has finished"}
+
+        started = time.time()
+        size_before = os.path.getsize(self.db.db_path) if os.path.exists(self.db.db_path) else 0
+        if not await self.db.vacuum_database():
+            return {"status": "error", "message": "Database VACUUM failed, see the log for details"}
+
+        await self.db.update_vacuum_timestamp()
+        self.last_vacuum = time.time()
+        size_after = os.path.getsize(self.db.db_path)
+        return {
+            "status": "success",
+            "message": "Database VACUUM completed",
+            "size_before_mb": round(size_before / (1024 * 1024), 1),
+            "size_after_mb": round(size_after / (1024 * 1024), 1),
+            "seconds": round(time.time() - started, 1),
+        }
+
+    async def _run_stats_refresh_job(self) -> Dict[str, Any]:
+        """Scheduled job: snapshot Jellyfin server statistics into the database."""
+        stats = await self.jellyfin.get_server_stats()
+        if not stats:
+            return {"status": "error", "message": "Could not fetch Jellyfin statistics"}
+
+        await self.db.save_jellyfin_stats(stats)
+        return {"status": "success"}
+
+    async def _run_cache_pruning_job(self) -> Dict[str, Any]:
+        """Scheduled job: drop expired entries from in-memory caches."""
+        pruned = 0
+        if self.discord:
+            pruned += self.discord.prune_caches()
+        if self.metadata_service:
+            pruned += self.metadata_service.prune_caches()
+
+        self.logger.debug(f"Cache pruning removed {pruned} expired entries")
+        return {"status": "success", "pruned": pruned}
+
+    async def _run_stats_compaction_job(self) -> Dict[str, Any]:
+        """Scheduled job: roll up old Jellyfin statistics and drop unused blobs."""
+        result = await self.db.compact_jellyfin_stats()
+        return {"status": "success", **result}
+
+    async def _check_jellyfin_connectivity(self) -> None:
+        """
+        Check Jellyfin connectivity and send offline/online notifications.
+
+        Sends a server status notification to Discord when the server goes
+        offline and again when it comes back.
         """
         try:
-            # Use the optimized DatabaseItem conversion for syncs
-            return await self.jellyfin.convert_to_database_item(item_data)
+            is_connected = await self.jellyfin.is_connected()
+
+            # Server went offline
+            if not is_connected and not self.server_was_offline:
+                self.logger.warning("Jellyfin server appears to be offline")
+                self.server_was_offline = True
+
+                # Send offline notification with enhanced data
+                await self.send_server_status_notification(
+                    is_online=False,
+                    error=Exception("Connection timeout or refused")
+                )
+
+            # Server came back online
+            elif is_connected and self.server_was_offline:
+                self.logger.info("Jellyfin server is back online")
+                self.server_was_offline = False
+
+                # Send online notification with recovery info
+                await self.send_server_status_notification(
+                    is_online=True
+                )
+
         except Exception as e:
-            # Log the error with item details for debugging
-            item_id = item_data.get('Id', 'unknown')
-            item_name = item_data.get('Name', 'unknown')
-            item_type = item_data.get('Type', 'unknown')
-            
-            self.logger.debug(
-                f"Failed to convert item {item_name} (ID: {item_id}, Type: {item_type}): {e}"
-            )
-            return None
+            self.logger.debug(f"Connection check failed: {e}")
+
+            if not self.server_was_offline:
+                self.server_was_offline = True
+                await self.send_server_status_notification(
+                    is_online=False,
+                    error=e
+                )
 
-    async def sync_jellyfin_library(self, background: bool = False) -> Dict[str, Any]:
+    async def sync_jellyfin_library(self, background: bool = False,
+                                    since: Optional[datetime] = None) -> Dict[str, Any]:
         """
-        Synchronize entire Jellyfin library to local database using streaming batch processing.
+        Synchronize entire Jellyfin library to local database using a staged pipeline.
 
-        This method performs a complete sync of the Jellyfin library using a producer-consumer
-        pattern that streams batches from the API while concurrently processing them to the
-        database. This provides optimal memory usage and performance for large libraries.
+        This method performs a complete sync of the Jellyfin library with a
+        LibrarySyncPipeline: fetch, convert and write stages run concurrently and are
+        connected by bounded queues. This provides optimal memory usage and performance
+        for large libraries.
 
-        **Streaming Architecture:**
-            - Producer task: Fetches batches from Jellyfin API and queues them
-            - Consumer task: Processes queued batches and saves to database
-            - Concurrent execution with configurable queue size for backpressure
-            - Memory-efficient: Only a few batches in memory at once
+        **Pipeline Architecture:**
+            - Fetch stage: Requests pages from the Jellyfin API (`sync.fetch_workers`)
+            - Convert stage: Turns API items into DatabaseItems (`sync.convert_workers`)
+            - Write stage: Saves batches to the database (`sync.write_workers`)
+            - Queues bounded by estimated bytes apply backpressure (`sync.queue_memory_mb`)
 
         **Enhanced Performance:**
-            - Overlapping network I/O (API fetch) with database I/O (batch save)
+            - Network I/O, conversion and database I/O all overlap
             - True streaming: No accumulation of all items in memory
-            - Real-time progress logging shows fetch and save operations
+            - Per-stage utilisation is reported in the result under "stages"
             - Partial progress saved even if sync fails midway
+            - Failing pages are retried, then split so one bad item only skips
+              itself; skipped items are recorded in the sync quarantine table
 
         **Background vs Foreground Sync:**
             - Background: Doesn't block webhook processing (for periodic syncs)
@@ -1122,6 +1347,8 @@ class WebhookService:
         Args:
             background (bool): Whether to run sync in background mode.
                 Background syncs don't block webhook processing.
+            since (Optional[datetime]): If given, only items saved in Jellyfin since
+                this time are synced (incremental sync). None syncs the whole library.
 
         Returns:
             Dict[str, Any]: Sync results including status, items processed, and timing
@@ -1162,7 +1389,9 @@ class WebhookService:
             self.sync_in_progress = True
             self.is_background_sync = background
 
-            if background:
+            if since is not None:
+                self.logger.info(f"Starting incremental library sync (changes since {since.isoformat()})...")
+            elif background:
                 self.logger.info("Starting background library sync...")
             else:
                 self.logger.info("Starting foreground library sync...")
@@ -1179,346 +1408,17 @@ class WebhookService:
                     "processing_time": round(time.time() - sync_start_time, 2)
                 }
 
-            # Use adaptive batch sizing (will be determined based on library size)
-            # API will automatically select optimal batch size
-            self.logger.info("Starting streaming sync with adaptive batch sizing")
-
-            # Create async queue for producer-consumer pattern
-            # Queue size of 20 provides plenty of headroom for API requests without overloading memory
-            batch_queue = asyncio.Queue(maxsize=20)
-            
-            # Shared state for tracking progress (thread-safe via asyncio)
-            sync_state = {
-                'total_items': 0,
-                'items_fetched': 0,
-                'items_processed': 0,
-                'batch_errors': 0,
-                'total_individual_errors': 0,
-                'new_items': 0,
-                'updated_items': 0,
-                'producer_done': False,
-                'consumer_done': False,
-                'fatal_error': '',  # Empty string instead of None for type consistency
-                'should_stop': False,  # Early exit flag for high error rates
-                'batch_size': 200  # Default, will be updated
-            }
-            
-            # Initialize progress display (will be set once we know total items)
-            progress_display = None
-            
-            # Error threshold for early exit (stop if more than 10% of items fail)
-            error_threshold_percent = 10
-            consecutive_batch_error_limit = 3
-            
-            async def producer():
-                """Fetch batches from Jellyfin API and queue them for processing."""
-                nonlocal progress_display  # Declare nonlocal at the start of the function
-                batch_num = 0
-                try:
-                    async for batch_items, total_count in self.jellyfin.get_items_stream():
-                        batch_num += 1
-                        sync_state['total_items'] = total_count
-                        sync_state['items_fetched'] += len(batch_items)
-                        sync_state['batch_size'] = len(batch_items)  # Update batch size
-                        
-                        # Initialize progress display on first batch
-                        if batch_num == 1 and progress_display is None:
-                            sync_type = "initial" if not background else "background"
-                            progress_display = SyncProgressDisplay(
-                                total_items=total_count,
-                                batch_size=len(batch_items),
-                                sync_type=sync_type,
-                                logger=self.logger
-                            )
-                            progress_display.log_sync_start()
-                        
-                        # Update progress display instead of basic logging
-                        if progress_display:
-                            progress_display.log_batch_progress(
-                                batch_num=batch_num,
-                                items_in_batch=len(batch_items),
-                                total_fetched=sync_state['items_fetched'],
-                                items_processed=sync_state['items_processed'],
-                                errors=sync_state['total_individual_errors'],
-                                new_items=sync_state.get('new_items', 0),
-                                updated_items=sync_state.get('updated_items', 0)
-                            )
-                        else:
-                            # Fallback to basic logging
-                            self.logger.info(
-                                f"Fetched batch {batch_num} from API: {len(batch_items)} items "
-                                f"(total fetched: {sync_state['items_fetched']}/{total_count})"
-                            )
-                        
-                        # Check if we should stop due to high error rate
-                        if sync_state['should_stop']:
-                            self.logger.warning("Producer stopping early due to high error rate")
-                            break
-                        
-                        # Queue the batch for processing
-                        await batch_queue.put((batch_num, batch_items))
-                        
-                    # Signal completion
-                    await batch_queue.put(None)
-                    sync_state['producer_done'] = True
-                    self.logger.info(f"API fetch completed: {sync_state['items_fetched']} total items fetched")
-                    
-                except Exception as e:
-                    self.logger.error(f"Producer task failed: {e}")
-                    sync_state['fatal_error'] = str(e)
-                    # Signal error to consumer
-                    await batch_queue.put(None)
-                    sync_state['producer_done'] = True
-            
-            async def consumer():
-                """Process batches from queue and save to database."""
-                nonlocal progress_display  # Declare nonlocal at the start of the function
-                consecutive_batch_errors = 0
-                try:
-                    while True:
-                        # Get batch from queue
-                        batch_data = await batch_queue.get()
-                        
-                        # Check for completion signal
-                        if batch_data is None:
-                            break
-                            
-                        batch_num, batch_items = batch_data
-                        batch_start_time = time.time()
-                        
-                        # Don't log processing here, it's handled by progress display
-                        self.logger.debug(
-                            f"Processing batch {batch_num}: {len(batch_items)} items "
-                            f"(queue size: {batch_queue.qsize()})"
-                        )
-                        
-                        try:
-                            # Convert API data to DatabaseItem objects in parallel for speed
-                            db_items = []
-                            conversion_errors = 0
-                            failed_items = []
-                            
-                            # Time the conversion process
-                            conversion_start_time = time.time()
-                            
-                            # Create conversion tasks for parallel processing
-                            conversion_tasks = []
-                            for item_data in batch_items:
-                                # Create task with item data for error tracking
-                                task = asyncio.create_task(self._convert_item_safe(item_data))
-                                conversion_tasks.append((task, item_data))
-                            
-                            # Wait for all conversions to complete
-                            results = await asyncio.gather(*[task for task, _ in conversion_tasks], return_exceptions=True)
-                            
-                            conversion_time = time.time() - conversion_start_time
-                            
-                            # Process results
-                            for (task, item_data), result in zip(conversion_tasks, results):
-                                if isinstance(result, Exception):
-                                    item_id = item_data.get('Id', 'unknown')
-                                    item_name = item_data.get('Name', 'unknown')
-                                    failed_items.append((item_id, item_name, str(result)))
-                                    conversion_errors += 1
-                                    sync_state['total_individual_errors'] += 1
-                                elif result is not None:
-                                    db_items.append(result)
-                            
-                            # Log conversion errors if any
-                            if failed_items:
-                                self.logger.warning(
-                                    f"Batch {batch_num}: {conversion_errors} items failed conversion"
-                                )
-                                # Log first few failed items for debugging
-                                for item_id, item_name, error in failed_items[:3]:
-                                    self.logger.debug(
-                                        f"  - Failed item: {item_name} (ID: {item_id}): {error}"
-                                    )
-                                if len(failed_items) > 3:
-                                    self.logger.debug(f"  ... and {len(failed_items) - 3} more")
-                            
-                            # Log conversion performance
-                            if db_items:
-                                conv_time_ms = conversion_time * 1000
-                                conv_per_item_ms = conv_time_ms / len(db_items) if db_items else 0
-                                self.logger.info(
-                                    f"DatabaseItem conversion for {len(db_items)} items: "
-                                    f"Total: {conv_time_ms:.1f}ms, "
-                                    f"Avg: {conv_per_item_ms:.2f}ms/item"
-                                )
-                            
-                            # Pre-generate content hashes to measure performance
-                            # This triggers the lazy hash calculation before database save
-                            # Note: We don't parallelize this because:
-                            # 1. Our hash data is <2KB (below GIL release threshold of 2047 bytes)
-                            # 2. Blake2b is already very fast for small data
-                            # 3. Database I/O is the actual bottleneck
-                            if db_items:
-                                hash_start_time = time.time()
-                                hash_generation_times = []
-                                
-                                for item in db_items:
-                                    try:
-                                        item_hash_start = time.time()
-                                        # Access the property to trigger hash generation
-                                        _ = item.content_hash
-                                        item_hash_time = time.time() - item_hash_start
-                                        hash_generation_times.append(item_hash_time)
-                                    except Exception as e:
-                                        self.logger.debug(f"Hash generation failed for {item.name}: {e}")
-                                
-                                total_hash_time = time.time() - hash_start_time
-                                
-                                # Log hash generation performance statistics
-                                if hash_generation_times:
-                                    avg_hash_time_ms = (sum(hash_generation_times) / len(hash_generation_times)) * 1000
-                                    max_hash_time_ms = max(hash_generation_times) * 1000
-                                    total_hash_time_ms = total_hash_time * 1000
-                                    hashes_per_second = len(hash_generation_times) / total_hash_time if total_hash_time > 0 else 0
-                                    
-                                    self.logger.info(
-                                        f"Hash generation stats for {len(db_items)} items: "
-                                        f"Total: {total_hash_time_ms:.1f}ms, "
-                                        f"Avg: {avg_hash_time_ms:.2f}ms/item, "
-                                        f"Max: {max_hash_time_ms:.2f}ms, "
-                                        f"Rate: {hashes_per_second:.0f} hashes/sec"
-                                    )
-                            
-                            # Save batch to database with timing
-                            if db_items:
-                                db_save_start = time.time()
-                                batch_results = await self.db.save_items_batch(db_items)
-                                db_save_time = time.time() - db_save_start
-                                
-                                # Check if entire batch failed
-                                if batch_results['failed'] == len(db_items) and batch_results['successful'] == 0:
-                                    sync_state['batch_errors'] += 1
-                                    sync_state['total_individual_errors'] += batch_results['failed']
-                                    consecutive_batch_errors += 1
-                                    
-                                    self.logger.error(
-                                        f"Batch {batch_num}: ENTIRE BATCH FAILED - "
-                                        f"likely schema mismatch or database issue. "
-                                        f"{batch_results['failed']} items could not be saved."
-                                    )
-                                    
-                                    # Check for consecutive batch failures
-                                    if consecutive_batch_errors >= consecutive_batch_error_limit:
-                                        self.logger.error(
-                                            f"Stopping sync: {consecutive_batch_errors} consecutive batches failed completely"
-                                        )
-                                        sync_state['should_stop'] = True
-                                        sync_state['fatal_error'] = f"Too many consecutive batch failures: {consecutive_batch_errors}"
-                                        break
-                                else:
-                                    # Reset consecutive error counter on successful batch
-                                    if batch_results['successful'] > 0:
-                                        consecutive_batch_errors = 0
-                                    
-                                    # Update progress
-                                    sync_state['items_processed'] += batch_results['successful']
-                                    sync_state['total_individual_errors'] += batch_results['failed']
-                                    
-                                    # Track new vs updated items
-                                    if 'new' in batch_results:
-                                        sync_state['new_items'] += batch_results['new']
-                                    if 'updated' in batch_results:
-                                        sync_state['updated_items'] += batch_results['updated']
-                                    
-                                    batch_time = time.time() - batch_start_time
-                                    
-                                    # Log batch save completion with breakdown
-                                    self.logger.info(
-                                        f"Batch {batch_num} saved to database: "
-                                        f"{batch_results['successful']}/{len(db_items)} items "
-                                        f"(Total: {batch_time:.2f}s, DB: {db_save_time:.2f}s)"
-                                    )
-                                    
-                                    # Log performance breakdown if timing data is available
-                                    if 'total_hash_time' in locals() and 'conversion_time' in locals():
-                                        hash_percent = (total_hash_time / batch_time) * 100 if batch_time > 0 else 0
-                                        db_percent = (db_save_time / batch_time) * 100 if batch_time > 0 else 0
-                                        conversion_percent = (conversion_time / batch_time) * 100 if batch_time > 0 else 0
-                                        other_percent = 100 - hash_percent - db_percent - conversion_percent
-                                        
-                                        self.logger.info(
-                                            f"Batch {batch_num} performance breakdown: "
-                                            f"Conversion: {conversion_percent:.1f}%, "
-                                            f"Hashing: {hash_percent:.1f}%, "
-                                            f"DB Save: {db_percent:.1f}%, "
-                                            f"Other: {other_percent:.1f}%"
-                                        )
-                                    
-                                    # Log failures if any
-                                    if batch_results['failed'] > 0:
-                                        self.logger.warning(
-                                            f"Batch {batch_num}: {batch_results['failed']} items failed to save"
-                                        )
-                            else:
-                                # All items in batch failed conversion
-                                self.logger.warning(f"Batch {batch_num}: All {len(batch_items)} items failed conversion")
-                                sync_state['batch_errors'] += 1
-                                consecutive_batch_errors += 1
-                                
-                                # Check for consecutive failures
-                                if consecutive_batch_errors >= consecutive_batch_error_limit:
-                                    self.logger.error(
-                                        f"Stopping sync: {consecutive_batch_errors} consecutive batches failed completely"
-                                    )
-                                    sync_state['should_stop'] = True
-                                    sync_state['fatal_error'] = f"Too many consecutive batch failures: {consecutive_batch_errors}"
-                                    break
-                            
-                            # Progress is now handled by the progress display in producer
-                            # Just update the progress display reference if needed
-                            if progress_display and batch_num % 5 == 0:
-                                # Update cumulative stats in progress display
-                                progress_display.items_processed = sync_state['items_processed']
-                                progress_display.errors = sync_state['total_individual_errors']
-                                progress_display.new_items = sync_state.get('new_items', 0)
-                                progress_display.updated_items = sync_state.get('updated_items', 0)
-                                
-                                # Check error rate and stop if too high
-                                if sync_state['items_processed'] > 100:  # Only check after processing some items
-                                    error_rate = (sync_state['total_individual_errors'] / sync_state['items_processed']) * 100
-                                    if error_rate > error_threshold_percent:
-                                        self.logger.error(
-                                            f"Stopping sync: Error rate {error_rate:.1f}% exceeds threshold {error_threshold_percent}%"
-                                        )
-                                        sync_state['should_stop'] = True
-                                        sync_state['fatal_error'] = f"Error rate too high: {error_rate:.1f}%"
-                                        break
-                            
-                        except Exception as e:
-                            self.logger.error(f"Error processing batch {batch_num}: {e}")
-                            sync_state['batch_errors'] += 1
-                            sync_state['total_individual_errors'] += len(batch_items)
-                        
-                        # Small delay to prevent overwhelming the database
-                        if not sync_state['producer_done']:
-                            await asyncio.sleep(0.1)  # Hardcoded optimal delay
-                    
-                    sync_state['consumer_done'] = True
-                    self.logger.info(f"Database processing completed: {sync_state['items_processed']} items saved")
-                    
-                except Exception as e:
-                    self.logger.error(f"Consumer task failed: {e}")
-                    sync_state['fatal_error'] = str(e)
-                    sync_state['consumer_done'] = True
-            
-            # Run producer and consumer concurrently
-            producer_task = asyncio.create_task(producer())
-            consumer_task = asyncio.create_task(consumer())
-            
-            try:
-                # Wait for both tasks to complete
-                await asyncio.gather(producer_task, consumer_task)
-            except Exception as e:
-                self.logger.error(f"Sync tasks failed: {e}")
-                sync_state['fatal_error'] = str(e)
-                # Cancel any running tasks
-                producer_task.cancel()
-                consumer_task.cancel()
+            # Run the fetch -> convert -> write pipeline
+            if since is not None:
+                sync_type = "incremental"
+            else:
+                sync_type = "initial" if not background else "background"
+            pipeline = LibrarySyncPipeline(
+                self.jellyfin, self.db, self.config.sync, sync_type=sync_type, since=since,
+                change_detector=self.change_detector
+            )
+            sync_state = await pipeline.run()
+            progress_display = pipeline.progress_display
             
             # Update last sync time in database
             try:
@@ -1535,6 +1435,25 @@ class WebhookService:
             batch_errors = sync_state['batch_errors']
             
             if total_items == 0:
+                if sync_state['fatal_error']:
+                    return {
+                        "status": "error",
+                        "message": sync_state['fatal_error'],
+                        "items_processed": 0,
+                        "total_items": 0,
+                        "errors": 0,
+                        "processing_time": round(processing_time, 2)
+                    }
+                if since is not None:
+                    # Nothing changed since the last sync - that's the normal case
+                    return {
+                        "status": "success",
+                        "message": "No library changes since last sync",
+                        "items_processed": 0,
+                        "total_items": 0,
+                        "errors": 0,
+                        "processing_time": round(processing_time, 2)
+                    }
                 return {
                     "status": "warning",
                     "message": "No items found in library",
@@ -1568,24 +1487,33 @@ class WebhookService:
                 self.logger.info(f"  Success rate: {success_rate:.1f}%")
                 self.logger.info(f"  Individual errors: {total_individual_errors:,}")
                 self.logger.info(f"  Batch errors: {batch_errors:,}")
+                self.logger.info(f"  Quarantined items: {sync_state['quarantined']:,}")
                 self.logger.info(f"  Processing time: {processing_time:.2f}s")
                 self.logger.info(f"  Throughput: {items_processed / processing_time:.1f} items/sec")
-                self.logger.info(f"  Batch size used: {api_batch_size:,}")
+                self.logger.info(f"  Batch size used: {sync_state['batch_size']:,}")
                 self.logger.info("=" * 80)
 
-            return {
+            result = {
                 "status": status,
                 "items_processed": items_processed,
                 "total_items": total_items,
                 "new_items": sync_state.get('new_items', 0),
                 "updated_items": sync_state.get('updated_items', 0),
+                "items_changed": sync_state.get('items_changed', 0),
                 "errors": total_individual_errors,
                 "batch_errors": batch_errors,
                 "success_rate": round(success_rate, 1),
                 "processing_time": round(processing_time, 2),
                 "throughput": round(items_processed / processing_time, 1) if processing_time > 0 else 0,
-                "batch_size_used": sync_state.get('batch_size', 200)
+                "batch_size_used": sync_state.get('batch_size', 200),
+                "quarantined": sync_state['quarantined'],
+                "pages_recovered": sync_state['pages_recovered'],
+                "stages": pipeline.get_stage_summary(),
+                "memory": pipeline.get_memory_summary()
             }
+            if sync_state['fatal_error']:
+                result["message"] = sync_state['fatal_error']
+            return result
 
         except Exception as e:
             processing_time = time.time() - sync_start_time
@@ -1604,6 +1532,96 @@ class WebhookService:
             self.sync_in_progress = False
             self.is_background_sync = False
 
+    async def sync_library_buckets(self) -> Dict[str, Any]:
+        """
+        Sync the library by comparing per-library bucket summaries.
+
+        Lists every library with only ids and save dates, skips buckets whose
+        summary matches the database and fetches only new or changed items
+        from the rest. See `BucketedLibrarySync` for details.
+
+        Returns:
+            Dict[str, Any]: Sync results including status, buckets compared and
+                skipped, items refreshed and timing
+
+        Example:
+            ```python
+            result = await service.sync_library_buckets()
+            logger.info(f"{result['buckets_skipped']} buckets unchanged")
+            ```
+        """
+        sync_start_time = time.time()
+
+        if self.sync_in_progress:
+            self.logger.warning("Library sync already in progress - skipping")
+            return {"status": "skipped", "message": "Sync already in progress", "items_processed": 0}
+
+        try:
+            self.sync_in_progress = True
+            self.is_background_sync = True
+            self.logger.info("Starting bucket-summary library sync...")
+
+            if not await self.jellyfin.is_connected():
+                self.logger.error("Cannot sync: Jellyfin server is not accessible")
+                return {
+                    "status": "error",
+                    "message": "Jellyfin server not accessible",
+                    "items_processed": 0,
+                    "processing_time": round(time.time() - sync_start_time, 2)
+                }
+
+            state = await BucketedLibrarySync(self.jellyfin, self.db, self.config.sync).run()
+
+            if state['failed_libraries'] and not state['libraries']:
+                status = "error"
+            elif state['failed_libraries'] or state['errors']:
+                status = "partial"
+            else:
+                status = "success"
+
+            if status != "error":
+                await self.db.update_last_sync_time()
+
+            processing_time = time.time() - sync_start_time
+            self.logger.info(
+                f"Bucket sync completed with status {status.upper()}: "
+                f"{state['buckets'] - state['buckets_mismatched']:,}/{state['buckets']:,} buckets unchanged, "
+                f"{state['items_processed']:,} items refreshed, {state['errors']:,} errors "
+                f"in {processing_time:.2f}s"
+            )
+
+            result = {
+                "status": status,
+                "sync_mode": "buckets",
+                "items_processed": state['items_processed'],
+                "total_items": state['total_items'],
+                "errors": state['errors'],
+                "libraries": state['libraries'],
+                "buckets": state['buckets'],
+                "buckets_skipped": state['buckets'] - state['buckets_mismatched'],
+                "items_fetched": state['items_fetched'],
+                "items_adopted": state['items_adopted'],
+                "items_detached": state['items_detached'],
+                "processing_time": round(processing_time, 2)
+            }
+            if state['failed_libraries']:
+                result["message"] = f"Failed libraries: {', '.join(state['failed_libraries'])}"
+            return result
+
+        except Exception as e:
+            processing_time = time.time() - sync_start_time
+            self.logger.error(f"Bucket sync failed after {processing_time:.2f}s: {e}")
+            return {
+                "status": "error",
+                "message": str(e),
+                "items_processed": 0,
+                "processing_time": round(processing_time, 2)
+            }
+
+        finally:
+            self.sync_in_progress = False
+            self.is_background_sync = False
+
     async def _check_initial_sync(self) -> None:
         """
         Check if initial sync is needed and perform it.
@@ -1656,10 +1674,20 @@ class WebhookService:
         **Why Block During Initial Sync?**
             We need a complete picture of the library before processing webhooks,
             otherwise we might treat existing items as "new" items.
+
+        **Bulk Load:**
+            When the database is empty (or nearly), the sync runs in the
+            database's bulk-load mode: indexes are built once at the end
+            instead of being updated for every item.
         """
         try:
             self.logger.info("Starting initial Jellyfin library sync...")
-            result = await self.sync_jellyfin_library()
+            bulk_load = await self.db.begin_bulk_load()
+            try:
+                result = await self.sync_jellyfin_library()
+            finally:
+                if bulk_load:
+                    await self.db.end_bulk_load()
 
             # Create completion marker only if sync was successful
             if result.get("status") == "success":
@@ -1762,24 +1790,24 @@ class WebhookService:
         self.logger.debug(f"  Library: {getattr(payload, 'LibraryName', 'Unknown')}")
         self.logger.debug(f"  Path: {getattr(payload, 'Path', 'Not provided')}")
         self.logger.debug(f"  Server: {payload.ServerName}")
-        self.logger.debug(f"  User: {payload.Username}")
+        self.logger.debug(f"  User: {getattr(payload, 'Username', 'Unknown')}")
         self.logger.debug(f"  Delete filtering enabled: {self.config.notifications.filter_deletes}")
         self.logger.debug(f"  Rename filtering enabled: {self.config.notifications.filter_renames}")
         self.logger.debug("=" * 60)
         
         # Check if deletion filtering is enabled
         if self.config.notifications.filter_deletes:
-            # Store deletion info with timestamp
-            deletion_key = f"{payload.Name}_{payload.ItemType}"
-            self.pending_deletions[deletion_key] = {
-                'payload': payload,
-                'timestamp': time.time(),
-                'item_id': payload.ItemId,
-                'file_path': getattr(payload, 'Path', None)
-            }
+            # Deletion webhooks may lack the path; the stored item still has it
+            file_path = getattr(payload, 'Path', None)
+            if not file_path:
+                stored_item = await self.db.get_item(payload.ItemId)
+                file_path = stored_item.file_path if stored_item else None
+
+            # Store deletion info with timestamp, filed under its correlation keys
+            deletion_info = self.pending_deletions.add(payload, time.time(), file_path)
             
             self.logger.info(f"Queued deletion for {payload.Name} - waiting for potential upgrade")
-            self.logger.debug(f"  Deletion key: {deletion_key}")
+            self.logger.debug(f"  Correlation keys: {deletion_info['keys']}")
             self.logger.debug(f"  Pending deletions queue size: {len(self.pending_deletions)}")
             
             # Start cleanup task if not running
@@ -1798,42 +1826,47 @@ class WebhookService:
             # Send deletion notification immediately if filtering is disabled
             return await self._send_deletion_notification(payload)
     
-    async def _check_pending_deletion(self, item_name: str, item_type: str) -> Optional[Dict]:
+    async def _check_pending_deletion(self, payload: WebhookPayload) -> Optional[Tuple[str, Dict]]:
         """
         Check if there's a pending deletion for this item.
+
+        Pending deletions are matched by provider id, episode slot, file path
+        stem and finally name (see the deletion_correlation module), with a
+        few dictionary lookups however many deletions are pending.
         
         Args:
-            item_name: Name of the item being added
-            item_type: Type of the item
+            payload: ItemAdded webhook payload
             
         Returns:
-            Deletion info if found, None otherwise
+            (matching strategy, deletion info) if found, None otherwise
         """
-        deletion_key = f"{item_name}_{item_type}"
-        return self.pending_deletions.get(deletion_key)
+        return self.pending_deletions.match(payload)
     
-    async def _handle_potential_upgrade(self, add_payload: WebhookPayload, deletion_info: Dict) -> Dict[str, Any]:
+    async def _handle_potential_upgrade(self, add_payload: WebhookPayload, deletion_info: Dict,
+                                        strategy: str) -> Dict[str, Any]:
         """
         Handle a potential upgrade or rename scenario.
         
         Args:
             add_payload: The ItemAdded webhook payload
             deletion_info: Information about the previous deletion
+            strategy: How the deletion was matched ("imdb", "episode", "path_stem", ...),
+                reported as "matched_by" in the result
             
         Returns:
             Processing result dictionary
         """
         start_time = time.time()
-        deletion_key = f"{add_payload.Name}_{add_payload.ItemType}"
+        self.logger.debug(f"{add_payload.Name} matches pending deletion {deletion_info['item_id']} by {strategy}")
         
         # Remove from pending deletions
-        del self.pending_deletions[deletion_key]
+        self.pending_deletions.pop(deletion_info['item_id'])
         
         # Get item details to check if it's a rename or upgrade
         item_data = await self.jellyfin.get_item(add_payload.ItemId)
         if not item_data:
             # Can't determine, treat as normal add
-            return await self._process_item_added(add_payload)
+            return {**await self._process_item_added(add_payload), "matched_by": strategy}
         
         # Convert to MediaItem for comparison
         new_item = await self.jellyfin.convert_to_media_item(item_data)
@@ -1841,6 +1874,7 @@ class WebhookService:
         # Check if this is just a rename (same content hash = same file, just moved/renamed)
         # NOTE: ItemId changes when files are renamed in Jellyfin, so we can't compare by ID
         is_rename = False
+        old_item = None
         if self.config.notifications.filter_renames:
             # Get the OLD item from database using the deletion's item_id
             old_item = await self.db.get_item(deletion_info['item_id'])
@@ -1855,26 +1889,104 @@ class WebhookService:
                     self.logger.debug(f"  Old Path: {deletion_info.get('file_path', 'unknown')}")
                     self.logger.debug(f"  New Path: {new_item.file_path}")
                 else:
-                    # Different hash means actual content changes (quality upgrade)
-                    changes = await self.change_detector.detect_changes(old_item, new_item)
-                    self.logger.debug(f"Content changed for {add_payload.Name}: {len(changes)} changes detected")
+                    # Different hash means actual content changes (quality upgrade);
+                    # _process_item_added() below works out what changed
+                    self.logger.debug(f"Content changed for {add_payload.Name} (content hash differs)")
         
         if is_rename:
-            # Just update the database, don't send notification
-            await self.db.save_item(new_item)
+            # Just move the database record to the new id, don't send notification
+            await self.db.replace_item(old_item.item_id, new_item)
             return {
                 "status": "filtered",
                 "action": "rename_filtered",
                 "item_id": add_payload.ItemId,
                 "item_name": add_payload.Name,
                 "message": "Rename detected and filtered",
+                "matched_by": strategy,
                 "processing_time": round(time.time() - start_time, 3)
             }
         else:
             # This is an upgrade - process normally but skip the deletion notification
             self.logger.info(f"Detected upgrade for {add_payload.Name} - processing as upgrade")
-            return await self._process_item_added(add_payload)
+            return {**await self._process_item_added(add_payload), "matched_by": strategy}
     
+    async def _find_replaced_item(self, media_item: MediaItem) -> Tuple[Optional[str], Optional[Any]]:
+        """
+        Find the stored item a newly added item replaces, if any.
+
+        Jellyfin derives item ids from file paths, so a renamed, moved or
+        replaced file arrives as a brand-new item. This works without a prior
+        ItemDeleted webhook (for example when the deletion happened before a
+        restart), using indexed database lookups:
+
+        - **Rename** (`filter_renames`): another item with the same content
+          hash (same name, type and specifications), found by hash
+        - **Upgrade** (`filter_deletes`): the item in the same episode slot,
+          or a same-named item of the same type and year
+
+        A candidate only counts if Jellyfin no longer has it; otherwise it
+        is a second copy, not a replacement.
+
+        Args:
+            media_item (MediaItem): The newly added item
+
+        Returns:
+            Tuple[Optional[str], Optional[DatabaseItem]]: ("rename" or "upgrade",
+                replaced item), or (None, None)
+        """
+        notifications = self.config.notifications
+
+        if notifications.filter_renames:
+            # Rows not yet upgraded to the current hash version still hold the old hash
+            legacy_hash = content_hash_v1(media_item) if self.db.rehash_pending else None
+            candidates = await self.db.get_items_by_hash(
+                media_item.content_hash, exclude_item_id=media_item.item_id, legacy_hash=legacy_hash
+            )
+            for candidate in candidates[:self.replacement_candidate_limit]:
+                is_rename, old_item = await self.change_detector.is_rename(media_item, [candidate])
+                if is_rename and await self._item_gone_from_jellyfin(old_item.item_id):
+                    return "rename", old_item
+
+        if notifications.filter_deletes:
+            if (media_item.item_type == "Episode" and media_item.series_name
+                    and media_item.season_number is not None and media_item.episode_number is not None):
+                candidates = await self.db.get_items_by_episode(
+                    media_item.series_name, media_item.season_number, media_item.episode_number
+                )
+            else:
+                candidates = [
+                    item for item in await self.db.get_items_by_name(media_item.name, media_item.item_type)
+                    if not (item.year and media_item.year and item.year != media_item.year)
+                ]
+            for candidate in candidates[:self.replacement_candidate_limit]:
+                if candidate.item_id != media_item.item_id and await self._item_gone_from_jellyfin(candidate.item_id):
+                    return "upgrade", candidate
+
+        return None, None
+
+    async def _item_gone_from_jellyfin(self, item_id: str) -> bool:
+        """
+        Check that Jellyfin no longer has an item.
+
+        Args:
+            item_id (str): Item to check
+
+        Returns:
+            bool: True only if Jellyfin answered and the item was missing
+        """
+        try:
+            return not await self.jellyfin.get_items_by_ids([item_id])
+        except Exception as e:
+            self.logger.debug(f"Could not check whether item {item_id} still exists: {e}")
+            return False
+
+    async def _save_added_item(self, media_item: MediaItem, replaced_item_id: Optional[str]) -> None:
+        """Save an added item, replacing the item it superseded if there is one."""
+        if replaced_item_id:
+            await self.db.replace_item(replaced_item_id, media_item)
+        else:
+            await self.db.save_item(media_item)
+
     async def _process_item_added(self, payload: WebhookPayload) -> Dict[str, Any]:
         """
         Process a normal ItemAdded notification.
@@ -1925,12 +2037,40 @@ class WebhookService:
             media_item.tvdb_slug = payload.Provider_tvdbslug
             self.logger.debug(f"Using TVDB slug from webhook: {payload.Provider_tvdbslug}")
         
-        existing_item = await self.db.get_item(media_item.item_id)
-        
-        if existing_item:
-            changes = await self.change_detector.detect_changes(existing_item, media_item)
+        change_status = await self.db.get_change_status(media_item)
+        existing_item = None
+        replaced_item_id = None
+
+        if change_status == ITEM_NEW:
+            # A new id may still be a file we know: renamed, moved or replaced
+            match, old_item = await self._find_replaced_item(media_item)
+            if match == "rename":
+                await self.db.replace_item(old_item.item_id, media_item)
+                self.logger.info(f"Detected rename/move for {media_item.name} (matching content hash) - filtering notification")
+                return {
+                    "status": "filtered",
+                    "action": "rename_filtered",
+                    "item_id": media_item.item_id,
+                    "item_name": media_item.name,
+                    "message": "Rename detected and filtered",
+                    "processing_time": round(time.time() - start_time, 3)
+                }
+            if match == "upgrade":
+                self.logger.info(f"{media_item.name} replaces {old_item.item_id} - comparing as an upgrade")
+                existing_item = old_item
+                replaced_item_id = old_item.item_id
+                change_status = ITEM_CHANGED
+
+        if change_status != ITEM_NEW:
+            changes = []
+            if change_status == ITEM_CHANGED:
+                if existing_item is None:
+                    existing_item = await self.db.get_item(media_item.item_id)
+                if existing_item:
+                    changes = self.change_detector.detect_changes(existing_item, media_item)
             if changes:
-                await self.db.save_item(media_item)
+                quality_upgrade = self.change_detector.is_quality_upgrade(existing_item, media_item)
+                await self._save_added_item(media_item, replaced_item_id)
                 enriched_item = await self.jellyfin.enrich_media_item_for_notification(
                     media_item, item_data, retry_on_failure=True
                 )
@@ -1949,10 +2089,11 @@ class WebhookService:
                     "item_id": media_item.item_id,
                     "item_name": media_item.name,
                     "changes": len(changes),
+                    "quality_upgrade": quality_upgrade,
                     "processing_time": round(time.time() - start_time, 3)
                 }
             else:
-                await self.db.save_item(media_item)
+                await self._save_added_item(media_item, replaced_item_id)
                 return {
                     "status": "success",
                     "action": "metadata_updated",
@@ -2069,8 +2210,12 @@ class WebhookService:
                 # Process expired deletions
                 for key in expired_deletions:
                     info = self.pending_deletions.pop(key)
+                    if info is None:
+                        continue  # Paired with an add while earlier notifications were sent
                     self.logger.info(f"Processing expired deletion for {info['payload'].Name} (no upgrade detected)")
-                    await self._send_deletion_notification(info['payload'])
+                    started = time.time()
+                    result = await self._send_deletion_notification(info['payload'])
+                    self._record_event(info['payload'], result, started)
                     
             except Exception as e:
                 self.logger.error(f"Error in deletion cleanup task: {e}")